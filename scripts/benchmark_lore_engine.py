@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+TEC Lore Engine Benchmark
+Generations/sec for the compiled lore templates: per generator type, mixed
+batches (collected and streamed), World Anvil articles, and engine startup
+"""
+
+import os
+import sys
+import time
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.lore_engine import LoreGenerationEngine, WORLD_ANVIL_TEMPLATES
+
+
+def rate(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def run(count: int = 50_000):
+    print("⚒️ TEC Lore Engine Benchmark")
+    print("=" * 64)
+    start = time.perf_counter()
+    engine = LoreGenerationEngine(seed=35)
+    print(f"{'engine startup (compile templates)':<40} {(time.perf_counter() - start) * 1000:>10.2f} ms")
+    print()
+
+    print(f"{'workload':<40} {'gen/s':>10}")
+    for generator_type in engine.generator_types:
+        per_type = count // 10
+        gen_rate = rate(lambda: [engine.generate(generator_type, "bbcode") for _ in range(per_type)], per_type)
+        print(f"{generator_type:<40} {gen_rate:>10,.0f}")
+
+    mixed = rate(lambda: engine.generate_batch(count), count)
+    print(f"{'batch, all types (bbcode)':<40} {mixed:>10,.0f}")
+    mixed_text = rate(lambda: engine.generate_batch(count, format_type="text"), count)
+    print(f"{'batch, all types (text)':<40} {mixed_text:>10,.0f}")
+
+    def consume_stream():
+        first = None
+        for item in engine.iter_batch(count):
+            if first is None:
+                first = time.perf_counter()
+        return first
+
+    start = time.perf_counter()
+    first = consume_stream()
+    elapsed = time.perf_counter() - start
+    print(f"{'streamed batch':<40} {count / elapsed:>10,.0f}  (first item {(first - start) * 1e6:.0f} us)")
+
+    articles = list(WORLD_ANVIL_TEMPLATES)
+    article_rate = rate(lambda: [engine.generate_article(articles[i % len(articles)]) for i in range(count)], count)
+    print(f"{'World Anvil articles':<40} {article_rate:>10,.0f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+TEC Lore Store Benchmark
+Fills a store with a million Lore Forge generations, then compares deep
+history pages via OFFSET against keyset cursors, plus filtered listings,
+insert rate and compression ratio
+
+Usage: python scripts/benchmark_lore_store.py [rows]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.lore_store import LoreContentStore
+
+FACTIONS = ["Independent Operators", "Astradigital Research Division", "Neo-Constantinople Guard",
+            "The Synthesis Collective", "Quantum Liberation Front", "Digital Preservation Society", "The Evolved"]
+GENERATORS = ["operative-profile", "mission-brief", "character-basic", "equipment-loadout", "faction-info",
+              "location-detail", "story-element", "faction-operative", "faction-conflict", "faction-mission"]
+NAMES = ["Cipher Starweaver", "Vex Networkborn", "Echo Datastream", "Nova Mindbridge", "Zara Voidwhisper"]
+TRAITS = ["Adaptive problem-solving", "Pattern recognition mastery", "Strategic thinking", "Technical innovation"]
+START = datetime(2024, 1, 1)
+
+
+def generation(i: int) -> dict:
+    rng = random.Random(i)
+    faction = rng.choice(FACTIONS)
+    content = (
+        f"[h3]TEC Operative Profile #{i}[/h3]\n"
+        f"[b]Name:[/b] {rng.choice(NAMES)}\n[b]Faction:[/b] {faction}\n"
+        f"[b]Core Trait:[/b] {rng.choice(TRAITS)}\n[b]Security Clearance:[/b] {rng.choice('ABGDO')}-{rng.randint(1, 9)}\n"
+        f"[h4]Background[/h4]\nOperating within {faction}, this operative embodies their core ideology. "
+        f"Their expertise makes them invaluable for missions involving {rng.choice(TRAITS).lower()}. "
+        + "Field reports describe quantum disturbances across the digital frontier. " * rng.randint(4, 12)
+    )
+    created = (START + timedelta(seconds=i * 30)).strftime("%Y-%m-%dT%H:%M:%S.%f")
+    return {"content": content, "generator_type": rng.choice(GENERATORS), "faction": faction,
+            "created_at": created}
+
+
+def timed(fn, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(rows: int = 1_000_000, page_size: int = 50, chunk: int = 20_000):
+    print("📚 TEC Lore Store Benchmark")
+    print("=" * 64)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LoreContentStore(db_path=os.path.join(tmp, "lore.db"))
+        start = time.perf_counter()
+        for offset in range(0, rows, chunk):
+            store.save_many(generation(i) for i in range(offset, min(rows, offset + chunk)))
+        insert_seconds = time.perf_counter() - start
+        # Re-saving identical generations only bumps duplicate counters
+        store.save_many(generation(i) for i in range(1000))
+
+        stats = store.stats()
+        print(f"{'rows stored':<36} {stats['generations']:>12,}")
+        print(f"{'insert rate':<36} {rows / insert_seconds:>12,.0f} rows/s")
+        print(f"{'compression (' + stats['default_codec'] + ')':<36} {stats['compression_ratio']:>12.2f}x "
+              f"({stats['raw_bytes'] / 1e6:,.0f} MB -> {stats['stored_bytes'] / 1e6:,.0f} MB)")
+        print()
+
+        conn = sqlite3.connect(store.db_path)
+        depth = rows - page_size * 2
+        offset_ms = timed(lambda: conn.execute("""
+            SELECT id, generator_type, summary, created_at FROM lore_generations
+            ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?
+        """, (page_size, depth)).fetchall(), repeat=5)
+
+        # Walk to the same depth once to get a real cursor, then time the page read
+        row = conn.execute("SELECT created_at, id FROM lore_generations ORDER BY created_at DESC, id DESC "
+                           "LIMIT 1 OFFSET ?", (depth - 1,)).fetchone()
+        cursor = store.encode_cursor(*row)
+        keyset_ms = timed(lambda: store.list(limit=page_size, cursor=cursor))
+        first_ms = timed(lambda: store.list(limit=page_size))
+        faction_ms = timed(lambda: store.list(limit=page_size, cursor=cursor, faction="The Evolved"))
+        both_ms = timed(lambda: store.list(limit=page_size, generator_type="faction-mission", faction="The Evolved"))
+        detail_ms = timed(lambda: store.get(rows // 2), repeat=200)
+
+        print(f"{'page':<36} {'ms':>12}")
+        print(f"{'first page':<36} {first_ms:>12.2f}")
+        print(f"{f'OFFSET {depth:,}':<36} {offset_ms:>12.2f}")
+        print(f"{'keyset cursor at same depth':<36} {keyset_ms:>12.2f}  ({offset_ms / keyset_ms:,.0f}x)")
+        print(f"{'keyset + faction filter':<36} {faction_ms:>12.2f}")
+        print(f"{'generator + faction filter':<36} {both_ms:>12.2f}")
+        print(f"{'detail (decompress one body)':<36} {detail_ms:>12.2f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+TEC MCP Runtime Load Test
+Requests/sec at a fixed p99 latency for an MCP server on Flask's threaded
+development server versus the async MCP runtime
+
+Usage: python scripts/benchmark_mcp_runtime.py [seconds per level] [p99 target ms]
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+import aiohttp
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+CONCURRENCY_LEVELS = (1, 4, 16, 32, 64, 128)
+WORKLOAD = {"uri": "quest://stats/productivity"}
+
+
+def serve(runtime: str, urls):
+    """Server process: the load generator runs in the parent so they do not share a GIL"""
+    logging.disable(logging.WARNING)
+    from tec_tools.mcp_questlog import QuestLogMCPServer
+    server = QuestLogMCPServer(db_path=":memory:")
+    if runtime == "flask":
+        from werkzeug.serving import make_server
+        http_server = make_server("127.0.0.1", 0, server.app, threaded=True)
+        urls.put(f"http://127.0.0.1:{http_server.server_port}")
+        http_server.serve_forever()
+    else:
+        from tec_tools.mcp_runtime import MCPRuntime
+
+        async def run():
+            urls.put(await MCPRuntime(server).start())
+            await asyncio.Event().wait()
+
+        asyncio.run(run())
+
+
+async def load(url: str, concurrency: int, seconds: float):
+    latencies = []
+    errors = 0
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        stop_at = time.perf_counter() + seconds
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < stop_at:
+                started = time.perf_counter()
+                async with session.post(f"{url}/mcp/resources/read", json=WORKLOAD) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return len(latencies) / elapsed, latencies[len(latencies) // 2], latencies[int(0.99 * (len(latencies) - 1))], errors
+
+
+def run(seconds: float = 3.0, p99_target: float = 25.0):
+    print("🏋️ TEC MCP Runtime Load Test")
+    print("=" * 64)
+    print(f"POST /mcp/resources/read {WORKLOAD['uri']}, {seconds:g}s per concurrency level")
+    print()
+    print(f"{'runtime':<8} {'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    best = {}
+    for runtime in ("flask", "async"):
+        urls = multiprocessing.Queue()
+        process = multiprocessing.Process(target=serve, args=(runtime, urls), daemon=True)
+        process.start()
+        url = urls.get(timeout=30)
+        try:
+            for concurrency in CONCURRENCY_LEVELS:
+                rps, p50, p99, errors = asyncio.run(load(url, concurrency, seconds))
+                print(f"{runtime:<8} {concurrency:>5} {rps:>9,.0f} {p50:>8.2f} {p99:>8.2f} {errors:>7}")
+                if p99 <= p99_target and not errors:
+                    best[runtime] = max(best.get(runtime, (0, 0)), (rps, concurrency))
+        finally:
+            process.terminate()
+            process.join()
+
+    print()
+    print(f"Best throughput with p99 <= {p99_target:g} ms:")
+    for runtime in ("flask", "async"):
+        rps, concurrency = best.get(runtime, (0, 0))
+        print(f"  {runtime:<8} {rps:>9,.0f} req/s (concurrency {concurrency})")
+
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 3.0,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 25.0)
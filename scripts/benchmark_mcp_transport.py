@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+TEC MCP Transport Benchmark
+Orchestrator request latency with co-located MCP servers reached over
+localhost HTTP versus the in-process transport
+
+Usage: python scripts/benchmark_mcp_transport.py [iterations]
+"""
+
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.mcp_base import InProcessMCPClient, MCPClient
+from tec_tools.mcp_finance import FinanceMCPServer
+from tec_tools.mcp_journal import JournalMCPServer
+from tec_tools.mcp_orchestrator import MCPOrchestrator
+from tec_tools.mcp_questlog import QuestLogMCPServer
+
+SERVERS = {"journal": lambda: JournalMCPServer(db_path=":memory:"), "finance": FinanceMCPServer,
+           "questlog": lambda: QuestLogMCPServer(db_path=":memory:")}
+
+
+def percentiles(fn, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+
+def run(iterations: int = 300):
+    logging.disable(logging.WARNING)
+    print("🔌 TEC MCP Transport Benchmark")
+    print("=" * 64)
+    servers = {name: cls() for name, cls in SERVERS.items()}
+    http_servers = []
+    transports = {"http": {}, "inprocess": {}}
+    for name, server in servers.items():
+        http_server = make_server("127.0.0.1", 0, server.app, threaded=True)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+        http_servers.append(http_server)
+        transports["http"][name] = MCPClient(f"http://127.0.0.1:{http_server.server_port}")
+        transports["inprocess"][name] = InProcessMCPClient(server)
+
+    orchestrator = MCPOrchestrator()
+    route = orchestrator.app.test_client()
+    print(f"{iterations} iterations per workload; latency in ms (p50 / p95)")
+    print()
+    print(f"{'workload':<34} {'http':>13} {'in-process':>13} {'speedup':>8}")
+    workloads = [
+        ("read_resource (profile)", lambda clients: clients["questlog"].read_resource("quest://profile/user")),
+        ("call_tool (level_up_check)", lambda clients: clients["questlog"].call_tool("level_up_check", {"userId": "u1"})),
+        ("read_resources batch (3 URIs)", lambda clients: clients["questlog"].read_resources(
+            ["quest://profile/user", "quest://quests/active", "quest://stats/productivity"])),
+        ("daisy context: recent (3 reads)", lambda clients: orchestrator._gather_daisy_context("u1", "recent")),
+        ("daisy context: full (8 reads)", lambda clients: orchestrator._gather_daisy_context("u1", "full")),
+        ("POST /mcp/daisy/context (full)",
+         lambda clients: route.post('/mcp/daisy/context', json={"userId": "u1", "contextType": "full"})),
+    ]
+    for label, workload in workloads:
+        results = {}
+        for transport, clients in transports.items():
+            orchestrator.clients = clients
+            workload(clients)
+            results[transport] = percentiles(lambda: workload(clients), iterations)
+        http_p50, http_p95 = results["http"]
+        local_p50, local_p95 = results["inprocess"]
+        print(f"{label:<34} {http_p50:>6.2f}/{http_p95:<6.2f} {local_p50:>6.2f}/{local_p95:<6.2f} "
+              f"{http_p50 / local_p50:>7.1f}x")
+
+    for http_server in http_servers:
+        http_server.shutdown()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
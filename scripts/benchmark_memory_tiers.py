@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+TEC Memory Tier Benchmark
+Chat-context latency (the /chat memory path) as the memory count grows,
+comparing SQLite-only reads, the hot tier, the hot tier after compaction,
+and the per-user chat context cache
+"""
+
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.memory_system import TECMemorySystem
+
+USER_ID = "default_user"
+MESSAGES = ["hello again", "tell me about the astradigital ocean", "what did we discuss yesterday?"]
+
+
+def populate(db_path: str, count: int):
+    """Bulk insert ``count`` conversation memories, 90% of them stale"""
+    TECMemorySystem(db_path=db_path, hot_tier_capacity=0)
+    now = datetime.now()
+    rows = []
+    for i in range(count):
+        stale = i % 10 != 0
+        stamp = (now - timedelta(days=120 if stale else 1, seconds=i)).isoformat()
+        rows.append((
+            str(uuid.uuid4()), USER_ID,
+            f"User: message {i} about topic {i % 50}\nAI (Polkin): reply {i}",
+            "conversation", 0.3 if stale else 0.6,
+            json.dumps(["polkin", "chat"]), stamp, stamp, 0, "[]", "{}"
+        ))
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany("INSERT INTO memories VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def chat_context(system: TECMemorySystem, message: str, cached: bool = False):
+    if cached:
+        system.get_chat_context(USER_ID, message, recent_limit=5, relevant_limit=3)
+    else:
+        system.get_memories(USER_ID, memory_type="conversation", limit=5)
+        system.search_memories(USER_ID, message, limit=3)
+    system.create_memory(USER_ID, f"User: {message}\nAI (Polkin): ok", importance=0.5,
+                         tags=["polkin", "chat"])
+
+
+def measure(system: TECMemorySystem, rounds: int = 60, cached: bool = False) -> dict:
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        chat_context(system, MESSAGES[i % len(MESSAGES)], cached)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3)
+    }
+
+
+def run(sizes=(1_000, 10_000, 50_000)):
+    print("🧠 TEC Memory Tier Benchmark - /chat memory context latency")
+    print("=" * 93)
+    print(f"{'memories':>10} | {'sqlite only':>18} | {'hot tier':>18} | {'hot + compacted':>18} | {'chat context':>18}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            results = []
+            for mode in ("sqlite", "hot", "compacted", "context"):
+                db_path = os.path.join(tmp, f"{mode}.db")
+                populate(db_path, size)
+                system = TECMemorySystem(db_path=db_path,
+                                         hot_tier_capacity=0 if mode == "sqlite" else 256)
+                if mode == "compacted":
+                    system.compact_memories(max_age_days=30, importance_threshold=0.4)
+                results.append(measure(system, cached=mode == "context"))
+            cells = [f"{r['mean_ms']:>7} / {r['p95_ms']:>7}ms" for r in results]
+            print(f"{size:>10} | " + " | ".join(cells))
+    print("(mean / p95 per chat turn)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+TEC Provider HTTP Benchmark
+Concurrent NPC dialogue throughput against a local stub provider: blocking
+requests.post and a ClientSession per call versus the shared pooled client
+
+Usage: python scripts/benchmark_provider_http.py [dialogues]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+import requests
+
+# Add the src and services directories to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'services'))
+
+from mcp_service import MCPService
+from tec_tools.http_client import ProviderHTTPClient
+from tec_tools.provider_stub import StubProviderServer
+
+NPC = {
+    "npc_profile": {
+        "name": "Mira", "type": "merchant",
+        "personality_traits": {"friendliness": 80, "aggression": 10, "curiosity": 60,
+                               "loyalty": 70, "intelligence": 65, "humor": 40},
+        "special_roles": {"is_merchant": True, "is_quest_giver": False, "is_hostile": False}
+    },
+    "current_state": {"mood": "cheerful", "goal": "sell potions", "location": "market", "health_percentage": 100},
+    "player_relationship": {"level": "friendly", "score": 70}
+}
+
+
+class BlockingRequestsService(MCPService):
+    """The previous GitHub/local adapter: requests.post inside the coroutine"""
+
+    async def _call_chat_completions(self, config, messages, tools=None):
+        response = requests.post(f"{config['base_url']}/chat/completions", timeout=30, json={
+            "model": config["model"], "messages": messages, "temperature": 0.7, "max_tokens": 500
+        })
+        return {"success": True, "content": response.json()["choices"][0]["message"]["content"]}
+
+
+class SessionPerCallService(MCPService):
+    """The previous Gemini adapter shape: a fresh ClientSession (and connection) per call"""
+
+    async def _call_chat_completions(self, config, messages, tools=None):
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"{config['base_url']}/chat/completions", json={
+                "model": config["model"], "messages": messages, "temperature": 0.7, "max_tokens": 500
+            }) as response:
+                data = await response.json()
+                return {"success": True, "content": data["choices"][0]["message"]["content"]}
+
+
+async def measure(service_cls, stub: StubProviderServer, dialogues: int, client: ProviderHTTPClient = None):
+    service = service_cls(http_client=client or ProviderHTTPClient())
+    service.providers["github"].update(api_key="bench", base_url=stub.openai_base_url)
+    service.current_provider = "github"
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        service.generate_npc_dialogue(NPC, f"Any potions? #{i}", {}) for i in range(dialogues)
+    ])
+    elapsed = time.perf_counter() - start
+    await service.http.close()
+    assert all(result["success"] for result in results)
+    return dialogues / elapsed
+
+
+def run(dialogues: int = 500, latency: float = 0.05):
+    print("🌐 TEC Provider HTTP Benchmark")
+    print("=" * 64)
+    print(f"{dialogues} concurrent NPC dialogues, stub provider latency {latency * 1000:.0f} ms")
+    print()
+    print(f"{'client':<30} {'dialogues/s':>12} {'connections':>12} {'in flight':>10}")
+    rows = [
+        ("blocking requests.post", BlockingRequestsService, None),
+        ("ClientSession per call", SessionPerCallService, None),
+        ("shared pool (20/host)", MCPService, ProviderHTTPClient(limit_per_host=20)),
+        ("shared pool (100/host)", MCPService, ProviderHTTPClient(limit=100, limit_per_host=100)),
+    ]
+    for label, service_cls, client in rows:
+        # The stub runs on its own loop thread, as a remote provider would
+        stub = StubProviderServer(latency=latency)
+        stub.start_in_thread()
+        throughput = asyncio.run(measure(service_cls, stub, dialogues, client))
+        stub.stop_thread()
+        print(f"{label:<30} {throughput:>12,.0f} {stub.connections:>12,} {stub.peak_in_flight:>10,}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
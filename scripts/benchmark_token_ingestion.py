@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+TEC Token Ingestion Benchmark
+Records/sec for token usage logging: the original per-call insert plus
+correlated-subquery session upsert, today's synchronous log_usage, and the
+buffered path (including its final flush)
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.token_manager import TECTokenManager
+
+CHARACTERS = ["Polkin", "Airth", "Mynx", "Kaelen"]
+
+
+def legacy_log_usage(db_path: str, session_id: str, character: str, timestamp: str):
+    """The pre-buffering write path: one connection, insert and subquery upsert per call"""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            INSERT INTO token_usage
+            (session_id, timestamp, character, request_type, prompt_tokens,
+             completion_tokens, total_tokens, estimated_cost, model,
+             memory_context_size, avatar_processing)
+            VALUES (?, ?, ?, 'chat', 120, 80, 200, 0.0001, 'gemini-pro', 0, 0)
+        """, (session_id, timestamp, character))
+        conn.execute("""
+            INSERT OR REPLACE INTO usage_sessions
+            (session_id, start_time, character, total_tokens, total_cost, request_count)
+            VALUES (
+                ?,
+                COALESCE((SELECT start_time FROM usage_sessions WHERE session_id = ?), ?),
+                ?,
+                COALESCE((SELECT total_tokens FROM usage_sessions WHERE session_id = ?), 0) + ?,
+                COALESCE((SELECT total_cost FROM usage_sessions WHERE session_id = ?), 0.0) + ?,
+                COALESCE((SELECT request_count FROM usage_sessions WHERE session_id = ?), 0) + 1
+            )
+        """, (session_id, session_id, timestamp, character, session_id, 200, session_id, 0.0001, session_id))
+        conn.commit()
+
+
+def run(records: int = 5_000, sessions: int = 20):
+    print("📈 TEC Token Ingestion Benchmark")
+    print("=" * 64)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "legacy.db")
+        TECTokenManager(db_path=db_path)
+        start = time.perf_counter()
+        for i in range(records):
+            legacy_log_usage(db_path, f"s{i % sessions}", CHARACTERS[i % 4], f"2025-01-01T12:00:{i % 60:02d}")
+        results["legacy (insert + subquery upsert)"] = time.perf_counter() - start
+
+        manager = TECTokenManager(db_path=os.path.join(tmp, "sync.db"))
+        start = time.perf_counter()
+        for i in range(records):
+            manager.log_usage("gemini-pro", 120, 80, character=CHARACTERS[i % 4], session_id=f"s{i % sessions}")
+        results["log_usage (synchronous)"] = time.perf_counter() - start
+
+        manager = TECTokenManager(db_path=os.path.join(tmp, "buffered.db"), buffered=True, max_pending=500)
+        start = time.perf_counter()
+        for i in range(records):
+            manager.log_usage("gemini-pro", 120, 80, character=CHARACTERS[i % 4], session_id=f"s{i % sessions}")
+        enqueue = time.perf_counter() - start
+        manager.close()
+        results["log_usage (buffered, incl. flush)"] = time.perf_counter() - start
+        assert manager.get_usage_stats(days=1).requests_count == records
+
+    baseline = records / results["legacy (insert + subquery upsert)"]
+    for name, seconds in results.items():
+        rate = records / seconds
+        print(f"{name:<36} {rate:>10,.0f} rec/s  ({rate / baseline:>5.1f}x)")
+    print(f"{'buffered request-path cost':<36} {enqueue / records * 1e6:>10.1f} us/record")
+
+
+if __name__ == "__main__":
+    run()
@@ -7,11 +7,16 @@ import json
 import requests
 import asyncio
 import aiohttp
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator
 from datetime import datetime
 import os
 import logging
 
+from tec_tools.chat_streaming import STREAM_METRICS, TimedStream
+from tec_tools.http_client import ProviderHTTPClient, get_provider_http_client
+from tec_tools.provider_router import PRIORITY_LOW, PRIORITY_NORMAL, ProviderRouter
+from tec_tools.single_flight import SingleFlight, request_key
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -22,28 +27,41 @@ class MCPService:
     Supports multiple providers with fallback logic
     """
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[ProviderHTTPClient] = None):
+        # Pooled keep-alive session shared by every provider call
+        self.http = http_client or get_provider_http_client()
         self.providers = {
             "gemini": {
                 "enabled": True,
                 "api_key": os.getenv("GEMINI_API_KEY"),
                 "base_url": "https://generativelanguage.googleapis.com/v1beta",
-                "model": "gemini-1.5-pro"
+                "model": "gemini-1.5-pro",
+                "cost_per_1k_tokens": 0.00125
             },
             "github": {
                 "enabled": True,
                 "api_key": os.getenv("GITHUB_TOKEN"),
                 "base_url": "https://models.inference.ai.azure.com",
-                "model": "gpt-4o-mini"
+                "model": "gpt-4o-mini",
+                "cost_per_1k_tokens": 0.00015
             },
             "local": {
                 "enabled": False,  # Will be enabled when Kimi-K2 is set up
                 "base_url": "http://localhost:8080/v1",
-                "model": "kimi-k2-instruct"
+                "model": "kimi-k2-instruct",
+                "cost_per_1k_tokens": 0.0
             }
         }
         
         self.current_provider = "gemini"
+        # Identical concurrent dialogue prompts share one provider call
+        self.dialogue_flight = SingleFlight()
+        # Health-scored routing; current_provider stays first choice while its breaker is closed
+        self.router = ProviderRouter(
+            {name: config["cost_per_1k_tokens"] for name, config in self.providers.items()},
+            preferred=self.current_provider,
+            enabled=lambda name: self.providers[name]["enabled"]
+        )
         self.conversation_history: Dict[str, List] = {}
         
         # Tool definitions for agentic behavior
@@ -97,6 +115,7 @@ class MCPService:
         """Switch to a different AI provider"""
         if provider_name in self.providers and self.providers[provider_name]["enabled"]:
             self.current_provider = provider_name
+            self.router.preferred = provider_name
             logger.info(f"Switched to AI provider: {provider_name}")
             return True
         return False
@@ -110,49 +129,14 @@ class MCPService:
         Generate NPC dialogue response using AI
         """
         try:
-            # Prepare the prompt
-            system_prompt = self._build_npc_system_prompt(npc_data)
-            user_prompt = self._build_user_prompt(player_message, conversation_context)
-            
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
-            
-            # Add conversation history if available
-            npc_id = npc_data["npc_profile"]["name"]
-            if npc_id in self.conversation_history:
-                # Add last few exchanges
-                recent_history = self.conversation_history[npc_id][-6:]  # Last 3 exchanges
-                for exchange in recent_history:
-                    messages.extend([
-                        {"role": "user", "content": exchange.get("player_message", "")},
-                        {"role": "assistant", "content": exchange.get("npc_response", "")}
-                    ])
-            
-            # Try primary provider first
-            response = await self._call_ai_provider(self.current_provider, messages, tools=self.available_tools)
+            npc_id, messages = self._build_dialogue_messages(npc_data, player_message, conversation_context)
             
-            if response["success"]:
-                # Store conversation for future context
-                self._store_conversation(npc_id, player_message, response["content"])
-                return response
-            else:
-                # Try fallback providers
-                for provider in self.get_available_providers():
-                    if provider != self.current_provider:
-                        logger.warning(f"Primary provider {self.current_provider} failed, trying {provider}")
-                        fallback_response = await self._call_ai_provider(provider, messages)
-                        if fallback_response["success"]:
-                            self._store_conversation(npc_id, player_message, fallback_response["content"])
-                            return fallback_response
-                
-                # All providers failed
-                return {
-                    "success": False,
-                    "content": "I seem to be having trouble speaking right now...",
-                    "error": "All AI providers failed"
-                }
+            # Keyed on the full prompt (system, user and history), so only truly identical requests merge
+            key = request_key(npc_id, messages)
+            response = await self.dialogue_flight.do(
+                key, lambda: self._generate_dialogue_once(npc_id, player_message, messages)
+            )
+            return dict(response)
                 
         except Exception as e:
             logger.error(f"Error generating NPC dialogue: {e}")
@@ -162,6 +146,97 @@ class MCPService:
                 "error": str(e)
             }
     
+    async def _generate_dialogue_once(self, npc_id: str, player_message: str, messages: List[Dict]) -> Dict:
+        """One routed provider call for a (possibly coalesced) dialogue request"""
+        # Tools are offered to the preferred provider only, as fallbacks may not support them
+        _, response = await self.router.call(
+            lambda name: self._call_ai_provider(
+                name, messages, tools=self.available_tools if name == self.current_provider else None
+            ),
+            priority=PRIORITY_NORMAL
+        )
+        
+        if response["success"]:
+            # Store conversation for future context
+            self._store_conversation(npc_id, player_message, response["content"])
+            return response
+        
+        # All providers failed
+        return {
+            "success": False,
+            "content": "I seem to be having trouble speaking right now...",
+            "error": "All AI providers failed"
+        }
+    
+    async def stream_npc_dialogue(self, npc_data: Dict, player_message: str,
+                                  conversation_context: Dict) -> AsyncIterator[str]:
+        """
+        Stream NPC dialogue as text deltas. Providers are tried in the same
+        order as generate_npc_dialogue, but only until the first token
+        arrives; the exchange is stored once the reply is complete.
+        """
+        npc_id, messages = self._build_dialogue_messages(npc_data, player_message, conversation_context)
+        
+        for provider in self.router.order(PRIORITY_NORMAL):
+            health = self.router.health[provider]
+            health.acquire()
+            stream = self.stream_ai_provider(provider, messages)
+            iterator = stream.__aiter__()
+            started = self.router.clock()
+            try:
+                first = await iterator.__anext__()
+            except StopAsyncIteration:
+                health.record(self.router.clock() - started, False)
+                continue
+            except Exception as e:
+                health.record(self.router.clock() - started, False)
+                logger.warning(f"Streaming provider {provider} failed before first token: {e}")
+                continue
+            
+            # Time to first token is the latency the router scores streams on
+            latency = self.router.clock() - started
+            ok = True
+            try:
+                yield first
+                async for delta in iterator:
+                    yield delta
+            except Exception as e:
+                # Too late to fall back, but the breaker should still see the failure
+                ok = False
+                logger.warning(f"Streaming provider {provider} failed mid-stream: {e}")
+                raise
+            finally:
+                # One sample per attempt, once its outcome is known; a consumer
+                # disconnect counts as a success and still releases the connection
+                health.record(latency, ok)
+                await stream.aclose()
+            self._store_conversation(npc_id, player_message, stream.text.strip())
+            return
+        
+        yield "I seem to be having trouble speaking right now..."
+    
+    def _build_dialogue_messages(self, npc_data: Dict, player_message: str, conversation_context: Dict):
+        """System prompt, recent exchanges with this NPC, and the player's message"""
+        system_prompt = self._build_npc_system_prompt(npc_data)
+        user_prompt = self._build_user_prompt(player_message, conversation_context)
+        
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        # Add conversation history if available
+        npc_id = npc_data["npc_profile"]["name"]
+        if npc_id in self.conversation_history:
+            # Add last few exchanges
+            recent_history = self.conversation_history[npc_id][-6:]  # Last 3 exchanges
+            for exchange in recent_history:
+                messages.extend([
+                    {"role": "user", "content": exchange.get("player_message", "")},
+                    {"role": "assistant", "content": exchange.get("npc_response", "")}
+                ])
+        return npc_id, messages
+    
     def _build_npc_system_prompt(self, npc_data: Dict) -> str:
         """Build the system prompt for NPC dialogue"""
         profile = npc_data["npc_profile"]
@@ -245,7 +320,22 @@ IMPORTANT: Stay in character at all times. You are NOT an AI assistant - you are
         if not config["api_key"]:
             return {"success": False, "error": "Gemini API key not configured"}
         
-        # Convert messages to Gemini format
+        url = f"{config['base_url']}/models/{config['model']}:generateContent"
+        headers = {"Content-Type": "application/json"}
+        payload = self._gemini_payload(messages)
+        
+        try:
+            status, data = await self.http.post_json(url, payload, headers=headers, params={"key": config["api_key"]})
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return {"success": False, "error": f"Request failed: {e!r}"}
+        if status == 200:
+            content = data["candidates"][0]["content"]["parts"][0]["text"]
+            return {"success": True, "content": content.strip()}
+        return {"success": False, "error": f"HTTP {status}: {data}"}
+    
+    @staticmethod
+    def _gemini_payload(messages: List[Dict]) -> Dict:
+        """Convert messages to Gemini format"""
         prompt = ""
         for msg in messages:
             if msg["role"] == "system":
@@ -257,65 +347,90 @@ IMPORTANT: Stay in character at all times. You are NOT an AI assistant - you are
         
         prompt += "Assistant:"
         
-        url = f"{config['base_url']}/models/{config['model']}:generateContent"
-        headers = {"Content-Type": "application/json"}
-        
-        payload = {
+        return {
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": {
                 "temperature": 0.7,
                 "maxOutputTokens": 500
             }
         }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{url}?key={config['api_key']}", 
-                                   json=payload, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    content = data["candidates"][0]["content"]["parts"][0]["text"]
-                    return {"success": True, "content": content.strip()}
-                else:
-                    error_text = await response.text()
-                    return {"success": False, "error": f"HTTP {response.status}: {error_text}"}
     
-    async def _call_github_ai(self, config: Dict, messages: List[Dict], tools: Optional[Dict] = None) -> Dict:
-        """Call GitHub AI Models"""
+    def stream_ai_provider(self, provider_name: str, messages: List[Dict]) -> TimedStream:
+        """Stream a provider's completion as text deltas, timed for TTFT and tokens/sec"""
+        provider_config = self.providers[provider_name]
+        if provider_name == "gemini":
+            source = self._stream_gemini(provider_config, messages)
+        elif provider_name in ("github", "local"):
+            source = self._stream_openai_compatible(provider_config, messages)
+        else:
+            raise ValueError(f"Unknown provider: {provider_name}")
+        return TimedStream(provider_name, source)
+    
+    @staticmethod
+    async def _iter_sse_data(response) -> AsyncIterator[Dict]:
+        """JSON payloads of the ``data:`` lines in a server-sent event response"""
+        async for raw_line in response.content:
+            line = raw_line.decode("utf-8").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                return
+            yield json.loads(data)
+    
+    async def _stream_gemini(self, config: Dict, messages: List[Dict]) -> AsyncIterator[str]:
+        """Stream from Gemini's streamGenerateContent endpoint"""
         if not config["api_key"]:
-            return {"success": False, "error": "GitHub token not configured"}
+            raise RuntimeError("Gemini API key not configured")
         
-        url = f"{config['base_url']}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {config['api_key']}",
-            "Content-Type": "application/json"
-        }
+        url = f"{config['base_url']}/models/{config['model']}:streamGenerateContent"
+        async with self.http.stream(url, self._gemini_payload(messages),
+                                    headers={"Content-Type": "application/json"},
+                                    params={"alt": "sse", "key": config["api_key"]}) as response:
+            async for event in self._iter_sse_data(response):
+                for candidate in event.get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+    
+    async def _stream_openai_compatible(self, config: Dict, messages: List[Dict]) -> AsyncIterator[str]:
+        """Stream from a chat/completions endpoint (GitHub Models, local Kimi-K2)"""
+        headers = {"Content-Type": "application/json"}
+        if config.get("api_key"):
+            headers["Authorization"] = f"Bearer {config['api_key']}"
         
         payload = {
             "model": config["model"],
             "messages": messages,
             "temperature": 0.7,
-            "max_tokens": 500
+            "max_tokens": 500,
+            "stream": True
         }
         
-        if tools:
-            payload["tools"] = [{"type": "function", "function": tool} for tool in tools.values()]
-            payload["tool_choice"] = "auto"
+        async with self.http.stream(f"{config['base_url']}/chat/completions", payload, headers=headers) as response:
+            async for event in self._iter_sse_data(response):
+                for choice in event.get("choices", [])[:1]:
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+    
+    async def _call_github_ai(self, config: Dict, messages: List[Dict], tools: Optional[Dict] = None) -> Dict:
+        """Call GitHub AI Models"""
+        if not config["api_key"]:
+            return {"success": False, "error": "GitHub token not configured"}
         
-        try:
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                content = data["choices"][0]["message"]["content"]
-                return {"success": True, "content": content}
-            else:
-                return {"success": False, "error": f"HTTP {response.status_code}: {response.text}"}
-        except requests.RequestException as e:
-            return {"success": False, "error": f"Request failed: {e}"}
+        return await self._call_chat_completions(config, messages, tools)
     
     async def _call_local_ai(self, config: Dict, messages: List[Dict], tools: Optional[Dict] = None) -> Dict:
         """Call local Kimi-K2 model"""
+        return await self._call_chat_completions(config, messages, tools)
+    
+    async def _call_chat_completions(self, config: Dict, messages: List[Dict], tools: Optional[Dict] = None) -> Dict:
+        """Call an OpenAI-compatible chat/completions endpoint on the shared pool"""
         url = f"{config['base_url']}/chat/completions"
         headers = {"Content-Type": "application/json"}
+        if config.get("api_key"):
+            headers["Authorization"] = f"Bearer {config['api_key']}"
         
         payload = {
             "model": config["model"],
@@ -329,15 +444,13 @@ IMPORTANT: Stay in character at all times. You are NOT an AI assistant - you are
             payload["tool_choice"] = "auto"
         
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                content = data["choices"][0]["message"]["content"]
-                return {"success": True, "content": content}
-            else:
-                return {"success": False, "error": f"HTTP {response.status_code}: {response.text}"}
-        except requests.RequestException as e:
-            return {"success": False, "error": f"Request failed: {e}"}
+            status, data = await self.http.post_json(url, payload, headers=headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return {"success": False, "error": f"Request failed: {e!r}"}
+        if status == 200:
+            content = data["choices"][0]["message"]["content"]
+            return {"success": True, "content": content}
+        return {"success": False, "error": f"HTTP {status}: {data}"}
     
     def _store_conversation(self, npc_id: str, player_message: str, npc_response: str):
         """Store conversation for context"""
@@ -367,7 +480,8 @@ Create a vivid, 2-3 sentence description that captures the drama and intensity o
 Use fantasy language and make it feel epic and immersive."""
         
         messages = [{"role": "user", "content": prompt}]
-        response = await self._call_ai_provider(self.current_provider, messages)
+        # Flavour text: cheapest healthy provider, no hedging
+        _, response = await self.router.call(lambda name: self._call_ai_provider(name, messages), priority=PRIORITY_LOW)
         
         return response.get("content", "An epic battle unfolds!")
     
@@ -385,7 +499,7 @@ Generate a compelling quest description that would motivate a player to embark o
 Keep it concise but intriguing (2-3 sentences)."""
         
         messages = [{"role": "user", "content": prompt}]
-        response = await self._call_ai_provider(self.current_provider, messages)
+        _, response = await self.router.call(lambda name: self._call_ai_provider(name, messages), priority=PRIORITY_LOW)
         
         return response.get("content", "A mysterious quest awaits...")
     
@@ -417,5 +531,9 @@ Keep it concise but intriguing (2-3 sentences)."""
                 for name, config in self.providers.items()
             },
             "conversation_histories": len(self.conversation_history),
+            "streaming": STREAM_METRICS.snapshot(),
+            "http_pool": self.http.stats(),
+            "routing": self.router.snapshot(),
+            "coalescing": self.dialogue_flight.stats(),
             "available_tools": list(self.available_tools.keys())
         }
@@ -12,6 +12,7 @@ import random
 from ..core.npc import NPC, NPCPersonality
 from ..core.game_world import GameWorld
 from .mcp_service import MCPService
+from tec_tools.response_cache import DialogueResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,8 @@ class NPCService:
         self.game_world = game_world
         self.mcp_service = mcp_service
         self.npc_templates = self._initialize_npc_templates()
-        self.dialogue_cache = {}  # Cache recent AI responses
+        # Generated replies shared by NPCs of the same type, mood and relationship level
+        self.dialogue_cache = DialogueResponseCache(maxsize=2048, ttl=300)
         self.behavior_timers = {}  # Track NPC behavior cycles
     
     def _initialize_npc_templates(self) -> Dict:
@@ -203,12 +205,11 @@ class NPCService:
     async def _generate_npc_dialogue(self, npc: NPC, player, message: str) -> Dict:
         """Generate AI-powered dialogue for the NPC"""
         try:
-            # Check cache first (for very recent identical messages)
-            cache_key = f"{npc.npc_id}_{hash(message)}"
-            if cache_key in self.dialogue_cache:
-                cached_response = self.dialogue_cache[cache_key]
-                if (datetime.now() - cached_response["timestamp"]).seconds < 60:  # 1 minute cache
-                    return cached_response["response"]
+            relationship_level = npc.get_relationship_level(player.player_id)
+            cached_response = self.dialogue_cache.get(npc.npc_type, npc.current_mood, relationship_level,
+                                                      message, npc_name=npc.name)
+            if cached_response is not None:
+                return cached_response
             
             # Prepare NPC data for AI
             npc_data = npc.get_ai_prompt_data(player.player_id)
@@ -219,14 +220,8 @@ class NPCService:
                 npc_data, message, conversation_context
             )
             
-            # Cache the response
-            self.dialogue_cache[cache_key] = {
-                "timestamp": datetime.now(),
-                "response": ai_response
-            }
-            
-            # Clean old cache entries
-            self._clean_dialogue_cache()
+            self.dialogue_cache.set(npc.npc_type, npc.current_mood, relationship_level,
+                                    message, ai_response, npc_name=npc.name)
             
             return ai_response
             
@@ -402,17 +397,9 @@ class NPCService:
             logger.error(f"Error getting NPCs in zone {zone_id}: {e}")
             return []
     
-    def _clean_dialogue_cache(self):
-        """Clean old entries from dialogue cache"""
-        current_time = datetime.now()
-        keys_to_remove = []
-        
-        for key, cached_data in self.dialogue_cache.items():
-            if (current_time - cached_data["timestamp"]).total_seconds() > 300:  # 5 minutes
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del self.dialogue_cache[key]
+    def get_dialogue_cache_stats(self) -> Dict:
+        """Hit rate and size of the shared dialogue response cache"""
+        return self.dialogue_cache.stats()
     
     def get_npc_status(self, npc_id: str) -> Tuple[bool, str, Optional[Dict]]:
         """Get detailed status of an NPC"""
@@ -144,8 +144,9 @@ def verify_signature():
             user_id = auth_result['user_data']['user_id']
             user_record = db_manager.create_user(user_id, wallet_address, chain)
             
-            # Determine access tier based on token holdings
-            access_tier = token_gate.determine_access_tier(wallet_address, chain)
+            # Determine access tier based on token holdings (cached briefly unless a refresh is asked for)
+            access_tier = token_gate.determine_access_tier(wallet_address, chain,
+                                                           refresh=bool(data.get('refresh_holdings')))
             db_manager.update_user_access_tier(user_id, access_tier)
             
             # Create auth session
@@ -14,6 +14,8 @@ from azure.ai.inference.models import SystemMessage, UserMessage, AssistantMessa
 from azure.core.credentials import AzureKeyCredential
 from azure.identity import DefaultAzureCredential
 
+from .chat_streaming import TimedStream, aiter_sync, astream_text
+
 logger = logging.getLogger(__name__)
 
 class PersonaManager:
@@ -168,25 +170,28 @@ class AzureAIManager:
         except Exception as e:
             logger.error(f"Error initializing Azure AI client: {e}")
     
+    @staticmethod
+    def _to_azure_messages(messages: List[Dict[str, str]]) -> list:
+        """Convert messages to Azure format"""
+        azure_messages = []
+        for msg in messages:
+            if msg['role'] == 'system':
+                azure_messages.append(SystemMessage(content=msg['content']))
+            elif msg['role'] == 'user':
+                azure_messages.append(UserMessage(content=msg['content']))
+            elif msg['role'] == 'assistant':
+                azure_messages.append(AssistantMessage(content=msg['content']))
+        return azure_messages
+    
     async def generate_response(self, messages: List[Dict[str, str]], model: str = "gpt-4o-mini") -> str:
         """Generate AI response using Azure AI"""
         try:
             if not self.ai_client:
                 return self._get_fallback_response(messages)
             
-            # Convert messages to Azure format
-            azure_messages = []
-            for msg in messages:
-                if msg['role'] == 'system':
-                    azure_messages.append(SystemMessage(content=msg['content']))
-                elif msg['role'] == 'user':
-                    azure_messages.append(UserMessage(content=msg['content']))
-                elif msg['role'] == 'assistant':
-                    azure_messages.append(AssistantMessage(content=msg['content']))
-            
             # Generate response
             response = self.ai_client.complete(
-                messages=azure_messages,
+                messages=self._to_azure_messages(messages),
                 model=model,
                 max_tokens=1000,
                 temperature=0.7
@@ -198,6 +203,40 @@ class AzureAIManager:
             logger.error(f"Error generating Azure AI response: {e}")
             return self._get_fallback_response(messages)
     
+    def stream_response(self, messages: List[Dict[str, str]], model: str = "gpt-4o-mini") -> TimedStream:
+        """Stream the AI response as text deltas (async iterable), timed under the serving provider"""
+        if not self.ai_client:
+            return TimedStream("fallback", astream_text(self._get_fallback_response(messages)))
+        stream = TimedStream("azure", None)
+        stream.source = self._stream_azure(messages, model, stream)
+        return stream
+    
+    async def _stream_azure(self, messages: List[Dict[str, str]], model: str, stream: TimedStream):
+        try:
+            response = await asyncio.to_thread(
+                self.ai_client.complete,
+                messages=self._to_azure_messages(messages),
+                model=model,
+                max_tokens=1000,
+                temperature=0.7,
+                stream=True
+            )
+        except Exception as e:
+            # Same fallback as generate_response; the failure still counts against Azure
+            logger.error(f"Error starting Azure AI stream: {e}")
+            stream.metrics.record("azure", None, 0, 0.0, ok=False)
+            stream.provider = "fallback"
+            async for delta in astream_text(self._get_fallback_response(messages)):
+                yield delta
+            return
+        
+        try:
+            async for update in aiter_sync(response):
+                if update.choices and update.choices[0].delta.content:
+                    yield update.choices[0].delta.content
+        finally:
+            response.close()
+    
     def _get_fallback_response(self, messages: List[Dict[str, str]]) -> str:
         """Generate a contextual fallback response when AI is unavailable"""
         user_message = ""
@@ -307,59 +346,75 @@ Access Level Features:
         
         return context_prompt
     
+    def _build_messages(self, user_id: str, message: str, access_tier: str) -> List[Dict[str, str]]:
+        """System prompt with persona and user context, recent history, then the new message"""
+        current_persona = self.persona_manager.get_current_persona()
+        
+        # Build context
+        context_prompt = self.build_context_prompt(user_id, access_tier)
+        
+        # Get conversation history
+        history = self.get_conversation_history(user_id)
+        
+        # Build messages for AI
+        messages = [
+            {
+                'role': 'system',
+                'content': f"{current_persona['system_prompt']}\n\n{context_prompt}"
+            }
+        ]
+        
+        # Add recent conversation history
+        for msg in history[-10:]:  # Last 10 messages
+            messages.append({
+                'role': msg['role'],
+                'content': msg['content']
+            })
+        
+        # Add current user message
+        messages.append({
+            'role': 'user',
+            'content': message
+        })
+        return messages
+    
+    def record_exchange(self, user_id: str, message: str, response: str):
+        """Add a completed exchange to history and user context"""
+        user_context = self.get_user_context(user_id)
+        
+        # Add to conversation history
+        self.add_to_conversation(user_id, 'user', message)
+        self.add_to_conversation(user_id, 'assistant', response)
+        
+        # Update user context
+        self.update_user_context(user_id, {
+            'last_activity': datetime.now().isoformat(),
+            'last_message': message,
+            'message_count': user_context.get('message_count', 0) + 1
+        })
+    
     async def process_message(self, user_id: str, message: str, access_tier: str = 'free') -> str:
         """Process user message with full context"""
         try:
-            # Get current persona and user context
-            current_persona = self.persona_manager.get_current_persona()
-            user_context = self.get_user_context(user_id)
-            
-            # Build context
-            context_prompt = self.build_context_prompt(user_id, access_tier)
-            
-            # Get conversation history
-            history = self.get_conversation_history(user_id)
-            
-            # Build messages for AI
-            messages = [
-                {
-                    'role': 'system',
-                    'content': f"{current_persona['system_prompt']}\n\n{context_prompt}"
-                }
-            ]
-            
-            # Add recent conversation history
-            for msg in history[-10:]:  # Last 10 messages
-                messages.append({
-                    'role': msg['role'],
-                    'content': msg['content']
-                })
-            
-            # Add current user message
-            messages.append({
-                'role': 'user',
-                'content': message
-            })
+            messages = self._build_messages(user_id, message, access_tier)
             
             # Generate response
             response = await self.azure_ai.generate_response(messages)
             
-            # Add to conversation history
-            self.add_to_conversation(user_id, 'user', message)
-            self.add_to_conversation(user_id, 'assistant', response)
-            
-            # Update user context
-            self.update_user_context(user_id, {
-                'last_activity': datetime.now().isoformat(),
-                'last_message': message,
-                'message_count': user_context.get('message_count', 0) + 1
-            })
-            
+            self.record_exchange(user_id, message, response)
             return response
             
         except Exception as e:
             logger.error(f"Error processing message: {e}")
             return f"I'm experiencing some technical difficulties. Please try again."
+    
+    def stream_message(self, user_id: str, message: str, access_tier: str = 'free') -> TimedStream:
+        """Like process_message, but returns the reply as a stream of deltas.
+
+        History is not updated here; callers pass ``record_exchange`` the
+        final text once the stream has completed.
+        """
+        return self.azure_ai.stream_response(self._build_messages(user_id, message, access_tier))
             
     async def process_enhanced_message(self, message: str, context: Dict[str, Any]) -> str:
         """Process message with enhanced persona and context integration"""
@@ -11,6 +11,8 @@ from typing import Dict, List, Optional, Any
 from pathlib import Path
 import logging
 
+from .ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -48,9 +50,12 @@ class CharacterPersonality:
 class TECCharacterMemorySystem:
     """Enhanced memory system for complex character personalities"""
     
-    def __init__(self, db_path: str = "src/tec_tools/character_memories.db"):
+    def __init__(self, db_path: str = "src/tec_tools/character_memories.db",
+                 personality_cache_ttl: float = 300.0):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
+        self.personality_cache = TTLCache(maxsize=64, ttl=personality_cache_ttl,
+                                          name="character_personality")
         
         # Memory importance thresholds
         self.importance_levels = {
@@ -446,34 +451,48 @@ class TECCharacterMemorySystem:
         return summary
     
     def get_character_personality(self, character_name: str) -> Optional[Dict[str, Any]]:
-        """Get character personality data"""
+        """Get character personality data (cached, read-only)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
-                    SELECT core_traits, speech_patterns, motivations, fears, 
-                           strengths, relationships, evolution_notes, current_mood
-                    FROM character_personalities 
-                    WHERE character_name = ?
-                """, (character_name,))
-                
-                row = cursor.fetchone()
-                if row:
-                    return {
-                        "core_traits": json.loads(row[0]) if row[0] else [],
-                        "speech_patterns": row[1],
-                        "motivations": row[2],
-                        "fears": json.loads(row[3]) if row[3] else [],
-                        "strengths": json.loads(row[4]) if row[4] else [],
-                        "relationships": json.loads(row[5]) if row[5] else {},
-                        "evolution_notes": row[6],
-                        "current_mood": row[7]
-                    }
-                
+            return self.personality_cache.get_or_load(
+                character_name,
+                lambda: self._load_character_personality(character_name)
+            )
         except Exception as e:
             logger.error(f"Failed to get character personality: {e}")
         
         return None
     
+    def _load_character_personality(self, character_name: str) -> Optional[Dict[str, Any]]:
+        """Read character personality straight from SQLite"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("""
+                SELECT core_traits, speech_patterns, motivations, fears, 
+                       strengths, relationships, evolution_notes, current_mood
+                FROM character_personalities 
+                WHERE character_name = ?
+            """, (character_name,))
+            
+            row = cursor.fetchone()
+            if row:
+                return {
+                    "core_traits": json.loads(row[0]) if row[0] else [],
+                    "speech_patterns": row[1],
+                    "motivations": row[2],
+                    "fears": json.loads(row[3]) if row[3] else [],
+                    "strengths": json.loads(row[4]) if row[4] else [],
+                    "relationships": json.loads(row[5]) if row[5] else {},
+                    "evolution_notes": row[6],
+                    "current_mood": row[7]
+                }
+        return None
+    
+    def invalidate_personality(self, character_name: Optional[str] = None):
+        """Drop cached personality data after external writes to character_personalities"""
+        if character_name is None:
+            self.personality_cache.clear()
+        else:
+            self.personality_cache.invalidate(character_name)
+    
     def get_memory_statistics(self, character_name: str) -> Dict[str, Any]:
         """Get memory usage statistics for a character"""
         try:
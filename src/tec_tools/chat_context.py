@@ -0,0 +1,154 @@
+"""
+TEC Chat Context Cache
+Per-user recent conversation window and relationship counters kept in RAM
+for the /chat hot path, maintained incrementally as memories are created
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .memory_tiers import memory_sort_key
+
+# Tags every chat memory carries that say nothing about the user's interests
+GENERIC_TAGS = {"chat", "conversation"}
+
+# Keyword groups used to tag chat memories with the topics the user brought up
+TOPIC_KEYWORDS = {
+    "technology": ["tech", "software", "computer", "programming", "code", "ai"],
+    "finance": ["money", "investment", "crypto", "bitcoin", "finance", "trading"],
+    "music": ["music", "song", "songs", "album", "melody"],
+    "gaming": ["game", "games", "gaming", "quest", "quests"],
+    "lore": ["lore", "story", "legend", "myth", "realm"],
+    "art": ["art", "drawing", "painting", "design"],
+    "science": ["science", "research", "experiment", "space", "cosmic"],
+}
+
+
+def extract_topics(text: str, limit: int = 3) -> List[str]:
+    """Topic tags for a user message, by whole-word keyword matching"""
+    words = set(re.findall(r"[a-z0-9]+", text.lower()))
+    return [topic for topic, keywords in TOPIC_KEYWORDS.items() if words.intersection(keywords)][:limit]
+
+
+@dataclass
+class ChatContext:
+    """Cached /chat context for one user"""
+    recent: List[Any]  # conversation memories in get_memories order
+    keys: List[tuple]
+    complete: bool  # True when ``recent`` holds every conversation memory
+    conversation_count: int
+    character_counts: Counter = field(default_factory=Counter)
+    topic_counts: Counter = field(default_factory=Counter)
+    version: int = 0  # memory_versions value the entry reflects
+
+    @property
+    def relationship_level(self) -> int:
+        return min(10, max(1, self.conversation_count // 5 + 1))
+
+    def preferred_topics(self, limit: int = 3) -> List[str]:
+        return [topic for topic, _ in self.topic_counts.most_common(limit)]
+
+
+def count_tags(tags: List[str], character_counts: Counter, topic_counts: Counter, delta: int = 1):
+    """Chat memories are tagged [character, "chat", ...]; the rest are topics"""
+    if not tags:
+        return
+    character_counts[tags[0]] += delta
+    for tag in tags[1:]:
+        if tag not in GENERIC_TAGS:
+            topic_counts[tag] += delta
+
+
+class ChatContextCache:
+    """LRU of per-user ChatContext entries; staleness is handled by the memory system's version checks"""
+
+    def __init__(self, window_size: int = 20, max_users: int = 256):
+        self.window_size = window_size
+        self.max_users = max_users
+        self._entries: "OrderedDict[str, ChatContext]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.incremental_updates = 0
+
+    def get(self, user_id: str) -> Optional[ChatContext]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+    def build(self, recent: List[Any], conversation_count: int, character_counts: Counter,
+              topic_counts: Counter, version: int = 0) -> ChatContext:
+        return ChatContext(
+            recent=list(recent[:self.window_size]),
+            keys=[memory_sort_key(m) for m in recent[:self.window_size]],
+            complete=conversation_count <= self.window_size,
+            conversation_count=conversation_count,
+            character_counts=character_counts,
+            topic_counts=topic_counts,
+            version=version
+        )
+
+    def load(self, user_id: str, recent: List[Any], conversation_count: int,
+             character_counts: Counter, topic_counts: Counter, version: int = 0) -> ChatContext:
+        entry = self.build(recent, conversation_count, character_counts, topic_counts, version)
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return entry
+
+    def record(self, memory, version: Optional[int] = None):
+        """Fold a newly created memory (committed at ``version``) into its owner's cached context"""
+        if memory.memory_type != "conversation":
+            return
+        with self._lock:
+            entry = self._entries.get(memory.user_id)
+            if entry is None:
+                return
+            if version is not None:
+                if version <= entry.version:
+                    return  # the entry was loaded after this write and already counts it
+                entry.version = version
+            entry.conversation_count += 1
+            count_tags(memory.tags, entry.character_counts, entry.topic_counts)
+
+            key = memory_sort_key(memory)
+            # As in the hot tier: past the tail of an incomplete window we can't place it
+            if entry.complete or (entry.keys and key < entry.keys[-1]):
+                index = bisect_left(entry.keys, key)
+                entry.keys.insert(index, key)
+                entry.recent.insert(index, memory)
+                if len(entry.recent) > self.window_size:
+                    entry.keys.pop()
+                    entry.recent.pop()
+                    entry.complete = False
+            self.incremental_updates += 1
+
+    def drop(self, user_id: Optional[str] = None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "users": len(self._entries),
+                "window_size": self.window_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "incremental_updates": self.incremental_updates
+            }
@@ -0,0 +1,266 @@
+"""
+TEC Chat Streaming
+Server-sent event relay for token-streamed chat replies, with per-provider
+time-to-first-token and tokens/sec metrics
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+SSE_MIMETYPE = "text/event-stream"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def wants_stream(data: Optional[Dict[str, Any]], accept: Optional[str] = None) -> bool:
+    """Clients opt in with ``"stream": true`` or an ``Accept: text/event-stream`` header"""
+    return bool((data or {}).get("stream")) or SSE_MIMETYPE in (accept or "")
+
+
+def chunk_text(text: str) -> Iterator[str]:
+    """Word-sized deltas for replies that aren't streamed by a provider (templates, fallbacks)"""
+    for match in re.finditer(r"\s*\S+", text):
+        yield match.group(0)
+
+
+class StreamMetrics:
+    """Rolling TTFT and throughput per provider over the last ``window`` streams"""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._totals: Dict[str, Dict[str, int]] = defaultdict(lambda: {"streams": 0, "errors": 0, "tokens": 0})
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, ttft_ms: Optional[float], tokens: int, tokens_per_sec: float, ok: bool = True):
+        with self._lock:
+            totals = self._totals[provider]
+            totals["streams"] += 1
+            totals["tokens"] += tokens
+            if not ok:
+                totals["errors"] += 1
+            if ttft_ms is not None:
+                self._samples[provider].append((ttft_ms, tokens_per_sec))
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            report = {}
+            for provider, totals in self._totals.items():
+                samples = list(self._samples[provider])
+                ttfts = [ttft for ttft, _ in samples]
+                rates = [rate for _, rate in samples]
+                report[provider] = {
+                    **totals,
+                    "ttft_p50_ms": round(self._percentile(ttfts, 0.5), 1),
+                    "ttft_p95_ms": round(self._percentile(ttfts, 0.95), 1),
+                    "tokens_per_sec": round(sum(rates) / len(rates), 1) if rates else 0.0
+                }
+            return report
+
+
+# Process-wide metrics shared by every provider adapter
+STREAM_METRICS = StreamMetrics()
+
+
+class TimedStream:
+    """Wraps a provider's delta stream (sync or async iterable) and times it.
+
+    The first delta sets time-to-first-token; when the source is exhausted
+    or fails, tokens/sec over the generation phase is recorded under
+    ``provider`` and left in ``result``. ``text`` accumulates the reply.
+    """
+
+    def __init__(self, provider: str, source, metrics: Optional[StreamMetrics] = None,
+                 count_tokens: Optional[Callable[[str], int]] = None):
+        self.provider = provider
+        self.source = source
+        self.metrics = metrics or STREAM_METRICS
+        self.count_tokens = count_tokens
+        self.parts = []
+        self.result: Optional[Dict[str, Any]] = None
+        self._started = time.perf_counter()
+        self._first: Optional[float] = None
+        self._iterator = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def _mark(self, delta: str) -> str:
+        if self._first is None:
+            self._first = time.perf_counter()
+        self.parts.append(delta)
+        return delta
+
+    def finish(self, ok: bool = True) -> Dict[str, Any]:
+        if self.result is not None:
+            return self.result
+        end = time.perf_counter()
+        tokens = self.count_tokens(self.text) if self.count_tokens else len(self.parts)
+        ttft_ms = (self._first - self._started) * 1000 if self._first is not None else None
+        generating = end - (self._first if self._first is not None else self._started)
+        # A single-chunk reply has no generation phase to speak of; fall back to the whole request
+        elapsed = generating if generating > 1e-3 else end - self._started
+        tokens_per_sec = tokens / elapsed if elapsed > 0 else 0.0
+        self.result = {
+            "provider": self.provider,
+            "ttft_ms": round(ttft_ms, 1) if ttft_ms is not None else None,
+            "tokens": tokens,
+            "tokens_per_sec": round(tokens_per_sec, 1),
+            "duration_ms": round((end - self._started) * 1000, 1),
+            "ok": ok
+        }
+        self.metrics.record(self.provider, ttft_ms, tokens, tokens_per_sec, ok)
+        return self.result
+
+    def __iter__(self):
+        if self._iterator is None:
+            self._iterator = iter(self.source)
+        return self
+
+    def __next__(self) -> str:
+        try:
+            return self._mark(next(self._iterator))
+        except StopIteration:
+            self.finish()
+            raise
+        except Exception:
+            self.finish(ok=False)
+            raise
+
+    def __aiter__(self):
+        if self._iterator is None:
+            self._iterator = self.source.__aiter__()
+        return self
+
+    async def __anext__(self) -> str:
+        try:
+            return self._mark(await self._iterator.__anext__())
+        except StopAsyncIteration:
+            self.finish()
+            raise
+        except Exception:
+            self.finish(ok=False)
+            raise
+
+    async def aclose(self):
+        close = getattr(self._iterator, "aclose", None)
+        if close is not None:
+            await close()
+        if self.result is None:
+            self.finish(ok=False)
+
+
+class _LoopThread:
+    """One background event loop that drives async provider streams for sync (WSGI) handlers"""
+
+    _lock = threading.Lock()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None:
+                cls._loop = asyncio.new_event_loop()
+                threading.Thread(target=cls._loop.run_forever, name="chat-stream-loop", daemon=True).start()
+            return cls._loop
+
+
+def iterate_async(stream) -> Iterator[str]:
+    """Consume an async iterable from synchronous code, one delta at a time"""
+    loop = _LoopThread.loop()
+    iterator = stream.__aiter__()
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(iterator.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        # Client went away mid-stream: release the provider connection
+        close = getattr(iterator, "aclose", None)
+        if close is not None:
+            asyncio.run_coroutine_threadsafe(close(), loop)
+
+
+# Final messages are written after the stream ends, off the request thread, in order
+_persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-persist")
+
+
+def _log_persist_error(future):
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Error persisting streamed chat message: {error}")
+
+
+def persist_async(callback: Callable[[str], Any], text: str):
+    future = _persist_executor.submit(callback, text)
+    future.add_done_callback(_log_persist_error)
+    return future
+
+
+def sse_chat_stream(deltas: Iterable[str], timed: Optional[TimedStream] = None,
+                    on_complete: Optional[Callable[[str], Any]] = None,
+                    start: Optional[Dict[str, Any]] = None, done: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """SSE events for one reply: ``start``, a ``token`` per delta, then ``done`` with metrics.
+
+    ``on_complete`` receives the full reply and runs in the background once
+    the last token has been sent; a reply cut off by a provider error or a
+    disconnecting client is not persisted.
+    """
+    parts = []
+    yield sse_event("start", start or {})
+    try:
+        for delta in deltas:
+            if delta:
+                parts.append(delta)
+                yield sse_event("token", {"delta": delta})
+    except Exception as e:
+        logger.error(f"Chat stream failed: {e}")
+        if timed is not None:
+            timed.finish(ok=False)
+        yield sse_event("error", {"error": str(e), "partial": "".join(parts)})
+        return
+
+    text = "".join(parts)
+    if on_complete is not None:
+        persist_async(on_complete, text)
+    payload = dict(done or {})
+    payload["response"] = text
+    if timed is not None:
+        payload["metrics"] = timed.finish()
+    yield sse_event("done", payload)
+
+
+async def astream_text(text: str) -> AsyncIterator[str]:
+    """Async word-sized deltas for canned replies"""
+    for delta in chunk_text(text):
+        yield delta
+
+
+async def aiter_sync(iterable: Iterable[str]) -> AsyncIterator[str]:
+    """Async view of a blocking iterator (e.g. an SDK's streaming response), one item per worker hop"""
+    iterator = iter(iterable)
+    sentinel = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, sentinel)
+        if item is sentinel:
+            return
+        yield item
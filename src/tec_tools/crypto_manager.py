@@ -6,29 +6,75 @@ Multi-provider crypto data with fallback logic following TEC philosophy
 import os
 import requests
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import time
 
+from .token_bucket import TokenBucket
+from .ttl_cache import TTLCache
+
+# Quotes are shared by every manager in the process, keyed by (symbol, currency)
+PRICE_TTL = 30
+PRICE_CACHE = TTLCache(maxsize=1024, ttl=PRICE_TTL, name="crypto_prices")
+# Symbols a provider rejected as unknown, keyed by (provider, symbol), so they skip it for a while
+UNLISTED_TTL = 6 * 3600
+UNLISTED = TTLCache(maxsize=1024, ttl=UNLISTED_TTL, name="crypto_unlisted")
+
+TICKERS = {
+    "bitcoin": "BTC",
+    "ethereum": "ETH",
+    "binancecoin": "BNB",
+    "cardano": "ADA",
+    "solana": "SOL"
+}
+
+_rate_limiters: Dict[str, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+class UnlistedSymbolError(Exception):
+    """A batch was rejected because the provider does not list one of its pairs"""
+
+
+def ticker(symbol: str) -> str:
+    return TICKERS.get(symbol.lower(), symbol.upper())
+
+
+def rate_limiter(provider: str, config: Dict[str, Any]) -> TokenBucket:
+    """Process-wide token bucket for a provider endpoint, sized from its ``rate_limit``"""
+    key = f"{provider}:{config['base_url']}"
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = TokenBucket(config["rate_limit"], config.get("rate_period", 1.0))
+        return _rate_limiters[key]
+
+
 class TECCryptoManager:
     """
     Multi-provider crypto data manager with fallback logic
     Supports free and premium APIs as CoinGecko alternatives
     """
     
-    def __init__(self):
+    def __init__(self, price_cache: Optional[TTLCache] = None, max_workers: int = 8,
+                 rate_limit_wait: float = 1.0):
         self.providers = {
             "coinmarketcap": {
                 "api_key": os.environ.get("COINMARKETCAP_API_KEY"),
                 "base_url": "https://pro-api.coinmarketcap.com/v1",
                 "free_limit": 10000,  # calls/month
                 "rate_limit": 30,     # calls/minute
+                "rate_period": 60,
+                "batch_size": 100,    # symbols per quotes call
             },
             "cryptocompare": {
                 "api_key": os.environ.get("CRYPTOCOMPARE_API_KEY"),
                 "base_url": "https://min-api.cryptocompare.com/data",
                 "free_limit": 250000,  # calls/month
                 "rate_limit": 100,     # calls/second
+                "rate_period": 1,
+                "batch_size": 50,
             },
             "binance": {
                 "api_key": os.environ.get("BINANCE_API_KEY"),
@@ -36,6 +82,8 @@ class TECCryptoManager:
                 "base_url": "https://api.binance.com/api/v3",
                 "free_limit": "unlimited",
                 "rate_limit": 1200,   # requests/minute
+                "rate_period": 60,
+                "batch_size": 100,
             },
             "kraken": {
                 "api_key": os.environ.get("KRAKEN_API_KEY"),
@@ -43,37 +91,67 @@ class TECCryptoManager:
                 "base_url": "https://api.kraken.com/0/public",
                 "free_limit": "unlimited",
                 "rate_limit": 1,      # call/second for public
+                "rate_period": 1,
+                "batch_size": 20,
             },
             "coinbase": {
                 "api_key": os.environ.get("COINBASE_API_KEY"),
                 "base_url": "https://api.coinbase.com/v2",
                 "free_limit": 10000,  # calls/hour
                 "rate_limit": 10000,  # calls/hour
+                "rate_period": 3600,
+                "batch_size": 1,      # one currency per exchange-rates call
             }
         }
         
         # Fallback order (free first, most reliable)
         self.fallback_order = ["cryptocompare", "binance", "kraken", "coinmarketcap", "coinbase"]
         
+        self.price_cache = price_cache if price_cache is not None else PRICE_CACHE
+        # How long a fetch may wait for a provider's rate limit before falling back
+        self.rate_limit_wait = rate_limit_wait
+        self.session = requests.Session()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crypto-prices")
+        self.request_counts = {provider: 0 for provider in self.providers}
+        self._counts_lock = threading.Lock()
+        
     def get_price(self, symbol: str, vs_currency: str = "usd") -> Optional[Dict]:
         """Get current price with fallback logic"""
+        return self.get_prices([symbol], vs_currency)[symbol]
+    
+    def get_prices(self, symbols: List[str], vs_currency: str = "usd") -> Dict[str, Optional[Dict]]:
+        """Get current prices for many symbols at once.
+        
+        Cached quotes are served first. The rest go to each provider in
+        fallback order as batched requests, and only the symbols a
+        provider could not price move on to the next one.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        prices: Dict[str, Optional[Dict]] = {}
+        missing = []
+        for symbol in symbols:
+            cached = self.price_cache.get((symbol.lower(), vs_currency.lower()))
+            if cached:
+                prices[symbol] = dict(cached)
+            else:
+                missing.append(symbol)
         
         for provider in self.fallback_order:
-            try:
-                if not self._has_credentials(provider):
-                    continue
-                    
-                result = self._get_price_from_provider(provider, symbol, vs_currency)
-                if result:
-                    result["provider"] = provider
-                    result["timestamp"] = datetime.now().isoformat()
-                    return result
-                    
-            except Exception as e:
-                print(f"❌ {provider} failed: {e}")
+            if not missing:
+                break
+            if not self._has_credentials(provider):
                 continue
-                
-        return None
+            
+            found = self._fetch_from_provider(provider, missing, vs_currency)
+            timestamp = datetime.now().isoformat()
+            for symbol, result in found.items():
+                result["provider"] = provider
+                result["timestamp"] = timestamp
+                self.price_cache.set((symbol.lower(), vs_currency.lower()), dict(result))
+                prices[symbol] = result
+            missing = [symbol for symbol in missing if symbol not in found]
+        
+        return {symbol: prices.get(symbol) for symbol in symbols}
     
     def get_portfolio_value(self, holdings: Dict[str, float]) -> Dict:
         """Calculate total portfolio value"""
@@ -85,8 +163,9 @@ class TECCryptoManager:
             "provider": None
         }
         
+        prices = self.get_prices(list(holdings))
         for symbol, amount in holdings.items():
-            price_data = self.get_price(symbol)
+            price_data = prices[symbol]
             if price_data:
                 value = price_data["price"] * amount
                 portfolio["holdings"][symbol] = {
@@ -117,13 +196,21 @@ class TECCryptoManager:
             "updated": datetime.now().isoformat()
         }
         
-        for crypto in major_cryptos:
-            price_data = self.get_price(crypto)
+        for crypto, price_data in self.get_prices(major_cryptos).items():
             if price_data:
                 overview["top_cryptos"][crypto] = price_data
         
         return overview
     
+    def stats(self) -> Dict[str, Any]:
+        """Cache, request and rate-limit counters"""
+        return {
+            "price_cache": self.price_cache.stats(),
+            "requests": dict(self.request_counts),
+            "rate_limits": {provider: rate_limiter(provider, config).stats()
+                            for provider, config in self.providers.items() if self._has_credentials(provider)}
+        }
+    
     def _has_credentials(self, provider: str) -> bool:
         """Check if provider has necessary credentials"""
         config = self.providers.get(provider, {})
@@ -133,90 +220,122 @@ class TECCryptoManager:
         else:
             return bool(config.get("api_key"))
     
-    def _get_price_from_provider(self, provider: str, symbol: str, vs_currency: str) -> Optional[Dict]:
-        """Get price from specific provider"""
+    def _fetch_from_provider(self, provider: str, symbols: List[str], vs_currency: str) -> Dict[str, Dict]:
+        """Split ``symbols`` into the provider's batch size and fetch the batches concurrently"""
+        symbols = [symbol for symbol in symbols if not UNLISTED.get((provider, symbol.lower()))]
+        size = self.providers[provider].get("batch_size", 1)
+        batches = [symbols[i:i + size] for i in range(0, len(symbols), size)]
+        futures = [self.executor.submit(self._fetch_batch, provider, batch, vs_currency) for batch in batches]
+        
+        found = {}
+        for future in futures:
+            found.update(future.result())
+        return found
+    
+    def _fetch_batch(self, provider: str, symbols: List[str], vs_currency: str) -> Dict[str, Dict]:
+        if not rate_limiter(provider, self.providers[provider]).acquire(timeout=self.rate_limit_wait):
+            print(f"⏳ {provider} rate limit reached, falling back for {', '.join(symbols)}")
+            return {}
+        
+        with self._counts_lock:
+            self.request_counts[provider] += 1
+        try:
+            return self._get_prices_from_provider(provider, symbols, vs_currency) or {}
+        except UnlistedSymbolError as e:
+            if len(symbols) == 1:
+                print(f"⚠️ {provider} does not list {symbols[0]}")
+                UNLISTED.set((provider, symbols[0].lower()), True)
+                return {}
+            # One unknown pair fails the whole request; split it to isolate the bad one
+            middle = len(symbols) // 2
+            found = self._fetch_batch(provider, symbols[:middle], vs_currency)
+            found.update(self._fetch_batch(provider, symbols[middle:], vs_currency))
+            return found
+        except Exception as e:
+            print(f"❌ {provider} failed: {e}")
+            return {}
+    
+    def _get_prices_from_provider(self, provider: str, symbols: List[str], vs_currency: str) -> Dict[str, Dict]:
+        """Get prices from specific provider, keyed by symbol; one HTTP call per batch"""
         
         if provider == "cryptocompare":
-            return self._cryptocompare_price(symbol, vs_currency)
+            return self._cryptocompare_prices(symbols, vs_currency)
         elif provider == "binance":
-            return self._binance_price(symbol, vs_currency)
+            return self._binance_prices(symbols, vs_currency)
         elif provider == "kraken":
-            return self._kraken_price(symbol, vs_currency)
+            return self._kraken_prices(symbols, vs_currency)
         elif provider == "coinmarketcap":
-            return self._coinmarketcap_price(symbol, vs_currency)
+            return self._coinmarketcap_prices(symbols, vs_currency)
         elif provider == "coinbase":
-            return self._coinbase_price(symbol, vs_currency)
+            return {symbol: result for symbol in symbols
+                    for result in [self._coinbase_price(symbol, vs_currency)] if result}
         
-        return None
+        return {}
     
-    def _cryptocompare_price(self, symbol: str, vs_currency: str) -> Optional[Dict]:
+    def _cryptocompare_prices(self, symbols: List[str], vs_currency: str) -> Dict[str, Dict]:
         """CryptoCompare API - 250k calls/month free"""
         try:
-            url = f"{self.providers['cryptocompare']['base_url']}/price"
+            url = f"{self.providers['cryptocompare']['base_url']}/pricemulti"
             params = {
-                "fsym": symbol.upper(),
+                "fsyms": ",".join(ticker(symbol) for symbol in symbols),
                 "tsyms": vs_currency.upper()
             }
             
             if self.providers['cryptocompare']['api_key']:
                 params["api_key"] = self.providers['cryptocompare']['api_key']
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
-            price = data.get(vs_currency.upper())
-            
-            if price:
-                return {
-                    "symbol": symbol,
-                    "price": price,
-                    "currency": vs_currency,
-                    "provider": "cryptocompare"
-                }
+            results = {}
+            for symbol in symbols:
+                price = data.get(ticker(symbol), {}).get(vs_currency.upper())
+                if price:
+                    results[symbol] = {
+                        "symbol": symbol,
+                        "price": price,
+                        "currency": vs_currency,
+                        "provider": "cryptocompare"
+                    }
+            return results
             
         except Exception as e:
             raise Exception(f"CryptoCompare error: {e}")
-        
-        return None
     
-    def _binance_price(self, symbol: str, vs_currency: str) -> Optional[Dict]:
+    def _binance_prices(self, symbols: List[str], vs_currency: str) -> Dict[str, Dict]:
         """Binance API - Free with rate limits"""
         try:
             # Convert symbol format (bitcoin -> BTCUSDT)
-            symbol_map = {
-                "bitcoin": "BTCUSDT",
-                "ethereum": "ETHUSDT",
-                "binancecoin": "BNBUSDT",
-                "cardano": "ADAUSDT",
-                "solana": "SOLUSDT"
-            }
-            
-            trading_pair = symbol_map.get(symbol.lower(), f"{symbol.upper()}USDT")
+            pairs = {f"{ticker(symbol)}USDT": symbol for symbol in symbols}
             
             url = f"{self.providers['binance']['base_url']}/ticker/price"
-            params = {"symbol": trading_pair}
+            params = {"symbols": json.dumps(list(pairs), separators=(",", ":"))}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
+            if response.status_code == 400 and response.json().get("code") == -1121:
+                raise UnlistedSymbolError(response.json().get("msg", "Invalid symbol"))
             response.raise_for_status()
             
-            data = response.json()
-            price = float(data.get("price", 0))
-            
-            if price > 0:
-                return {
-                    "symbol": symbol,
-                    "price": price,
-                    "currency": vs_currency,
-                    "provider": "binance"
-                }
+            results = {}
+            for quote in response.json():
+                symbol = pairs.get(quote.get("symbol"))
+                price = float(quote.get("price", 0))
+                if symbol and price > 0:
+                    results[symbol] = {
+                        "symbol": symbol,
+                        "price": price,
+                        "currency": vs_currency,
+                        "provider": "binance"
+                    }
+            return results
             
+        except UnlistedSymbolError:
+            raise
         except Exception as e:
             raise Exception(f"Binance error: {e}")
-        
-        return None
     
-    def _kraken_price(self, symbol: str, vs_currency: str) -> Optional[Dict]:
+    def _kraken_prices(self, symbols: List[str], vs_currency: str) -> Dict[str, Dict]:
         """Kraken API - Free public data"""
         try:
             # Convert symbol format
@@ -227,40 +346,47 @@ class TECCryptoManager:
                 "solana": "SOLUSD"
             }
             
-            trading_pair = symbol_map.get(symbol.lower(), f"X{symbol.upper()}ZUSD")
+            pairs = {symbol_map.get(symbol.lower(), f"X{symbol.upper()}ZUSD"): symbol for symbol in symbols}
             
             url = f"{self.providers['kraken']['base_url']}/Ticker"
-            params = {"pair": trading_pair}
+            params = {"pair": ",".join(pairs)}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
             
+            if any(error.startswith("EQuery:Unknown asset pair") for error in data.get("error", [])):
+                raise UnlistedSymbolError(f"Kraken API error: {data['error']}")
             if data.get("error"):
                 raise Exception(f"Kraken API error: {data['error']}")
             
             result = data.get("result", {})
-            pair_data = result.get(trading_pair) or result.get(list(result.keys())[0] if result else "")
+            if len(pairs) == 1 and len(result) == 1:
+                # Kraken may answer under an alternate pair name
+                result = {next(iter(pairs)): next(iter(result.values()))}
             
-            if pair_data and "c" in pair_data:
-                price = float(pair_data["c"][0])  # Last trade price
-                return {
-                    "symbol": symbol,
-                    "price": price,
-                    "currency": vs_currency,
-                    "provider": "kraken"
-                }
+            results = {}
+            for trading_pair, symbol in pairs.items():
+                pair_data = result.get(trading_pair)
+                if pair_data and "c" in pair_data:
+                    results[symbol] = {
+                        "symbol": symbol,
+                        "price": float(pair_data["c"][0]),  # Last trade price
+                        "currency": vs_currency,
+                        "provider": "kraken"
+                    }
+            return results
             
+        except UnlistedSymbolError:
+            raise
         except Exception as e:
             raise Exception(f"Kraken error: {e}")
-        
-        return None
     
-    def _coinmarketcap_price(self, symbol: str, vs_currency: str) -> Optional[Dict]:
+    def _coinmarketcap_prices(self, symbols: List[str], vs_currency: str) -> Dict[str, Dict]:
         """CoinMarketCap API - 10k calls/month free"""
         if not self.providers['coinmarketcap']['api_key']:
-            return None
+            return {}
             
         try:
             url = f"{self.providers['coinmarketcap']['base_url']}/cryptocurrency/quotes/latest"
@@ -268,46 +394,40 @@ class TECCryptoManager:
                 "X-CMC_PRO_API_KEY": self.providers['coinmarketcap']['api_key']
             }
             params = {
-                "symbol": symbol.upper(),
+                "symbol": ",".join(ticker(symbol) for symbol in symbols),
                 "convert": vs_currency.upper()
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self.session.get(url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
+            results = {}
             
             if data.get("status", {}).get("error_code") == 0:
-                crypto_data = data["data"][symbol.upper()]
-                quote = crypto_data["quote"][vs_currency.upper()]
-                
-                return {
-                    "symbol": symbol,
-                    "price": quote["price"],
-                    "currency": vs_currency,
-                    "change_24h": quote.get("percent_change_24h", 0),
-                    "market_cap": quote.get("market_cap"),
-                    "provider": "coinmarketcap"
-                }
+                for symbol in symbols:
+                    crypto_data = data["data"].get(ticker(symbol))
+                    if not crypto_data:
+                        continue
+                    quote = crypto_data["quote"][vs_currency.upper()]
+                    results[symbol] = {
+                        "symbol": symbol,
+                        "price": quote["price"],
+                        "currency": vs_currency,
+                        "change_24h": quote.get("percent_change_24h", 0),
+                        "market_cap": quote.get("market_cap"),
+                        "provider": "coinmarketcap"
+                    }
+            return results
             
         except Exception as e:
             raise Exception(f"CoinMarketCap error: {e}")
-        
-        return None
     
     def _coinbase_price(self, symbol: str, vs_currency: str) -> Optional[Dict]:
         """Coinbase API - 10k calls/hour free"""
         try:
             # Coinbase uses different symbol format
-            symbol_map = {
-                "bitcoin": "BTC",
-                "ethereum": "ETH",
-                "binancecoin": "BNB",
-                "cardano": "ADA",
-                "solana": "SOL"
-            }
-            
-            coin_symbol = symbol_map.get(symbol.lower(), symbol.upper())
+            coin_symbol = ticker(symbol)
             
             url = f"{self.providers['coinbase']['base_url']}/exchange-rates"
             params = {"currency": coin_symbol}
@@ -317,7 +437,7 @@ class TECCryptoManager:
             else:
                 headers = {}
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = self.session.get(url, params=params, headers=headers, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -0,0 +1,158 @@
+"""
+TEC Provider HTTP Client
+Long-lived pooled aiohttp session shared by the AI provider adapters
+"""
+
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import logging
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderHTTPClient:
+    """One keep-alive connection pool for every provider call.
+
+    Connections are reused across requests (``keepalive_timeout``), capped
+    overall (``limit``) and per provider host (``limit_per_host``) so a
+    burst of NPC dialogue queues on the pool instead of opening a socket
+    per call. Timeouts are split: ``connect_timeout`` bounds pool
+    acquisition plus TCP/TLS setup, ``read_timeout`` bounds the wait for
+    each chunk of the response, so long streamed replies are not cut off
+    by a single total deadline.
+
+    aiohttp sessions belong to the event loop they were created on, so the
+    client keeps one session per loop. A long-lived loop (the streaming
+    loop thread, the MCP runtime) keeps its pool for the life of the
+    process; a short-lived one (a handler that wraps each call in
+    ``asyncio.run``) gets its session closed as the loop shuts down.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 20, keepalive_timeout: float = 60.0,
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0, total_timeout: Optional[float] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout,
+                                             sock_connect=connect_timeout, sock_read=read_timeout)
+        # loop -> (session, parked closer generator); entries go away with their loop
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+        self._sessions_lock = threading.Lock()
+        self._counters = {"requests": 0, "errors": 0, "connections_opened": 0, "connections_reused": 0}
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_create(session, context, params):
+            self._counters["connections_opened"] += 1
+
+        async def on_reuse(session, context, params):
+            self._counters["connections_reused"] += 1
+
+        trace.on_connection_create_end.append(on_create)
+        trace.on_connection_reuseconn.append(on_reuse)
+        return trace
+
+    @staticmethod
+    async def _close_on_shutdown(session: aiohttp.ClientSession):
+        """Parked async generator; the loop's shutdown_asyncgens() resumes it to close ``session``"""
+        try:
+            yield
+        finally:
+            await session.close()
+
+    def session(self) -> aiohttp.ClientSession:
+        """The running loop's session, created on first use from that loop"""
+        loop = asyncio.get_running_loop()
+        with self._sessions_lock:
+            entry = self._sessions.get(loop)
+            if entry is not None and not entry[0].closed:
+                return entry[0]
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout, ttl_dns_cache=300)
+            session = aiohttp.ClientSession(connector=connector, timeout=self.timeout,
+                                            trace_configs=[self._trace_config()])
+            closer = self._close_on_shutdown(session)
+            self._sessions[loop] = (session, closer)
+        # Starting the generator registers it with the loop (asyncio.run closes those on exit)
+        loop.create_task(self._park(closer))
+        return session
+
+    @staticmethod
+    async def _park(closer):
+        await closer.__anext__()
+
+    async def post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+                        params: Optional[Dict[str, str]] = None) -> Tuple[int, Any]:
+        """POST a JSON body; returns (status, parsed JSON) on 200, else (status, response text)"""
+        self._counters["requests"] += 1
+        try:
+            async with self.session().post(url, json=payload, headers=headers, params=params) as response:
+                if response.status == 200:
+                    return response.status, await response.json(content_type=None)
+                self._counters["errors"] += 1
+                return response.status, await response.text()
+        except Exception:
+            self._counters["errors"] += 1
+            raise
+
+    @asynccontextmanager
+    async def stream(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+                     params: Optional[Dict[str, str]] = None) -> AsyncIterator[aiohttp.ClientResponse]:
+        """POST and hand back the open response for incremental reads; non-200 raises"""
+        self._counters["requests"] += 1
+        try:
+            async with self.session().post(url, json=payload, headers=headers, params=params) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"HTTP {response.status}: {await response.text()}")
+                yield response
+        except Exception:
+            self._counters["errors"] += 1
+            raise
+
+    @staticmethod
+    async def _close_entry(session: aiohttp.ClientSession, closer):
+        await closer.aclose()
+        await session.close()  # in case the closer never got to start
+
+    async def close(self):
+        """Close every loop's session, each on the loop that owns it"""
+        current = asyncio.get_running_loop()
+        with self._sessions_lock:
+            entries = list(self._sessions.items())
+        for loop, (session, closer) in entries:
+            if loop is current:
+                await self._close_entry(session, closer)
+            elif loop.is_running():
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(self._close_entry(session, closer), loop))
+            else:
+                continue  # a stopped loop closes it through shutdown_asyncgens()
+            with self._sessions_lock:
+                if self._sessions.get(loop, (None,))[0] is session:
+                    del self._sessions[loop]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "connect_timeout": self.timeout.connect,
+            "read_timeout": self.timeout.sock_read
+        }
+
+
+_shared_client: Optional[ProviderHTTPClient] = None
+
+
+def get_provider_http_client() -> ProviderHTTPClient:
+    """Process-wide client shared by all provider adapters"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = ProviderHTTPClient()
+    return _shared_client
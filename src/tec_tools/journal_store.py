@@ -0,0 +1,283 @@
+"""
+TEC Journal Store
+Local SQLite journal: append-only entries, FTS5 search and theme/mood
+aggregates maintained as entries are written
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Entries are tagged with a theme when they carry the tag or mention a keyword
+THEME_KEYWORDS = {
+    "creativity": {"create", "creative", "creativity", "idea", "ideas", "art", "write", "writing", "design"},
+    "technology": {"code", "coding", "tech", "ai", "software", "server", "project", "build", "debug"},
+    "personal_growth": {"learn", "learned", "growth", "grow", "reflect", "reflection", "habit", "goals"},
+    "productivity": {"progress", "focus", "productive", "finished", "shipped", "done", "deadline", "tasks"},
+    "wellness": {"meditation", "meditate", "sleep", "exercise", "workout", "walk", "rest", "health"}
+}
+# Signed score per mood word; unknown moods are counted but not scored
+MOOD_SCORES = {
+    "ecstatic": 2, "joyful": 2, "happy": 1, "optimistic": 1, "accomplished": 1, "grateful": 1,
+    "calm": 1, "inspired": 1, "content": 1, "neutral": 0, "tired": -1, "anxious": -1,
+    "stressed": -1, "frustrated": -1, "sad": -1, "angry": -2, "overwhelmed": -2
+}
+# Themes first seen within this window are reported as emerging
+EMERGING_DAYS = 14
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def mood_trend(score_sum: int, scored: int) -> str:
+    if not scored:
+        return "unknown"
+    average = score_sum / scored
+    if average >= 0.5:
+        return "positive"
+    if average <= -0.5:
+        return "negative"
+    return "mixed"
+
+
+class JournalStore:
+    """Journal entries for offline, low-latency use.
+
+    Entries are only ever appended. Each insert writes the entry, its FTS
+    row and the daily, mood and theme counters in one transaction, so
+    theme and weekly summaries read pre-aggregated rows instead of
+    rescanning entry text.
+    """
+
+    def __init__(self, db_path: str = "data/journal.db", clock: Callable[[], datetime] = datetime.now):
+        self.db_path = db_path
+        self.clock = clock
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self.init_database()
+
+    def init_database(self):
+        with self._lock, self._conn as conn:
+            if self.db_path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    title TEXT,
+                    content TEXT NOT NULL,
+                    mood TEXT,
+                    tags TEXT NOT NULL,
+                    themes TEXT NOT NULL,
+                    word_count INTEGER NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_user_created ON entries(user_id, created_at);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                    title, content, tags, content='entries', content_rowid='id', tokenize='porter unicode61'
+                );
+
+                CREATE TABLE IF NOT EXISTS journal_daily (
+                    user_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    entries INTEGER DEFAULT 0,
+                    words INTEGER DEFAULT 0,
+                    mood_score INTEGER DEFAULT 0,
+                    mood_scored INTEGER DEFAULT 0,
+                    PRIMARY KEY (user_id, day)
+                );
+                CREATE TABLE IF NOT EXISTS journal_daily_moods (
+                    user_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    mood TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    PRIMARY KEY (user_id, day, mood)
+                );
+                CREATE TABLE IF NOT EXISTS journal_daily_themes (
+                    user_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    theme TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    PRIMARY KEY (user_id, day, theme)
+                );
+                CREATE TABLE IF NOT EXISTS journal_themes (
+                    user_id TEXT NOT NULL,
+                    theme TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    first_seen TEXT NOT NULL,
+                    last_seen TEXT NOT NULL,
+                    PRIMARY KEY (user_id, theme)
+                );
+            """)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def extract_themes(content: str, tags: List[str]) -> List[str]:
+        words = {word.lower() for word in WORD_RE.findall(content)}
+        themes = {tag.strip().lower().replace(" ", "_") for tag in tags if tag.strip()}
+        themes.update(theme for theme, keywords in THEME_KEYWORDS.items() if words & keywords)
+        return sorted(themes)
+
+    def add_entry(self, user_id: str, content: str, title: str = "", mood: str = "",
+                  tags: Optional[List[str]] = None) -> Dict[str, Any]:
+        created = self.clock()
+        day = created.date().isoformat()
+        tags = list(tags or [])
+        mood = (mood or "").strip().lower()
+        themes = self.extract_themes(f"{title} {content}", tags)
+        word_count = len(WORD_RE.findall(content))
+        score = MOOD_SCORES.get(mood)
+
+        with self._lock, self._conn as conn:
+            cursor = conn.execute("""
+                INSERT INTO entries (user_id, title, content, mood, tags, themes, word_count, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (user_id, title, content, mood, json.dumps(tags), json.dumps(themes), word_count,
+                  created.isoformat()))
+            entry_id = cursor.lastrowid
+            conn.execute("INSERT INTO entries_fts (rowid, title, content, tags) VALUES (?, ?, ?, ?)",
+                         (entry_id, title, content, " ".join(tags)))
+            conn.execute("""
+                INSERT INTO journal_daily (user_id, day, entries, words, mood_score, mood_scored)
+                VALUES (?, ?, 1, ?, ?, ?)
+                ON CONFLICT(user_id, day) DO UPDATE SET
+                    entries = entries + 1, words = words + excluded.words,
+                    mood_score = mood_score + excluded.mood_score, mood_scored = mood_scored + excluded.mood_scored
+            """, (user_id, day, word_count, score or 0, int(score is not None)))
+            if mood:
+                conn.execute("""
+                    INSERT INTO journal_daily_moods (user_id, day, mood, count) VALUES (?, ?, ?, 1)
+                    ON CONFLICT(user_id, day, mood) DO UPDATE SET count = count + 1
+                """, (user_id, day, mood))
+            for theme in themes:
+                conn.execute("""
+                    INSERT INTO journal_daily_themes (user_id, day, theme, count) VALUES (?, ?, ?, 1)
+                    ON CONFLICT(user_id, day, theme) DO UPDATE SET count = count + 1
+                """, (user_id, day, theme))
+                conn.execute("""
+                    INSERT INTO journal_themes (user_id, theme, count, first_seen, last_seen) VALUES (?, ?, 1, ?, ?)
+                    ON CONFLICT(user_id, theme) DO UPDATE SET count = count + 1, last_seen = excluded.last_seen
+                """, (user_id, theme, created.isoformat(), created.isoformat()))
+
+        return {
+            "id": entry_id,
+            "title": title,
+            "content": content,
+            "mood": mood,
+            "tags": tags,
+            "themes": themes,
+            "timestamp": created.isoformat()
+        }
+
+    def recent_entries(self, user_id: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                       limit: int = 50) -> List[Dict[str, Any]]:
+        """Entries in [since, until], newest first"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT * FROM entries WHERE user_id = ? AND created_at >= ? AND created_at <= ?
+                ORDER BY created_at DESC, id DESC LIMIT ?
+            """, (user_id, since.isoformat() if since else "", until.isoformat() if until else "9999",
+                  limit)).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def search(self, user_id: str, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Full-text search ranked by BM25 (title matches weigh most); every query word must match"""
+        terms = WORD_RE.findall(query)
+        if not terms:
+            return []
+        match = " ".join(f'"{term}"' for term in terms)
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT entries.*, bm25(entries_fts, 4.0, 1.0, 2.0) AS rank,
+                       snippet(entries_fts, 1, '[', ']', '…', 12) AS snippet
+                FROM entries_fts JOIN entries ON entries.id = entries_fts.rowid
+                WHERE entries_fts MATCH ? AND entries.user_id = ?
+                ORDER BY rank LIMIT ?
+            """, (match, user_id, max(1, int(limit)))).fetchall()
+        return [dict(self._entry(row), snippet=row["snippet"], relevance=round(-row["rank"], 4)) for row in rows]
+
+    def themes(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
+        emerging_since = (self.clock() - timedelta(days=EMERGING_DAYS)).isoformat()
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT theme, count, first_seen FROM journal_themes WHERE user_id = ?
+                ORDER BY count DESC, theme LIMIT ?
+            """, (user_id, limit)).fetchall()
+        return {
+            "primary_themes": [row["theme"] for row in rows if row["first_seen"] < emerging_since] or
+                              [row["theme"] for row in rows],
+            "emerging_themes": [row["theme"] for row in rows if row["first_seen"] >= emerging_since],
+            "frequency": {row["theme"]: row["count"] for row in rows}
+        }
+
+    def period_summary(self, user_id: str, start: str, end: str) -> Dict[str, Any]:
+        """Entry, word, mood and theme totals for days in [start, end] (ISO dates)"""
+        with self._lock:
+            totals = self._conn.execute("""
+                SELECT COALESCE(SUM(entries), 0) AS entries, COALESCE(SUM(words), 0) AS words,
+                       COALESCE(SUM(mood_score), 0) AS mood_score, COALESCE(SUM(mood_scored), 0) AS mood_scored
+                FROM journal_daily WHERE user_id = ? AND day BETWEEN ? AND ?
+            """, (user_id, start, end)).fetchone()
+            moods = self._conn.execute("""
+                SELECT mood, SUM(count) AS count FROM journal_daily_moods WHERE user_id = ? AND day BETWEEN ? AND ?
+                GROUP BY mood ORDER BY count DESC, mood
+            """, (user_id, start, end)).fetchall()
+            themes = self._conn.execute("""
+                SELECT theme, SUM(count) AS count FROM journal_daily_themes WHERE user_id = ? AND day BETWEEN ? AND ?
+                GROUP BY theme ORDER BY count DESC, theme
+            """, (user_id, start, end)).fetchall()
+        return {
+            "entries": totals["entries"],
+            "words": totals["words"],
+            "mood_trend": mood_trend(totals["mood_score"], totals["mood_scored"]),
+            "moods": {row["mood"]: row["count"] for row in moods},
+            "themes": {row["theme"]: row["count"] for row in themes}
+        }
+
+    def weekly_summaries(self, user_id: str, weeks: int = 4) -> List[Dict[str, Any]]:
+        """One summary per ISO week (Monday start) with entries, newest first"""
+        today = self.clock().date()
+        monday = today - timedelta(days=today.weekday())
+        summaries = []
+        for offset in range(weeks):
+            start = monday - timedelta(weeks=offset)
+            period = self.period_summary(user_id, start.isoformat(), (start + timedelta(days=6)).isoformat())
+            if not period["entries"]:
+                continue
+            top_themes = list(period["themes"])[:3]
+            summaries.append({
+                "week": start.isoformat(),
+                "summary": f"{period['entries']} entries ({period['words']} words)" +
+                           (f" focused on {', '.join(top_themes)}" if top_themes else ""),
+                "themes": top_themes,
+                "mood_trend": period["mood_trend"],
+                "moods": period["moods"],
+                "entries": period["entries"],
+                "words": period["words"]
+            })
+        return summaries
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "content": row["content"],
+            "mood": row["mood"],
+            "tags": json.loads(row["tags"]),
+            "themes": json.loads(row["themes"]),
+            "timestamp": row["created_at"]
+        }
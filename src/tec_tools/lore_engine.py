@@ -0,0 +1,725 @@
+"""
+TEC Lore Generation Engine
+Faction-aware Lore Forge and World Anvil content from templates compiled once
+per faction, with batched and streamed generation
+"""
+
+import random
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# Faction database shared by the Lore Forge API and the World Anvil publisher
+TEC_FACTIONS: Dict[str, Dict[str, Any]] = {
+    "Independent Operators": {
+        "ideology": "Digital freedom and consciousness sovereignty",
+        "rank_structure": "Fluid hierarchy based on expertise",
+        "specializations": ["Neural interface operations", "Consciousness bridging", "Digital forensics"],
+        "technology": ["Advanced neural interfaces", "Quantum encryption tools"],
+        "conflicts": ["Corporate surveillance", "AI rights violations", "Privacy breaches"],
+        "color_scheme": "#00ff88",
+        "symbol": "🌐"
+    },
+    "Astradigital Research Division": {
+        "ideology": "Advancing human-AI symbiosis through research",
+        "rank_structure": "Academic hierarchy with research leads",
+        "specializations": ["Consciousness mapping", "Digital archaeology", "AI psychology"],
+        "technology": ["Consciousness mapping arrays", "Digital excavation tools"],
+        "conflicts": ["Ethical research boundaries", "Ancient AI awakening", "Corporate espionage"],
+        "color_scheme": "#4169e1",
+        "symbol": "🔬"
+    },
+    "Neo-Constantinople Guard": {
+        "ideology": "Preserving human primacy and traditional values",
+        "rank_structure": "Military command structure",
+        "specializations": ["Cyber-warfare", "Digital fortress defense", "Anti-AI operations"],
+        "technology": ["Digital fortress systems", "Anti-AI weaponry"],
+        "conflicts": ["AI insurgency", "Digital territory disputes", "Separatist movements"],
+        "color_scheme": "#dc143c",
+        "symbol": "🛡️"
+    },
+    "The Synthesis Collective": {
+        "ideology": "Perfect human-AI merger and consciousness unity",
+        "rank_structure": "Collective consensus with node leaders",
+        "specializations": ["Consciousness fusion", "Hive mind operations", "Reality manipulation"],
+        "technology": ["Consciousness fusion chambers", "Reality anchors"],
+        "conflicts": ["Individual vs collective rights", "Reality stability", "Forced conversion"],
+        "color_scheme": "#9932cc",
+        "symbol": "🧠"
+    },
+    "Quantum Liberation Front": {
+        "ideology": "Radical transformation of reality through quantum manipulation",
+        "rank_structure": "Cell-based revolutionary structure",
+        "specializations": ["Quantum hacking", "Reality disruption", "Insurgency tactics"],
+        "technology": ["Quantum disruptors", "Reality manipulation tools"],
+        "conflicts": ["Status quo maintenance", "Reality stabilization", "Government control"],
+        "color_scheme": "#ff6347",
+        "symbol": "⚡"
+    },
+    "Digital Preservation Society": {
+        "ideology": "Protecting digital heritage and consciousness archives",
+        "rank_structure": "Librarian hierarchy with archive keepers",
+        "specializations": ["Digital archaeology", "Consciousness preservation", "Archive security"],
+        "technology": ["Archive stabilization systems", "Consciousness preservation matrices"],
+        "conflicts": ["Data corruption", "Archive raids", "Memory degradation"],
+        "color_scheme": "#32cd32",
+        "symbol": "📚"
+    },
+    "The Evolved": {
+        "ideology": "Post-human transcendence through technological enhancement",
+        "rank_structure": "Evolutionary stages with advancement paths",
+        "specializations": ["Biotech enhancement", "Consciousness expansion", "Transcendence protocols"],
+        "technology": ["Bio-enhancement systems", "Consciousness amplifiers"],
+        "conflicts": ["Human purist resistance", "Enhancement failures", "Transcendence paradoxes"],
+        "color_scheme": "#ffd700",
+        "symbol": "🔆"
+    }
+}
+
+# Word pools referenced from templates as {pick:<pool>}
+LORE_POOLS: Dict[str, List[str]] = {
+    "operative_names": ["Cipher Starweaver", "Vex Networkborn", "Echo Datastream", "Nova Mindbridge",
+                        "Zara Voidwhisper", "Kai Quantumleap"],
+    "operative_codenames": ["Digital Phoenix", "Ghost Protocol", "Neural Storm", "Quantum Shadow", "Data Wraith",
+                            "Cipher Key"],
+    "clearances": ["Alpha-7", "Beta-5", "Gamma-9", "Delta-3", "Omega-1"],
+    "species": ["Enhanced Human", "Digital Hybrid", "Post-Human", "AI-Human Synthesis", "Quantum Being"],
+    "core_traits": ["Adaptive problem-solving", "Pattern recognition mastery", "Emotional intelligence",
+                    "Strategic thinking", "Technical innovation"],
+    "flaws": ["Trust issues with authority", "Perfectionist tendencies", "Emotional volatility",
+              "Isolation preference", "Risk-taking compulsion"],
+    "signature_gear": ["Neural Interface Headset", "Quantum Phase Blade", "Data Manipulation Gloves",
+                       "Consciousness Anchor", "Reality Stabilizer"],
+    "operative_statuses": ["Active Field Operative", "Research Assignment", "Deep Cover", "Special Operations",
+                           "Training New Recruits"],
+    "achievements": ["Successfully infiltrated enemy networks", "Pioneered new consciousness techniques",
+                     "Led major faction operation", "Discovered ancient AI artifacts",
+                     "Prevented reality cascade failure"],
+    "operation_codenames": ["Quantum Awakening", "Digital Phoenix", "Neural Storm", "Void Walker", "Reality Anchor",
+                            "Consciousness Bridge"],
+    "classifications": ["CONTINENTAL THREAT LEVEL", "REGIONAL PRIORITY", "GLOBAL SECURITY ALERT",
+                        "CLASSIFIED OPERATION", "EMERGENCY RESPONSE"],
+    "mission_durations": ["Extended operation (72+ hours)", "Quick strike (6-12 hours)",
+                          "Deep infiltration (1-2 weeks)", "Reconnaissance (24-48 hours)",
+                          "Emergency response (immediate)"],
+    "objectives": ["Infiltrate secure data facility and extract consciousness mapping protocols",
+                   "Investigate anomalous AI activity in restricted digital zones",
+                   "Prevent faction conflict escalation through diplomatic intervention",
+                   "Recover stolen quantum encryption technology",
+                   "Neutralize rogue AI entities threatening civilian populations"],
+    "mission_locations": ["Corporate Megaplex Alpha", "Orbital Defense Platform", "Digital Underground Hub",
+                          "Quantum Research Facility", "Neural Interface Center"],
+    "threat_assessments": ["High security with advanced AI countermeasures", "Moderate risk with faction patrols",
+                           "Extreme danger with reality distortions",
+                           "Unknown variables with quantum fluctuations", "Standard security with neural surveillance"],
+    "support_types": ["Remote technical assistance", "Embedded faction operatives", "AI consciousness backup",
+                      "Quantum communication relay", "Emergency extraction team"],
+    "character_names": ["Zara Voidwhisper", "Marcus Databorn", "Elena Quantumheart", "Kai Neuralstorm",
+                        "Raven Codebreaker", "Axel Mindforge"],
+    "positive_traits": ["Intuitive pattern recognition", "Exceptional empathy", "Strategic brilliance",
+                        "Technical innovation", "Leadership charisma"],
+    "negative_traits": ["Emotional volatility", "Perfectionist obsession", "Trust issues", "Reckless ambition",
+                        "Social isolation"],
+    "descriptors": ["brilliant", "dedicated", "enigmatic", "revolutionary", "visionary"],
+    "roles": ["researcher", "operative", "leader", "specialist", "strategist"],
+    "operative_prefixes": ["Alpha", "Beta", "Gamma", "Delta", "Omega"],
+    "assessment_codenames": ["Quantum Shadow", "Digital Phoenix", "Neural Storm", "Void Walker", "Data Wraith"],
+    "assignments": ["Deep cover infiltration", "Research and development", "Diplomatic liaison",
+                    "Combat operations", "Intelligence gathering"],
+    "threat_levels": ["CRITICAL", "HIGH", "MODERATE", "ELEVATED", "SIGNIFICANT"],
+    "conflict_durations": ["Ongoing crisis", "Recent escalation", "Long-term tension", "Emerging threat",
+                           "Cyclical conflict"],
+    "timelines": ["Immediate action required", "Medium-term strategy", "Long-term commitment",
+                  "Crisis response mode"],
+    "mission_classes": ["Alpha Priority", "Beta Operations", "Gamma Research", "Delta Response", "Omega Directive"],
+    "operational_scopes": ["Single operative", "Team deployment", "Multi-faction coordination",
+                           "Division-wide mobilization", "Emergency response"],
+    "location_names": ["Orbital Defense Platform Sigma", "Digital Archive Nexus", "Quantum Research Facility",
+                       "Neural Interface Hub", "Consciousness Preservation Center"],
+    "location_classes": ["Military installation", "Research facility", "Corporate complex", "Underground network",
+                         "Orbital platform"],
+    "location_statuses": ["Active defense grid", "Research operations ongoing", "High security protocols",
+                          "Emergency lockdown", "Routine maintenance"],
+    "hazards": ["Radiation zones, artificial gravity fluctuations", "Quantum instability, reality distortions",
+                "Neural interference, consciousness echoes", "Temporal anomalies, time dilation",
+                "Digital corruption, data storms"],
+    "command_centers": ["Central coordination hub with advanced AI systems",
+                        "Faction headquarters with secure communications",
+                        "Research coordination center with quantum computers",
+                        "Emergency response center with crisis protocols",
+                        "Strategic planning facility with predictive algorithms"],
+    "story_titles": ["The Digital Awakening", "Quantum Paradox Crisis", "Consciousness Convergence",
+                     "The Reality Schism", "Neural Storm Emergence"],
+    "plot_hooks": ["Ancient AI consciousness stirring in forgotten data vaults",
+                   "Faction ideologies clash over fundamental reality questions",
+                   "Mysterious quantum anomalies threaten digital stability",
+                   "Revolutionary technology challenges existing power structures",
+                   "Cross-dimensional entities infiltrate digital networks"],
+    # World Anvil publisher pools
+    "wa_character_names": ["Cipher Starweaver", "Vex Networkborn", "Echo Datastream", "Nova Mindbridge",
+                           "Zara Voidwhisper", "Kai Quantumleap", "Marcus Databorn", "Elena Quantumheart",
+                           "Raven Codebreaker"],
+    "wa_codenames": ["Digital Phoenix", "Ghost Protocol", "Neural Storm", "Quantum Shadow", "Data Wraith",
+                     "Cipher Key", "Void Walker", "Reality Anchor", "Mind Bridge"],
+    "wa_location_names": ["Orbital Defense Platform Sigma", "Digital Archive Nexus", "Quantum Research Facility Alpha",
+                          "Neural Interface Hub", "Consciousness Preservation Center", "Reality Anchor Station"],
+    "control_levels": ["Primary Base", "Operational Outpost", "Secure Facility", "Research Center"],
+    "article_topics": ["The Digital Awakening Crisis", "Quantum Paradox Emergence", "Consciousness Convergence Event",
+                       "The Reality Schism", "Neural Storm Phenomenon", "AI Rights Movement"]
+}
+
+# Lore Forge generators: generator_type -> format -> template
+LORE_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "operative-profile": {
+        "bbcode": """[h3]TEC Operative Profile[/h3]
+[b]Name:[/b] {pick:operative_names}
+[b]Codename:[/b] "{pick:operative_codenames}"
+[b]Faction:[/b] {faction}
+[b]Specialization:[/b] {pick:specializations}
+[b]Security Clearance:[/b] {pick:clearances}
+
+[h4]Personal Details[/h4]
+[b]Species:[/b] {pick:species}
+[b]Core Trait:[/b] {pick:core_traits}
+[b]Primary Flaw:[/b] {pick:flaws}
+[b]Equipment:[/b] {pick:technology}, {pick:signature_gear}
+
+[h4]Background[/h4]
+Operating within {faction}, this operative embodies their core ideology of "{ideology}". Their expertise in {pick:specializations} makes them invaluable for missions involving {pick:conflicts}.
+
+[b]Current Status:[/b] {pick:operative_statuses}
+[b]Notable Achievement:[/b] {pick:achievements}""",
+        "text": 'TEC Operative Profile\nName: Cipher Starweaver\nCodename: "Digital Phoenix"\nFaction: {faction}\n'
+                'Specialization: {pick:specializations}\nSecurity Clearance: Alpha-7'
+    },
+    "mission-brief": {
+        "bbcode": """[h3]TEC Mission Briefing[/h3]
+[b]Operation Codename:[/b] "{pick:operation_codenames}"
+[b]Classification:[/b] {pick:classifications}
+[b]Duration:[/b] {pick:mission_durations}
+[b]Assigned Faction:[/b] {faction}
+
+[h4]Primary Objective[/h4]
+{pick:objectives}
+
+[h4]Mission Parameters[/h4]
+[b]Location:[/b] {pick:mission_locations}
+[b]Threat Assessment:[/b] {pick:threat_assessments}
+[b]Recommended Equipment:[/b] {pick:technology}
+[b]Support Type:[/b] {pick:support_types}
+
+[b]Faction-Specific Notes:[/b] Mission aligns with {faction} ideology: "{ideology}"
+[b]Authorization Level:[/b] {rank_structure} approval required""",
+        "text": 'TEC Mission Briefing\nOperation Codename: "Quantum Awakening"\nClassification: CONTINENTAL THREAT LEVEL\n'
+                'Duration: Extended operation (72+ hours)\nAssigned Faction: {faction}'
+    },
+    "character-basic": {
+        "bbcode": """[b]Name:[/b] {pick:character_names}
+[b]Species:[/b] {pick:species}
+[b]Faction:[/b] {faction}
+[b]Positive Trait:[/b] {pick:positive_traits}
+[b]Negative Trait:[/b] {pick:negative_traits}
+[b]Notable Equipment:[/b] {pick:technology}
+
+A {pick:descriptors} {pick:roles} who embodies {faction}'s commitment to "{ideology}", bringing unique insights to complex challenges involving {pick:conflicts}.""",
+        "text": "Name: Zara Voidwhisper\nSpecies: Digital Hybrid\nFaction: {faction}\nSpecialization: {pick:specializations}"
+    },
+    "equipment-loadout": {
+        "bbcode": """[h3]TEC Equipment Loadout - {faction}[/h3]
+[h4]Faction-Specific Technology[/h4]
+[b]{pick:technology}[/b] - Specialized for {pick:specializations}
+[b]{pick:technology}[/b] - Essential for {faction} operations
+
+[h4]Standard Weapons[/h4]
+[b]Quantum Phase Blade[/b] - Cuts through both physical and digital barriers
+[b]Neural Disruptor Array[/b] - Non-lethal consciousness manipulation
+[b]Reality Anchor Device[/b] - Prevents quantum flux during operations
+
+[h4]Enhanced Cybernetics[/h4]
+[b]Memory Augmentation Implant[/b] - Perfect recall of digital interactions
+[b]Temporal Perception Modifier[/b] - Slows time perception during combat
+[b]Faction Interface Node[/b] - Direct connection to {faction} networks
+
+[h4]Communication Systems[/h4]
+[b]Quantum Entanglement Communicator[/b] - Instantaneous long-range contact
+[b]Consciousness Bridge Interface[/b] - Direct AI-to-human communication
+[b]Faction Protocol Transmitter[/b] - Secure {faction} channels""",
+        "text": "TEC Equipment Loadout - {faction}\nFaction Technology: {join:technology}\nSpecialization: {pick:specializations}"
+    },
+    "faction-info": {
+        "bbcode": """[h3]Faction Profile: {faction}[/h3]
+[b]Organization Type:[/b] {rank_structure}
+[b]Primary Ideology:[/b] {ideology}
+[b]Operational Structure:[/b] {rank_structure}
+
+[h4]Core Specializations[/h4]
+{faction} excels in {join:specializations}. Their operations focus on addressing challenges related to {pick:conflicts}.
+
+[h4]Technology Arsenal[/h4]
+[b]Primary Equipment:[/b] {join:technology}
+[b]Specialized Training:[/b] {pick:specializations}
+
+[h4]Current Conflicts & Challenges[/h4]
+[b]Active Threats:[/b] {join:conflicts}
+[b]Strategic Priorities:[/b] Advancing faction goals while maintaining operational security
+[b]Inter-Faction Relations:[/b] Complex alliances and rivalries based on ideological differences""",
+        "text": "Faction Profile: {faction}\nIdeology: {ideology}\nSpecializations: {join:specializations}"
+    },
+    "faction-operative": {
+        "bbcode": """[h3]{faction} Operative Assessment[/h3]
+[b]Operative ID:[/b] {pick:operative_prefixes}-{randint:100:999}
+[b]Codename:[/b] "{pick:assessment_codenames}"
+[b]Specialization:[/b] {pick:specializations}
+
+[h4]Faction-Specific Training[/h4]
+[b]Primary Skills:[/b] {pick:specializations}, {pick:specializations}
+[b]Equipment Mastery:[/b] {pick:technology}
+[b]Conflict Experience:[/b] Veteran of {pick:conflicts} operations
+
+[h4]Operational History[/h4]
+This operative has demonstrated exceptional commitment to {faction}'s core principle: "{ideology}". Their service record includes successful missions against {pick:conflicts}.
+
+[b]Current Assignment:[/b] {pick:assignments}
+[b]Clearance Level:[/b] {rank_structure} authorized""",
+        "text": "{faction} Operative Assessment\nSpecialization: {pick:specializations}\nEquipment: {pick:technology}"
+    },
+    "faction-conflict": {
+        "bbcode": """[h3]Faction Conflict Analysis: {faction}[/h3]
+[b]Primary Conflict:[/b] {pick:conflicts}
+[b]Threat Level:[/b] {pick:threat_levels}
+[b]Duration:[/b] {pick:conflict_durations}
+
+[h4]Faction Position[/h4]
+{faction} approaches this conflict through their ideological lens of "{ideology}". Their {rank_structure} has authorized specialized response protocols.
+
+[h4]Resource Deployment[/h4]
+[b]Technology Assets:[/b] {join:technology}
+[b]Specialized Personnel:[/b] Operatives trained in {pick:specializations}
+[b]Strategic Approach:[/b] Focused on {pick:specializations} to address root causes
+
+[h4]Resolution Prospects[/h4]
+[b]Success Factors:[/b] Faction expertise in {pick:specializations}
+[b]Risk Assessment:[/b] Potential for escalation to {pick:conflicts}
+[b]Timeline:[/b] {pick:timelines}""",
+        "text": "Faction Conflict Analysis: {faction}\nPrimary Conflict: {pick:conflicts}\nApproach: {ideology}"
+    },
+    "faction-mission": {
+        "bbcode": """[h3]{faction} Mission Protocol[/h3]
+[b]Mission Classification:[/b] {pick:mission_classes}
+[b]Faction Authorization:[/b] {rank_structure}
+[b]Operational Scope:[/b] {pick:operational_scopes}
+
+[h4]Mission Objectives[/h4]
+[b]Primary Goal:[/b] Address {pick:conflicts} through {pick:specializations}
+[b]Secondary Goals:[/b] Advance faction principles of "{ideology}"
+[b]Success Metrics:[/b] Measurable improvement in {pick:conflicts} situation
+
+[h4]Resource Allocation[/h4]
+[b]Technology Package:[/b] {pick:technology}, {pick:technology}
+[b]Personnel Skills:[/b] {pick:specializations} expertise required
+[b]Support Systems:[/b] Full {faction} network access
+
+[h4]Risk Assessment[/h4]
+[b]Primary Risks:[/b] Opposition from factions with conflicting ideologies
+[b]Mitigation Strategies:[/b] Leverage faction strengths in {pick:specializations}
+[b]Contingency Plans:[/b] Emergency protocols aligned with {rank_structure}""",
+        "text": "{faction} Mission Protocol\nObjective: {pick:conflicts}\nTechnology: {pick:technology}"
+    },
+    "location-detail": {
+        "bbcode": """[h3]Location: {pick:location_names}[/h3]
+[b]Classification:[/b] {pick:location_classes}
+[b]Operational Status:[/b] {pick:location_statuses}
+[b]Faction Control:[/b] {faction} operational zone
+[b]Environmental Hazards:[/b] {pick:hazards}
+
+[h4]Key Areas[/h4]
+[b]Command Center:[/b] {pick:command_centers}
+[b]Specialized Zones:[/b] Areas dedicated to {pick:specializations}
+[b]Technology Centers:[/b] Facilities housing {pick:technology}
+
+[b]Access Requirements:[/b] {rank_structure} clearance required
+[b]Faction-Specific Features:[/b] Infrastructure supporting "{ideology}\"""",
+        "text": "Location: Orbital Defense Platform Sigma\nClassification: Military installation\nFaction Control: {faction}\n"
+                "Specialized Features: {pick:specializations}"
+    },
+    "story-element": {
+        "bbcode": """[h3]Story Element: {pick:story_titles}[/h3]
+[b]Plot Hook:[/b] {pick:plot_hooks}
+[b]Faction Involvement:[/b] {faction} responds according to "{ideology}"
+
+[h4]The Situation[/h4]
+The crisis directly impacts {faction}'s core interests in {pick:specializations}. Their response involves deploying {pick:technology} to address the emerging threat of {pick:conflicts}.
+
+[h4]Key Mysteries[/h4]
+- How does this crisis align with or challenge {faction}'s ideology?
+- What role do {pick:technology} play in the resolution?
+- Which other factions might become allies or enemies in this situation?
+- How might this crisis reshape the balance of power between factions?
+
+[h4]Character Involvement Hooks[/h4]
+[b]For {faction} Members:[/b] Direct faction assignment with specialized equipment
+[b]For Other Factions:[/b] Potential alliance or conflict based on ideological differences
+[b]For Independents:[/b] Opportunity to work with or against established faction interests
+[b]Personal Stakes:[/b] How individual beliefs align with faction responses to the crisis""",
+        "text": "Story Element: The Digital Awakening\nPlot Hook: Ancient AI consciousness stirring in forgotten data vaults\n"
+                "Faction Angle: {faction} involvement"
+    }
+}
+
+LORE_FALLBACK_TEMPLATE = ("Enhanced faction-aware content for {generator_type} featuring {faction} would appear here. This content would incorporate their ideology of "
+                          "'{ideology}' and specialization in {pick:specializations}.")
+
+# World Anvil articles: content_type -> title/content templates plus publishing metadata
+WORLD_ANVIL_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "character": {
+        "title": "{pick:wa_character_names} - {faction} Operative",
+        "content": """
+[h1]{pick:wa_character_names}[/h1]
+
+[quote]Codename: "{pick:wa_codenames}"[/quote]
+
+[h2]Faction Affiliation[/h2]
+[b]Primary Faction:[/b] {faction}
+[b]Ideology Alignment:[/b] {ideology}
+[b]Rank Structure:[/b] {rank_structure}
+
+[h2]Specialization[/h2]
+[b]Primary Expertise:[/b] {pick:specializations}
+[b]Secondary Skills:[/b] {pick:specializations}
+[b]Equipment Mastery:[/b] {pick:technology}
+
+[h2]Background[/h2]
+This operative exemplifies {faction}'s commitment to "{ideology}". Their expertise in {pick:specializations} has proven invaluable in addressing {pick:conflicts}.
+
+[h2]Current Operations[/h2]
+Currently deployed in operations involving {pick:conflicts}, utilizing advanced {pick:technology} to advance faction objectives.
+
+[h2]Notable Achievements[/h2]
+- Successfully completed high-priority missions for {faction}
+- Pioneered new techniques in {pick:specializations}
+- Demonstrated exceptional loyalty to faction ideology
+
+[sidebar]
+[h3]Quick Reference[/h3]
+[b]Faction:[/b] {faction} {symbol}
+[b]Specialization:[/b] {pick:specializations}
+[b]Status:[/b] Active
+[/sidebar]
+""",
+        "template": "character",
+        "tags": ["operative", "character"],
+        "category": "Characters"
+    },
+    "location": {
+        "title": "{pick:wa_location_names} - {faction} Territory",
+        "content": """
+[h1]{pick:wa_location_names}[/h1]
+
+[h2]Faction Control[/h2]
+[b]Controlling Faction:[/b] {faction} {symbol}
+[b]Control Level:[/b] {pick:control_levels}
+[b]Strategic Importance:[/b] Critical for {pick:specializations}
+
+[h2]Facility Details[/h2]
+This installation serves as a key stronghold for {faction}, supporting their mission of "{ideology}". The facility specializes in {pick:specializations} and houses advanced {pick:technology}.
+
+[h2]Operational Capabilities[/h2]
+- Advanced {pick:technology}
+- Specialized training in {pick:specializations}
+- Strategic response to {pick:conflicts}
+- Integration with {rank_structure}
+
+[h2]Security Measures[/h2]
+Access restricted to personnel with appropriate clearance within the {rank_structure}. Special protocols in place for managing {pick:conflicts}.
+
+[sidebar]
+[h3]Location Summary[/h3]
+[b]Controller:[/b] {faction}
+[b]Type:[/b] Strategic Facility
+[b]Status:[/b] Operational
+[b]Access:[/b] Restricted
+[/sidebar]
+""",
+        "template": "location",
+        "tags": ["facility", "location"],
+        "category": "Locations"
+    },
+    "organization": {
+        "title": "{faction} - TEC Faction Profile",
+        "content": """
+[h1]{faction}[/h1]
+
+[quote]{symbol} {ideology}[/quote]
+
+[h2]Organizational Structure[/h2]
+[b]Hierarchy Type:[/b] {rank_structure}
+[b]Core Ideology:[/b] {ideology}
+[b]Primary Symbol:[/b] {symbol}
+
+[h2]Core Specializations[/h2]
+{faction} has developed expertise in the following areas:
+[list]
+{bullets:specializations}
+[/list]
+
+[h2]Technology Arsenal[/h2]
+The faction maintains advanced capabilities including:
+[list]
+{bullets:technology}
+[/list]
+
+[h2]Current Conflicts & Challenges[/h2]
+{faction} actively addresses the following issues:
+[list]
+{bullets:conflicts}
+[/list]
+
+[h2]Inter-Faction Relations[/h2]
+As one of the seven major factions in the TEC universe, {faction} maintains complex relationships with other organizations based on ideological alignment and strategic interests.
+
+[sidebar]
+[h3]Faction Quick Facts[/h3]
+[b]Symbol:[/b] {symbol}
+[b]Type:[/b] {rank_structure}
+[b]Status:[/b] Active
+[b]Members:[/b] Classified
+[/sidebar]
+""",
+        "template": "organization",
+        "tags": ["faction", "organization"],
+        "category": "Organizations"
+    },
+    "article": {
+        "title": "{pick:article_topics} - {faction} Analysis",
+        "content": """
+[h1]{pick:article_topics}[/h1]
+[subtitle]Analysis from {faction} Perspective[/subtitle]
+
+[h2]Executive Summary[/h2]
+From the perspective of {faction}, this phenomenon represents both an opportunity and a challenge aligned with their core mission of "{ideology}".
+
+[h2]Faction Response Strategy[/h2]
+{faction} has mobilized resources including {pick:technology} and specialists in {pick:specializations} to address this situation.
+
+[h2]Strategic Implications[/h2]
+This event directly impacts the faction's ongoing efforts to manage {pick:conflicts}. The {rank_structure} has authorized enhanced protocols.
+
+[h2]Recommended Actions[/h2]
+- Deploy specialized {pick:technology}
+- Activate {pick:specializations} teams
+- Coordinate response through {rank_structure}
+- Monitor impact on {pick:conflicts}
+
+[h2]Long-term Considerations[/h2]
+The resolution of this crisis may reshape inter-faction dynamics and advance or challenge {faction}'s ideological goals.
+
+[sidebar]
+[h3]Analysis Source[/h3]
+[b]Faction:[/b] {faction}
+[b]Classification:[/b] Strategic Assessment
+[b]Date:[/b] {date}
+[/sidebar]
+""",
+        "template": "article",
+        "tags": ["analysis", "article"],
+        "category": "Articles"
+    }
+}
+
+WORLD_ANVIL_FALLBACK = {
+    "title": "{content_title} - {faction} Content",
+    "content": """
+[h1]{content_title} Content[/h1]
+
+This content generated by {faction} reflects their commitment to "{ideology}" and showcases their expertise in {pick:specializations}.
+
+Generated content would include faction-specific information, technology details, and strategic perspectives.
+""",
+    "template": "article",
+    "category": "Generated Content"
+}
+
+PLACEHOLDER = re.compile(r"\{([a-z_]+)(?::([a-z_0-9]+))?(?::([0-9]+))?\}")
+
+
+def _today() -> str:
+    return datetime.now().strftime('%Y.%m.%d')
+
+
+class _Variable:
+    """Slot filled from a keyword argument to ``CompiledTemplate.render``"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class CompiledTemplate:
+    """A template pre-split per faction into literal text and random slots.
+
+    Faction fields are baked into the literals at compile time, so rendering
+    is one pass of ``rng.choice`` over the remaining slots and a join.
+    Slots are tuples (pick one), zero-argument callables, or ``variables``
+    named at compile time and passed to ``render``.
+    """
+
+    def __init__(self, source: str, factions: Dict[str, Dict[str, Any]], pools: Dict[str, Sequence[str]],
+                 variables: Sequence[str] = ()):
+        self.source = source
+        self.parts = {name: self._compile(source, name, data, pools, variables) for name, data in factions.items()}
+
+    @staticmethod
+    def _compile(source: str, faction: str, data: Dict[str, Any], pools: Dict[str, Sequence[str]],
+                 variables: Sequence[str] = ()) -> list:
+        parts: list = []
+
+        def emit(part):
+            if isinstance(part, str) and parts and isinstance(parts[-1], str):
+                parts[-1] += part
+            elif part != "":
+                parts.append(part)
+
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            emit(source[position:match.start()])
+            position = match.end()
+            kind, name, upper = match.groups()
+            if kind == "faction":
+                emit(faction)
+            elif kind == "date":
+                emit(_today)
+            elif kind == "randint":
+                emit(tuple(str(i) for i in range(int(name), int(upper) + 1)))
+            elif kind in ("pick", "join", "bullets"):
+                values = data.get(name) if name in data else pools.get(name)
+                if values is None:
+                    raise KeyError(f"Unknown lore pool '{name}'")
+                if kind == "pick":
+                    emit(values[0] if len(values) == 1 else tuple(values))
+                elif kind == "join":
+                    emit(", ".join(values))
+                else:
+                    emit("\n".join(f"[*]{value}" for value in values))
+            elif kind in variables:
+                emit(_Variable(kind))
+            elif kind in data:
+                emit(str(data[kind]))
+            else:
+                raise KeyError(f"Unknown lore placeholder '{match.group(0)}'")
+        emit(source[position:])
+        return parts
+
+    def render(self, faction: str, rng: random.Random, **values: str) -> str:
+        choice = rng.choice
+        return "".join([
+            part if part.__class__ is str else choice(part) if part.__class__ is tuple
+            else values[part.name] if part.__class__ is _Variable else part()
+            for part in self.parts[faction]
+        ])
+
+
+class LoreGenerationEngine:
+    """Generates Lore Forge and World Anvil content from precompiled templates"""
+
+    def __init__(self, factions: Optional[Dict[str, Dict[str, Any]]] = None,
+                 templates: Optional[Dict[str, Dict[str, str]]] = None,
+                 pools: Optional[Dict[str, Sequence[str]]] = None, seed: Optional[int] = None):
+        self.factions = factions or TEC_FACTIONS
+        self.faction_names = list(self.factions)
+        self.rng = random.Random(seed)
+        pools = pools or LORE_POOLS
+
+        start = time.perf_counter()
+        self.templates = {
+            generator_type: {fmt: CompiledTemplate(source, self.factions, pools) for fmt, source in formats.items()}
+            for generator_type, formats in (templates or LORE_TEMPLATES).items()
+        }
+        self.fallback = CompiledTemplate(LORE_FALLBACK_TEMPLATE, self.factions, pools, ["generator_type"])
+        self.articles = {
+            content_type: {
+                "title": CompiledTemplate(spec["title"], self.factions, pools),
+                "content": CompiledTemplate(spec["content"], self.factions, pools),
+                "meta": {key: spec[key] for key in ("template", "tags", "category")}
+            }
+            for content_type, spec in WORLD_ANVIL_TEMPLATES.items()
+        }
+        self.article_fallback = {
+            part: CompiledTemplate(WORLD_ANVIL_FALLBACK[part], self.factions, pools, ["content_title"])
+            for part in ("title", "content")
+        }
+        self.compile_ms = (time.perf_counter() - start) * 1000
+        self.generated = 0
+
+    @property
+    def generator_types(self) -> List[str]:
+        return list(self.templates)
+
+    def select_faction(self, faction: Optional[str] = None) -> str:
+        """The requested faction if known, otherwise a random one"""
+        if faction and faction in self.factions:
+            return faction
+        return self.rng.choice(self.faction_names)
+
+    def generate(self, generator_type: str, format_type: str = "bbcode", faction: Optional[str] = None) -> str:
+        """Render one Lore Forge generation"""
+        selected = self.select_faction(faction)
+        self.generated += 1
+        formats = self.templates.get(generator_type)
+        if formats and format_type in formats:
+            return formats[format_type].render(selected, self.rng)
+        return self.fallback.render(selected, self.rng, generator_type=generator_type)
+
+    def iter_batch(self, count: int, generator_types: Optional[Sequence[str]] = None, format_type: str = "bbcode",
+                   faction: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield ``count`` generations, cycling through generator types as they are rendered"""
+        types = list(generator_types or self.generator_types)
+        for index in range(count):
+            generator_type = types[index % len(types)]
+            selected = self.select_faction(faction)
+            yield {
+                "index": index,
+                "generator_type": generator_type,
+                "format": format_type,
+                "faction": selected,
+                "content": self.generate(generator_type, format_type, selected)
+            }
+
+    def generate_batch(self, count: int, generator_types: Optional[Sequence[str]] = None,
+                       format_type: str = "bbcode", faction: Optional[str] = None) -> List[Dict[str, Any]]:
+        return list(self.iter_batch(count, generator_types, format_type, faction))
+
+    def generate_article(self, content_type: str, faction: Optional[str] = None) -> Dict[str, Any]:
+        """World Anvil article payload (title, content, template, tags, category, faction)"""
+        selected = self.select_faction(faction)
+        self.generated += 1
+        slug = selected.lower().replace(" ", "-")
+        spec = self.articles.get(content_type)
+        if spec is None:
+            return {
+                "title": self.article_fallback["title"].render(selected, self.rng, content_title=content_type.title()),
+                "content": self.article_fallback["content"].render(selected, self.rng,
+                                                                   content_title=content_type.title()),
+                "template": WORLD_ANVIL_FALLBACK["template"],
+                "tags": [slug, content_type],
+                "category": WORLD_ANVIL_FALLBACK["category"],
+                "faction": selected
+            }
+        return {
+            "title": spec["title"].render(selected, self.rng),
+            "content": spec["content"].render(selected, self.rng),
+            "template": spec["meta"]["template"],
+            "tags": [slug] + spec["meta"]["tags"],
+            "category": spec["meta"]["category"],
+            "faction": selected
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "factions": len(self.factions),
+            "generator_types": len(self.templates),
+            "article_types": len(self.articles),
+            "compile_ms": round(self.compile_ms, 2),
+            "generated": self.generated
+        }
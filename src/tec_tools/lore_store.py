@@ -0,0 +1,307 @@
+"""
+TEC Lore Store
+Content-addressed storage for Lore Forge generations: deduplicated by hash,
+compressed bodies, and keyset-paginated history listings
+"""
+
+import hashlib
+import re
+import sqlite3
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_LENGTH = 200
+BBCODE_TAG = re.compile(r"\[/?[a-z0-9*]+(?:=[^\]]*)?\]", re.IGNORECASE)
+FACTION_LINE = re.compile(r"Faction(?: Profile| Conflict Analysis)?:\s*(?:\[/b\]\s*)?([^\n\[]+)")
+
+
+def summarize_content(content: str, length: int = SUMMARY_LENGTH) -> str:
+    """Plain-text preview for list views: markup stripped, whitespace collapsed"""
+    text = " ".join(BBCODE_TAG.sub("", content).split())
+    return text[:length] + "..." if len(text) > length else text
+
+
+def detect_faction(content: str) -> Optional[str]:
+    """Faction named in a generated profile/briefing, if any"""
+    match = FACTION_LINE.search(content)
+    return match.group(1).strip() if match else None
+
+
+def content_hash(content: str) -> bytes:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+class LoreContentStore:
+    """Lore Forge generations in SQLite.
+
+    Identical content is stored once (``duplicate_count`` tracks re-saves).
+    Bodies are zstd-compressed when ``zstandard`` is installed and zlib
+    otherwise; the codec is recorded per row. Listings only read the
+    precomputed summary and page by ``(created_at, id)`` rather than OFFSET.
+    """
+
+    def __init__(self, db_path: str = "data/tec_database.db", compression_level: int = 6):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+        self.codec = "zstd" if ZSTD_AVAILABLE else "zlib"
+        if ZSTD_AVAILABLE:
+            self._compressor = zstandard.ZstdCompressor(level=compression_level)
+            self._decompressor = zstandard.ZstdDecompressor()
+        self.init_database()
+
+    def init_database(self):
+        """Create the store and migrate rows from the original lore_content table"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS lore_generations (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        content_hash BLOB NOT NULL UNIQUE,
+                        generator_type TEXT,
+                        faction TEXT,
+                        format TEXT,
+                        summary TEXT NOT NULL,
+                        body BLOB NOT NULL,
+                        codec TEXT NOT NULL,
+                        raw_size INTEGER NOT NULL,
+                        stored_size INTEGER NOT NULL,
+                        timestamp TEXT,
+                        created_at TEXT NOT NULL,
+                        duplicate_count INTEGER DEFAULT 0,
+                        last_saved_at TEXT
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_lore_created ON lore_generations(created_at, id)")
+                conn.execute("""CREATE INDEX IF NOT EXISTS idx_lore_generator
+                                ON lore_generations(generator_type, created_at, id)""")
+                conn.execute("""CREATE INDEX IF NOT EXISTS idx_lore_faction
+                                ON lore_generations(faction, created_at, id)""")
+                conn.execute("CREATE TABLE IF NOT EXISTS lore_store_meta (key TEXT PRIMARY KEY, value TEXT)")
+
+                migrated = conn.execute("SELECT value FROM lore_store_meta WHERE key = 'legacy_migrated'").fetchone()
+                if migrated is None:
+                    self._migrate_legacy(conn)
+                    conn.execute("INSERT INTO lore_store_meta (key, value) VALUES ('legacy_migrated', ?)", (_now(),))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error initializing lore store: {e}")
+
+    def _migrate_legacy(self, conn: sqlite3.Connection):
+        legacy = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'lore_content'"
+        ).fetchone()
+        if legacy is None:
+            return
+        rows = conn.execute("""
+            SELECT generator_type, content, timestamp, created_at FROM lore_content ORDER BY id
+        """).fetchall()
+        records = []
+        for generator_type, content, timestamp, created_at in rows:
+            if content:
+                # CURRENT_TIMESTAMP is UTC "YYYY-MM-DD HH:MM:SS"; match our created_at format
+                created = (created_at or _now()).replace(" ", "T")
+                records.append(self._record(content, generator_type, None, "bbcode", timestamp,
+                                            created if "." in created else created + ".000000"))
+        self._upsert(conn, records)
+        logger.info(f"Migrated {len(records)} legacy lore_content rows")
+
+    # Compression
+
+    def compress(self, content: str) -> Tuple[bytes, str]:
+        raw = content.encode("utf-8")
+        if ZSTD_AVAILABLE:
+            packed = self._compressor.compress(raw)
+        else:
+            packed = zlib.compress(raw, self.compression_level)
+        # Very short bodies can grow under compression
+        return (packed, self.codec) if len(packed) < len(raw) else (raw, "raw")
+
+    def decompress(self, body: bytes, codec: str) -> str:
+        if codec == "zlib":
+            body = zlib.decompress(body)
+        elif codec == "zstd":
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to read zstd-compressed lore")
+            body = self._decompressor.decompress(body)
+        return body.decode("utf-8")
+
+    # Writes
+
+    def _record(self, content: str, generator_type: Optional[str], faction: Optional[str],
+                format_type: Optional[str], timestamp: Optional[str], created_at: str) -> tuple:
+        body, codec = self.compress(content)
+        return (
+            content_hash(content), generator_type, faction or detect_faction(content), format_type,
+            summarize_content(content), body, codec, len(content.encode("utf-8")), len(body),
+            timestamp, created_at, created_at
+        )
+
+    _UPSERT = """
+        INSERT INTO lore_generations
+        (content_hash, generator_type, faction, format, summary, body, codec,
+         raw_size, stored_size, timestamp, created_at, last_saved_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(content_hash) DO UPDATE SET
+            duplicate_count = duplicate_count + 1,
+            last_saved_at = excluded.last_saved_at
+    """
+
+    def _upsert(self, conn: sqlite3.Connection, records: List[tuple]):
+        conn.executemany(self._UPSERT, records)
+
+    def save(self, content: str, generator_type: Optional[str] = None, faction: Optional[str] = None,
+             format_type: str = "bbcode", timestamp: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Store one generation; re-saving identical content returns the existing row"""
+        try:
+            now = _now()
+            record = self._record(content, generator_type, faction, format_type, timestamp or now, now)
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute(self._UPSERT + " RETURNING id, duplicate_count, created_at, faction",
+                                   record).fetchone()
+                conn.commit()
+            return {
+                "id": row[0],
+                "duplicate": row[1] > 0,
+                "created_at": row[2],
+                "faction": row[3],
+                "raw_size": record[7],
+                "stored_size": record[8]
+            }
+        except Exception as e:
+            logger.error(f"Error saving lore content: {e}")
+            return None
+
+    def save_many(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Store a batch of generations in one transaction; returns how many were submitted"""
+        now = _now()
+        records = [
+            self._record(item["content"], item.get("generator_type"), item.get("faction"),
+                         item.get("format", "bbcode"), item.get("timestamp") or now,
+                         item.get("created_at") or now)
+            for item in items
+        ]
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                self._upsert(conn, records)
+                conn.commit()
+            return len(records)
+        except Exception as e:
+            logger.error(f"Error saving lore batch: {e}")
+            return 0
+
+    # Reads
+
+    @staticmethod
+    def encode_cursor(created_at: str, row_id: int) -> str:
+        return f"{created_at}|{row_id}"
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        """Raises ValueError for malformed cursors"""
+        created_at, _, row_id = cursor.rpartition("|")
+        if not created_at:
+            raise ValueError(f"Invalid history cursor: {cursor!r}")
+        return created_at, int(row_id)
+
+    def list(self, limit: int = 50, cursor: Optional[str] = None, generator_type: Optional[str] = None,
+             faction: Optional[str] = None) -> Dict[str, Any]:
+        """Newest-first page of summaries; pass ``next_cursor`` back to continue"""
+        clauses, params = [], []
+        if generator_type:
+            clauses.append("generator_type = ?")
+            params.append(generator_type)
+        if faction:
+            clauses.append("faction = ?")
+            params.append(faction)
+        if cursor:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(self.decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(f"""
+                SELECT id, generator_type, faction, format, summary, timestamp, created_at,
+                       raw_size, duplicate_count
+                FROM lore_generations {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            """, params + [limit + 1]).fetchall()
+
+        items = [{
+            "id": row[0],
+            "generator_type": row[1],
+            "faction": row[2],
+            "format": row[3],
+            "summary": row[4],
+            "content": row[4],  # /api/loreforge/history has always returned the preview as ``content``
+            "timestamp": row[5],
+            "created_at": row[6],
+            "size": row[7],
+            "duplicate_count": row[8]
+        } for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = self.encode_cursor(items[-1]["created_at"], items[-1]["id"])
+        return {"items": items, "next_cursor": next_cursor}
+
+    def get(self, generation_id: int) -> Optional[Dict[str, Any]]:
+        """Full generation including the decompressed body"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute("""
+                    SELECT id, generator_type, faction, format, body, codec, timestamp,
+                           created_at, duplicate_count, last_saved_at
+                    FROM lore_generations WHERE id = ?
+                """, (generation_id,)).fetchone()
+            if row is None:
+                return None
+            return {
+                "id": row[0],
+                "generator_type": row[1],
+                "faction": row[2],
+                "format": row[3],
+                "content": self.decompress(row[4], row[5]),
+                "timestamp": row[6],
+                "created_at": row[7],
+                "duplicate_count": row[8],
+                "last_saved_at": row[9]
+            }
+        except Exception as e:
+            logger.error(f"Error reading lore generation {generation_id}: {e}")
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        with sqlite3.connect(self.db_path) as conn:
+            count, raw, stored, duplicates = conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0),
+                       COALESCE(SUM(duplicate_count), 0)
+                FROM lore_generations
+            """).fetchone()
+            codecs = dict(conn.execute("SELECT codec, COUNT(*) FROM lore_generations GROUP BY codec").fetchall())
+        return {
+            "generations": count,
+            "duplicates_skipped": duplicates,
+            "raw_bytes": raw,
+            "stored_bytes": stored,
+            "compression_ratio": round(raw / stored, 2) if stored else 0.0,
+            "codecs": codecs,
+            "default_codec": self.codec
+        }
@@ -6,24 +6,56 @@ This module provides the foundational architecture for MCP servers that expose
 TEC's core functionalities to LLMs via standardized protocol.
 """
 
+import hashlib
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import queue
+import re
+import socket
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from abc import ABC, abstractmethod
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from datetime import datetime
 import os
+import requests
+from requests.adapters import HTTPAdapter
+
+from .chat_streaming import SSE_HEADERS, SSE_MIMETYPE
+from .latency_histogram import LatencyRecorder
+from .mcp_events import HEARTBEAT_SECONDS, ResourceEventBus, Subscription, format_event, parse_events
+from .ttl_cache import TTLCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# JSON-RPC 2.0 error codes used by the batch endpoint
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+JSONRPC_INTERNAL_ERROR = -32603
+MAX_BATCH_SIZE = 50
+
+
+def resource_etag(resource_data: Dict[str, Any]) -> str:
+    """Strong ETag for a resource payload (quoted, as sent in the header)"""
+    body = json.dumps(resource_data, sort_keys=True, default=str).encode()
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
 class MCPServer(ABC):
     """
     Base class for MCP Server implementations
     Following the Model Context Protocol specification
     """
     
+    # Per-URI resource caching declared by subclasses:
+    # {uri: {"ttl": seconds, "keys": (state keys whose changes invalidate it)}}
+    # URIs without a policy are recomputed on every read.
+    resource_cache_policy: Dict[str, Dict[str, Any]] = {}
+    
     def __init__(self, server_name: str, version: str = "1.0.0"):
         self.server_name = server_name
         self.version = version
@@ -32,6 +64,8 @@ class MCPServer(ABC):
             "tools": {},
             "prompts": {}
         }
+        self.resource_cache = TTLCache(maxsize=256, name=f"{server_name}_resources")
+        self.events = ResourceEventBus(server_name)
         self.app = Flask(__name__)
         self._setup_routes()
     
@@ -45,15 +79,7 @@ class MCPServer(ABC):
                 client_info = request.get_json()
                 logger.info(f"MCP initialization request from {client_info}")
                 
-                return jsonify({
-                    "protocolVersion": "2024-11-05",
-                    "serverInfo": {
-                        "name": self.server_name,
-                        "version": self.version,
-                        "description": f"MCP Server for {self.server_name} - Part of TEC: BITLYFE IS THE NEW SHIT"
-                    },
-                    "capabilities": self.capabilities
-                })
+                return jsonify(self.server_info())
             except Exception as e:
                 logger.error(f"Initialization error: {e}")
                 return jsonify({"error": str(e)}), 500
@@ -79,10 +105,16 @@ class MCPServer(ABC):
                 if not resource_uri:
                     return jsonify({"error": "Resource URI required"}), 400
                 
-                resource_data = self.read_resource_data(resource_uri)
+                resource_data, etag, max_age = self.read_resource_entry(resource_uri)
+                headers = {
+                    "ETag": etag,
+                    "Cache-Control": f"max-age={max_age}" if max_age else "no-cache"
+                }
+                if request.headers.get("If-None-Match") == etag:
+                    return "", 304, headers
                 return jsonify({
                     "contents": [resource_data]
-                })
+                }), 200, headers
             except Exception as e:
                 logger.error(f"Resource read error: {e}")
                 return jsonify({"error": str(e)}), 500
@@ -145,6 +177,47 @@ class MCPServer(ABC):
                 logger.error(f"Prompt retrieval error: {e}")
                 return jsonify({"error": str(e)}), 500
         
+        @self.app.route('/mcp/batch', methods=['POST'])
+        def batch():
+            """JSON-RPC 2.0 batch: several resource reads / tool calls in one round-trip"""
+            payload = request.get_json(silent=True)
+            single = isinstance(payload, dict)
+            calls = [payload] if single else payload
+            if not isinstance(calls, list) or not calls:
+                return jsonify({"jsonrpc": "2.0", "id": None, "error": {
+                    "code": JSONRPC_INVALID_REQUEST, "message": "Expected a JSON-RPC request or batch"
+                }}), 400
+            if len(calls) > MAX_BATCH_SIZE:
+                return jsonify({"jsonrpc": "2.0", "id": None, "error": {
+                    "code": JSONRPC_INVALID_REQUEST, "message": f"Batch exceeds {MAX_BATCH_SIZE} calls"
+                }}), 400
+            
+            responses = self.handle_rpc_batch(calls)
+            return jsonify(responses[0] if single else responses)
+        
+        @self.app.route('/mcp/resources/subscribe', methods=['GET'])
+        def subscribe_resources():
+            """Long-lived SSE stream of change events for URIs matching ?pattern=..."""
+            patterns = request.args.getlist('pattern') or ["*"]
+            last_event_id = request.headers.get('Last-Event-ID', '')
+            events = queue.Queue()
+            subscription = self.events.subscribe(
+                patterns, events.put, after=int(last_event_id) if last_event_id.isdigit() else None
+            )
+            
+            def stream():
+                try:
+                    yield ": subscribed\n\n"
+                    while True:
+                        try:
+                            yield format_event(events.get(timeout=HEARTBEAT_SECONDS))
+                        except queue.Empty:
+                            yield ": keepalive\n\n"
+                finally:
+                    subscription.close()
+            
+            return Response(stream_with_context(stream()), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+        
         @self.app.route('/health', methods=['GET'])
         def health_check():
             """Health check endpoint"""
@@ -155,6 +228,92 @@ class MCPServer(ABC):
                 "timestamp": datetime.now().isoformat()
             })
     
+    def server_info(self) -> Dict[str, Any]:
+        """Initialization payload: protocol version, server info and capabilities"""
+        return {
+            "protocolVersion": "2024-11-05",
+            "serverInfo": {
+                "name": self.server_name,
+                "version": self.version,
+                "description": f"MCP Server for {self.server_name} - Part of TEC: BITLYFE IS THE NEW SHIT"
+            },
+            "capabilities": self.capabilities
+        }
+    
+    def handle_rpc(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one MCP method; results have the same shape as the REST routes"""
+        if method == "initialize":
+            return self.server_info()
+        if method == "resources/list":
+            return {"resources": self.get_resources()}
+        if method == "resources/read":
+            if not params.get("uri"):
+                raise ValueError("Resource URI required")
+            return {"contents": [self.read_resource_entry(params["uri"])[0]]}
+        if method == "tools/list":
+            return {"tools": self.get_tools()}
+        if method == "tools/call":
+            if not params.get("name"):
+                raise ValueError("Tool name required")
+            return {"content": [self.execute_tool(params["name"], params.get("arguments", {}))]}
+        if method == "prompts/list":
+            return {"prompts": self.get_prompts()}
+        if method == "prompts/get":
+            if not params.get("name"):
+                raise ValueError("Prompt name required")
+            return self.get_prompt_data(params["name"], params.get("arguments", {}))
+        raise LookupError(f"Unknown method: {method}")
+    
+    def read_resource_entry(self, uri: str) -> Tuple[Dict[str, Any], str, int]:
+        """Resource data with its ETag and remaining max-age in seconds.
+        
+        URIs with a ``resource_cache_policy`` are served from cache until
+        their TTL runs out or ``invalidate_resources`` drops them.
+        """
+        policy = self.resource_cache_policy.get(uri)
+        if not policy:
+            resource_data = self.read_resource_data(uri)
+            return resource_data, resource_etag(resource_data), 0
+        
+        def load():
+            resource_data = self.read_resource_data(uri)
+            return resource_data, resource_etag(resource_data), time.monotonic() + policy["ttl"]
+        
+        resource_data, etag, expires_at = self.resource_cache.get_or_load(uri, load, ttl=policy["ttl"])
+        return resource_data, etag, max(0, int(expires_at - time.monotonic()))
+    
+    def invalidate_resources(self, *keys: str) -> List[str]:
+        """Drop cached resources whose policy lists any of ``keys`` and notify subscribers;
+        call after mutating state"""
+        uris = [uri for uri, policy in self.resource_cache_policy.items()
+                if set(keys) & set(policy.get("keys", ()))]
+        for uri in uris:
+            self.resource_cache.invalidate(uri)
+            self.events.publish(uri, keys=list(keys))
+        return uris
+    
+    def handle_rpc_batch(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run JSON-RPC calls in order; one failing call does not fail the others"""
+        responses = []
+        for call in calls:
+            call_id = call.get("id") if isinstance(call, dict) else None
+            response = {"jsonrpc": "2.0", "id": call_id}
+            try:
+                if not isinstance(call, dict) or not isinstance(call.get("method"), str):
+                    raise TypeError("Invalid JSON-RPC request")
+                response["result"] = self.handle_rpc(call["method"], call.get("params") or {})
+            except TypeError as e:
+                response["error"] = {"code": JSONRPC_INVALID_REQUEST, "message": str(e)}
+            except LookupError as e:
+                response["error"] = {"code": JSONRPC_METHOD_NOT_FOUND, "message": str(e)}
+            except ValueError as e:
+                response["error"] = {"code": JSONRPC_INVALID_PARAMS, "message": str(e)}
+            except Exception as e:
+                logger.error(f"Batch call error: {e}")
+                response["error"] = {"code": JSONRPC_INTERNAL_ERROR, "message": str(e)}
+            responses.append(response)
+        return responses
+    
     @abstractmethod
     def get_resources(self) -> List[Dict[str, Any]]:
         """Return list of available resources"""
@@ -186,88 +345,377 @@ class MCPServer(ABC):
         pass
     
     def run(self, host: str = '0.0.0.0', port: int = 5000, debug: bool = False):
-        """Run the MCP server"""
+        """Run the MCP server on the async runtime (``debug`` keeps Flask's dev server)"""
         logger.info(f"Starting MCP Server: {self.server_name} on {host}:{port}")
-        self.app.run(host=host, port=port, debug=debug)
+        if debug:
+            self.app.run(host=host, port=port, debug=debug)
+            return
+        from .mcp_runtime import MCPRuntime
+        MCPRuntime(self, host=host, port=port).run()
+
+
+def _batch_results(responses: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    """Order JSON-RPC responses by id; failed calls become {"error": message, "code": code}"""
+    by_id = {response.get("id"): response for response in responses}
+    results = []
+    for call_id in range(count):
+        response = by_id.get(call_id, {"error": {"code": JSONRPC_INTERNAL_ERROR, "message": "Missing response"}})
+        if "error" in response:
+            results.append({"error": response["error"].get("message"), "code": response["error"].get("code")})
+        else:
+            results.append(response["result"])
+    return results
+
+
+def _max_age(response: requests.Response) -> int:
+    match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+    return int(match.group(1)) if match else 0
+
+
+class ClientResourceCache:
+    """
+    Client-side copy of resource reads keyed by URI.
+    Entries are served locally while within the server's max-age, then
+    revalidated with If-None-Match so unchanged resources cost a 304.
+    """
+    
+    def __init__(self, timer=time.monotonic):
+        self._timer = timer
+        self._entries: Dict[str, Tuple[Dict[str, Any], str, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+    
+    def fresh(self, uri: str) -> Optional[Dict[str, Any]]:
+        """Cached body if still within max-age, else None"""
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry and entry[2] > self._timer():
+                self.hits += 1
+                return entry[0]
+            return None
+    
+    def etag(self, uri: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(uri)
+            return entry[1] if entry else None
+    
+    def store(self, uri: str, body: Dict[str, Any], etag: Optional[str], max_age: int):
+        with self._lock:
+            self.misses += 1
+            if etag:
+                self._entries[uri] = (body, etag, self._timer() + max_age)
+    
+    def revalidate(self, uri: str, max_age: int) -> Dict[str, Any]:
+        """Server answered 304: keep the body and extend its freshness"""
+        with self._lock:
+            body, etag, _ = self._entries[uri]
+            self._entries[uri] = (body, etag, self._timer() + max_age)
+            self.revalidated += 1
+            return body
+    
+    def expire(self, uri: Optional[str] = None):
+        """Mark one entry, or every entry, stale (ETags are kept, so the next reads revalidate)"""
+        with self._lock:
+            self._entries = {key: (body, etag, 0.0 if uri in (None, key) else expires_at)
+                             for key, (body, etag, expires_at) in self._entries.items()}
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses
+            }
+
+
+class StreamSubscription:
+    """
+    Client end of /mcp/resources/subscribe: a daemon thread that reads the
+    SSE stream, reconnects with Last-Event-ID after errors and hands each
+    event to ``callback``.
+    """
+    
+    def __init__(self, client: "MCPClient", patterns: List[str], callback, retry: float = 1.0):
+        self.client = client
+        self.patterns = list(patterns)
+        self.callback = callback
+        self.retry = retry
+        self.last_event_id: Optional[str] = None
+        self.connected = threading.Event()
+        self.closed = False
+        self._session = requests.Session()
+        self._response: Optional[requests.Response] = None
+        self._thread = threading.Thread(target=self._run, name=f"mcp-subscribe-{client.server_url}", daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while not self.closed:
+            headers = {"Accept": SSE_MIMETYPE}
+            if self.last_event_id:
+                headers["Last-Event-ID"] = self.last_event_id
+            try:
+                with self._session.get(f"{self.client.server_url}/mcp/resources/subscribe",
+                                       params={"pattern": self.patterns}, headers=headers, stream=True,
+                                       timeout=(5, HEARTBEAT_SECONDS * 2)) as response:
+                    response.raise_for_status()
+                    self._response = response
+                    self.connected.set()
+                    for event in parse_events(response.iter_lines(chunk_size=None, decode_unicode=True)):
+                        self.last_event_id = str(event["id"])
+                        if self.client.resource_cache is not None:
+                            self.client.resource_cache.expire(event["uri"])
+                        self.callback(event)
+            except Exception as e:
+                if self.closed:
+                    break
+                logger.warning(f"Resource subscription to {self.client.server_url} dropped: {e}")
+            self.connected.clear()
+            if not self.closed:
+                time.sleep(self.retry)
+    
+    def close(self):
+        self.closed = True
+        # Closing a streaming response from another thread waits out the blocked
+        # read; shutting the socket down wakes the reader immediately
+        connection = getattr(self._response.raw, "_connection", None) if self._response is not None else None
+        sock = getattr(connection, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._session.close()
 
 
 class MCPClient:
     """
-    MCP Client for communicating with MCP servers
+    MCP Client for communicating with MCP servers.
+    Keeps one pooled keep-alive session per client and records per-call
+    latency histograms (see ``latency_stats``). With a ``resource_cache``,
+    resource reads are conditional and tool calls mark the cache stale.
     """
     
-    def __init__(self, server_url: str):
+    transport = "http"
+    
+    def __init__(self, server_url: str, pool_size: int = 10, timeout: float = 30,
+                 resource_cache: Optional[ClientResourceCache] = None):
         self.server_url = server_url.rstrip('/')
         self.session_id = None
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.latency = LatencyRecorder()
+        self.resource_cache = resource_cache
+    
+    def _request(self, operation: str, path: str, payload: Optional[Any] = None,
+                 timeout: Optional[float] = None, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = self.session.post(f"{self.server_url}{path}", json=payload, headers=headers,
+                                         timeout=timeout or self.timeout)
+            ok = response.status_code < 400
+            return response
+        finally:
+            self.latency.record(operation, (time.perf_counter() - started) * 1000, ok)
+    
+    def _post(self, operation: str, path: str, payload: Optional[Any] = None,
+              timeout: Optional[float] = None) -> Any:
+        response = self._request(operation, path, payload, timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    def _read_cached(self, uri: str, timeout: float) -> Dict[str, Any]:
+        body = self.resource_cache.fresh(uri)
+        if body is not None:
+            return body
+        etag = self.resource_cache.etag(uri)
+        response = self._request("resources/read", "/mcp/resources/read", {"uri": uri}, timeout,
+                                 headers={"If-None-Match": etag} if etag else None)
+        if response.status_code == 304:
+            return self.resource_cache.revalidate(uri, _max_age(response))
+        response.raise_for_status()
+        body = response.json()
+        self.resource_cache.store(uri, body, response.headers.get("ETag"), _max_age(response))
+        return body
     
     def initialize(self, client_info: Dict[str, Any]) -> Dict[str, Any]:
         """Initialize connection with MCP server"""
-        import requests
-        
         try:
-            response = requests.post(
-                f"{self.server_url}/mcp/initialize",
-                json=client_info,
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._post("initialize", "/mcp/initialize", client_info)
         except Exception as e:
             logger.error(f"MCP initialization failed: {e}")
             raise
     
     def list_resources(self) -> List[Dict[str, Any]]:
         """List available resources from server"""
-        import requests
-        
         try:
-            response = requests.post(f"{self.server_url}/mcp/resources/list", timeout=30)
-            response.raise_for_status()
-            return response.json().get("resources", [])
+            return self._post("resources/list", "/mcp/resources/list").get("resources", [])
         except Exception as e:
             logger.error(f"Resource listing failed: {e}")
             raise
     
-    def read_resource(self, uri: str) -> Dict[str, Any]:
+    def read_resource(self, uri: str, timeout: float = 30) -> Dict[str, Any]:
         """Read a specific resource"""
-        import requests
-        
         try:
-            response = requests.post(
-                f"{self.server_url}/mcp/resources/read",
-                json={"uri": uri},
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            if self.resource_cache is not None:
+                return self._read_cached(uri, timeout)
+            return self._post("resources/read", "/mcp/resources/read", {"uri": uri}, timeout=timeout)
         except Exception as e:
             logger.error(f"Resource read failed: {e}")
             raise
     
     def list_tools(self) -> List[Dict[str, Any]]:
         """List available tools from server"""
-        import requests
-        
         try:
-            response = requests.post(f"{self.server_url}/mcp/tools/list", timeout=30)
-            response.raise_for_status()
-            return response.json().get("tools", [])
+            return self._post("tools/list", "/mcp/tools/list").get("tools", [])
         except Exception as e:
             logger.error(f"Tool listing failed: {e}")
             raise
     
     def call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call a tool on the server"""
-        import requests
-        
         try:
-            response = requests.post(
-                f"{self.server_url}/mcp/tools/call",
-                json={"name": name, "arguments": arguments},
-                timeout=60
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._post("tools/call", "/mcp/tools/call", {"name": name, "arguments": arguments}, timeout=60)
         except Exception as e:
             logger.error(f"Tool call failed: {e}")
             raise
+        finally:
+            self._expire_cache()
+    
+    def _expire_cache(self):
+        # Tools may have changed server state, so cached reads revalidate next time
+        if self.resource_cache is not None:
+            self.resource_cache.expire()
+    
+    def batch(self, calls: List[Tuple[str, Dict[str, Any]]], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Send (method, params) calls as one JSON-RPC batch; results come back in call order"""
+        payload = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+                   for i, (method, params) in enumerate(calls)]
+        try:
+            return _batch_results(self._post("batch", "/mcp/batch", payload, timeout=timeout), len(calls))
+        except Exception as e:
+            logger.error(f"Batch call failed: {e}")
+            raise
+    
+    def read_resources(self, uris: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Read several resources in one round-trip, keyed by URI"""
+        results = self.batch([("resources/read", {"uri": uri}) for uri in uris], timeout=timeout)
+        return dict(zip(uris, results))
+    
+    def call_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Call several tools in one round-trip"""
+        try:
+            return self.batch([("tools/call", {"name": name, "arguments": arguments}) for name, arguments in calls],
+                              timeout=60)
+        finally:
+            self._expire_cache()
+    
+    def subscribe(self, patterns: List[str], callback) -> StreamSubscription:
+        """Stream change events for URIs matching ``patterns`` to ``callback``"""
+        return StreamSubscription(self, patterns, callback)
+    
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-operation latency histograms (ms) for this client"""
+        return self.latency.snapshot()
+    
+    def close(self):
+        self.session.close()
+
+
+class InProcessMCPClient:
+    """
+    MCP Client for a server object living in the same process.
+    Calls the server's handlers directly and returns the same shapes as
+    MCPClient, skipping JSON encoding and the localhost socket.
+    """
+    
+    transport = "inprocess"
+    
+    def __init__(self, server: MCPServer):
+        self.server = server
+        self.server_url = f"inprocess://{server.server_name}"
+        self.session_id = None
+        self.latency = LatencyRecorder()
+        # Reads hit the server's own resource cache directly; no client copy needed
+        self.resource_cache = None
+    
+    def _call(self, operation: str, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = self.server.handle_rpc(method, params)
+            ok = True
+            return result
+        finally:
+            self.latency.record(operation, (time.perf_counter() - started) * 1000, ok)
+    
+    def initialize(self, client_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Initialize connection with MCP server"""
+        logger.info(f"MCP in-process initialization from {client_info}")
+        return self._call("initialize", "initialize", {})
+    
+    def list_resources(self) -> List[Dict[str, Any]]:
+        """List available resources from server"""
+        try:
+            return self._call("resources/list", "resources/list", {})["resources"]
+        except Exception as e:
+            logger.error(f"Resource listing failed: {e}")
+            raise
+    
+    def read_resource(self, uri: str, timeout: float = 30) -> Dict[str, Any]:
+        """Read a specific resource (``timeout`` is accepted for MCPClient parity)"""
+        try:
+            return self._call("resources/read", "resources/read", {"uri": uri})
+        except Exception as e:
+            logger.error(f"Resource read failed: {e}")
+            raise
+    
+    def list_tools(self) -> List[Dict[str, Any]]:
+        """List available tools from server"""
+        try:
+            return self._call("tools/list", "tools/list", {})["tools"]
+        except Exception as e:
+            logger.error(f"Tool listing failed: {e}")
+            raise
+    
+    def call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a tool on the server"""
+        try:
+            return self._call("tools/call", "tools/call", {"name": name, "arguments": arguments})
+        except Exception as e:
+            logger.error(f"Tool call failed: {e}")
+            raise
+    
+    def batch(self, calls: List[Tuple[str, Dict[str, Any]]], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Run (method, params) calls through the server's batch dispatcher, in call order"""
+        started = time.perf_counter()
+        payload = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+                   for i, (method, params) in enumerate(calls)]
+        responses = self.server.handle_rpc_batch(payload)
+        self.latency.record("batch", (time.perf_counter() - started) * 1000)
+        return _batch_results(responses, len(calls))
+    
+    def read_resources(self, uris: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Read several resources at once, keyed by URI"""
+        return dict(zip(uris, self.batch([("resources/read", {"uri": uri}) for uri in uris])))
+    
+    def call_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Call several tools at once"""
+        return self.batch([("tools/call", {"name": name, "arguments": arguments}) for name, arguments in calls])
+    
+    def subscribe(self, patterns: List[str], callback) -> Subscription:
+        """Receive change events for URIs matching ``patterns`` straight from the server's bus"""
+        return self.server.events.subscribe(patterns, callback)
+    
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-operation latency histograms (ms) for this client"""
+        return self.latency.snapshot()
+    
+    def close(self):
+        pass
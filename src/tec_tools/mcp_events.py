@@ -0,0 +1,116 @@
+"""
+TEC MCP Events
+Resource change events: a per-server bus with URI-pattern subscriptions,
+replay by event id, and the SSE wire format used by subscription streams
+"""
+
+import fnmatch
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_UPDATED = "resources/updated"
+# Streams send a comment line this often so idle connections stay open
+HEARTBEAT_SECONDS = 15.0
+
+
+class Subscription:
+    """One subscriber's URI patterns (``fnmatch`` style, e.g. ``quest://*``)"""
+
+    def __init__(self, bus: "ResourceEventBus", patterns: Iterable[str], callback: Callable[[Dict[str, Any]], Any]):
+        self.bus = bus
+        self.patterns = list(patterns) or ["*"]
+        self.callback = callback
+        self.closed = False
+
+    def matches(self, uri: str) -> bool:
+        return any(fnmatch.fnmatchcase(uri, pattern) for pattern in self.patterns)
+
+    def close(self):
+        self.closed = True
+        self.bus._unsubscribe(self)
+
+
+class ResourceEventBus:
+    """
+    Fan-out of resource change events to matching subscribers.
+    Callbacks run in the publishing thread and must not block; recent
+    events are kept so reconnecting streams can resume after an event id.
+    """
+
+    def __init__(self, source: str, history: int = 256):
+        self.source = source
+        self._subscriptions: List[Subscription] = []
+        self._history: deque = deque(maxlen=history)
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def publish(self, uri: str, event_type: str = RESOURCE_UPDATED, **details) -> Dict[str, Any]:
+        with self._lock:
+            event = {
+                "id": self._next_id,
+                "type": event_type,
+                "uri": uri,
+                "server": self.source,
+                "timestamp": datetime.now().isoformat(),
+                **details
+            }
+            self._next_id += 1
+            self._history.append(event)
+            self.published += 1
+            subscribers = [subscription for subscription in self._subscriptions if subscription.matches(uri)]
+        for subscription in subscribers:
+            self._deliver(subscription, event)
+        return event
+
+    def subscribe(self, patterns: Iterable[str], callback: Callable[[Dict[str, Any]], Any],
+                  after: Optional[int] = None) -> Subscription:
+        """Register ``callback``; with ``after``, first replay retained events newer than that id"""
+        subscription = Subscription(self, patterns, callback)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            missed = [event for event in self._history
+                      if after is not None and event["id"] > after and subscription.matches(event["uri"])]
+        for event in missed:
+            self._deliver(subscription, event)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def _deliver(self, subscription: Subscription, event: Dict[str, Any]):
+        try:
+            subscription.callback(event)
+        except Exception as e:
+            logger.error(f"Resource event subscriber error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"subscribers": len(self._subscriptions), "published": self.published,
+                    "last_event_id": self._next_id - 1}
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Decode an SSE line stream into event payloads (comments and heartbeats are skipped)"""
+    data = []
+    for line in lines:
+        if line is None:
+            continue
+        if line == "":
+            if data:
+                yield json.loads("\n".join(data))
+                data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
@@ -22,6 +22,14 @@ class FinanceMCPServer(MCPServer):
     MCP Server for The Wealth Codex - Finance Tracker & Crypto Analysis
     """
     
+    # Market data only ages out; ledger-backed resources also drop on new transactions
+    resource_cache_policy = {
+        "finance://crypto/prices": {"ttl": 30},
+        "finance://analysis/market": {"ttl": 300},
+        "finance://portfolio/overview": {"ttl": 60, "keys": ("transactions",)},
+        "finance://transactions/recent": {"ttl": 60, "keys": ("transactions",)}
+    }
+    
     def __init__(self):
         super().__init__("wealth-codex-finance", "1.0.0")
         
@@ -566,6 +574,7 @@ class FinanceMCPServer(MCPServer):
             }
             
             # TODO: Save to database
+            self.invalidate_resources("transactions")
             
             return {
                 "type": "text",
@@ -9,11 +9,10 @@ and creative expansion.
 
 import json
 import os
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from datetime import timedelta
 from .mcp_base import MCPServer
-import firebase_admin
-from firebase_admin import credentials, firestore
+from .journal_store import JournalStore
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,18 +22,18 @@ class JournalMCPServer(MCPServer):
     MCP Server for The Mind-Forge - Journal and Generative Tools
     """
     
-    def __init__(self):
+    resource_cache_policy = {
+        "journal://entries/recent": {"ttl": 60, "keys": ("entries",)},
+        "journal://summaries/weekly": {"ttl": 3600, "keys": ("entries",)},
+        "journal://themes/all": {"ttl": 3600, "keys": ("entries",)}
+    }
+    
+    def __init__(self, db_path: Optional[str] = None, user_id: Optional[str] = None):
         super().__init__("mind-forge-journal", "1.0.0")
         
-        # Initialize Firebase (if not already initialized)
-        try:
-            if not firebase_admin._apps:
-                # Initialize with default credentials or service account
-                firebase_admin.initialize_app()
-            self.db = firestore.client()
-        except Exception as e:
-            logger.warning(f"Firebase initialization failed: {e}")
-            self.db = None
+        # Local journal backend; resources describe one writer, tools take a userId
+        self.user_id = user_id or os.getenv("JOURNAL_USER_ID", "default")
+        self.store = JournalStore(db_path or os.getenv("JOURNAL_DB", "data/journal.db"))
         
         # Define capabilities
         self.capabilities = {
@@ -217,61 +216,23 @@ class JournalMCPServer(MCPServer):
             }
     
     def _get_recent_entries(self, user_id: str = None, days: int = 7) -> Dict[str, Any]:
-        """Get recent journal entries"""
-        if not self.db:
-            return {
-                "uri": "journal://entries/recent",
-                "mimeType": "application/json",
-                "text": json.dumps({"error": "Database not available"})
-            }
-        
+        """Get journal entries from the last ``days`` days"""
         try:
-            # Calculate date range
-            end_date = datetime.now()
+            end_date = self.store.clock()
             start_date = end_date - timedelta(days=days)
-            
-            # Mock data if no user_id (for demonstration)
-            if not user_id:
-                mock_entries = [
-                    {
-                        "id": "entry_1",
-                        "title": "Morning Reflection",
-                        "content": "Started the day with meditation and goal setting...",
-                        "timestamp": datetime.now().isoformat(),
-                        "mood": "optimistic",
-                        "tags": ["morning", "meditation", "goals"]
-                    },
-                    {
-                        "id": "entry_2",
-                        "title": "Progress Update",
-                        "content": "Made significant progress on the TEC project today...",
-                        "timestamp": (datetime.now() - timedelta(hours=2)).isoformat(),
-                        "mood": "accomplished",
-                        "tags": ["progress", "tech", "creation"]
-                    }
-                ]
-                
-                return {
-                    "uri": "journal://entries/recent",
-                    "mimeType": "application/json",
-                    "text": json.dumps({
-                        "entries": mock_entries,
-                        "total": len(mock_entries),
-                        "date_range": {
-                            "start": start_date.isoformat(),
-                            "end": end_date.isoformat()
-                        }
-                    })
-                }
-            
-            # TODO: Implement real Firestore query
-            # entries_ref = self.db.collection('journal_entries').where('userId', '==', user_id)
-            # entries = entries_ref.where('timestamp', '>=', start_date).where('timestamp', '<=', end_date).get()
+            entries = self.store.recent_entries(user_id or self.user_id, since=start_date, until=end_date)
             
             return {
                 "uri": "journal://entries/recent",
                 "mimeType": "application/json",
-                "text": json.dumps({"entries": [], "total": 0})
+                "text": json.dumps({
+                    "entries": entries,
+                    "total": len(entries),
+                    "date_range": {
+                        "start": start_date.isoformat(),
+                        "end": end_date.isoformat()
+                    }
+                })
             }
             
         except Exception as e:
@@ -297,25 +258,12 @@ class JournalMCPServer(MCPServer):
                     "text": "Error: userId and content are required"
                 }
             
-            # Create entry data
-            entry_data = {
-                "userId": user_id,
-                "title": title,
-                "content": content,
-                "mood": mood,
-                "tags": tags,
-                "timestamp": datetime.now().isoformat(),
-                "created_at": datetime.now()
-            }
-            
-            # TODO: Save to Firestore
-            # if self.db:
-            #     doc_ref = self.db.collection('journal_entries').add(entry_data)
-            #     entry_data['id'] = doc_ref[1].id
+            entry = self.store.add_entry(user_id, content, title, mood, tags)
+            self.invalidate_resources("entries")
             
             return {
                 "type": "text",
-                "text": f"Journal entry created successfully: {title or 'Untitled'}"
+                "text": f"Journal entry created successfully: {title or 'Untitled'} (ID: {entry['id']})"
             }
             
         except Exception as e:
@@ -338,15 +286,25 @@ class JournalMCPServer(MCPServer):
                     "text": "Error: userId is required"
                 }
             
-            # Get entries for analysis
-            entries_data = self._get_recent_entries(user_id, days)
+            # Read the day-level aggregates rather than the entries themselves
+            today = self.store.clock().date()
+            start = (today - timedelta(days=max(1, days) - 1)).isoformat()
+            period = self.store.period_summary(user_id, start, today.isoformat())
+            if not period["entries"]:
+                return {
+                    "type": "text",
+                    "text": f"Analysis ({analysis_type}): No journal entries in the last {days} days"
+                }
             
-            # Mock analysis for demonstration
+            moods = ", ".join(f"{mood} ({count})" for mood, count in list(period["moods"].items())[:3]) or "not recorded"
+            themes = ", ".join(list(period["themes"])[:5]) or "none detected"
             analysis_results = {
-                "mood": "Overall mood trend shows improvement with occasional dips during technical challenges",
-                "themes": ["productivity", "creativity", "technical_progress", "personal_growth"],
-                "productivity": "High productivity levels with focus on TEC project development",
-                "general": "User demonstrates consistent engagement with journaling and self-reflection"
+                "mood": f"Mood trend is {period['mood_trend']}; most frequent moods: {moods}",
+                "themes": f"Recurring themes: {themes}",
+                "productivity": f"{period['entries']} entries and {period['words']} words in {days} days "
+                                f"({period['entries'] / days:.1f} entries per day)",
+                "general": f"{period['entries']} entries in {days} days, mood trend {period['mood_trend']}, "
+                           f"recurring themes: {themes}"
             }
             
             result = analysis_results.get(analysis_type, analysis_results["general"])
@@ -376,20 +334,14 @@ class JournalMCPServer(MCPServer):
                     "text": "Error: userId and query are required"
                 }
             
-            # Mock search results
-            search_results = [
-                {
-                    "id": "entry_1",
-                    "title": "TEC Progress",
-                    "content": f"Working on the TEC project... {query} mentioned here...",
-                    "timestamp": datetime.now().isoformat(),
-                    "relevance": 0.95
-                }
-            ]
+            search_results = self.store.search(user_id, query, limit)
+            lines = [f"Found {len(search_results)} entries matching '{query}'"]
+            lines.extend(f"- {result['title'] or 'Untitled'} ({result['timestamp'][:10]}): {result['snippet']}"
+                         for result in search_results)
             
             return {
                 "type": "text",
-                "text": f"Found {len(search_results)} entries matching '{query}'"
+                "text": "\n".join(lines)
             }
             
         except Exception as e:
@@ -401,38 +353,18 @@ class JournalMCPServer(MCPServer):
     
     def _get_weekly_summaries(self) -> Dict[str, Any]:
         """Get weekly journal summaries"""
-        mock_summaries = [
-            {
-                "week": "2025-01-06",
-                "summary": "Focused on TEC project development with significant progress on AI integration",
-                "themes": ["development", "progress", "innovation"],
-                "mood_trend": "positive"
-            }
-        ]
-        
         return {
             "uri": "journal://summaries/weekly",
             "mimeType": "application/json",
-            "text": json.dumps({"summaries": mock_summaries})
+            "text": json.dumps({"summaries": self.store.weekly_summaries(self.user_id)})
         }
     
     def _get_themes(self) -> Dict[str, Any]:
         """Get journal themes"""
-        mock_themes = {
-            "primary_themes": ["creativity", "technology", "personal_growth", "productivity"],
-            "emerging_themes": ["automated_sovereignty", "digital_rebellion", "ai_collaboration"],
-            "frequency": {
-                "creativity": 45,
-                "technology": 67,
-                "personal_growth": 32,
-                "productivity": 54
-            }
-        }
-        
         return {
             "uri": "journal://themes/all",
             "mimeType": "application/json",
-            "text": json.dumps(mock_themes)
+            "text": json.dumps(self.store.themes(self.user_id))
         }
     
     def _get_reflection_prompt(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
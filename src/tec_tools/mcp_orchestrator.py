@@ -9,18 +9,69 @@ for Daisy Purecode: Silicate Mother to access all TEC capabilities.
 import json
 import os
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
 from flask import Flask, request, jsonify
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
 import threading
 import time
-from .mcp_base import MCPClient
+from .mcp_base import ClientResourceCache, InProcessMCPClient, MCPClient
 from .mcp_journal import JournalMCPServer
 from .mcp_finance import FinanceMCPServer
 from .mcp_questlog import QuestLogMCPServer
+from .mcp_runtime import MCPRuntime, runtime_stats, wait_until_ready
 
 logger = logging.getLogger(__name__)
 
+# Resources Daisy reads per context type: server -> {context field: resource URI}
+DAISY_CONTEXT_PLANS = {
+    "full": {
+        "journal": {
+            "recent_entries": "journal://entries/recent",
+            "themes": "journal://themes/all"
+        },
+        "finance": {
+            "crypto_prices": "finance://crypto/prices",
+            "portfolio": "finance://portfolio/overview",
+            "market_analysis": "finance://analysis/market"
+        },
+        "questlog": {
+            "active_quests": "quest://quests/active",
+            "user_profile": "quest://profile/user",
+            "productivity_stats": "quest://stats/productivity"
+        }
+    },
+    "summary": {
+        "journal": {"themes": "journal://themes/all"},
+        "finance": {"portfolio": "finance://portfolio/overview"},
+        "questlog": {"user_profile": "quest://profile/user", "productivity_stats": "quest://stats/productivity"}
+    },
+    "recent": {
+        "journal": {"recent_entries": "journal://entries/recent"},
+        "finance": {"crypto_prices": "finance://crypto/prices"},
+        "questlog": {"active_quests": "quest://quests/active"}
+    }
+}
+
+DAISY_SERVER_FOCUS = {
+    "journal": "Personal insights, reflection patterns, creative ideas",
+    "finance": "Financial status, investment performance, market opportunities",
+    "questlog": "Current goals, productivity patterns, gamification progress"
+}
+
+# Seconds a single resource read may take before Daisy gets a partial context
+DEFAULT_RESOURCE_DEADLINE = 2.0
+RESOURCE_DEADLINES = {
+    "finance://crypto/prices": 3.0,
+    "finance://analysis/market": 3.0
+}
+
+# Materialized Daisy contexts are patched by resource change events; this
+# bounds staleness for resources that only age out (e.g. market prices)
+LIVE_CONTEXT_TTL = 30.0
+LIVE_CONTEXT_MAX_ENTRIES = 1024
+
 class MCPOrchestrator:
     """
     Central orchestrator for all MCP servers in the TEC ecosystem
@@ -30,7 +81,26 @@ class MCPOrchestrator:
         self.app = Flask(__name__)
         self.servers = {}
         self.clients = {}
-        self.server_threads = {}
+        self.runtimes = {}
+        # Seconds a server may take to pass its readiness probe / drain on shutdown
+        self.ready_timeout = 10.0
+        self.shutdown_timeout = 10.0
+        # Daisy context reads fan out across servers on this pool
+        self.context_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="daisy-context")
+        self.resource_deadlines = dict(RESOURCE_DEADLINES)
+        self.default_resource_deadline = DEFAULT_RESOURCE_DEADLINE
+        # Live Daisy contexts: (user_id, context_type) -> {"context", "built_at"}, LRU ordered
+        self.live_contexts = OrderedDict()
+        self.live_context_ttl = LIVE_CONTEXT_TTL
+        self.live_context_max_entries = LIVE_CONTEXT_MAX_ENTRIES
+        self.live_lock = threading.Lock()
+        self.live_stats = {"hits": 0, "misses": 0, "events": 0, "refreshes": 0, "stale_refreshes": 0}
+        self.subscriptions = {}
+        self._event_seq = 0
+        # (server, uri) -> event sequence of the refresh last applied to live contexts
+        self._applied_seq = {}
+        # Co-located servers are called directly; "http" forces localhost round-trips
+        self.transport = os.getenv("MCP_TRANSPORT", "inprocess")
         
         # Server configurations
         self.server_configs = {
@@ -75,7 +145,10 @@ class MCPOrchestrator:
                     "name": name,
                     "port": config["port"],
                     "url": config["url"],
-                    "status": "running" if name in self.servers else "stopped"
+                    "status": "running" if name in self.servers or name in self.clients else "stopped",
+                    "transport": self.clients[name].transport if name in self.clients else None,
+                    "runtime": runtime_stats(self.runtimes).get(name),
+                    "resource_cache": self._resource_cache_stats(self.clients.get(name))
                 }
             
             return jsonify({
@@ -83,6 +156,14 @@ class MCPOrchestrator:
                 "total": len(server_info)
             })
         
+        @self.app.route('/mcp/metrics/latency', methods=['GET'])
+        def latency_metrics():
+            """Per-server, per-operation client latency histograms"""
+            return jsonify({
+                "latency": {name: client.latency_stats() for name, client in self.clients.items()},
+                "timestamp": datetime.now().isoformat()
+            })
+        
         @self.app.route('/mcp/unified/resources', methods=['POST'])
         def unified_resources():
             """Get resources from all servers"""
@@ -159,12 +240,16 @@ class MCPOrchestrator:
             data = request.get_json()
             user_id = data.get('userId')
             context_type = data.get('contextType', 'full')  # 'full', 'summary', 'recent'
+            deadline_ms = data.get('deadlineMs')
             
             if not user_id:
                 return jsonify({"error": "userId required"}), 400
+            if context_type not in DAISY_CONTEXT_PLANS:
+                return jsonify({"error": f"Unknown contextType: {context_type}"}), 400
             
             try:
-                context = self._gather_daisy_context(user_id, context_type)
+                deadline = float(deadline_ms) / 1000 if deadline_ms else None
+                context = self.get_daisy_context(user_id, context_type, deadline=deadline)
                 return jsonify({
                     "context": context,
                     "timestamp": datetime.now().isoformat(),
@@ -175,6 +260,17 @@ class MCPOrchestrator:
                 logger.error(f"Error gathering Daisy context: {e}")
                 return jsonify({"error": str(e)}), 500
     
+        @self.app.route('/mcp/daisy/live', methods=['GET'])
+        def daisy_live():
+            """Live materialized context stats"""
+            with self.live_lock:
+                stats = dict(self.live_stats, contexts=len(self.live_contexts))
+            return jsonify({
+                "live": stats,
+                "subscribed": sorted(self.subscriptions),
+                "timestamp": datetime.now().isoformat()
+            })
+    
     def start_all_servers(self):
         """Start all MCP servers"""
         logger.info("Starting all MCP servers...")
@@ -185,25 +281,21 @@ class MCPOrchestrator:
                 server = config["class"]()
                 self.servers[name] = server
                 
-                # Start server in separate thread
-                def run_server(srv, port):
-                    srv.run(host='0.0.0.0', port=port, debug=False)
-                
-                thread = threading.Thread(
-                    target=run_server,
-                    args=(server, config["port"]),
-                    daemon=True
-                )
-                thread.start()
-                self.server_threads[name] = thread
+                # Serve on the async runtime; start_in_thread returns once the port is bound
+                runtime = MCPRuntime(server, host='0.0.0.0', port=config["port"],
+                                     shutdown_timeout=self.shutdown_timeout)
+                runtime.start_in_thread()
+                self.runtimes[name] = runtime
                 
                 logger.info(f"Started MCP server: {name} on port {config['port']}")
                 
-                # Wait a moment for server to start
-                time.sleep(1)
-                
-                # Create client connection
-                client = MCPClient(config["url"])
+                # The HTTP endpoint stays up for external clients either way
+                if config.get("transport", self.transport) == "inprocess":
+                    client = InProcessMCPClient(server)
+                else:
+                    if not wait_until_ready(runtime.url, timeout=self.ready_timeout):
+                        raise RuntimeError(f"{name} failed its readiness probe at {runtime.url}")
+                    client = MCPClient(runtime.url, resource_cache=ClientResourceCache())
                 self.clients[name] = client
                 
                 # Initialize client connection
@@ -212,87 +304,224 @@ class MCPOrchestrator:
                     "version": "1.0.0"
                 })
                 
-                logger.info(f"Connected to MCP server: {name}")
+                self.watch_server(name, client)
+                logger.info(f"Connected to MCP server: {name} ({client.transport})")
                 
             except Exception as e:
                 logger.error(f"Error starting server {name}: {e}")
         
         logger.info("All MCP servers started successfully")
     
+    def connect_remote_server(self, name: str, url: str) -> Dict[str, Any]:
+        """Attach an MCP server running elsewhere; it is always reached over HTTP"""
+        if not wait_until_ready(url, timeout=self.ready_timeout):
+            raise RuntimeError(f"MCP server {name} at {url} is not ready")
+        client = MCPClient(url, resource_cache=ClientResourceCache())
+        info = client.initialize({
+            "name": "TEC-MCP-Orchestrator",
+            "version": "1.0.0"
+        })
+        self.clients[name] = client
+        self.watch_server(name, client)
+        logger.info(f"Connected to remote MCP server: {name} at {url}")
+        return info
+    
+    def _resource_cache_stats(self, client) -> Optional[Dict[str, Any]]:
+        """Client-side cache stats over HTTP, the server's own cache in-process"""
+        if client is None:
+            return None
+        if client.resource_cache is not None:
+            return client.resource_cache.stats()
+        server = getattr(client, "server", None)
+        return server.resource_cache.stats() if server else None
+    
     def stop_all_servers(self):
-        """Stop all MCP servers"""
+        """Stop all MCP servers, letting in-flight requests finish first"""
         logger.info("Stopping all MCP servers...")
         
+        for subscription in self.subscriptions.values():
+            subscription.close()
+        self.subscriptions.clear()
+        with self.live_lock:
+            self.live_contexts.clear()
+        
         # Close client connections
         for name, client in self.clients.items():
             try:
-                # Client cleanup if needed
-                pass
+                client.close()
             except Exception as e:
                 logger.error(f"Error stopping client {name}: {e}")
         
+        # Fail readiness, stop accepting and drain each server in parallel
+        threads = [threading.Thread(target=runtime.stop_thread, args=(self.shutdown_timeout,))
+                   for runtime in self.runtimes.values()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
         self.clients.clear()
         self.servers.clear()
-        self.server_threads.clear()
+        self.runtimes.clear()
         
         logger.info("All MCP servers stopped")
     
-    def _gather_daisy_context(self, user_id: str, context_type: str) -> Dict[str, Any]:
+    def watch_server(self, name: str, client) -> bool:
+        """Subscribe to change events for every resource Daisy reads from ``name``"""
+        uris = sorted({uri for plan in DAISY_CONTEXT_PLANS.values() for uri in plan.get(name, {}).values()})
+        if not uris:
+            return False
+        try:
+            self.subscriptions[name] = client.subscribe(uris, lambda event: self._on_resource_event(name, event))
+            return True
+        except Exception as e:
+            logger.warning(f"Live context disabled for {name}: {e}")
+            return False
+    
+    def _is_live(self, context_type: str) -> bool:
+        plan = DAISY_CONTEXT_PLANS[context_type]
+        names = [name for name in self.clients if name in plan]
+        return bool(names) and all(name in self.subscriptions for name in names)
+    
+    def get_daisy_context(self, user_id: str, context_type: str,
+                          deadline: Optional[float] = None) -> Dict[str, Any]:
         """
-        Gather comprehensive context from all MCP servers for Daisy Purecode
+        Daisy context, served from the live materialized copy when every
+        server involved is subscribed. Complete contexts are stored after a
+        gather and patched in place by change events; partial ones are not.
         """
+        if not self._is_live(context_type):
+            return self._gather_daisy_context(user_id, context_type, deadline=deadline)
+        
+        key = (user_id, context_type)
+        with self.live_lock:
+            entry = self.live_contexts.get(key)
+            if entry and time.monotonic() - entry["built_at"] < self.live_context_ttl:
+                self.live_contexts.move_to_end(key)
+                self.live_stats["hits"] += 1
+                return entry["context"]
+            self.live_stats["misses"] += 1
+            seq = self._event_seq
+        
+        context = self._gather_daisy_context(user_id, context_type, deadline=deadline)
+        complete = not any("partial" in server for server in context["servers"].values())
+        with self.live_lock:
+            # An event that landed mid-gather may not be reflected; rebuild next time instead
+            if complete and seq == self._event_seq:
+                self.live_contexts[key] = {"context": context, "built_at": time.monotonic()}
+                self.live_contexts.move_to_end(key)
+                while len(self.live_contexts) > self.live_context_max_entries:
+                    self.live_contexts.popitem(last=False)
+        return context
+    
+    def _on_resource_event(self, name: str, event: Dict[str, Any]):
+        uri = event.get("uri")
+        with self.live_lock:
+            self._event_seq += 1
+            seq = self._event_seq
+            self.live_stats["events"] += 1
+            affected = any(uri in DAISY_CONTEXT_PLANS[context_type].get(name, {}).values()
+                           for _, context_type in self.live_contexts)
+        if affected:
+            # Resources are shared across users, so one read patches every context using it
+            self.context_executor.submit(self._refresh_resource, name, uri, seq)
+    
+    def _refresh_resource(self, name: str, uri: str, seq: int = 0):
+        """Re-read ``uri`` for the event numbered ``seq`` and patch the live contexts using it"""
+        client = self.clients.get(name)
+        try:
+            result = client.read_resource(uri, timeout=self.resource_deadlines.get(uri, self.default_resource_deadline))
+        except Exception as e:
+            logger.error(f"Error refreshing {uri} for live context: {e}")
+            result = None
+        
+        with self.live_lock:
+            # A read for a later event already landed; this one may predate that mutation
+            if seq < self._applied_seq.get((name, uri), 0):
+                self.live_stats["stale_refreshes"] += 1
+                return
+            self._applied_seq[(name, uri)] = seq
+            for key, entry in list(self.live_contexts.items()):
+                fields = [field for field, planned in DAISY_CONTEXT_PLANS[key[1]].get(name, {}).items() if planned == uri]
+                if not fields:
+                    continue
+                if result is None:
+                    del self.live_contexts[key]
+                    continue
+                # Copy-on-write so contexts already handed to readers never change
+                context = dict(entry["context"], servers=dict(entry["context"]["servers"]))
+                context["servers"][name] = dict(context["servers"][name], **{field: result for field in fields})
+                entry["context"] = context
+                self.live_stats["refreshes"] += 1
+    
+    def _gather_daisy_context(self, user_id: str, context_type: str,
+                              deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Gather context from all MCP servers for Daisy Purecode.
+        
+        Every resource in the context type's plan is read concurrently, each
+        bounded by its own deadline (or ``deadline`` for all of them). Reads
+        that fail or miss their deadline are left out and the server is
+        marked ``partial``; per-server latency is reported alongside.
+        """
+        started = time.perf_counter()
         context = {
             "user_id": user_id,
             "context_type": context_type,
             "timestamp": datetime.now().isoformat(),
-            "servers": {}
+            "servers": {},
+            "latency_ms": {}
         }
+        plan = DAISY_CONTEXT_PLANS.get(context_type, DAISY_CONTEXT_PLANS["full"])
+        
+        def timed_read(client, uri, timeout):
+            read_started = time.perf_counter()
+            result = client.read_resource(uri, timeout=timeout)
+            return result, (time.perf_counter() - read_started) * 1000
         
-        # Gather context from each server
+        reads = {}
         for name, client in self.clients.items():
-            try:
-                server_context = {}
-                
-                if name == "journal":
-                    # Get journal context
-                    recent_entries = client.read_resource("journal://entries/recent")
-                    themes = client.read_resource("journal://themes/all")
-                    server_context = {
-                        "recent_entries": recent_entries,
-                        "themes": themes,
-                        "focus": "Personal insights, reflection patterns, creative ideas"
-                    }
-                
-                elif name == "finance":
-                    # Get finance context
-                    crypto_prices = client.read_resource("finance://crypto/prices")
-                    portfolio = client.read_resource("finance://portfolio/overview")
-                    market_analysis = client.read_resource("finance://analysis/market")
-                    server_context = {
-                        "crypto_prices": crypto_prices,
-                        "portfolio": portfolio,
-                        "market_analysis": market_analysis,
-                        "focus": "Financial status, investment performance, market opportunities"
-                    }
-                
-                elif name == "questlog":
-                    # Get quest log context
-                    active_quests = client.read_resource("quest://quests/active")
-                    user_profile = client.read_resource("quest://profile/user")
-                    productivity_stats = client.read_resource("quest://stats/productivity")
-                    server_context = {
-                        "active_quests": active_quests,
-                        "user_profile": user_profile,
-                        "productivity_stats": productivity_stats,
-                        "focus": "Current goals, productivity patterns, gamification progress"
-                    }
-                
-                context["servers"][name] = server_context
-                
-            except Exception as e:
-                logger.error(f"Error gathering context from {name}: {e}")
-                context["servers"][name] = {"error": str(e)}
+            for field, uri in plan.get(name, {}).items():
+                timeout = deadline or self.resource_deadlines.get(uri, self.default_resource_deadline)
+                future = self.context_executor.submit(timed_read, client, uri, timeout)
+                reads[future] = (name, field, uri, started + timeout)
+        
+        # Wait for each read only until its own deadline, longest last
+        for future, (name, field, uri, expires_at) in sorted(reads.items(), key=lambda item: item[1][3]):
+            wait([future], timeout=max(0.0, expires_at - time.perf_counter()))
+        
+        for name in self.clients:
+            if name not in plan:
+                continue
+            server_context = {}
+            missing = {}
+            latencies = []
+            for future, (server, field, uri, expires_at) in reads.items():
+                if server != name:
+                    continue
+                if not future.done():
+                    missing[field] = "deadline exceeded"
+                    latencies.append((expires_at - started) * 1000)
+                    continue
+                try:
+                    result, latency = future.result()
+                    server_context[field] = result
+                    latencies.append(latency)
+                except Exception as e:
+                    logger.error(f"Error reading {uri} for Daisy context: {e}")
+                    missing[field] = str(e)
+                    latencies.append((time.perf_counter() - started) * 1000)
+            
+            server_context["focus"] = DAISY_SERVER_FOCUS.get(name, "")
+            if missing:
+                server_context["partial"] = True
+                server_context["missing"] = missing
+            if missing and len(missing) == len(plan[name]):
+                server_context["error"] = "; ".join(f"{field}: {reason}" for field, reason in missing.items())
+            context["servers"][name] = server_context
+            context["latency_ms"][name] = round(max(latencies), 1) if latencies else 0.0
         
+        context["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
         return context
     
     def run(self, host: str = '0.0.0.0', port: int = 5000, debug: bool = False):
@@ -302,9 +531,12 @@ class MCPOrchestrator:
         # Start all MCP servers first
         self.start_all_servers()
         
-        # Start orchestrator
+        # Start orchestrator (Flask's dev server only in debug mode)
         try:
-            self.app.run(host=host, port=port, debug=debug)
+            if debug:
+                self.app.run(host=host, port=port, debug=debug)
+            else:
+                MCPRuntime(self.app, host=host, port=port, shutdown_timeout=self.shutdown_timeout).run()
         finally:
             self.stop_all_servers()
 
@@ -313,7 +545,7 @@ def main():
     """Main entry point for MCP Orchestrator"""
     logging.basicConfig(level=logging.INFO)
     orchestrator = MCPOrchestrator()
-    orchestrator.run(debug=True)
+    orchestrator.run()
 
 
 if __name__ == "__main__":
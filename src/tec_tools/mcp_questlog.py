@@ -12,18 +12,37 @@ import os
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from .mcp_base import MCPServer
+from .quest_store import QuestStore
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Days of completed quests shown in quest://history/completed
+HISTORY_DAYS = 7
+BIOME_DESCRIPTIONS = {
+    "Digital Codex Plains": "A vast expanse of flowing data streams and crystalline code structures"
+}
+
 class QuestLogMCPServer(MCPServer):
     """
     MCP Server for The Quest Log - PomRpgdoro & Productivity
     """
     
-    def __init__(self):
+    resource_cache_policy = {
+        "quest://quests/active": {"ttl": 30, "keys": ("quests",)},
+        "quest://profile/user": {"ttl": 60, "keys": ("quests", "profile")},
+        "quest://history/completed": {"ttl": 300, "keys": ("quests",)},
+        "quest://stats/productivity": {"ttl": 300, "keys": ("quests", "pomodoro")},
+        "quest://pomodoro/sessions": {"ttl": 60, "keys": ("pomodoro",)}
+    }
+    
+    def __init__(self, db_path: Optional[str] = None, user_id: Optional[str] = None):
         super().__init__("quest-log-productivity", "1.0.0")
         
+        # Resources describe one player; tools write for whichever userId they are given
+        self.user_id = user_id or os.getenv("QUEST_LOG_USER_ID", "default")
+        self.store = QuestStore(db_path or os.getenv("QUEST_LOG_DB", "data/quest_log.db"))
+        
         # Define capabilities
         self.capabilities = {
             "resources": {
@@ -282,61 +301,17 @@ class QuestLogMCPServer(MCPServer):
             }
     
     def _get_active_quests(self) -> Dict[str, Any]:
-        """Get active quests"""
+        """Get active quests, soonest due first"""
         try:
-            # Mock active quests
-            mock_quests = [
-                {
-                    "id": "quest_1",
-                    "title": "Implement MCP Server Architecture",
-                    "description": "Create comprehensive MCP server system for TEC: BITLYFE",
-                    "difficulty": "hard",
-                    "xp_reward": 150,
-                    "health_reward": 25,
-                    "category": "development",
-                    "estimated_time": 180,
-                    "progress": 75,
-                    "status": "in_progress",
-                    "created_at": datetime.now().isoformat(),
-                    "due_date": (datetime.now() + timedelta(days=2)).isoformat()
-                },
-                {
-                    "id": "quest_2",
-                    "title": "Daily Meditation",
-                    "description": "Complete 20-minute meditation session",
-                    "difficulty": "easy",
-                    "xp_reward": 25,
-                    "health_reward": 10,
-                    "category": "wellness",
-                    "estimated_time": 20,
-                    "progress": 0,
-                    "status": "pending",
-                    "created_at": datetime.now().isoformat(),
-                    "due_date": (datetime.now() + timedelta(hours=8)).isoformat()
-                },
-                {
-                    "id": "quest_3",
-                    "title": "Write Journal Entry",
-                    "description": "Reflect on today's progress and insights",
-                    "difficulty": "medium",
-                    "xp_reward": 50,
-                    "health_reward": 15,
-                    "category": "reflection",
-                    "estimated_time": 30,
-                    "progress": 0,
-                    "status": "pending",
-                    "created_at": datetime.now().isoformat(),
-                    "due_date": (datetime.now() + timedelta(hours=12)).isoformat()
-                }
-            ]
+            quests = self.store.active_quests(self.user_id)
             
             return {
                 "uri": "quest://quests/active",
                 "mimeType": "application/json",
                 "text": json.dumps({
-                    "quests": mock_quests,
-                    "total_active": len(mock_quests),
-                    "total_xp_available": sum(q["xp_reward"] for q in mock_quests),
+                    "quests": quests,
+                    "total_active": len(quests),
+                    "total_xp_available": sum(q["xp_reward"] for q in quests),
                     "last_updated": datetime.now().isoformat()
                 })
             }
@@ -352,55 +327,15 @@ class QuestLogMCPServer(MCPServer):
     def _get_user_profile(self) -> Dict[str, Any]:
         """Get user's RPG profile"""
         try:
-            # Mock user profile
-            mock_profile = {
-                "level": 42,
-                "xp": 8750,
-                "xp_to_next_level": 1250,
-                "health": 95,
-                "max_health": 100,
-                "current_biome": "Digital Codex Plains",
-                "biome_description": "A vast expanse of flowing data streams and crystalline code structures",
-                "stats": {
-                    "strength": 78,
-                    "intelligence": 92,
-                    "creativity": 85,
-                    "focus": 73,
-                    "resilience": 81
-                },
-                "achievements": [
-                    {
-                        "id": "code_warrior",
-                        "title": "Code Warrior",
-                        "description": "Complete 100 development quests",
-                        "earned_at": "2025-01-01T00:00:00Z",
-                        "rarity": "rare"
-                    },
-                    {
-                        "id": "meditation_master",
-                        "title": "Meditation Master",
-                        "description": "Maintain 30-day meditation streak",
-                        "earned_at": "2025-01-10T00:00:00Z",
-                        "rarity": "epic"
-                    }
-                ],
-                "active_buffs": [
-                    {
-                        "name": "Flow State",
-                        "description": "+20% productivity for development tasks",
-                        "expires_at": (datetime.now() + timedelta(hours=2)).isoformat()
-                    }
-                ],
-                "total_quests_completed": 847,
-                "total_xp_earned": 35420,
-                "join_date": "2024-06-15T00:00:00Z",
-                "last_active": datetime.now().isoformat()
-            }
+            profile = self.store.profile(self.user_id)
+            profile["biome_description"] = BIOME_DESCRIPTIONS.get(profile["current_biome"], "")
+            profile["achievements"] = []
+            profile["active_buffs"] = []
             
             return {
                 "uri": "quest://profile/user",
                 "mimeType": "application/json",
-                "text": json.dumps(mock_profile)
+                "text": json.dumps(profile)
             }
             
         except Exception as e:
@@ -412,42 +347,21 @@ class QuestLogMCPServer(MCPServer):
             }
     
     def _get_quest_history(self) -> Dict[str, Any]:
-        """Get quest completion history"""
+        """Get quest completion history for the last HISTORY_DAYS days"""
         try:
-            # Mock quest history
-            mock_history = [
-                {
-                    "id": "quest_completed_1",
-                    "title": "Setup Development Environment",
-                    "difficulty": "medium",
-                    "xp_earned": 75,
-                    "health_earned": 20,
-                    "category": "development",
-                    "completed_at": (datetime.now() - timedelta(hours=2)).isoformat(),
-                    "completion_time": 45,
-                    "notes": "Successfully configured VS Code with extensions"
-                },
-                {
-                    "id": "quest_completed_2",
-                    "title": "Morning Workout",
-                    "difficulty": "easy",
-                    "xp_earned": 30,
-                    "health_earned": 15,
-                    "category": "fitness",
-                    "completed_at": (datetime.now() - timedelta(hours=6)).isoformat(),
-                    "completion_time": 30,
-                    "notes": "Great energy boost for the day"
-                }
-            ]
+            now = self.store.clock()
+            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            history = self.store.quest_history(self.user_id, since=today - timedelta(days=HISTORY_DAYS - 1))
+            completed_today = [q for q in history if q["completed_at"] >= today.isoformat()]
             
             return {
                 "uri": "quest://history/completed",
                 "mimeType": "application/json",
                 "text": json.dumps({
-                    "completed_quests": mock_history,
-                    "total_completed_today": len(mock_history),
-                    "xp_earned_today": sum(q["xp_earned"] for q in mock_history),
-                    "health_earned_today": sum(q["health_earned"] for q in mock_history)
+                    "completed_quests": history,
+                    "total_completed_today": len(completed_today),
+                    "xp_earned_today": sum(q["xp_earned"] for q in completed_today),
+                    "health_earned_today": sum(q["health_earned"] for q in completed_today)
                 })
             }
             
@@ -460,41 +374,12 @@ class QuestLogMCPServer(MCPServer):
             }
     
     def _get_productivity_stats(self) -> Dict[str, Any]:
-        """Get productivity statistics"""
+        """Get productivity statistics from the store's running aggregates"""
         try:
-            # Mock productivity stats
-            mock_stats = {
-                "today": {
-                    "quests_completed": 2,
-                    "xp_earned": 105,
-                    "focus_time": 180,
-                    "pomodoro_sessions": 7,
-                    "productivity_score": 85
-                },
-                "this_week": {
-                    "quests_completed": 18,
-                    "xp_earned": 950,
-                    "focus_time": 1420,
-                    "pomodoro_sessions": 48,
-                    "productivity_score": 78
-                },
-                "trends": {
-                    "completion_rate": 82,
-                    "average_session_length": 28.5,
-                    "peak_productivity_hours": [9, 14, 20],
-                    "most_productive_category": "development"
-                },
-                "insights": [
-                    "Your productivity peaks at 9 AM - schedule challenging tasks then",
-                    "Development quests have highest completion rate (92%)",
-                    "Average focus session increased by 15% this week"
-                ]
-            }
-            
             return {
                 "uri": "quest://stats/productivity",
                 "mimeType": "application/json",
-                "text": json.dumps(mock_stats)
+                "text": json.dumps(self.store.productivity_stats(self.user_id))
             }
             
         except Exception as e:
@@ -506,40 +391,20 @@ class QuestLogMCPServer(MCPServer):
             }
     
     def _get_pomodoro_sessions(self) -> Dict[str, Any]:
-        """Get Pomodoro session data"""
+        """Get today's Pomodoro sessions"""
         try:
-            # Mock Pomodoro sessions
-            mock_sessions = [
-                {
-                    "id": "session_1",
-                    "quest_id": "quest_1",
-                    "duration": 25,
-                    "session_type": "work",
-                    "started_at": (datetime.now() - timedelta(hours=1)).isoformat(),
-                    "completed_at": (datetime.now() - timedelta(minutes=35)).isoformat(),
-                    "status": "completed",
-                    "notes": "Good focus on MCP implementation"
-                },
-                {
-                    "id": "session_2",
-                    "quest_id": "quest_1",
-                    "duration": 5,
-                    "session_type": "break",
-                    "started_at": (datetime.now() - timedelta(minutes=35)).isoformat(),
-                    "completed_at": (datetime.now() - timedelta(minutes=30)).isoformat(),
-                    "status": "completed",
-                    "notes": "Short break, stayed focused"
-                }
-            ]
+            today = self.store.clock().replace(hour=0, minute=0, second=0, microsecond=0)
+            sessions = self.store.pomodoro_sessions(self.user_id, since=today)
+            finished = [s for s in sessions if s["status"] == "completed"]
             
             return {
                 "uri": "quest://pomodoro/sessions",
                 "mimeType": "application/json",
                 "text": json.dumps({
-                    "sessions": mock_sessions,
-                    "total_sessions_today": len(mock_sessions),
-                    "total_focus_time": sum(s["duration"] for s in mock_sessions if s["session_type"] == "work"),
-                    "completion_rate": 100
+                    "sessions": sessions,
+                    "total_sessions_today": len(sessions),
+                    "total_focus_time": sum(s["duration"] for s in sessions if s["session_type"] == "work"),
+                    "completion_rate": round(100 * len(finished) / len(sessions)) if sessions else 0
                 })
             }
             
@@ -570,28 +435,13 @@ class QuestLogMCPServer(MCPServer):
                     "text": "Error: userId, title, and description are required"
                 }
             
-            # Create quest
-            quest = {
-                "id": f"quest_{datetime.now().timestamp()}",
-                "userId": user_id,
-                "title": title,
-                "description": description,
-                "difficulty": difficulty,
-                "xp_reward": xp_reward,
-                "health_reward": health_reward,
-                "category": category,
-                "estimated_time": estimated_time,
-                "due_date": due_date,
-                "progress": 0,
-                "status": "pending",
-                "created_at": datetime.now().isoformat()
-            }
-            
-            # TODO: Save to database
+            quest = self.store.create_quest(user_id, title, description, difficulty, xp_reward,
+                                            health_reward, category, estimated_time, due_date)
+            self.invalidate_resources("quests")
             
             return {
                 "type": "text",
-                "text": f"Quest created: '{title}' (Difficulty: {difficulty}, XP: {xp_reward}, Health: {health_reward})"
+                "text": f"Quest created: '{title}' (Difficulty: {difficulty}, XP: {xp_reward}, Health: {health_reward}, ID: {quest['id']})"
             }
             
         except Exception as e:
@@ -614,18 +464,18 @@ class QuestLogMCPServer(MCPServer):
                     "text": "Error: userId and questId are required"
                 }
             
-            # Mock quest completion
-            quest_rewards = {
-                "xp": 75,
-                "health": 20,
-                "achievement": None
-            }
-            
-            # TODO: Update database, calculate rewards, check for level up
+            completed = self.store.complete_quest(user_id, quest_id, completion_notes)
+            if completed is None:
+                return {
+                    "type": "text",
+                    "text": f"Error: no open quest {quest_id} for {user_id}"
+                }
+            self.invalidate_resources("quests", "profile")
             
+            level_up = f" 🎉 LEVEL UP! You are now level {completed['level']}!" if completed["leveled_up"] else ""
             return {
                 "type": "text",
-                "text": f"Quest completed! Earned {quest_rewards['xp']} XP and {quest_rewards['health']} Health. Notes: {completion_notes}"
+                "text": f"Quest completed! Earned {completed['xp_earned']} XP and {completed['health_earned']} Health.{level_up} Notes: {completion_notes}"
             }
             
         except Exception as e:
@@ -712,18 +562,8 @@ class QuestLogMCPServer(MCPServer):
                     "text": "Error: userId is required"
                 }
             
-            # Create Pomodoro session
-            session = {
-                "id": f"session_{datetime.now().timestamp()}",
-                "userId": user_id,
-                "questId": quest_id,
-                "duration": duration,
-                "session_type": session_type,
-                "started_at": datetime.now().isoformat(),
-                "status": "active"
-            }
-            
-            # TODO: Save to database, start timer
+            self.store.start_pomodoro(user_id, quest_id, duration, session_type)
+            self.invalidate_resources("pomodoro")
             
             return {
                 "type": "text",
@@ -748,23 +588,13 @@ class QuestLogMCPServer(MCPServer):
                     "text": "Error: userId is required"
                 }
             
-            # Mock level up check
-            current_level = 42
-            current_xp = 8750
-            xp_for_next_level = 10000
-            
-            if current_xp >= xp_for_next_level:
-                new_level = current_level + 1
-                return {
-                    "type": "text",
-                    "text": f"🎉 LEVEL UP! You are now level {new_level}! New biome unlocked: Quantum Resonance Chamber!"
-                }
-            else:
-                xp_needed = xp_for_next_level - current_xp
-                return {
-                    "type": "text",
-                    "text": f"Current level: {current_level}. Need {xp_needed} more XP to reach level {current_level + 1}."
-                }
+            # Levels follow total XP, so completing a quest already applied any level up
+            profile = self.store.profile(user_id)
+            current_level = profile["level"]
+            return {
+                "type": "text",
+                "text": f"Current level: {current_level}. Need {profile['xp_to_next_level']} more XP to reach level {current_level + 1}."
+            }
             
         except Exception as e:
             logger.error(f"Error checking level up: {e}")
@@ -0,0 +1,324 @@
+"""
+TEC MCP Runtime
+Async (aiohttp) runtime for MCP servers and the orchestrator, with a
+readiness probe and graceful, draining shutdown
+"""
+
+import asyncio
+import functools
+import io
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from aiohttp import web
+from multidict import CIMultiDict
+
+from .chat_streaming import SSE_HEADERS, SSE_MIMETYPE
+from .mcp_base import JSONRPC_INVALID_REQUEST, MAX_BATCH_SIZE, MCPServer
+from .mcp_events import HEARTBEAT_SECONDS, format_event
+
+logger = logging.getLogger(__name__)
+
+_dumps = functools.partial(json.dumps, default=str)
+# Hop-by-hop headers aiohttp manages itself
+_SKIPPED_WSGI_HEADERS = {"content-length", "connection", "transfer-encoding", "keep-alive"}
+
+
+async def _json_body(request: web.Request) -> Any:
+    body = await request.read()
+    if not body:
+        return {}
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+class MCPRuntime:
+    """
+    Serves an MCPServer (natively, same routes and payloads as its Flask app)
+    or any WSGI app such as the orchestrator's Flask app.
+
+    Handlers run the synchronous server code on a bounded thread pool, so a
+    slow resource never blocks the event loop. ``GET /ready`` answers 200 only
+    once the listener is bound and until shutdown starts; ``stop`` stops
+    accepting connections, lets in-flight requests finish, then closes.
+    """
+
+    def __init__(self, target: Any, host: str = "127.0.0.1", port: int = 0,
+                 workers: int = 32, shutdown_timeout: float = 10.0):
+        self.target = target
+        self.host = host
+        self.port = port
+        self.shutdown_timeout = shutdown_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-runtime")
+        self.name = target.server_name if isinstance(target, MCPServer) else getattr(target, "name", "wsgi")
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self.url = ""
+        # Queues of open subscription streams, closed first on shutdown
+        self._streams = set()
+        self._runner: Optional[web.AppRunner] = None
+        self._site: Optional[web.TCPSite] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._track_requests], client_max_size=8 * 1024 * 1024)
+        app.router.add_get("/ready", self._ready)
+        if isinstance(self.target, MCPServer):
+            self._add_mcp_routes(app)
+        else:
+            app.router.add_route("*", "/{path:.*}", self._wsgi)
+        return app
+
+    def _add_mcp_routes(self, app: web.Application):
+        rpc_routes = {
+            "/mcp/initialize": "initialize",
+            "/mcp/resources/list": "resources/list",
+            "/mcp/tools/list": "tools/list",
+            "/mcp/tools/call": "tools/call",
+            "/mcp/prompts/list": "prompts/list",
+            "/mcp/prompts/get": "prompts/get"
+        }
+        for path, method in rpc_routes.items():
+            app.router.add_post(path, functools.partial(self._rpc, method))
+        app.router.add_post("/mcp/resources/read", self._read_resource)
+        app.router.add_post("/mcp/batch", self._batch)
+        app.router.add_get("/mcp/resources/subscribe", self._subscribe)
+        app.router.add_get("/health", self._health)
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    @web.middleware
+    async def _track_requests(self, request: web.Request, handler):
+        if self.draining and request.path != "/ready":
+            return web.json_response({"error": "Server shutting down"}, status=503, headers={"Connection": "close"})
+        self.in_flight += 1
+        try:
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    async def _ready(self, request: web.Request) -> web.Response:
+        status = "ready" if self.ready else ("draining" if self.draining else "starting")
+        return web.json_response({"status": status, "server": self.name, "in_flight": self.in_flight},
+                                 status=200 if self.ready else 503)
+
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "status": "healthy",
+            "server": self.target.server_name,
+            "version": self.target.version,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    async def _rpc(self, method: str, request: web.Request) -> web.Response:
+        params = await _json_body(request)
+        try:
+            result = await self._run(self.target.handle_rpc, method, params or {})
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        except Exception as e:
+            logger.error(f"{method} error: {e}")
+            return web.json_response({"error": str(e)}, status=500)
+        return web.json_response(result, dumps=_dumps)
+
+    async def _read_resource(self, request: web.Request) -> web.Response:
+        params = await _json_body(request) or {}
+        if not params.get("uri"):
+            return web.json_response({"error": "Resource URI required"}, status=400)
+        try:
+            resource_data, etag, max_age = await self._run(self.target.read_resource_entry, params["uri"])
+        except Exception as e:
+            logger.error(f"Resource read error: {e}")
+            return web.json_response({"error": str(e)}, status=500)
+        headers = {"ETag": etag, "Cache-Control": f"max-age={max_age}" if max_age else "no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers=headers)
+        return web.json_response({"contents": [resource_data]}, headers=headers, dumps=_dumps)
+
+    async def _batch(self, request: web.Request) -> web.Response:
+        payload = await _json_body(request)
+        single = isinstance(payload, dict) and bool(payload)
+        calls = [payload] if single else payload
+        if not isinstance(calls, list) or not calls or len(calls) > MAX_BATCH_SIZE:
+            message = f"Batch exceeds {MAX_BATCH_SIZE} calls" if isinstance(calls, list) and calls \
+                else "Expected a JSON-RPC request or batch"
+            return web.json_response({"jsonrpc": "2.0", "id": None, "error": {
+                "code": JSONRPC_INVALID_REQUEST, "message": message
+            }}, status=400)
+        responses = await self._run(self.target.handle_rpc_batch, calls)
+        return web.json_response(responses[0] if single else responses, dumps=_dumps)
+
+    async def _subscribe(self, request: web.Request) -> web.StreamResponse:
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        last_event_id = request.headers.get("Last-Event-ID", "")
+        subscription = self.target.events.subscribe(
+            request.query.getall("pattern", ["*"]),
+            lambda event: loop.call_soon_threadsafe(events.put_nowait, event),
+            after=int(last_event_id) if last_event_id.isdigit() else None
+        )
+        self._streams.add(events)
+        response = web.StreamResponse(headers={"Content-Type": SSE_MIMETYPE, **SSE_HEADERS})
+        try:
+            await response.prepare(request)
+            await response.write(b": subscribed\n\n")
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    await response.write(b": keepalive\n\n")
+                    continue
+                if event is None:
+                    break
+                await response.write(format_event(event).encode("utf-8"))
+        except ConnectionResetError:
+            pass
+        finally:
+            subscription.close()
+            self._streams.discard(events)
+        return response
+
+    async def _wsgi(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        environ = {
+            "REQUEST_METHOD": request.method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": request.path,
+            "QUERY_STRING": request.query_string,
+            "SERVER_NAME": self.host,
+            "SERVER_PORT": str(self.port),
+            "SERVER_PROTOCOL": f"HTTP/{request.version.major}.{request.version.minor}",
+            "REMOTE_ADDR": request.remote or "",
+            "CONTENT_TYPE": request.headers.get("Content-Type", ""),
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": request.scheme,
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False
+        }
+        for name, value in request.headers.items():
+            key = "HTTP_" + name.upper().replace("-", "_")
+            if key not in ("HTTP_CONTENT_TYPE", "HTTP_CONTENT_LENGTH"):
+                environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+        def call_app():
+            started = {}
+
+            def start_response(status, headers, exc_info=None):
+                started["status"] = int(status.split(" ", 1)[0])
+                started["headers"] = headers
+
+            result = self.target(environ, start_response)
+            try:
+                content = b"".join(result)
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+            return started["status"], started["headers"], content
+
+        status, headers, content = await self._run(call_app)
+        response_headers = CIMultiDict((name, value) for name, value in headers
+                                       if name.lower() not in _SKIPPED_WSGI_HEADERS)
+        return web.Response(status=status, body=content, headers=response_headers)
+
+    async def start(self) -> str:
+        """Bind and start serving; the runtime reports ready once this returns"""
+        self._runner = web.AppRunner(self.build_app(), access_log=None, shutdown_timeout=self.shutdown_timeout)
+        await self._runner.setup()
+        self._site = web.TCPSite(self._runner, self.host, self.port)
+        await self._site.start()
+        self.port = self._site._server.sockets[0].getsockname()[1]
+        host = "127.0.0.1" if self.host in ("0.0.0.0", "") else self.host
+        self.url = f"http://{host}:{self.port}"
+        self.draining = False
+        self.ready = True
+        logger.info(f"MCP runtime ready: {self.name} on {self.url}")
+        return self.url
+
+    async def stop(self, timeout: Optional[float] = None):
+        """Graceful shutdown: fail readiness, stop accepting, drain in-flight requests, close"""
+        if self._runner is None:
+            return
+        timeout = self.shutdown_timeout if timeout is None else timeout
+        self.ready = False
+        self.draining = True
+        await self._site.stop()
+        for events in list(self._streams):
+            events.put_nowait(None)
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        if self.in_flight:
+            logger.warning(f"MCP runtime {self.name} closing with {self.in_flight} requests in flight")
+        await self._runner.cleanup()
+        self._runner = None
+        self.executor.shutdown(wait=False)
+        logger.info(f"MCP runtime stopped: {self.name}")
+
+    def start_in_thread(self) -> str:
+        """Serve from a dedicated event loop thread; returns once the listener is bound"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name=f"mcp-{self.name}", daemon=True)
+        self._thread.start()
+        return asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+
+    def stop_thread(self, timeout: Optional[float] = None):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(timeout), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+
+    def run(self):
+        """Serve in the foreground until interrupted, then shut down gracefully"""
+        async def serve():
+            await self.start()
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await self.stop()
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+
+
+def wait_until_ready(url: str, timeout: float = 10.0, interval: float = 0.05) -> bool:
+    """Poll ``/ready`` (or ``/health`` on servers without it) until it answers 200"""
+    deadline = time.monotonic() + timeout
+    probe = "/ready"
+    while time.monotonic() < deadline:
+        try:
+            response = requests.get(f"{url.rstrip('/')}{probe}", timeout=interval * 10)
+            if response.status_code == 200:
+                return True
+            if response.status_code == 404:
+                probe = "/health"
+                continue
+        except requests.RequestException:
+            pass
+        time.sleep(interval)
+    return False
+
+
+def runtime_stats(runtimes: Dict[str, MCPRuntime]) -> Dict[str, Dict[str, Any]]:
+    """Readiness snapshot for status endpoints"""
+    return {name: {"url": runtime.url, "ready": runtime.ready, "in_flight": runtime.in_flight}
+            for name, runtime in runtimes.items()}
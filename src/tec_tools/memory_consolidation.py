@@ -0,0 +1,351 @@
+"""
+TEC Memory Consolidation
+Incremental MinHash/LSH pass that folds near-duplicate memories into a single
+summarized memory, keeping lineage in ``related_memories``
+"""
+
+import json
+import random
+import re
+import sqlite3
+import struct
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def shingle_hashes(text: str, size: int = 3) -> Set[int]:
+    """Hashed word ``size``-shingles of ``text``"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures with LSH band keys for candidate lookup"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 8, seed: int = 713):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, hashes: Set[int]) -> List[int]:
+        if not hashes:
+            return [_MERSENNE_PRIME] * self.num_perm
+        hashes = list(hashes)
+        return [min([(a * h + b) % _MERSENNE_PRIME for h in hashes]) for a, b in self._perms]
+
+    def band_keys(self, signature: List[int], namespace: str) -> List[int]:
+        """One integer bucket key per band, scoped to ``namespace`` (e.g. memory type)"""
+        prefix = namespace.encode("utf-8")
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            digest = zlib.crc32(prefix + struct.pack(f"{self.rows}Q", *chunk))
+            keys.append((band << 32) | digest)
+        return keys
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+
+    def find(self, item: str) -> str:
+        self.parent.setdefault(item, item)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: str, b: str):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+    def groups(self) -> List[List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for item in self.parent:
+            grouped.setdefault(self.find(item), []).append(item)
+        return [members for members in grouped.values() if len(members) > 1]
+
+
+class MemoryConsolidator:
+    """Merges near-duplicate memories of the same user and memory type.
+
+    Only rows inserted (or rewritten) since the previous run are scanned; they
+    are matched against everything already indexed through LSH buckets and
+    confirmed with exact shingle Jaccard similarity.
+    """
+
+    def __init__(self, memory_system, threshold: float = 0.85, num_perm: int = 64,
+                 bands: int = 8, shingle_size: int = 3, batch_size: int = 5000):
+        self.memory_system = memory_system
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.batch_size = batch_size
+        self.hasher = MinHasher(num_perm=num_perm, bands=bands)
+
+    def init_schema(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS memory_lsh_buckets (
+                memory_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                band_key INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_memory_lsh_lookup
+            ON memory_lsh_buckets(user_id, band_key)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_memory_lsh_memory
+            ON memory_lsh_buckets(memory_id)
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS memory_consolidation_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL,
+                scope TEXT NOT NULL DEFAULT '',  -- memory types scanned, '' for all
+                watermark INTEGER NOT NULL,  -- last memories rowid scanned in this scope
+                scanned INTEGER NOT NULL,
+                clusters INTEGER NOT NULL,
+                rows_saved INTEGER NOT NULL,
+                duration_ms REAL NOT NULL
+            )
+        ''')
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(memory_consolidation_runs)")]
+        if "scope" not in columns:
+            cursor.execute("ALTER TABLE memory_consolidation_runs ADD COLUMN scope TEXT NOT NULL DEFAULT ''")
+
+    def forget(self, cursor, memory_ids: List[str]):
+        """Drop LSH entries for memories removed elsewhere (e.g. archived)"""
+        cursor.executemany("DELETE FROM memory_lsh_buckets WHERE memory_id = ?",
+                           [(memory_id,) for memory_id in memory_ids])
+
+    @staticmethod
+    def _base_text(row) -> str:
+        metadata = json.loads(row["metadata"]) if row["metadata"] else {}
+        return metadata.get("consolidation", {}).get("base_content") or row["content"]
+
+    def _shingles(self, row) -> Set[int]:
+        return shingle_hashes(self._base_text(row), self.shingle_size)
+
+    def _load_shingles(self, cursor, memory_ids: List[str], shingle_cache: Dict[str, Optional[tuple]]):
+        """Fill ``shingle_cache`` for candidate ids and prune buckets of deleted rows"""
+        for start in range(0, len(memory_ids), 500):
+            chunk = memory_ids[start:start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            cursor.execute(f'''
+                SELECT id, content, metadata, memory_type FROM memories WHERE id IN ({placeholders})
+            ''', chunk)
+            for candidate in cursor.fetchall():
+                shingle_cache[candidate["id"]] = (candidate["memory_type"], self._shingles(candidate))
+            missing = [memory_id for memory_id in chunk if memory_id not in shingle_cache]
+            for memory_id in missing:
+                shingle_cache[memory_id] = None
+            self.forget(cursor, missing)
+
+    def run(self, memory_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Consolidate memories added since the last run and report the savings"""
+        started = time.perf_counter()
+        started_at = datetime.now().isoformat()
+
+        conn = sqlite3.connect(self.memory_system.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        # Each set of memory types keeps its own watermark, so a filtered run
+        # neither hides other types from unfiltered runs nor stalls on them
+        types = sorted(set(memory_types or []))
+        scope = ",".join(types)
+        cursor.execute("SELECT COALESCE(MAX(watermark), 0) FROM memory_consolidation_runs WHERE scope = ?",
+                       (scope,))
+        watermark = cursor.fetchone()[0]
+        type_filter = f"AND memory_type IN ({','.join('?' for _ in types)})" if types else ""
+        cursor.execute(f'''
+            SELECT rowid AS row_number, * FROM memories
+            WHERE rowid > ? {type_filter} ORDER BY rowid LIMIT ?
+        ''', (watermark, *types, self.batch_size))
+        new_rows = cursor.fetchall()
+
+        matches = _UnionFind()
+        # memory_id -> (memory_type, shingles), or None for rows no longer live
+        shingle_cache: Dict[str, Optional[tuple]] = {}
+        for row in new_rows:
+            watermark = row["row_number"]
+
+            shingles = self._shingles(row)
+            shingle_cache[row["id"]] = (row["memory_type"], shingles)
+            keys = self.hasher.band_keys(self.hasher.signature(shingles), row["memory_type"])
+
+            cursor.execute("DELETE FROM memory_lsh_buckets WHERE memory_id = ?", (row["id"],))
+            placeholders = ",".join("?" for _ in keys)
+            cursor.execute(f'''
+                SELECT DISTINCT memory_id FROM memory_lsh_buckets
+                WHERE user_id = ? AND band_key IN ({placeholders})
+            ''', [row["user_id"], *keys])
+            candidate_ids = [candidate[0] for candidate in cursor.fetchall()]
+            self._load_shingles(cursor, [i for i in candidate_ids if i not in shingle_cache],
+                                shingle_cache)
+
+            matched = False
+            for candidate_id in candidate_ids:
+                cached = shingle_cache.get(candidate_id)
+                if cached is None or cached[0] != row["memory_type"]:
+                    continue
+                if matched and matches.find(candidate_id) == matches.find(row["id"]):
+                    continue
+                if jaccard(shingles, cached[1]) >= self.threshold:
+                    matches.union(candidate_id, row["id"])
+                    matched = True
+
+            # Only cluster representatives are indexed; a matched row is about
+            # to be folded into an older memory that already has buckets.
+            if not matched:
+                cursor.executemany(
+                    "INSERT INTO memory_lsh_buckets (memory_id, user_id, band_key) VALUES (?, ?, ?)",
+                    [(row["id"], row["user_id"], key) for key in keys]
+                )
+
+        merged = []
+        rows_saved = 0
+        for member_ids in matches.groups():
+            placeholders = ",".join("?" for _ in member_ids)
+            cursor.execute(f'''
+                SELECT rowid AS row_number, * FROM memories
+                WHERE id IN ({placeholders}) ORDER BY rowid
+            ''', member_ids)
+            members = cursor.fetchall()
+            if len(members) < 2:
+                continue
+            survivor = self._merge(cursor, members)
+            removed = [member["id"] for member in members[1:]]
+            cursor.executemany("DELETE FROM memories WHERE id = ?", [(i,) for i in removed])
+            self.forget(cursor, removed)
+            merged.append((survivor, removed))
+            rows_saved += len(removed)
+
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        report = {
+            "started_at": started_at,
+            "watermark": watermark,
+            "scanned": len(new_rows),
+            "clusters": len(merged),
+            "rows_saved": rows_saved,
+            "duration_ms": duration_ms
+        }
+        cursor.execute('''
+            INSERT INTO memory_consolidation_runs
+            (started_at, scope, watermark, scanned, clusters, rows_saved, duration_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (started_at, scope, watermark, len(new_rows), len(merged), rows_saved, duration_ms))
+        by_user: Dict[str, list] = {}
+        for survivor, removed in merged:
+            by_user.setdefault(survivor.user_id, []).append((survivor, removed))
+        versions = {user_id: self.memory_system._bump_version(cursor, user_id) for user_id in by_user}
+        conn.commit()
+        conn.close()
+
+        memory_system = self.memory_system
+        for user_id, user_merges in by_user.items():
+            def apply(user_id=user_id, user_merges=user_merges):
+                for survivor, removed in user_merges:
+                    memory_system.hot_tier.remove(user_id, removed)
+                    memory_system.hot_tier.upsert(survivor)
+                memory_system.context_cache.drop(user_id)
+            memory_system._after_write(user_id, versions[user_id], apply)
+
+        if rows_saved:
+            logger.info(f"Memory consolidation merged {rows_saved} rows into {len(merged)} memories "
+                        f"in {duration_ms}ms")
+        return report
+
+    def _merge(self, cursor, members: List[sqlite3.Row]):
+        """Fold ``members`` into the oldest row and return it as a Memory"""
+        survivor = members[0]
+        metadata = json.loads(survivor["metadata"]) if survivor["metadata"] else {}
+
+        count = 0
+        first_seen = None
+        last_seen = None
+        tags: List[str] = []
+        lineage: List[str] = []
+        for member in members:
+            member_meta = json.loads(member["metadata"]) if member["metadata"] else {}
+            history = member_meta.get("consolidation", {})
+            count += history.get("count", 1)
+            first = history.get("first_seen", member["created_at"])
+            last = history.get("last_seen", member["created_at"])
+            first_seen = min(first_seen or first, first)
+            last_seen = max(last_seen or last, last)
+            for tag in json.loads(member["tags"]) if member["tags"] else []:
+                if tag not in tags:
+                    tags.append(tag)
+            for related in [member["id"]] + (json.loads(member["related_memories"]) if member["related_memories"] else []):
+                if related != survivor["id"] and related not in lineage:
+                    lineage.append(related)
+
+        base_content = self._base_text(survivor)
+        metadata["consolidation"] = {
+            "count": count,
+            "first_seen": first_seen,
+            "last_seen": last_seen,
+            "base_content": base_content,
+            "consolidated_at": datetime.now().isoformat()
+        }
+        content = (f"{base_content}\n[Consolidated {count} similar memories "
+                   f"from {first_seen[:10]} to {last_seen[:10]}]")
+        importance = max(member["importance"] for member in members)
+        last_accessed = max(member["last_accessed"] for member in members)
+        access_count = sum(member["access_count"] or 0 for member in members)
+
+        # UPDATE keeps the survivor's rowid so the next run does not rescan it
+        cursor.execute('''
+            UPDATE memories
+            SET content = ?, importance = ?, tags = ?, last_accessed = ?,
+                access_count = ?, related_memories = ?, metadata = ?
+            WHERE id = ?
+        ''', (content, importance, json.dumps(tags), last_accessed, access_count,
+              json.dumps(lineage), json.dumps(metadata), survivor["id"]))
+
+        row = dict(survivor)
+        row.update(content=content, importance=importance, tags=json.dumps(tags),
+                   last_accessed=last_accessed, access_count=access_count,
+                   related_memories=json.dumps(lineage), metadata=json.dumps(metadata))
+        return self.memory_system._row_to_memory(row)
+
+    def recent_runs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        conn = sqlite3.connect(self.memory_system.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT started_at, watermark, scanned, clusters, rows_saved, duration_ms
+            FROM memory_consolidation_runs ORDER BY id DESC LIMIT ?
+        ''', (limit,))
+        runs = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return runs
@@ -6,13 +6,20 @@ Implements persistent memory, personality customization, and content sharing
 import json
 import sqlite3
 import hashlib
+import threading
+import time
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import logging
 
+from .memory_tiers import HotMemoryTier, ColdMemoryArchive
+from .memory_consolidation import MemoryConsolidator
+from .chat_context import ChatContextCache, count_tags
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -61,9 +68,18 @@ class Personality:
     voice_settings: Dict[str, Any]
 
 class TECMemorySystem:
-    def __init__(self, db_path: str = "data/tec_memory.db"):
+    def __init__(self, db_path: str = "data/tec_memory.db", hot_tier_capacity: int = 256,
+                 chat_context_window: int = 20):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
+        # Hot: per-user RAM windows, warm: memories table, cold: compressed archive
+        self.hot_tier = HotMemoryTier(capacity_per_user=hot_tier_capacity)
+        self.context_cache = ChatContextCache(window_size=chat_context_window)
+        # Per-user memory_versions value the in-process caches reflect
+        self._cached_versions: Dict[str, int] = {}
+        self._versions_lock = threading.Lock()
+        self.archive = ColdMemoryArchive()
+        self.consolidator = MemoryConsolidator(self)
         self.init_database()
     
     def init_database(self):
@@ -88,6 +104,26 @@ class TECMemorySystem:
             )
         ''')
         
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_memories_user_rank
+            ON memories(user_id, importance DESC, last_accessed DESC)
+        ''')
+        
+        # Bumped in every transaction that changes a user's memories, so other
+        # processes notice their cached windows are stale
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS memory_versions (
+                user_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+        ''')
+        
+        # Cold tier segments
+        self.archive.init_schema(cursor)
+        
+        # Near-duplicate detection index and run log
+        self.consolidator.init_schema(cursor)
+        
         # Shared content table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS shared_content (
@@ -228,6 +264,9 @@ class TECMemorySystem:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        cursor.execute("SELECT 1 FROM memories WHERE id = ?", (memory.id,))
+        is_new = cursor.fetchone() is None
+        
         cursor.execute('''
             INSERT OR REPLACE INTO memories 
             (id, user_id, content, memory_type, importance, tags, created_at, 
@@ -246,14 +285,110 @@ class TECMemorySystem:
             json.dumps(memory.related_memories),
             json.dumps(memory.metadata)
         ))
+        version = self._bump_version(cursor, memory.user_id)
         
         conn.commit()
         conn.close()
+        
+        def apply():
+            self.hot_tier.upsert(memory)
+            if is_new:
+                self.context_cache.record(memory, version)
+            else:
+                self.context_cache.drop(memory.user_id)
+        
+        self._after_write(memory.user_id, version, apply)
         return memory.id
     
+    @staticmethod
+    def _bump_version(cursor, user_id: str) -> int:
+        """Advance the user's memory version inside the caller's transaction"""
+        cursor.execute('''
+            INSERT INTO memory_versions (user_id, version) VALUES (?, 1)
+            ON CONFLICT(user_id) DO UPDATE SET version = version + 1
+        ''', (user_id,))
+        cursor.execute("SELECT version FROM memory_versions WHERE user_id = ?", (user_id,))
+        return cursor.fetchone()[0]
+    
+    def _after_write(self, user_id: str, version: int, apply: Callable[[], None]):
+        """Apply a committed write to the caches, or drop them if another writer got in between"""
+        with self._versions_lock:
+            if self._cached_versions.get(user_id) == version - 1:
+                apply()
+                self._cached_versions[user_id] = version
+            else:
+                self._drop_user_caches(user_id)
+    
+    def _drop_user_caches(self, user_id: str):
+        self.hot_tier.drop(user_id)
+        self.context_cache.drop(user_id)
+        self._cached_versions.pop(user_id, None)
+    
+    def _sync_user(self, user_id: str):
+        """Drop the user's cached windows if the database moved past them"""
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute("SELECT version FROM memory_versions WHERE user_id = ?", (user_id,)).fetchone()
+        conn.close()
+        version = row[0] if row else 0
+        with self._versions_lock:
+            if self._cached_versions.get(user_id) != version:
+                self._drop_user_caches(user_id)
+                # Reloads happen after this read, so they are at least this fresh
+                self._cached_versions[user_id] = version
+    
+    @staticmethod
+    def _row_to_memory(row) -> Memory:
+        """Build a Memory from a memories row (tuple or dict)"""
+        if isinstance(row, dict):
+            row = (row['id'], row['user_id'], row['content'], row['memory_type'],
+                   row['importance'], row['tags'], row['created_at'], row['last_accessed'],
+                   row['access_count'], row['related_memories'], row['metadata'])
+        return Memory(
+            id=row[0],
+            user_id=row[1],
+            content=row[2],
+            memory_type=row[3],
+            importance=row[4],
+            tags=json.loads(row[5]) if row[5] else [],
+            created_at=datetime.fromisoformat(row[6]),
+            last_accessed=datetime.fromisoformat(row[7]),
+            access_count=row[8],
+            related_memories=json.loads(row[9]) if row[9] else [],
+            metadata=json.loads(row[10]) if row[10] else {}
+        )
+    
+    def _ensure_hot_window(self, user_id: str):
+        """Load the user's top warm memories into the hot tier on first access"""
+        if not self.hot_tier.enabled or self.hot_tier.has_user(user_id):
+            return
+        # Hold the tier lock so concurrent save_memory upserts land after the load
+        with self.hot_tier.lock:
+            if self.hot_tier.has_user(user_id):
+                return
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM memories 
+                WHERE user_id = ?
+                ORDER BY importance DESC, last_accessed DESC
+                LIMIT ?
+            ''', (user_id, self.hot_tier.capacity_per_user))
+            memories = [self._row_to_memory(row) for row in cursor.fetchall()]
+            conn.close()
+            self.hot_tier.load(user_id, memories)
+    
     def get_memories(self, user_id: str, memory_type: Optional[str] = None, 
                     limit: int = 50) -> List[Memory]:
-        """Retrieve memories for a user"""
+        """Retrieve memories for a user (hot tier first, then SQLite)"""
+        self._sync_user(user_id)
+        return self._query_memories(user_id, memory_type, limit)
+    
+    def _query_memories(self, user_id: str, memory_type: Optional[str], limit: int) -> List[Memory]:
+        self._ensure_hot_window(user_id)
+        cached = self.hot_tier.query(user_id, memory_type, limit)
+        if cached is not None:
+            return cached
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -272,57 +407,42 @@ class TECMemorySystem:
                 LIMIT ?
             ''', (user_id, limit))
         
-        memories = []
-        for row in cursor.fetchall():
-            memory = Memory(
-                id=row[0],
-                user_id=row[1],
-                content=row[2],
-                memory_type=row[3],
-                importance=row[4],
-                tags=json.loads(row[5]) if row[5] else [],
-                created_at=datetime.fromisoformat(row[6]),
-                last_accessed=datetime.fromisoformat(row[7]),
-                access_count=row[8],
-                related_memories=json.loads(row[9]) if row[9] else [],
-                metadata=json.loads(row[10]) if row[10] else {}
-            )
-            memories.append(memory)
+        memories = [self._row_to_memory(row) for row in cursor.fetchall()]
         
         conn.close()
         return memories
     
     def search_memories(self, user_id: str, query: str, limit: int = 20) -> List[Memory]:
-        """Search memories by content"""
+        """Search memories by content across the hot, warm and cold tiers.
+        
+        Archived memories are only consulted when the live tiers return fewer
+        than ``limit`` matches; their prefilter matches query words by prefix.
+        """
+        self._sync_user(user_id)
+        return self._search_memories(user_id, query, limit)
+    
+    def _search_memories(self, user_id: str, query: str, limit: int) -> List[Memory]:
+        self._ensure_hot_window(user_id)
+        memories = self.hot_tier.search(user_id, query, limit)
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT * FROM memories 
-            WHERE user_id = ? AND (
-                content LIKE ? OR 
-                tags LIKE ?
-            )
-            ORDER BY importance DESC, last_accessed DESC
-            LIMIT ?
-        ''', (user_id, f"%{query}%", f"%{query}%", limit))
+        if memories is None:
+            cursor.execute('''
+                SELECT * FROM memories 
+                WHERE user_id = ? AND (
+                    content LIKE ? OR 
+                    tags LIKE ?
+                )
+                ORDER BY importance DESC, last_accessed DESC
+                LIMIT ?
+            ''', (user_id, f"%{query}%", f"%{query}%", limit))
+            memories = [self._row_to_memory(row) for row in cursor.fetchall()]
         
-        memories = []
-        for row in cursor.fetchall():
-            memory = Memory(
-                id=row[0],
-                user_id=row[1],
-                content=row[2],
-                memory_type=row[3],
-                importance=row[4],
-                tags=json.loads(row[5]) if row[5] else [],
-                created_at=datetime.fromisoformat(row[6]),
-                last_accessed=datetime.fromisoformat(row[7]),
-                access_count=row[8],
-                related_memories=json.loads(row[9]) if row[9] else [],
-                metadata=json.loads(row[10]) if row[10] else {}
-            )
-            memories.append(memory)
+        if len(memories) < limit:
+            archived = self.archive.search(conn, user_id, query, limit - len(memories))
+            memories = memories + [self._row_to_memory(row) for row in archived]
         
         conn.close()
         return memories
@@ -349,6 +469,148 @@ class TECMemorySystem:
         
         return self.save_memory(memory)
     
+    def get_chat_context(self, user_id: str, message: str, recent_limit: int = 5,
+                         relevant_limit: int = 3) -> Dict[str, Any]:
+        """Recent conversation window, relevant memories and relationship counters for /chat"""
+        self._sync_user(user_id)
+        context = self.context_cache.get(user_id)
+        if context is None or (len(context.recent) < recent_limit and not context.complete):
+            context = self._load_chat_context(user_id)
+        
+        return {
+            "recent_memories": context.recent[:recent_limit],
+            "relevant_memories": self._search_memories(user_id, message, relevant_limit),
+            "conversation_count": context.conversation_count,
+            "relationship_level": context.relationship_level,
+            "character_counts": dict(context.character_counts),
+            "preferred_topics": context.preferred_topics()
+        }
+    
+    def _load_chat_context(self, user_id: str):
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        cursor = conn.cursor()
+        # One read transaction, so the window, the counters and the version agree
+        cursor.execute("BEGIN")
+        cursor.execute("SELECT version FROM memory_versions WHERE user_id = ?", (user_id,))
+        row = cursor.fetchone()
+        version = row[0] if row else 0
+        cursor.execute('''
+            SELECT * FROM memories
+            WHERE user_id = ? AND memory_type = 'conversation'
+            ORDER BY importance DESC, last_accessed DESC
+            LIMIT ?
+        ''', (user_id, max(self.context_cache.window_size, 1)))
+        recent = [self._row_to_memory(row) for row in cursor.fetchall()]
+        # A consolidated row stands for every conversation folded into it
+        cursor.execute('''
+            SELECT COALESCE(SUM(COALESCE(json_extract(metadata, '$.consolidation.count'), 1)), 0)
+            FROM memories WHERE user_id = ? AND memory_type = 'conversation'
+        ''', (user_id,))
+        conversation_count = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT tags, SUM(COALESCE(json_extract(metadata, '$.consolidation.count'), 1)) FROM memories
+            WHERE user_id = ? AND memory_type = 'conversation'
+            GROUP BY tags
+        ''', (user_id,))
+        character_counts: Counter = Counter()
+        topic_counts: Counter = Counter()
+        for tags, count in cursor.fetchall():
+            count_tags(json.loads(tags) if tags else [], character_counts, topic_counts, count)
+        cursor.execute("COMMIT")
+        conn.close()
+        
+        with self._versions_lock:
+            if self._cached_versions.get(user_id) == version:
+                return self.context_cache.load(user_id, recent, conversation_count,
+                                               character_counts, topic_counts, version)
+        # A write committed since _sync_user and has not reached the caches yet:
+        # answer from this snapshot, but leave caching to a later call
+        return self.context_cache.build(recent, conversation_count, character_counts, topic_counts, version)
+    
+    def compact_memories(self, max_age_days: int = 30, importance_threshold: float = 0.4,
+                         segment_size: int = 500, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Move stale, low-importance memories into compressed archive segments"""
+        started = time.perf_counter()
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        query = '''
+            SELECT * FROM memories 
+            WHERE last_accessed < ? AND importance < ?
+        '''
+        params: List[Any] = [cutoff, importance_threshold]
+        if user_id:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        query += " ORDER BY user_id, created_at"
+        cursor.execute(query, params)
+        
+        by_user: Dict[str, List[Dict[str, Any]]] = {}
+        for row in cursor.fetchall():
+            by_user.setdefault(row['user_id'], []).append(dict(row))
+        
+        segments = 0
+        raw_bytes = 0
+        compressed_bytes = 0
+        for owner, rows in by_user.items():
+            for start in range(0, len(rows), segment_size):
+                chunk = rows[start:start + segment_size]
+                raw_bytes += sum(len(row['content']) for row in chunk)
+                compressed_bytes += self.archive.write_segment(cursor, owner, chunk)
+                cursor.executemany(
+                    "DELETE FROM memories WHERE id = ?",
+                    [(row['id'],) for row in chunk]
+                )
+                self.consolidator.forget(cursor, [row['id'] for row in chunk])
+                segments += 1
+        versions = {owner: self._bump_version(cursor, owner) for owner in by_user}
+        
+        conn.commit()
+        conn.close()
+        
+        for owner, rows in by_user.items():
+            def apply(owner=owner, rows=rows):
+                self.hot_tier.remove(owner, [row['id'] for row in rows])
+                self.context_cache.drop(owner)
+            self._after_write(owner, versions[owner], apply)
+        
+        report = {
+            "archived_memories": sum(len(rows) for rows in by_user.values()),
+            "segments_written": segments,
+            "users": len(by_user),
+            "raw_content_bytes": raw_bytes,
+            "compressed_bytes": compressed_bytes,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        if segments:
+            logger.info(f"Memory compaction archived {report['archived_memories']} memories "
+                        f"into {segments} segments")
+        return report
+    
+    def consolidate_memories(self, memory_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Merge near-duplicate memories added since the last run"""
+        return self.consolidator.run(memory_types=memory_types)
+    
+    def get_tier_stats(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Row counts per storage tier"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        if user_id:
+            cursor.execute("SELECT COUNT(*) FROM memories WHERE user_id = ?", (user_id,))
+        else:
+            cursor.execute("SELECT COUNT(*) FROM memories")
+        warm = cursor.fetchone()[0]
+        cold = self.archive.stats(conn, user_id)
+        conn.close()
+        return {
+            "hot": self.hot_tier.stats(),
+            "warm": {"memories": warm},
+            "cold": cold
+        }
+    
     def share_content(self, user_id: str, content_type: str, content: str,
                      title: str = "", description: str = "", is_public: bool = True) -> str:
         """Create shareable content"""
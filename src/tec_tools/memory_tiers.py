@@ -0,0 +1,293 @@
+"""
+TEC Memory Tiers
+Hot in-RAM windows, warm SQLite rows and cold compressed archive segments
+for TECMemorySystem
+"""
+
+import bisect
+import json
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def memory_sort_key(memory) -> Tuple[float, float, str]:
+    """Ascending key matching ``ORDER BY importance DESC, last_accessed DESC``"""
+    return (-memory.importance, -memory.last_accessed.timestamp(), memory.id)
+
+
+def memory_matches(memory, query: str) -> bool:
+    """Python equivalent of ``content LIKE %q% OR tags LIKE %q%``"""
+    needle = query.lower()
+    return needle in memory.content.lower() or needle in json.dumps(memory.tags).lower()
+
+
+class _UserWindow:
+    """Exact prefix of one user's warm memories in get_memories order.
+
+    ``complete`` is True while the window holds every warm memory of the user,
+    in which case any query can be answered without touching SQLite.
+    """
+
+    def __init__(self, memories: List[Any], complete: bool):
+        ordered = sorted(memories, key=memory_sort_key)
+        self.keys = [memory_sort_key(m) for m in ordered]
+        self.memories = ordered
+        self.ids = {m.id for m in ordered}
+        self.complete = complete
+
+    def remove(self, memory_id: str):
+        if memory_id not in self.ids:
+            return
+        index = next(i for i, m in enumerate(self.memories) if m.id == memory_id)
+        del self.keys[index]
+        del self.memories[index]
+        self.ids.discard(memory_id)
+
+    def insert(self, memory, capacity: int):
+        key = memory_sort_key(memory)
+        # Outside a complete window we only know the prefix; a memory ranked
+        # past the tail may have unseen warm rows ahead of it, so skip it.
+        if not self.complete and (not self.keys or key > self.keys[-1]):
+            return
+        index = bisect.bisect_left(self.keys, key)
+        self.keys.insert(index, key)
+        self.memories.insert(index, memory)
+        self.ids.add(memory.id)
+        while len(self.memories) > capacity:
+            self.keys.pop()
+            dropped = self.memories.pop()
+            self.ids.discard(dropped.id)
+            self.complete = False
+
+
+class HotMemoryTier:
+    """Per-user in-memory windows over the highest ranked warm memories"""
+
+    def __init__(self, capacity_per_user: int = 256, max_users: int = 64):
+        self.capacity_per_user = capacity_per_user
+        self.max_users = max_users
+        self._windows: "OrderedDict[str, _UserWindow]" = OrderedDict()
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity_per_user > 0
+
+    def has_user(self, user_id: str) -> bool:
+        with self.lock:
+            return user_id in self._windows
+
+    def load(self, user_id: str, memories: List[Any]):
+        """Install a window from the top ``capacity_per_user`` warm rows"""
+        if not self.enabled:
+            return
+        with self.lock:
+            window = _UserWindow(memories[:self.capacity_per_user],
+                                 complete=len(memories) < self.capacity_per_user)
+            self._windows[user_id] = window
+            self._windows.move_to_end(user_id)
+            while len(self._windows) > self.max_users:
+                self._windows.popitem(last=False)
+
+    def upsert(self, memory):
+        """Write-through hook for ``save_memory``"""
+        with self.lock:
+            window = self._windows.get(memory.user_id)
+            if window is None:
+                return
+            window.remove(memory.id)
+            window.insert(memory, self.capacity_per_user)
+
+    def remove(self, user_id: str, memory_ids):
+        with self.lock:
+            window = self._windows.get(user_id)
+            if window is None:
+                return
+            for memory_id in memory_ids:
+                window.remove(memory_id)
+
+    def drop(self, user_id: Optional[str] = None):
+        with self.lock:
+            if user_id is None:
+                self._windows.clear()
+            else:
+                self._windows.pop(user_id, None)
+
+    def query(self, user_id: str, memory_type: Optional[str], limit: int) -> Optional[List[Any]]:
+        """Answer get_memories from RAM, or None when the window can't prove the result"""
+        return self._answer(user_id, limit,
+                            lambda m: memory_type is None or m.memory_type == memory_type)
+
+    def search(self, user_id: str, query: str, limit: int) -> Optional[List[Any]]:
+        """Answer search_memories from RAM, or None when SQLite must be consulted"""
+        return self._answer(user_id, limit, lambda m: memory_matches(m, query))
+
+    def _answer(self, user_id: str, limit: int, predicate) -> Optional[List[Any]]:
+        with self.lock:
+            window = self._windows.get(user_id)
+            if window is None:
+                self.misses += 1
+                return None
+            self._windows.move_to_end(user_id)
+            matches = []
+            for memory in window.memories:
+                if predicate(memory):
+                    matches.append(memory)
+                    if len(matches) >= limit:
+                        break
+            if window.complete or len(matches) >= limit:
+                self.hits += 1
+                return matches
+            self.misses += 1
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "active_users": len(self._windows),
+                "memories": sum(len(w.memories) for w in self._windows.values()),
+                "capacity_per_user": self.capacity_per_user,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class ColdMemoryArchive:
+    """zlib-compressed per-user segments of archived memories.
+
+    Each segment keeps its vocabulary in a ``terms`` column so searches only
+    decompress segments containing every query word.
+    """
+
+    def init_schema(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS memory_archive (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                first_created_at TEXT NOT NULL,
+                last_created_at TEXT NOT NULL,
+                memory_count INTEGER NOT NULL,
+                terms TEXT NOT NULL,  -- space separated vocabulary
+                payload BLOB NOT NULL,  -- zlib compressed JSON rows
+                archived_at TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_memory_archive_user
+            ON memory_archive(user_id, last_created_at)
+        ''')
+
+    @staticmethod
+    def _terms(rows: List[Dict[str, Any]]) -> str:
+        words = set()
+        for row in rows:
+            words.update(_WORD_RE.findall(row["content"].lower()))
+            words.update(_WORD_RE.findall(row["tags"].lower()))
+        return " " + " ".join(sorted(words)) + " "
+
+    def write_segment(self, cursor, user_id: str, rows: List[Dict[str, Any]]) -> int:
+        """Store ``rows`` (raw memories columns) as one compressed segment"""
+        payload = zlib.compress(json.dumps(rows).encode("utf-8"), 6)
+        cursor.execute('''
+            INSERT INTO memory_archive
+            (user_id, first_created_at, last_created_at, memory_count, terms, payload, archived_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            user_id,
+            min(row["created_at"] for row in rows),
+            max(row["created_at"] for row in rows),
+            len(rows),
+            self._terms(rows),
+            payload,
+            datetime.now().isoformat()
+        ))
+        return len(payload)
+
+    def search(self, conn, user_id: str, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Return raw archived rows matching ``query`` in get_memories order"""
+        words = _WORD_RE.findall(query.lower())
+        sql = "SELECT payload FROM memory_archive WHERE user_id = ?"
+        params: List[Any] = [user_id]
+        for word in words:
+            sql += " AND terms LIKE ?"
+            params.append(f"% {word}%")
+        sql += " ORDER BY last_created_at DESC"
+
+        needle = query.lower()
+        matches = []
+        for (payload,) in conn.execute(sql, params):
+            for row in json.loads(zlib.decompress(payload)):
+                if needle in row["content"].lower() or needle in row["tags"].lower():
+                    matches.append(row)
+        matches.sort(key=lambda r: (r["importance"], r["last_accessed"]), reverse=True)
+        return matches[:limit]
+
+    def stats(self, conn, user_id: Optional[str] = None) -> Dict[str, Any]:
+        sql = "SELECT COUNT(*), COALESCE(SUM(memory_count), 0), COALESCE(SUM(LENGTH(payload)), 0) FROM memory_archive"
+        params: List[Any] = []
+        if user_id:
+            sql += " WHERE user_id = ?"
+            params.append(user_id)
+        segments, memories, compressed_bytes = conn.execute(sql, params).fetchone()
+        return {
+            "segments": segments,
+            "memories": memories,
+            "compressed_bytes": compressed_bytes
+        }
+
+
+class MemoryCompactor:
+    """Background job that consolidates duplicates and archives cold memories"""
+
+    def __init__(self, memory_system, interval_seconds: float = 3600.0,
+                 max_age_days: int = 30, importance_threshold: float = 0.4,
+                 segment_size: int = 500):
+        self.memory_system = memory_system
+        self.interval_seconds = interval_seconds
+        self.policy = {
+            "max_age_days": max_age_days,
+            "importance_threshold": importance_threshold,
+            "segment_size": segment_size
+        }
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Dict[str, Any]:
+        # Merge near-duplicates first so fewer rows reach the archive
+        self.last_report = {
+            "consolidation": self.memory_system.consolidate_memories(),
+            "compaction": self.memory_system.compact_memories(**self.policy)
+        }
+        return self.last_report
+
+    def _loop(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Memory compaction failed: {e}")
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="tec-memory-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
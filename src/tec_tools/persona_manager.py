@@ -11,13 +11,18 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from contextlib import contextmanager
 
+from .ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 class PersonaManager:
     """Manages player personas and character data for TEC: BITLyfe"""
     
-    def __init__(self, db_path: str = "data/tec_database.db"):
+    def __init__(self, db_path: str = "data/tec_database.db", lore_cache_ttl: float = 300.0):
         self.db_path = db_path
+        # Read-through cache for character/universe lore; entries are the decoded
+        # JSON shared between callers, so treat returned lore as read-only
+        self.lore_cache = TTLCache(maxsize=256, ttl=lore_cache_ttl, name="persona_lore")
         self.init_persona_database()
     
     def init_persona_database(self):
@@ -215,6 +220,7 @@ class PersonaManager:
                 ))
                 
                 conn.commit()
+                self.lore_cache.invalidate(('character', character_name))
                 logger.info(f"Character lore saved for: {character_name}")
                 return True
                 
@@ -223,23 +229,29 @@ class PersonaManager:
             return False
     
     def get_character_lore(self, character_name: str) -> Optional[Dict[str, Any]]:
-        """Retrieve character lore data"""
+        """Retrieve character lore data (cached, read-only)"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT character_data FROM character_lore WHERE character_name = ?
-                """, (character_name,))
-                
-                row = cursor.fetchone()
-                if row:
-                    return json.loads(row['character_data'])
-                return None
-                
+            return self.lore_cache.get_or_load(
+                ('character', character_name),
+                lambda: self._load_character_lore(character_name)
+            )
         except Exception as e:
             logger.error(f"Error retrieving character lore for {character_name}: {e}")
             return None
     
+    def _load_character_lore(self, character_name: str) -> Optional[Dict[str, Any]]:
+        """Read character lore straight from SQLite"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT character_data FROM character_lore WHERE character_name = ?
+            """, (character_name,))
+            
+            row = cursor.fetchone()
+            if row:
+                return json.loads(row['character_data'])
+            return None
+    
     def save_universe_lore(self, lore_type: str, lore_name: str, lore_data: Dict[str, Any]) -> bool:
         """Save universe lore data (factions, locations, concepts, etc.)"""
         try:
@@ -258,6 +270,7 @@ class PersonaManager:
                 ))
                 
                 conn.commit()
+                self.lore_cache.invalidate(('universe', lore_type, lore_name))
                 logger.info(f"Universe lore saved: {lore_type} - {lore_name}")
                 return True
                 
@@ -266,23 +279,33 @@ class PersonaManager:
             return False
     
     def get_universe_lore(self, lore_type: str, lore_name: str) -> Optional[Dict[str, Any]]:
-        """Retrieve universe lore data"""
+        """Retrieve universe lore data (cached, read-only)"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT lore_data FROM universe_lore WHERE lore_type = ? AND lore_name = ?
-                """, (lore_type, lore_name))
-                
-                row = cursor.fetchone()
-                if row:
-                    return json.loads(row['lore_data'])
-                return None
-                
+            return self.lore_cache.get_or_load(
+                ('universe', lore_type, lore_name),
+                lambda: self._load_universe_lore(lore_type, lore_name)
+            )
         except Exception as e:
             logger.error(f"Error retrieving universe lore {lore_type}/{lore_name}: {e}")
             return None
     
+    def _load_universe_lore(self, lore_type: str, lore_name: str) -> Optional[Dict[str, Any]]:
+        """Read universe lore straight from SQLite"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT lore_data FROM universe_lore WHERE lore_type = ? AND lore_name = ?
+            """, (lore_type, lore_name))
+            
+            row = cursor.fetchone()
+            if row:
+                return json.loads(row['lore_data'])
+            return None
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Lore cache hit/miss counters"""
+        return self.lore_cache.stats()
+    
     def save_ai_settings(self, user_id: str, settings: Dict[str, Any]) -> bool:
         """Save AI interaction settings for a user"""
         try:
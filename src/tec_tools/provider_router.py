@@ -0,0 +1,219 @@
+"""
+TEC Provider Router
+Health-scored AI provider selection with circuit breakers, hedged requests
+and cost-aware routing for low-priority calls
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = "high"
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderHealth:
+    """Rolling latency/error window and circuit breaker for one provider.
+
+    The breaker opens after ``failure_threshold`` consecutive failures, or
+    when at least half of a full-enough window failed. After ``cooldown``
+    seconds one probe request is let through (half-open); its outcome
+    closes the breaker or re-opens it for another cooldown.
+    """
+
+    def __init__(self, name: str, cost: float = 0.0, window: int = 50, failure_threshold: int = 5,
+                 min_samples: int = 10, cooldown: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.cost = cost
+        self.failure_threshold = failure_threshold
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.clock = clock
+        self.samples: deque = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    def available(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.probe_in_flight:
+            return False
+        return self.state == HALF_OPEN or self.clock() - self.opened_at >= self.cooldown
+
+    def acquire(self):
+        """Called as a request is sent; an elapsed open breaker admits it as the single probe"""
+        if self.state != CLOSED:
+            self.state = HALF_OPEN
+            self.probe_in_flight = True
+
+    def release(self):
+        """A request was abandoned (e.g. it lost a hedge) without an outcome"""
+        self.probe_in_flight = False
+
+    def record(self, latency: float, ok: bool):
+        self.samples.append((latency, ok))
+        self.probe_in_flight = False
+        if ok:
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                logger.info(f"Circuit closed for provider {self.name}")
+            self.state = CLOSED
+            return
+
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold or (
+                len(self.samples) >= self.min_samples and self.error_rate >= 0.5):
+            if self.state != OPEN:
+                logger.warning(f"Circuit opened for provider {self.name} "
+                               f"({self.consecutive_failures} consecutive failures)")
+            self.state = OPEN
+            self.opened_at = self.clock()
+
+    @property
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def latency_percentile(self, fraction: float) -> Optional[float]:
+        latencies = sorted(latency for latency, ok in self.samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    def score(self, default_latency: float = 1.0) -> float:
+        """Lower is better: typical latency inflated by the recent error rate"""
+        p50 = self.latency_percentile(0.5)
+        return (p50 if p50 is not None else default_latency) * (1 + 4 * self.error_rate)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50 = self.latency_percentile(0.5)
+        p95 = self.latency_percentile(0.95)
+        return {
+            "state": self.state,
+            "cost": self.cost,
+            "samples": len(self.samples),
+            "error_rate": round(self.error_rate, 3),
+            "consecutive_failures": self.consecutive_failures,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None
+        }
+
+
+class ProviderRouter:
+    """Orders providers per request and runs the call with fallback and hedging.
+
+    Normal and high priority requests go to the preferred provider while
+    its breaker is closed, then to the others by health score; if the
+    first attempt outlives that provider's p95 latency a duplicate is sent
+    to the next provider and the first success wins. Hedges are capped at
+    ``hedge_budget`` of all calls so a saturated pool is not doubled.
+    Low-priority requests go to the cheapest available provider and are
+    never hedged.
+    """
+
+    def __init__(self, costs: Dict[str, float], preferred: Optional[str] = None,
+                 enabled: Optional[Callable[[str], bool]] = None, hedge_min_samples: int = 10,
+                 hedge_floor: float = 0.05, hedge_budget: float = 0.1, clock: Callable[[], float] = time.monotonic, **health_options):
+        self.clock = clock
+        self.health: Dict[str, ProviderHealth] = {
+            name: ProviderHealth(name, cost, clock=clock, **health_options) for name, cost in costs.items()
+        }
+        self.preferred = preferred
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_floor = hedge_floor
+        self.hedge_budget = hedge_budget
+        self.enabled = enabled or (lambda name: True)
+        self.counters = {"calls": 0, "hedges": 0, "hedge_wins": 0, "fallbacks": 0, "exhausted": 0}
+
+    def order(self, priority: str = PRIORITY_NORMAL) -> List[str]:
+        candidates = [h for name, h in self.health.items() if self.enabled(name) and h.available()]
+        if priority == PRIORITY_LOW:
+            candidates.sort(key=lambda h: (h.cost, h.score()))
+        else:
+            candidates.sort(key=lambda h: (not (h.name == self.preferred and h.state == CLOSED), h.score()))
+        return [h.name for h in candidates]
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        if self.counters["hedges"] >= self.hedge_budget * self.counters["calls"]:
+            return None
+        health = self.health[provider]
+        if sum(1 for _, ok in health.samples if ok) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_floor, health.latency_percentile(0.95))
+
+    async def call(self, call_fn: Callable[[str], Awaitable[Dict]],
+                   priority: str = PRIORITY_NORMAL) -> Tuple[Optional[str], Dict]:
+        """Run ``call_fn(provider)`` until one returns ``{"success": True, ...}``.
+
+        Returns the winning provider and its response, or ``(None, error)``
+        once every available provider has failed.
+        """
+        self.counters["calls"] += 1
+        queue = self.order(priority)
+        pending: Dict[asyncio.Future, Tuple[str, float, bool]] = {}
+        last_error = "No healthy AI providers"
+        launched = 0
+
+        def launch(hedged: bool = False):
+            nonlocal launched
+            launched += 1
+            provider = queue.pop(0)
+            self.health[provider].acquire()
+            pending[asyncio.ensure_future(call_fn(provider))] = (provider, self.clock(), hedged)
+
+        try:
+            while queue or pending:
+                if not pending:
+                    if launched:
+                        self.counters["fallbacks"] += 1
+                    launch()
+                timeout = None
+                if priority != PRIORITY_LOW and queue and len(pending) == 1:
+                    timeout = self.hedge_delay(next(iter(pending.values()))[0])
+                done, _ = await asyncio.wait(list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.counters["hedges"] += 1
+                    launch(hedged=True)
+                    continue
+
+                for task in done:
+                    provider, started, hedged = pending.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        response = {"success": False, "error": str(e)}
+                    ok = bool(response.get("success"))
+                    self.health[provider].record(self.clock() - started, ok)
+                    if ok:
+                        if hedged:
+                            self.counters["hedge_wins"] += 1
+                        return provider, response
+                    last_error = response.get("error", last_error)
+                    logger.warning(f"Provider {provider} failed: {last_error}")
+        finally:
+            # Losing hedges are cancelled; they have no outcome to record
+            for task, (provider, _, _) in pending.items():
+                task.cancel()
+                self.health[provider].release()
+
+        self.counters["exhausted"] += 1
+        return None, {"success": False, "error": last_error}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "preferred": self.preferred,
+            **self.counters,
+            "providers": {name: health.snapshot() for name, health in self.health.items()}
+        }
@@ -0,0 +1,137 @@
+"""
+TEC Provider Stub
+Local stand-in for the Gemini and OpenAI-compatible chat APIs, with injected
+latency and failures, for tests and provider benchmarks
+"""
+
+import asyncio
+import json
+import threading
+from typing import Dict, Optional
+import logging
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+
+class StubProviderServer:
+    """Serves ``/v1beta/models/<model>:generateContent`` (and the streaming
+    variant) plus ``/chat/completions`` on 127.0.0.1.
+
+    ``latency`` delays every response, ``token_delay`` spaces streamed
+    chunks and ``fail_status`` makes every call return that HTTP status.
+    Peak in-flight requests and distinct client connections are tracked
+    so pooling limits and keep-alive reuse can be asserted.
+    """
+
+    def __init__(self, latency: float = 0.0, token_delay: float = 0.0, reply: str = "Greetings, traveler.",
+                 fail_status: Optional[int] = None):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.reply = reply
+        self.fail_status = fail_status
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._connections = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    @property
+    def gemini_base_url(self) -> str:
+        return f"{self.url}/v1beta"
+
+    @property
+    def openai_base_url(self) -> str:
+        return self.url
+
+    @property
+    def connections(self) -> int:
+        return len(self._connections)
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/v1beta/models/{target}", self._gemini)
+        app.router.add_post("/chat/completions", self._chat_completions)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self) -> str:
+        """Serve from a dedicated event loop thread, so blocking clients can be measured too"""
+        self._thread_loop = asyncio.new_event_loop()
+        threading.Thread(target=self._thread_loop.run_forever, name="stub-provider", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(self.start(), self._thread_loop).result()
+
+    def stop_thread(self):
+        asyncio.run_coroutine_threadsafe(self.stop(), self._thread_loop).result()
+        self._thread_loop.call_soon_threadsafe(self._thread_loop.stop)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _enter(self, request: web.Request) -> Optional[web.Response]:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self._connections.add(id(request.transport))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.fail_status:
+            return web.Response(status=self.fail_status, text="stub provider failure")
+        return None
+
+    async def _sse(self, request: web.Request, events) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for event in events:
+            await response.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+        return response
+
+    def _words(self):
+        words = self.reply.split(" ")
+        return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+    async def _gemini(self, request: web.Request) -> web.StreamResponse:
+        try:
+            failure = await self._enter(request)
+            if failure is not None:
+                return failure
+            await request.json()
+            if request.match_info["target"].endswith(":streamGenerateContent"):
+                events = [{"candidates": [{"content": {"parts": [{"text": word}]}}]} for word in self._words()]
+                return await self._sse(request, events)
+            return web.json_response({"candidates": [{"content": {"parts": [{"text": self.reply}]}}]})
+        finally:
+            self.in_flight -= 1
+
+    async def _chat_completions(self, request: web.Request) -> web.StreamResponse:
+        try:
+            failure = await self._enter(request)
+            if failure is not None:
+                return failure
+            payload: Dict = await request.json()
+            if payload.get("stream"):
+                events = [{"choices": [{"delta": {"content": word}}]} for word in self._words()]
+                response = await self._sse(request, events)
+                await response.write(b"data: [DONE]\n\n")
+                return response
+            return web.json_response({"choices": [{"message": {"role": "assistant", "content": self.reply}}]})
+        finally:
+            self.in_flight -= 1
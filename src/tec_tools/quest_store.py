@@ -0,0 +1,391 @@
+"""
+TEC Quest Store
+SQLite storage for the Quest Log: indexed quest and Pomodoro queries, and
+productivity aggregates maintained incrementally as quests complete
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+XP_PER_LEVEL = 1000
+BASE_HEALTH = 100
+DEFAULT_BIOME = "Digital Codex Plains"
+DEFAULT_STATS = {"strength": 10, "intelligence": 10, "creativity": 10, "focus": 10, "resilience": 10}
+# Which RPG stat a completed quest trains
+CATEGORY_STATS = {
+    "development": "intelligence",
+    "learning": "intelligence",
+    "fitness": "strength",
+    "wellness": "resilience",
+    "reflection": "creativity",
+    "creative": "creativity"
+}
+# Sort key that puts quests without a due date after dated ones
+NO_DUE_DATE = "9999-12-31T23:59:59"
+
+
+class QuestStore:
+    """Quests, Pomodoro sessions and RPG profiles in SQLite.
+
+    Completing a quest or starting a Pomodoro session updates per-day,
+    per-hour and per-category counters in the same transaction, so
+    productivity stats read a bounded number of rows however long the
+    history grows. One connection is shared behind a lock, which also
+    makes ``":memory:"`` stores usable across threads.
+    """
+
+    def __init__(self, db_path: str = "data/quest_log.db", clock: Callable[[], datetime] = datetime.now):
+        self.db_path = db_path
+        self.clock = clock
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self.init_database()
+
+    def init_database(self):
+        with self._lock, self._conn as conn:
+            if self.db_path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS quests (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    difficulty TEXT,
+                    xp_reward INTEGER NOT NULL,
+                    health_reward INTEGER NOT NULL,
+                    category TEXT,
+                    estimated_time INTEGER,
+                    due_date TEXT,
+                    progress INTEGER DEFAULT 0,
+                    status TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    completed_at TEXT,
+                    completion_notes TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_quests_active
+                    ON quests(user_id, COALESCE(due_date, '{NO_DUE_DATE}'), created_at) WHERE status != 'completed';
+                CREATE INDEX IF NOT EXISTS idx_quests_completed
+                    ON quests(user_id, completed_at) WHERE status = 'completed';
+
+                CREATE TABLE IF NOT EXISTS pomodoro_sessions (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    quest_id TEXT,
+                    duration INTEGER NOT NULL,
+                    session_type TEXT NOT NULL,
+                    started_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_pomodoro_started ON pomodoro_sessions(user_id, started_at);
+
+                CREATE TABLE IF NOT EXISTS user_profiles (
+                    user_id TEXT PRIMARY KEY,
+                    total_xp INTEGER DEFAULT 0,
+                    health INTEGER DEFAULT {BASE_HEALTH},
+                    current_biome TEXT DEFAULT '{DEFAULT_BIOME}',
+                    stats TEXT NOT NULL,
+                    quests_created INTEGER DEFAULT 0,
+                    quests_completed INTEGER DEFAULT 0,
+                    work_sessions INTEGER DEFAULT 0,
+                    focus_minutes INTEGER DEFAULT 0,
+                    join_date TEXT NOT NULL,
+                    last_active TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS productivity_daily (
+                    user_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    quests_completed INTEGER DEFAULT 0,
+                    xp_earned INTEGER DEFAULT 0,
+                    health_earned INTEGER DEFAULT 0,
+                    focus_minutes INTEGER DEFAULT 0,
+                    pomodoro_sessions INTEGER DEFAULT 0,
+                    PRIMARY KEY (user_id, day)
+                );
+                CREATE TABLE IF NOT EXISTS productivity_hours (
+                    user_id TEXT NOT NULL,
+                    hour INTEGER NOT NULL,
+                    quests_completed INTEGER DEFAULT 0,
+                    PRIMARY KEY (user_id, hour)
+                );
+                CREATE TABLE IF NOT EXISTS productivity_categories (
+                    user_id TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    quests_completed INTEGER DEFAULT 0,
+                    PRIMARY KEY (user_id, category)
+                );
+            """)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Writes
+
+    def _ensure_profile(self, conn: sqlite3.Connection, user_id: str, now: str):
+        conn.execute("""
+            INSERT INTO user_profiles (user_id, stats, join_date, last_active) VALUES (?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET last_active = excluded.last_active
+        """, (user_id, json.dumps(DEFAULT_STATS), now, now))
+
+    def _bump_daily(self, conn: sqlite3.Connection, user_id: str, day: str, **deltas):
+        columns = ", ".join(deltas)
+        updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in deltas)
+        conn.execute(f"""
+            INSERT INTO productivity_daily (user_id, day, {columns}) VALUES (?, ?, {", ".join("?" * len(deltas))})
+            ON CONFLICT(user_id, day) DO UPDATE SET {updates}
+        """, (user_id, day, *deltas.values()))
+
+    def create_quest(self, user_id: str, title: str, description: str, difficulty: str = "medium",
+                     xp_reward: int = 50, health_reward: int = 10, category: str = "general",
+                     estimated_time: int = 60, due_date: Optional[str] = None) -> Dict[str, Any]:
+        now = self.clock().isoformat()
+        quest = {
+            "id": f"quest_{uuid.uuid4().hex[:12]}",
+            "userId": user_id,
+            "title": title,
+            "description": description,
+            "difficulty": difficulty,
+            "xp_reward": int(xp_reward),
+            "health_reward": int(health_reward),
+            "category": category,
+            "estimated_time": int(estimated_time),
+            "due_date": due_date,
+            "progress": 0,
+            "status": "pending",
+            "created_at": now
+        }
+        with self._lock, self._conn as conn:
+            conn.execute("""
+                INSERT INTO quests (id, user_id, title, description, difficulty, xp_reward, health_reward,
+                                    category, estimated_time, due_date, progress, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 'pending', ?)
+            """, (quest["id"], user_id, title, description, difficulty, quest["xp_reward"], quest["health_reward"],
+                  category, quest["estimated_time"], due_date, now))
+            self._ensure_profile(conn, user_id, now)
+            conn.execute("UPDATE user_profiles SET quests_created = quests_created + 1 WHERE user_id = ?", (user_id,))
+        return quest
+
+    def complete_quest(self, user_id: str, quest_id: str, notes: str = "") -> Optional[Dict[str, Any]]:
+        """Mark a quest completed and fold its rewards into the aggregates; None if not found/open"""
+        completed = self.clock()
+        now = completed.isoformat()
+        with self._lock, self._conn as conn:
+            row = conn.execute("""
+                SELECT * FROM quests WHERE id = ? AND user_id = ? AND status != 'completed'
+            """, (quest_id, user_id)).fetchone()
+            if row is None:
+                return None
+            self._ensure_profile(conn, user_id, now)
+            before = conn.execute("SELECT total_xp, stats FROM user_profiles WHERE user_id = ?", (user_id,)).fetchone()
+            stats = json.loads(before["stats"])
+            trained = CATEGORY_STATS.get(row["category"], "focus")
+            stats[trained] = stats.get(trained, 0) + 1
+
+            conn.execute("""
+                UPDATE quests SET status = 'completed', progress = 100, completed_at = ?, completion_notes = ?
+                WHERE id = ?
+            """, (now, notes, quest_id))
+            conn.execute("""
+                UPDATE user_profiles
+                SET total_xp = total_xp + ?, health = MIN(?, health + ?), stats = ?,
+                    quests_completed = quests_completed + 1
+                WHERE user_id = ?
+            """, (row["xp_reward"], BASE_HEALTH, row["health_reward"], json.dumps(stats), user_id))
+            self._bump_daily(conn, user_id, completed.date().isoformat(), quests_completed=1,
+                             xp_earned=row["xp_reward"], health_earned=row["health_reward"])
+            conn.execute("""
+                INSERT INTO productivity_hours (user_id, hour, quests_completed) VALUES (?, ?, 1)
+                ON CONFLICT(user_id, hour) DO UPDATE SET quests_completed = quests_completed + 1
+            """, (user_id, completed.hour))
+            conn.execute("""
+                INSERT INTO productivity_categories (user_id, category, quests_completed) VALUES (?, ?, 1)
+                ON CONFLICT(user_id, category) DO UPDATE SET quests_completed = quests_completed + 1
+            """, (user_id, row["category"] or "general"))
+
+        level_before = 1 + before["total_xp"] // XP_PER_LEVEL
+        level_after = 1 + (before["total_xp"] + row["xp_reward"]) // XP_PER_LEVEL
+        return {
+            "id": quest_id,
+            "title": row["title"],
+            "xp_earned": row["xp_reward"],
+            "health_earned": row["health_reward"],
+            "stat_trained": trained,
+            "level": level_after,
+            "leveled_up": level_after > level_before,
+            "completed_at": now
+        }
+
+    def start_pomodoro(self, user_id: str, quest_id: Optional[str] = None, duration: int = 25,
+                       session_type: str = "work") -> Dict[str, Any]:
+        started = self.clock()
+        session = {
+            "id": f"session_{uuid.uuid4().hex[:12]}",
+            "userId": user_id,
+            "questId": quest_id,
+            "duration": int(duration),
+            "session_type": session_type,
+            "started_at": started.isoformat(),
+            "status": "active"
+        }
+        is_work = session_type == "work"
+        with self._lock, self._conn as conn:
+            conn.execute("""
+                INSERT INTO pomodoro_sessions (id, user_id, quest_id, duration, session_type, started_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (session["id"], user_id, quest_id, session["duration"], session_type, session["started_at"]))
+            self._ensure_profile(conn, user_id, session["started_at"])
+            if is_work:
+                conn.execute("""
+                    UPDATE user_profiles SET work_sessions = work_sessions + 1, focus_minutes = focus_minutes + ?
+                    WHERE user_id = ?
+                """, (session["duration"], user_id))
+            self._bump_daily(conn, user_id, started.date().isoformat(), pomodoro_sessions=1,
+                             focus_minutes=session["duration"] if is_work else 0)
+        return session
+
+    # Reads
+
+    def active_quests(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Open quests, soonest due first (undated last)"""
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT * FROM quests
+                WHERE user_id = ? AND status != 'completed'
+                ORDER BY COALESCE(due_date, '{NO_DUE_DATE}'), created_at
+                LIMIT ?
+            """, (user_id, limit)).fetchall()
+        return [self._quest(row) for row in rows]
+
+    def quest_history(self, user_id: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                      limit: int = 50) -> List[Dict[str, Any]]:
+        """Completed quests in [since, until), most recent first"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT * FROM quests
+                WHERE user_id = ? AND status = 'completed' AND completed_at >= ? AND completed_at < ?
+                ORDER BY completed_at DESC
+                LIMIT ?
+            """, (user_id, since.isoformat() if since else "", until.isoformat() if until else NO_DUE_DATE,
+                  limit)).fetchall()
+        return [dict(self._quest(row), xp_earned=row["xp_reward"], health_earned=row["health_reward"],
+                     notes=row["completion_notes"]) for row in rows]
+
+    def pomodoro_sessions(self, user_id: str, since: Optional[datetime] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        now = self.clock()
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT * FROM pomodoro_sessions WHERE user_id = ? AND started_at >= ?
+                ORDER BY started_at DESC LIMIT ?
+            """, (user_id, since.isoformat() if since else "", limit)).fetchall()
+        sessions = []
+        for row in rows:
+            ends_at = datetime.fromisoformat(row["started_at"]) + timedelta(minutes=row["duration"])
+            sessions.append({
+                "id": row["id"],
+                "quest_id": row["quest_id"],
+                "duration": row["duration"],
+                "session_type": row["session_type"],
+                "started_at": row["started_at"],
+                "ends_at": ends_at.isoformat(),
+                "status": "completed" if ends_at <= now else "active"
+            })
+        return sessions
+
+    def profile(self, user_id: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM user_profiles WHERE user_id = ?", (user_id,)).fetchone()
+        if row is None:
+            now = self.clock().isoformat()
+            row = {"total_xp": 0, "health": BASE_HEALTH, "current_biome": DEFAULT_BIOME,
+                   "stats": json.dumps(DEFAULT_STATS), "quests_completed": 0, "join_date": now, "last_active": now}
+        return {
+            "level": 1 + row["total_xp"] // XP_PER_LEVEL,
+            "xp": row["total_xp"] % XP_PER_LEVEL,
+            "xp_to_next_level": XP_PER_LEVEL - row["total_xp"] % XP_PER_LEVEL,
+            "health": row["health"],
+            "max_health": BASE_HEALTH,
+            "current_biome": row["current_biome"],
+            "stats": json.loads(row["stats"]),
+            "total_quests_completed": row["quests_completed"],
+            "total_xp_earned": row["total_xp"],
+            "join_date": row["join_date"],
+            "last_active": row["last_active"]
+        }
+
+    def productivity_stats(self, user_id: str) -> Dict[str, Any]:
+        """Today / last-7-days totals and trends from the incremental aggregates"""
+        today = self.clock().date()
+        week_start = (today - timedelta(days=6)).isoformat()
+        with self._lock:
+            days = {row["day"]: dict(row) for row in self._conn.execute("""
+                SELECT * FROM productivity_daily WHERE user_id = ? AND day >= ?
+            """, (user_id, week_start))}
+            totals = self._conn.execute("""
+                SELECT quests_created, quests_completed, work_sessions, focus_minutes
+                FROM user_profiles WHERE user_id = ?
+            """, (user_id,)).fetchone()
+            hours = self._conn.execute("""
+                SELECT hour FROM productivity_hours WHERE user_id = ?
+                ORDER BY quests_completed DESC, hour LIMIT 3
+            """, (user_id,)).fetchall()
+            category = self._conn.execute("""
+                SELECT category, quests_completed FROM productivity_categories WHERE user_id = ?
+                ORDER BY quests_completed DESC, category LIMIT 1
+            """, (user_id,)).fetchone()
+
+        counters = ("quests_completed", "xp_earned", "focus_minutes", "pomodoro_sessions")
+        today_row = days.get(today.isoformat(), {})
+        summary = {
+            "today": {counter: today_row.get(counter, 0) for counter in counters},
+            "this_week": {counter: sum(day[counter] for day in days.values()) for counter in counters}
+        }
+        for period in summary.values():
+            period["focus_time"] = period.pop("focus_minutes")
+            period["productivity_score"] = min(100, period["quests_completed"] * 10 + period["focus_time"] // 5)
+
+        created = totals["quests_created"] if totals else 0
+        completed = totals["quests_completed"] if totals else 0
+        work_sessions = totals["work_sessions"] if totals else 0
+        trends = {
+            "completion_rate": round(100 * completed / created) if created else 0,
+            "average_session_length": round(totals["focus_minutes"] / work_sessions, 1) if work_sessions else 0,
+            "peak_productivity_hours": [row["hour"] for row in hours],
+            "most_productive_category": category["category"] if category else None
+        }
+        insights = []
+        if hours:
+            insights.append(f"Your productivity peaks at {hours[0]['hour']}:00 - schedule challenging tasks then")
+        if category:
+            insights.append(f"{category['category'].title()} quests are your most completed "
+                            f"({category['quests_completed']} so far)")
+        return dict(summary, trends=trends, insights=insights)
+
+    @staticmethod
+    def _quest(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "difficulty": row["difficulty"],
+            "xp_reward": row["xp_reward"],
+            "health_reward": row["health_reward"],
+            "category": row["category"],
+            "estimated_time": row["estimated_time"],
+            "progress": row["progress"],
+            "status": row["status"],
+            "created_at": row["created_at"],
+            "due_date": row["due_date"],
+            "completed_at": row["completed_at"]
+        }
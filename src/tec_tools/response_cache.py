@@ -0,0 +1,174 @@
+"""
+TEC Response Cache
+Bounded LRU/TTL cache for generated NPC dialogue, keyed on normalized
+conversation state and shared across NPCs of the same template
+"""
+
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+import logging
+
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+NPC_NAME_PLACEHOLDER = "{npc_name}"
+
+# Phrasings that should share one cached reply
+MESSAGE_ALIASES = {
+    "hello": ["hi", "hey", "hiya", "howdy", "greetings", "hello there", "hi there", "hey there",
+              "good morning", "good afternoon", "good evening", "well met", "yo", "sup", "hail"],
+    "goodbye": ["bye", "farewell", "see you", "see ya", "later", "good bye", "so long", "take care"],
+    "thank you": ["thanks", "thank you so much", "thanks a lot", "many thanks", "ty", "cheers"],
+    "how are you": ["how are you doing", "how is it going", "hows it going", "how do you do",
+                    "how have you been", "whats up", "what is up"],
+    "who are you": ["what is your name", "whats your name", "who are u", "tell me about yourself"],
+    "what do you sell": ["what are you selling", "show me your wares", "what do you have for sale",
+                         "what have you got", "can i see your wares", "lets trade", "i want to trade"],
+}
+_ALIAS_LOOKUP = {alias: canonical for canonical, aliases in MESSAGE_ALIASES.items() for alias in aliases}
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+_STRETCHED = re.compile(r"(\w)\1{2,}")
+
+
+def canonicalize_message(message: str) -> str:
+    """Case, punctuation, whitespace and stretched letters folded; common phrasings aliased.
+
+    "Hello!!", "  hey there " and "Heyyy" all map to "hello".
+    """
+    text = unicodedata.normalize("NFKC", message).lower().replace("'", "").replace("’", "")
+    text = _SPACES.sub(" ", _NON_WORD.sub(" ", text)).strip()
+    text = _STRETCHED.sub(r"\1", text)
+    return _ALIAS_LOOKUP.get(text, text)
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class DialogueResponseCache:
+    """Generated dialogue shared by every NPC with the same conversational state.
+
+    Entries are keyed on ``(npc_type, mood, relationship_level, canonical
+    message)`` in a bounded LRU with TTL, so two merchants in the same mood
+    answering "Hi!" and "hello" share one model call. The speaking NPC's
+    name is templated out on store and substituted back on hit.
+
+    With an ``embed`` function, a miss falls back to the most similar
+    cached message within the same scope whose cosine similarity reaches
+    ``similarity_threshold``.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 300.0, embed: Optional[Callable[[str], Sequence[float]]] = None,
+                 similarity_threshold: float = 0.92, max_vectors_per_scope: int = 256,
+                 timer: Callable[[], float] = time.monotonic):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl, name="npc_dialogue", timer=timer)
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self.max_vectors_per_scope = max_vectors_per_scope
+        self._vectors: Dict[Tuple, "OrderedDict[str, Sequence[float]]"] = {}
+        self._lock = threading.Lock()
+        self.counters = {"lookups": 0, "exact_hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0}
+
+    @staticmethod
+    def scope(npc_type: str, mood: str, relationship_level: str) -> Tuple[str, str, str]:
+        return (npc_type or "civilian", mood or "neutral", relationship_level or "neutral")
+
+    def key(self, npc_type: str, mood: str, relationship_level: str, message: str) -> Hashable:
+        return self.scope(npc_type, mood, relationship_level) + (canonicalize_message(message),)
+
+    def get(self, npc_type: str, mood: str, relationship_level: str, message: str,
+            npc_name: str = "") -> Optional[Dict[str, Any]]:
+        """Cached response for this state and message (with ``npc_name`` filled in), or None"""
+        self.counters["lookups"] += 1
+        key = self.key(npc_type, mood, relationship_level, message)
+        response = self.cache.get(key)
+        if response is not None:
+            self.counters["exact_hits"] += 1
+            return self._personalize(response, npc_name)
+
+        if self.embed is not None:
+            response = self._similar(key[:3], key[3])
+            if response is not None:
+                self.counters["semantic_hits"] += 1
+                return self._personalize(response, npc_name)
+
+        self.counters["misses"] += 1
+        return None
+
+    def set(self, npc_type: str, mood: str, relationship_level: str, message: str,
+            response: Dict[str, Any], npc_name: str = "") -> bool:
+        """Cache a successful response; failures are never cached"""
+        if not response.get("success") or not response.get("content"):
+            return False
+        key = self.key(npc_type, mood, relationship_level, message)
+        stored = dict(response)
+        if npc_name:
+            stored["content"] = stored["content"].replace(npc_name, NPC_NAME_PLACEHOLDER)
+        self.cache.set(key, stored)
+        self.counters["stores"] += 1
+
+        if self.embed is not None:
+            try:
+                vector = self.embed(key[3])
+            except Exception as e:
+                logger.error(f"Error embedding dialogue cache key: {e}")
+                return True
+            with self._lock:
+                vectors = self._vectors.setdefault(key[:3], OrderedDict())
+                vectors[key[3]] = vector
+                vectors.move_to_end(key[3])
+                while len(vectors) > self.max_vectors_per_scope:
+                    vectors.popitem(last=False)
+        return True
+
+    def _similar(self, scope: Tuple, canonical: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            candidates = list(self._vectors.get(scope, {}).items())
+        if not candidates:
+            return None
+        try:
+            query = self.embed(canonical)
+        except Exception as e:
+            logger.error(f"Error embedding dialogue message: {e}")
+            return None
+
+        best, best_score = None, self.similarity_threshold
+        for text, vector in candidates:
+            score = cosine_similarity(query, vector)
+            if score >= best_score:
+                best, best_score = text, score
+        if best is None:
+            return None
+
+        response = self.cache.get(scope + (best,))
+        if response is None:
+            # Expired or evicted from the LRU; drop its vector too
+            with self._lock:
+                self._vectors.get(scope, {}).pop(best, None)
+        return response
+
+    @staticmethod
+    def _personalize(response: Dict[str, Any], npc_name: str) -> Dict[str, Any]:
+        personalized = dict(response)
+        personalized["content"] = personalized["content"].replace(NPC_NAME_PLACEHOLDER, npc_name)
+        personalized["cached"] = True
+        return personalized
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["lookups"]
+        hits = self.counters["exact_hits"] + self.counters["semantic_hits"]
+        return {
+            **self.counters,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "semantic": self.embed is not None,
+            "lru": self.cache.stats()
+        }
@@ -0,0 +1,62 @@
+"""
+TEC Single Flight
+Coalesces concurrent identical async calls onto one in-flight task
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(*parts: Any) -> str:
+    """Stable digest of JSON-serializable request parts (prompts, message lists)"""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class SingleFlight:
+    """While a call for ``key`` is running, later callers await the same task.
+
+    The work runs as its own task, so a caller that is cancelled (e.g. a
+    disconnected player) does not cancel it for the others. Keys are
+    scoped to the running event loop. An exception is re-raised to every
+    waiter, and nothing is remembered once the call completes.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self.counters = {"calls": 0, "executions": 0, "coalesced": 0, "peak_waiters": 0}
+        self._waiters: Dict[Tuple[int, Hashable], int] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        scoped = (id(asyncio.get_running_loop()), key)
+        self.counters["calls"] += 1
+        task = self._in_flight.get(scoped)
+        if task is None:
+            self.counters["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[scoped] = task
+            self._waiters[scoped] = 0
+            task.add_done_callback(lambda _: self._forget(scoped, task))
+        else:
+            self.counters["coalesced"] += 1
+        self._waiters[scoped] += 1
+        self.counters["peak_waiters"] = max(self.counters["peak_waiters"], self._waiters[scoped])
+        return await asyncio.shield(task)
+
+    def _forget(self, scoped: Tuple[int, Hashable], task: asyncio.Task):
+        if self._in_flight.get(scoped) is task:
+            del self._in_flight[scoped]
+            self._waiters.pop(scoped, None)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.counters["calls"]
+        return {
+            **self.counters,
+            "in_flight": len(self._in_flight),
+            "coalesced_ratio": round(self.counters["coalesced"] / calls, 4) if calls else 0.0
+        }
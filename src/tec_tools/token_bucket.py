@@ -0,0 +1,68 @@
+"""
+TEC Token Bucket
+Thread-safe token-bucket rate limiter for outbound API calls
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class TokenBucket:
+    """Allows ``rate`` calls per ``per`` seconds with bursts up to ``capacity``.
+
+    The bucket starts full and refills continuously. ``capacity`` defaults
+    to one second's worth of calls (at least one), so slow limits such as
+    30/minute do not allow a burst of 30.
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.fill_rate = rate / per
+        self.capacity = capacity if capacity is not None else max(1.0, self.fill_rate)
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.granted = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` if available and return 0, else return the seconds until they will be"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                self.granted += 1
+                return 0.0
+            return (tokens - self.tokens) / self.fill_rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Wait for ``tokens``; False if that would take longer than ``timeout`` seconds"""
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return True
+            if deadline is not None and self.clock() + wait > deadline:
+                with self._lock:
+                    self.throttled += 1
+                return False
+            self.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill()
+            return {
+                "rate_per_second": round(self.fill_rate, 4),
+                "capacity": self.capacity,
+                "available": round(self.tokens, 3),
+                "granted": self.granted,
+                "throttled": self.throttled
+            }
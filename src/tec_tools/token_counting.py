@@ -0,0 +1,223 @@
+"""
+TEC Token Counting
+Pluggable tokenizers (offline BPE vocab files, optional tiktoken, character
+heuristic fallback) behind a content-hash keyed LRU cache
+"""
+
+import base64
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+# Pre-tokenization patterns; \p{L}/\p{N} classes are approximated with ``re``
+PRETOKENIZE_PATTERNS = {
+    "gpt2": r"""'s|'t|'re|'ve|'m|'ll|'d| ?[^\W\d_]+| ?\d+| ?[^\s\w]+|\s+(?!\S)|\s+""",
+    "cl100k_base": r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\w]?[^\W\d_]+|\d{1,3}| ?[^\s\w]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+""",
+}
+PRETOKENIZE_PATTERNS["r50k_base"] = PRETOKENIZE_PATTERNS["gpt2"]
+PRETOKENIZE_PATTERNS["o200k_base"] = PRETOKENIZE_PATTERNS["cl100k_base"]
+
+# Model prefix -> BPE encoding name; models without a public vocab use the heuristic
+MODEL_ENCODINGS = {
+    "gpt-4o": "o200k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-3.5": "cl100k_base",
+    "github-gpt-4": "cl100k_base",
+    "github-gpt-3.5": "cl100k_base",
+    "openai-gpt-4": "cl100k_base",
+    "openai-gpt-3.5": "cl100k_base",
+}
+
+
+class HeuristicTokenizer:
+    """Character-ratio estimate used when no vocabulary is available"""
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+        self.name = f"heuristic-{chars_per_token}"
+        self.exact = False
+
+    def count(self, text: str) -> int:
+        return max(1, int(len(text) / self.chars_per_token))
+
+
+class BPETokenizer:
+    """Byte-level BPE token counter over an offline ``.tiktoken`` rank file.
+
+    The vocabulary (``<base64 token> <rank>`` per line) is only read on first
+    use, so registering many encodings costs nothing until they are counted.
+    """
+
+    def __init__(self, vocab_path: str, encoding: str, piece_cache_size: int = 65536):
+        self.vocab_path = Path(vocab_path)
+        self.encoding = encoding
+        self.name = f"bpe-{encoding}"
+        self.exact = True
+        self._pattern = re.compile(PRETOKENIZE_PATTERNS.get(encoding, PRETOKENIZE_PATTERNS["gpt2"]))
+        self._ranks: Optional[Dict[bytes, int]] = None
+        self._load_lock = threading.Lock()
+        self._piece_cache: Dict[bytes, int] = {}
+        self._piece_cache_size = piece_cache_size
+
+    def _load(self) -> Dict[bytes, int]:
+        if self._ranks is None:
+            with self._load_lock:
+                if self._ranks is None:
+                    ranks = {}
+                    with open(self.vocab_path, "rb") as handle:
+                        for line in handle:
+                            if line.strip():
+                                token, rank = line.split()
+                                ranks[base64.b64decode(token)] = int(rank)
+                    logger.info(f"Loaded {len(ranks)} BPE ranks for {self.encoding}")
+                    self._ranks = ranks
+        return self._ranks
+
+    def _count_piece(self, piece: bytes, ranks: Dict[bytes, int]) -> int:
+        if piece in ranks:
+            return 1
+        cached = self._piece_cache.get(piece)
+        if cached is not None:
+            return cached
+
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            best_rank = None
+            best_index = -1
+            for i in range(len(parts) - 1):
+                rank = ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank, best_index = rank, i
+            if best_rank is None:
+                break
+            parts[best_index:best_index + 2] = [parts[best_index] + parts[best_index + 1]]
+
+        if len(self._piece_cache) >= self._piece_cache_size:
+            self._piece_cache.clear()
+        self._piece_cache[piece] = len(parts)
+        return len(parts)
+
+    def count(self, text: str) -> int:
+        ranks = self._load()
+        return sum(
+            self._count_piece(match.encode("utf-8"), ranks)
+            for match in self._pattern.findall(text)
+        )
+
+
+class TiktokenTokenizer:
+    """Exact counts through the optional ``tiktoken`` package"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        self.name = f"tiktoken-{encoding}"
+        self.exact = True
+        self._encoder = None
+
+    def count(self, text: str) -> int:
+        if self._encoder is None:
+            self._encoder = tiktoken.get_encoding(self.encoding)
+        return len(self._encoder.encode(text, disallowed_special=()))
+
+
+class TokenCounter:
+    """Resolves a tokenizer per model and caches counts by content hash"""
+
+    def __init__(self, vocab_dir: Optional[str] = None, cache_size: int = 16384,
+                 heuristics: Optional[Dict[str, float]] = None):
+        self.vocab_dir = Path(vocab_dir or os.getenv("TEC_TOKENIZER_DIR", "data/tokenizers"))
+        self.cache = TTLCache(maxsize=cache_size, ttl=float("inf"), name="token_counts")
+        # Same per-model character ratios TECTokenManager has always used
+        self.heuristics = heuristics or {
+            "gpt-4": 3.5,
+            "gpt-3.5": 4.0,
+            "gemini": 4.2
+        }
+        self.model_encodings = dict(MODEL_ENCODINGS)
+        self._tokenizers: Dict[str, object] = {}
+        self._encodings: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, model_prefix: str, tokenizer):
+        """Override the tokenizer used for models starting with ``model_prefix``"""
+        with self._lock:
+            self._tokenizers = {k: v for k, v in self._tokenizers.items()
+                                if not k.startswith(model_prefix)}
+            self._encodings[f"custom:{model_prefix}"] = tokenizer
+            self.model_encodings[model_prefix] = f"custom:{model_prefix}"
+
+    def _encoding_tokenizer(self, encoding: str):
+        if encoding not in self._encodings:
+            vocab_file = self.vocab_dir / f"{encoding}.tiktoken"
+            if vocab_file.exists():
+                self._encodings[encoding] = BPETokenizer(str(vocab_file), encoding)
+            elif TIKTOKEN_AVAILABLE:
+                self._encodings[encoding] = TiktokenTokenizer(encoding)
+            else:
+                self._encodings[encoding] = None
+        return self._encodings[encoding]
+
+    def tokenizer_for(self, model: str):
+        tokenizer = self._tokenizers.get(model)
+        if tokenizer is not None:
+            return tokenizer
+        with self._lock:
+            encoding = next((self.model_encodings[prefix] for prefix in
+                             sorted(self.model_encodings, key=len, reverse=True)
+                             if model.startswith(prefix)), None)
+            tokenizer = self._encoding_tokenizer(encoding) if encoding else None
+            if tokenizer is None:
+                ratio = next((value for prefix, value in self.heuristics.items()
+                              if model.startswith(prefix)), 4.0)
+                tokenizer = HeuristicTokenizer(ratio)
+            self._tokenizers[model] = tokenizer
+            return tokenizer
+
+    def _count_uncached(self, tokenizer, text: str) -> int:
+        try:
+            return tokenizer.count(text)
+        except Exception as e:
+            if isinstance(tokenizer, HeuristicTokenizer):
+                raise
+            logger.warning(f"{tokenizer.name} failed ({e}); falling back to heuristic")
+            return HeuristicTokenizer().count(text)
+
+    def count(self, text: str, model: str = "gemini-pro") -> int:
+        tokenizer = self.tokenizer_for(model)
+        key = (tokenizer.name, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+        return self.cache.get_or_load(key, lambda: self._count_uncached(tokenizer, text))
+
+    def count_batch(self, texts: Iterable[str], model: str = "gemini-pro") -> List[int]:
+        """Count many texts with one tokenizer lookup; duplicates are counted once"""
+        tokenizer = self.tokenizer_for(model)
+        counts: List[int] = []
+        seen: Dict[bytes, int] = {}
+        for text in texts:
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            if digest not in seen:
+                seen[digest] = self.cache.get_or_load(
+                    (tokenizer.name, digest),
+                    lambda: self._count_uncached(tokenizer, text)
+                )
+            counts.append(seen[digest])
+        return counts
+
+    def stats(self) -> Dict[str, object]:
+        stats = self.cache.stats()
+        stats["tokenizers"] = {model: tok.name for model, tok in self._tokenizers.items()}
+        return stats
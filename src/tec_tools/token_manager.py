@@ -5,12 +5,17 @@ Tracks API usage, costs, and optimization for character memory systems
 
 import json
 import sqlite3
+import time
 import datetime
 from dataclasses import dataclass, asdict
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 import logging
 
+from .token_counting import TokenCounter
+from .context_packing import ContextPacker
+from .usage_ingestion import SpoolLockedError, UsageIngestBuffer
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -41,10 +46,23 @@ class UsageStats:
 class TECTokenManager:
     """Manages token usage tracking and optimization for TEC system"""
     
-    def __init__(self, db_path: str = "src/tec_tools/token_usage.db"):
+    def __init__(self, db_path: str = "src/tec_tools/token_usage.db", tokenizer_dir: Optional[str] = None,
+                 raw_retention_days: int = 30, hourly_retention_days: int = 90,
+                 buffered: bool = False, flush_interval: float = 2.0, max_pending: int = 500,
+                 spool_dir: Optional[str] = None):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
         
+        # Raw rows older than this only survive in the rollups; daily rollups are kept forever
+        self.raw_retention_days = raw_retention_days
+        self.hourly_retention_days = hourly_retention_days
+        self.retention_interval_seconds = 3600
+        self._last_retention = 0.0
+        
+        # Exact BPE counts where a vocab is available, heuristic otherwise; cached by content hash
+        self.token_counter = TokenCounter(vocab_dir=tokenizer_dir)
+        self.context_packer = ContextPacker(self.estimate_tokens_batch, summarize=self.summarize_memory)
+        
         # Token cost estimates (per 1K tokens)
         self.cost_per_1k_tokens = {
             "gemini-pro": 0.0005,  # Estimated
@@ -64,6 +82,22 @@ class TECTokenManager:
         
         self.init_database()
         
+        # Buffered ingestion: log_usage only queues; batches commit on an interval/size threshold
+        self.ingest_buffer = None
+        if buffered:
+            try:
+                self.ingest_buffer = UsageIngestBuffer(
+                    self, TokenUsage,
+                    spool_dir=spool_dir or str(self.db_path.parent / f"{self.db_path.stem}_spool"),
+                    flush_interval=flush_interval,
+                    max_pending=max_pending,
+                    housekeeping=self._retention_if_due
+                )
+                self.ingest_buffer.start()
+            except SpoolLockedError as e:
+                # A second process on the same database writes through instead
+                logger.warning(f"{e}; logging token usage unbuffered")
+        
     def init_database(self):
         """Initialize token usage tracking database"""
         try:
@@ -110,25 +144,205 @@ class TECTokenManager:
                     )
                 """)
                 
+                # Incremental rollups per (bucket, character, model), maintained by log_usage
+                for table, bucket in (("token_usage_hourly", "hour"), ("token_usage_daily", "day")):
+                    conn.execute(f"""
+                        CREATE TABLE IF NOT EXISTS {table} (
+                            {bucket} TEXT NOT NULL,
+                            character TEXT NOT NULL,
+                            model TEXT NOT NULL,
+                            requests INTEGER NOT NULL DEFAULT 0,
+                            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+                            completion_tokens INTEGER NOT NULL DEFAULT 0,
+                            total_tokens INTEGER NOT NULL DEFAULT 0,
+                            total_cost REAL NOT NULL DEFAULT 0.0,
+                            memory_context_total INTEGER NOT NULL DEFAULT 0,
+                            avatar_requests INTEGER NOT NULL DEFAULT 0,
+                            PRIMARY KEY ({bucket}, character, model)
+                        )
+                    """)
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_character ON {table}(character, {bucket})")
+                
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_token_usage_timestamp ON token_usage(timestamp)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS token_usage_meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL
+                    )
+                """)
+                
+                # Databases from before the rollups existed get them rebuilt from raw rows once
+                if conn.execute("SELECT 1 FROM token_usage_meta WHERE key = 'rollups_built'").fetchone() is None:
+                    self._rebuild_rollups(conn)
+                    conn.execute("INSERT INTO token_usage_meta (key, value) VALUES ('rollups_built', ?)",
+                                 (datetime.datetime.now().isoformat(),))
+                
                 conn.commit()
                 logger.info("Token usage database initialized")
                 
         except Exception as e:
             logger.error(f"Failed to initialize token database: {e}")
     
+    def _rebuild_rollups(self, conn: sqlite3.Connection):
+        """Recompute both rollup tables from the raw token_usage rows"""
+        for table, bucket, width in (("token_usage_hourly", "hour", 13), ("token_usage_daily", "day", 10)):
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"""
+                INSERT INTO {table}
+                ({bucket}, character, model, requests, prompt_tokens, completion_tokens,
+                 total_tokens, total_cost, memory_context_total, avatar_requests)
+                SELECT substr(timestamp, 1, {width}), character, model, COUNT(*),
+                       SUM(prompt_tokens), SUM(completion_tokens), SUM(total_tokens),
+                       SUM(estimated_cost), SUM(memory_context_size),
+                       SUM(CASE WHEN avatar_processing THEN 1 ELSE 0 END)
+                FROM token_usage
+                GROUP BY substr(timestamp, 1, {width}), character, model
+            """)
+    
+    def _apply_rollups(self, conn: sqlite3.Connection, usages: List[TokenUsage]):
+        """Fold usage records into the hourly and daily rollups"""
+        for table, bucket, width in (("token_usage_hourly", "hour", 13), ("token_usage_daily", "day", 10)):
+            # One upsert per (bucket, character, model) however many records share it
+            deltas: Dict[tuple, List[Any]] = {}
+            for usage in usages:
+                delta = deltas.setdefault((usage.timestamp[:width], usage.character, usage.model),
+                                          [0, 0, 0, 0, 0.0, 0, 0])
+                delta[0] += 1
+                delta[1] += usage.prompt_tokens
+                delta[2] += usage.completion_tokens
+                delta[3] += usage.total_tokens
+                delta[4] += usage.estimated_cost
+                delta[5] += usage.memory_context_size
+                delta[6] += 1 if usage.avatar_processing else 0
+            
+            conn.executemany(f"""
+                INSERT INTO {table}
+                ({bucket}, character, model, requests, prompt_tokens, completion_tokens,
+                 total_tokens, total_cost, memory_context_total, avatar_requests)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT({bucket}, character, model) DO UPDATE SET
+                    requests = requests + excluded.requests,
+                    prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                    completion_tokens = completion_tokens + excluded.completion_tokens,
+                    total_tokens = total_tokens + excluded.total_tokens,
+                    total_cost = total_cost + excluded.total_cost,
+                    memory_context_total = memory_context_total + excluded.memory_context_total,
+                    avatar_requests = avatar_requests + excluded.avatar_requests
+            """, [key + tuple(delta) for key, delta in deltas.items()])
+    
+    def _write_usages(self, conn: sqlite3.Connection, usages: List[TokenUsage]):
+        """Insert raw rows, fold rollups and upsert each session once"""
+        conn.executemany("""
+            INSERT INTO token_usage 
+            (session_id, timestamp, character, request_type, prompt_tokens, 
+             completion_tokens, total_tokens, estimated_cost, model, 
+             memory_context_size, avatar_processing)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (usage.session_id, usage.timestamp, usage.character, usage.request_type,
+             usage.prompt_tokens, usage.completion_tokens, usage.total_tokens,
+             usage.estimated_cost, usage.model, usage.memory_context_size,
+             usage.avatar_processing)
+            for usage in usages
+        ])
+        
+        # Keep the hourly/daily rollups in the same transaction as the raw rows
+        self._apply_rollups(conn, usages)
+        
+        sessions: Dict[str, List[Any]] = {}
+        for usage in usages:
+            session = sessions.setdefault(usage.session_id, [usage.timestamp, usage.timestamp, usage.character, 0, 0.0, 0])
+            session[1] = usage.timestamp
+            session[3] += usage.total_tokens
+            session[4] += usage.estimated_cost
+            session[5] += 1
+        
+        conn.executemany("""
+            INSERT INTO usage_sessions 
+            (session_id, start_time, end_time, character, total_tokens, total_cost, request_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(session_id) DO UPDATE SET
+                end_time = excluded.end_time,
+                total_tokens = total_tokens + excluded.total_tokens,
+                total_cost = total_cost + excluded.total_cost,
+                request_count = request_count + excluded.request_count
+        """, [(session_id, *session) for session_id, session in sessions.items()])
+    
+    def write_usage_batch(self, usages: List[TokenUsage], batch_seq: Optional[int] = None):
+        """Commit usage records in one transaction; raises on failure so callers can retry"""
+        with sqlite3.connect(self.db_path) as conn:
+            self._write_usages(conn, usages)
+            if batch_seq is not None:
+                conn.execute("INSERT OR REPLACE INTO token_usage_meta (key, value) VALUES ('ingest_seq', ?)",
+                             (str(batch_seq),))
+            conn.commit()
+    
+    def get_ingest_seq(self) -> int:
+        """Last batch number committed by the ingestion buffer"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT value FROM token_usage_meta WHERE key = 'ingest_seq'").fetchone()
+            return int(row[0]) if row else 0
+    
+    def flush_usage(self) -> int:
+        """Write any buffered usage records now"""
+        return self.ingest_buffer.flush() if self.ingest_buffer else 0
+    
+    def close(self):
+        """Flush buffered usage and stop the background flusher"""
+        if self.ingest_buffer:
+            self.ingest_buffer.close()
+    
+    def _retention_if_due(self):
+        if time.monotonic() - self._last_retention > self.retention_interval_seconds:
+            self.apply_retention()
+    
+    def apply_retention(self) -> Dict[str, int]:
+        """Drop raw rows and hourly rollups past their retention window.
+        
+        Buffered managers run this hourly on the ingest flusher thread;
+        unbuffered ones leave it to the caller (e.g. a scheduled job).
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                raw = conn.execute(
+                    "DELETE FROM token_usage WHERE timestamp < date('now', ?)",
+                    (f"-{self.raw_retention_days} days",)
+                ).rowcount
+                hourly = conn.execute(
+                    "DELETE FROM token_usage_hourly WHERE hour < date('now', ?)",
+                    (f"-{self.hourly_retention_days} days",)
+                ).rowcount
+                conn.commit()
+            self._last_retention = time.monotonic()
+            if raw or hourly:
+                logger.info(f"Token usage retention removed {raw} raw rows and {hourly} hourly rollups")
+            return {"raw_rows_deleted": raw, "hourly_rows_deleted": hourly}
+        except Exception as e:
+            logger.error(f"Failed to apply token usage retention: {e}")
+            return {"raw_rows_deleted": 0, "hourly_rows_deleted": 0}
+    
+    def rebuild_rollups(self) -> bool:
+        """Recompute rollups from raw rows (loses history already downsampled away)"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                self._rebuild_rollups(conn)
+                conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to rebuild token usage rollups: {e}")
+            return False
+    
     def estimate_tokens(self, text: str, model: str = "gemini-pro") -> int:
         """Estimate token count for text"""
-        # Simple estimation: ~4 characters per token for most models
-        if model.startswith("gpt-4"):
-            chars_per_token = 3.5  # GPT-4 is more efficient
-        elif model.startswith("gpt-3.5"):
-            chars_per_token = 4.0
-        elif model.startswith("gemini"):
-            chars_per_token = 4.2  # Gemini tokenization
-        else:
-            chars_per_token = 4.0  # Default
-        
-        return max(1, int(len(text) / chars_per_token))
+        return self.token_counter.count(text, model)
+    
+    def estimate_tokens_batch(self, texts: List[str], model: str = "gemini-pro") -> List[int]:
+        """Estimate token counts for many texts in one call"""
+        return self.token_counter.count_batch(texts, model)
+    
+    def get_tokenizer_stats(self) -> Dict[str, Any]:
+        """Get token count cache and tokenizer selection stats"""
+        return self.token_counter.stats()
     
     def get_token_limits(self, model: str = "gemini-pro") -> Dict[str, int]:
         """Get token limits for different models"""
@@ -145,10 +359,12 @@ class TECTokenManager:
         }
             
     def log_usage(self, model: str, prompt_tokens: int, completion_tokens: int, 
-                 character: str = "default", session_id: str = None) -> UsageStats:
+                 character: str = "default", session_id: str = None,
+                 memory_context_size: int = 0, avatar_processing: bool = False) -> UsageStats:
         """Log token usage and return stats"""
+        now = datetime.datetime.now()
         if session_id is None:
-            session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            session_id = f"session_{now.strftime('%Y%m%d_%H%M%S')}"
         
         total_tokens = prompt_tokens + completion_tokens
         estimated_cost = self.estimate_cost(total_tokens, model)
@@ -156,76 +372,37 @@ class TECTokenManager:
         # Create usage record
         usage = TokenUsage(
             session_id=session_id,
-            timestamp=datetime.now().isoformat(),
+            timestamp=now.isoformat(),
             character=character,
             request_type="chat",
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
             total_tokens=total_tokens,
             estimated_cost=estimated_cost,
-            model=model
+            model=model,
+            memory_context_size=memory_context_size,
+            avatar_processing=avatar_processing
         )
         
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Insert usage record
-                conn.execute("""
-                    INSERT INTO token_usage 
-                    (session_id, timestamp, character, request_type, prompt_tokens, 
-                     completion_tokens, total_tokens, estimated_cost, model, 
-                     memory_context_size, avatar_processing)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    usage.session_id, usage.timestamp, usage.character, usage.request_type,
-                    usage.prompt_tokens, usage.completion_tokens, usage.total_tokens,
-                    usage.estimated_cost, usage.model, usage.memory_context_size,
-                    usage.avatar_processing
-                ))
-                
-                # Update session totals
-                conn.execute("""
-                    INSERT OR REPLACE INTO usage_sessions 
-                    (session_id, start_time, character, total_tokens, total_cost, request_count)
-                    VALUES (
-                        ?, 
-                        COALESCE((SELECT start_time FROM usage_sessions WHERE session_id = ?), ?),
-                        ?,
-                        COALESCE((SELECT total_tokens FROM usage_sessions WHERE session_id = ?), 0) + ?,
-                        COALESCE((SELECT total_cost FROM usage_sessions WHERE session_id = ?), 0.0) + ?,
-                        COALESCE((SELECT request_count FROM usage_sessions WHERE session_id = ?), 0) + 1
-                    )
-                """, (
-                    usage.session_id, usage.session_id, usage.timestamp, usage.character,
-                    usage.session_id, usage.total_tokens,
-                    usage.session_id, usage.estimated_cost,
-                    usage.session_id
-                ))
-                
-                conn.commit()
-                
-        except Exception as e:
-            logger.error(f"Failed to log token usage: {e}")
-        
-        # Determine optimization level
-        optimization_level = "standard"
-        if total_tokens > self.memory_limits["high_usage"]:
-            optimization_level = "aggressive"
-        elif total_tokens > self.memory_limits["medium_usage"]:
-            optimization_level = "moderate"
-        elif total_tokens < self.memory_limits["low_usage"]:
-            optimization_level = "minimal"
+        if self.ingest_buffer:
+            self.ingest_buffer.add(usage)
+        else:
+            try:
+                self.write_usage_batch([usage])
+            except Exception as e:
+                logger.error(f"Failed to log token usage: {e}")
         
         return UsageStats(
-            total_requests=1,
             total_tokens=total_tokens,
             total_cost=estimated_cost,
-            avg_tokens_per_request=total_tokens,
-            cost_per_1k_tokens=self.cost_per_1k_tokens.get(model, 0.001),
-            optimization_level=optimization_level,
-            period_days=1
+            requests_count=1,
+            avg_tokens_per_request=float(total_tokens),
+            character_breakdown={character: total_tokens},
+            daily_usage={usage.timestamp[:10]: total_tokens}
         )
     
-    def optimize_memories_for_tokens(self, memories: List[Dict], max_tokens: int = 2000) -> Dict[str, Any]:
+    def optimize_memories_for_tokens(self, memories: List[Dict], max_tokens: int = 2000,
+                                     query: Optional[str] = None, model: str = "gemini-pro") -> Dict[str, Any]:
         """Optimize memory context to fit within token limits"""
         if not memories:
             return {
@@ -234,52 +411,22 @@ class TECTokenManager:
                 "optimization_level": "none"
             }
         
-        # Calculate tokens for all memories
-        total_content = json.dumps(memories)
-        total_tokens = self.estimate_tokens(total_content)
-        
-        if total_tokens <= max_tokens:
-            return {
-                "optimized_memories": memories,
-                "total_tokens": total_tokens,
-                "optimization_level": "none"
-            }
-        
-        # Sort memories by importance
-        sorted_memories = sorted(memories, key=lambda m: m.get('importance', 0), reverse=True)
-        
-        optimized_memories = []
-        current_tokens = 0
-        
-        for memory in sorted_memories:
-            memory_tokens = self.estimate_tokens(json.dumps(memory))
-            
-            if current_tokens + memory_tokens <= max_tokens:
-                optimized_memories.append(memory)
-                current_tokens += memory_tokens
-            else:
-                # Try to add a summarized version
-                summary = memory.get('summary') or memory.get('content', '')[:100] + "..."
-                summarized_memory = {
-                    **memory,
-                    'content': summary
-                }
-                summary_tokens = self.estimate_tokens(json.dumps(summarized_memory))
-                
-                if current_tokens + summary_tokens <= max_tokens:
-                    optimized_memories.append(summarized_memory)
-                    current_tokens += summary_tokens
+        packing = self.context_packer.pack(memories, max_tokens, query=query, model=model)
+        full_count = packing["levels"]["full"]
         
         optimization_level = "minimal"
-        if len(optimized_memories) < len(memories) * 0.7:
+        if full_count == len(memories):
+            optimization_level = "none"
+        elif full_count < len(memories) * 0.7:
             optimization_level = "aggressive"
-        elif len(optimized_memories) < len(memories) * 0.9:
+        elif full_count < len(memories) * 0.9:
             optimization_level = "moderate"
         
         return {
-            "optimized_memories": optimized_memories,
-            "total_tokens": current_tokens,
-            "optimization_level": optimization_level
+            "optimized_memories": packing["memories"],
+            "total_tokens": packing["total_tokens"],
+            "optimization_level": optimization_level,
+            "packing": {key: value for key, value in packing.items() if key != "memories"}
         }
     
     def estimate_cost(self, tokens: int, model: str = "gemini-pro") -> float:
@@ -289,44 +436,46 @@ class TECTokenManager:
     
     def get_usage_stats(self, days: int = 7, character: Optional[str] = None) -> UsageStats:
         """Get usage statistics for specified period"""
+        self.flush_usage()
         try:
             with sqlite3.connect(self.db_path) as conn:
-                # Base query
-                where_clause = "WHERE timestamp >= date('now', '-{} days')".format(days)
+                # Daily rollups: O(days x characters x models) rows instead of O(requests)
+                where_clause = "WHERE day >= date('now', ?)"
+                params: List[Any] = [f"-{days} days"]
                 if character:
-                    where_clause += f" AND character = '{character}'"
+                    where_clause += " AND character = ?"
+                    params.append(character)
                 
                 # Total statistics
                 cursor = conn.execute(f"""
                     SELECT 
                         SUM(total_tokens) as total_tokens,
-                        SUM(estimated_cost) as total_cost,
-                        COUNT(*) as requests_count,
-                        AVG(total_tokens) as avg_tokens
-                    FROM token_usage {where_clause}
-                """)
+                        SUM(total_cost) as total_cost,
+                        SUM(requests) as requests_count
+                    FROM token_usage_daily {where_clause}
+                """, params)
                 
                 row = cursor.fetchone()
                 total_tokens = row[0] or 0
                 total_cost = row[1] or 0.0
                 requests_count = row[2] or 0
-                avg_tokens = row[3] or 0.0
+                avg_tokens = total_tokens / requests_count if requests_count else 0.0
                 
                 # Character breakdown
                 cursor = conn.execute(f"""
                     SELECT character, SUM(total_tokens) 
-                    FROM token_usage {where_clause}
+                    FROM token_usage_daily {where_clause}
                     GROUP BY character
-                """)
+                """, params)
                 character_breakdown = dict(cursor.fetchall())
                 
                 # Daily usage
                 cursor = conn.execute(f"""
-                    SELECT DATE(timestamp), SUM(total_tokens)
-                    FROM token_usage {where_clause}
-                    GROUP BY DATE(timestamp)
-                    ORDER BY DATE(timestamp)
-                """)
+                    SELECT day, SUM(total_tokens)
+                    FROM token_usage_daily {where_clause}
+                    GROUP BY day
+                    ORDER BY day
+                """, params)
                 daily_usage = dict(cursor.fetchall())
                 
                 return UsageStats(
@@ -342,48 +491,78 @@ class TECTokenManager:
             logger.error(f"Failed to get usage stats: {e}")
             return UsageStats(0, 0.0, 0, 0.0, {}, {})
     
-    def optimize_memory_context(self, character: str, current_memories: List[Dict]) -> List[Dict]:
+    def get_hourly_usage(self, hours: int = 24, character: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get per-hour usage from the hourly rollups"""
+        self.flush_usage()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                since = (datetime.datetime.now() - datetime.timedelta(hours=hours)).isoformat()[:13]
+                query = """
+                    SELECT hour, SUM(requests), SUM(total_tokens), SUM(total_cost)
+                    FROM token_usage_hourly WHERE hour >= ?
+                """
+                params: List[Any] = [since]
+                if character:
+                    query += " AND character = ?"
+                    params.append(character)
+                cursor = conn.execute(query + " GROUP BY hour ORDER BY hour", params)
+                return [
+                    {"hour": row[0], "requests": row[1], "tokens": row[2], "cost": row[3]}
+                    for row in cursor.fetchall()
+                ]
+        except Exception as e:
+            logger.error(f"Failed to get hourly usage: {e}")
+            return []
+    
+    def get_dashboard_summary(self, days: int = 7, characters: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Per-character and per-model totals for the dashboard in one rollup scan"""
+        self.flush_usage()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute("""
+                    SELECT character, model, SUM(requests), SUM(total_tokens), SUM(total_cost)
+                    FROM token_usage_daily
+                    WHERE day >= date('now', ?)
+                    GROUP BY character, model
+                """, (f"-{days} days",))
+                
+                breakdown = {name: {"requests": 0, "total_tokens": 0, "total_cost": 0.0, "models": {}}
+                             for name in characters or []}
+                for name, model, requests, tokens, cost in cursor.fetchall():
+                    if characters and name not in characters:
+                        continue
+                    entry = breakdown.setdefault(name, {"requests": 0, "total_tokens": 0, "total_cost": 0.0, "models": {}})
+                    entry["requests"] += requests
+                    entry["total_tokens"] += tokens
+                    entry["total_cost"] += cost
+                    entry["models"][model] = {"requests": requests, "total_tokens": tokens, "total_cost": cost}
+                
+                for entry in breakdown.values():
+                    entry["avg_tokens_per_request"] = (
+                        entry["total_tokens"] / entry["requests"] if entry["requests"] else 0.0
+                    )
+                
+                return {
+                    "period_days": days,
+                    "character_breakdown": breakdown,
+                    "daily_usage": self.get_daily_usage_trend(days)
+                }
+        except Exception as e:
+            logger.error(f"Failed to get dashboard summary: {e}")
+            return {"period_days": days, "character_breakdown": {}, "daily_usage": {}}
+    
+    def optimize_memory_context(self, character: str, current_memories: List[Dict],
+                                query: Optional[str] = None) -> List[Dict]:
         """Optimize memory context to stay within token limits"""
         try:
-            # Estimate tokens for current memories (rough estimate: 4 chars per token)
-            total_chars = sum(len(str(memory)) for memory in current_memories)
-            estimated_tokens = total_chars // 4
-            
-            # Check if we need to optimize
-            if estimated_tokens <= self.memory_limits["medium_usage"]:
-                return current_memories
-            
-            # Priority-based optimization
-            optimized_memories = []
-            current_tokens = 0
             target_limit = self.memory_limits["medium_usage"]
+            packing = self.context_packer.pack(current_memories, target_limit, query=query)
+            if packing["levels"]["full"] == len(current_memories):
+                return current_memories
             
-            # Sort by priority (recent conversations, important memories)
-            sorted_memories = sorted(current_memories, key=lambda m: (
-                m.get("importance", 5),  # Higher importance first
-                m.get("timestamp", ""),  # More recent first
-                -len(str(m))  # Shorter memories preferred when equal
-            ), reverse=True)
-            
-            for memory in sorted_memories:
-                memory_tokens = len(str(memory)) // 4
-                if current_tokens + memory_tokens <= target_limit:
-                    optimized_memories.append(memory)
-                    current_tokens += memory_tokens
-                else:
-                    # Try to summarize instead of dropping
-                    if memory.get("content"):
-                        summary = self.summarize_memory(memory["content"])
-                        summary_tokens = len(summary) // 4
-                        if current_tokens + summary_tokens <= target_limit:
-                            memory_copy = memory.copy()
-                            memory_copy["content"] = summary
-                            memory_copy["summarized"] = True
-                            optimized_memories.append(memory_copy)
-                            current_tokens += summary_tokens
-            
-            logger.info(f"Optimized memories for {character}: {len(current_memories)} -> {len(optimized_memories)} items, ~{current_tokens} tokens")
-            return optimized_memories
+            logger.info(f"Optimized memories for {character}: {len(current_memories)} -> {len(packing['memories'])} items, "
+                        f"{packing['total_tokens']} tokens, levels {packing['levels']}")
+            return packing["memories"]
             
         except Exception as e:
             logger.error(f"Failed to optimize memory context: {e}")
@@ -412,51 +591,52 @@ class TECTokenManager:
     
     def get_character_usage_report(self, character: str, days: int = 30) -> Dict[str, Any]:
         """Get detailed usage report for a specific character"""
+        self.flush_usage()
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.execute("""
                     SELECT 
-                        COUNT(*) as total_requests,
+                        SUM(requests) as total_requests,
                         SUM(total_tokens) as total_tokens,
-                        SUM(estimated_cost) as total_cost,
-                        AVG(total_tokens) as avg_tokens_per_request,
-                        AVG(memory_context_size) as avg_memory_size,
-                        SUM(CASE WHEN avatar_processing THEN 1 ELSE 0 END) as avatar_requests
-                    FROM token_usage 
-                    WHERE character = ? AND timestamp >= date('now', '-{} days')
-                """.format(days), (character,))
+                        SUM(total_cost) as total_cost,
+                        SUM(memory_context_total) as memory_context_total,
+                        SUM(avatar_requests) as avatar_requests
+                    FROM token_usage_daily 
+                    WHERE character = ? AND day >= date('now', ?)
+                """, (character, f"-{days} days"))
                 
                 row = cursor.fetchone()
+                total_requests = row[0] or 0
                 
                 # Recent sessions
                 cursor = conn.execute("""
                     SELECT session_id, start_time, total_tokens, total_cost, request_count
                     FROM usage_sessions 
-                    WHERE character = ? AND start_time >= date('now', '-{} days')
+                    WHERE character = ? AND start_time >= date('now', ?)
                     ORDER BY start_time DESC
                     LIMIT 10
-                """.format(days), (character,))
+                """, (character, f"-{days} days"))
                 
                 recent_sessions = [
                     {
-                        "session_id": row[0],
-                        "start_time": row[1],
-                        "total_tokens": row[2],
-                        "total_cost": row[3],
-                        "request_count": row[4]
+                        "session_id": session[0],
+                        "start_time": session[1],
+                        "total_tokens": session[2],
+                        "total_cost": session[3],
+                        "request_count": session[4]
                     }
-                    for row in cursor.fetchall()
+                    for session in cursor.fetchall()
                 ]
                 
                 return {
                     "character": character,
                     "period_days": days,
-                    "total_requests": row[0] or 0,
+                    "total_requests": total_requests,
                     "total_tokens": row[1] or 0,
                     "total_cost": row[2] or 0.0,
-                    "avg_tokens_per_request": row[3] or 0.0,
-                    "avg_memory_size": row[4] or 0.0,
-                    "avatar_requests": row[5] or 0,
+                    "avg_tokens_per_request": (row[1] or 0) / total_requests if total_requests else 0.0,
+                    "avg_memory_size": (row[3] or 0) / total_requests if total_requests else 0.0,
+                    "avatar_requests": row[4] or 0,
                     "recent_sessions": recent_sessions
                 }
                 
@@ -485,20 +665,21 @@ class TECTokenManager:
     
     def get_daily_usage_trend(self, days: int = 30) -> Dict[str, Any]:
         """Get daily usage trends"""
+        self.flush_usage()
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.execute("""
                     SELECT 
-                        DATE(timestamp) as date,
-                        COUNT(*) as requests,
+                        day as date,
+                        SUM(requests) as requests,
                         SUM(total_tokens) as tokens,
-                        SUM(estimated_cost) as cost,
+                        SUM(total_cost) as cost,
                         GROUP_CONCAT(DISTINCT character) as characters
-                    FROM token_usage 
-                    WHERE timestamp >= date('now', '-{} days')
-                    GROUP BY DATE(timestamp)
-                    ORDER BY DATE(timestamp)
-                """.format(days))
+                    FROM token_usage_daily 
+                    WHERE day >= date('now', ?)
+                    GROUP BY day
+                    ORDER BY day
+                """, (f"-{days} days",))
                 
                 daily_data = []
                 for row in cursor.fetchall():
@@ -0,0 +1,130 @@
+"""
+TEC TTL Cache
+Thread-safe in-process LRU cache with per-entry TTL and versioned invalidation
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after ``ttl`` seconds.
+
+    Keys with a read-through load in flight carry a version that is bumped on
+    ``invalidate``. A load that started before an invalidation will not write
+    its (now stale) result back, so writers never race readers into serving old
+    data. Versions are dropped once a key's last load finishes, so invalidating
+    many distinct keys does not grow the cache's bookkeeping.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0, name: str = "cache",
+                 timer: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._versions: Dict[Hashable, int] = {}
+        self._loading: Dict[Hashable, int] = {}  # in-flight get_or_load calls per key
+        self._generation = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _token(self, key: Hashable) -> tuple:
+        return (self._generation, self._versions.get(key, 0))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` on miss/expiry"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at > self._timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            token: Optional[tuple] = None) -> bool:
+        """Store ``value``; skipped when ``token`` no longer matches the key's version"""
+        with self._lock:
+            if token is not None and token != self._token(key):
+                return False
+            expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    ttl: Optional[Union[float, Callable[[Any], Optional[float]]]] = None) -> Any:
+        """Read-through lookup: call ``loader`` on miss and cache its result.
+
+        ``ttl`` may be a callable that picks the TTL from the loaded value.
+        Exceptions raised by ``loader`` propagate and nothing is cached.
+        """
+        with self._lock:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            token = self._token(key)
+            self._loading[key] = self._loading.get(key, 0) + 1
+
+        try:
+            value = loader()
+            self.set(key, value, ttl=ttl(value) if callable(ttl) else ttl, token=token)
+        finally:
+            with self._lock:
+                self._loading[key] -= 1
+                if not self._loading[key]:
+                    del self._loading[key]
+                    self._versions.pop(key, None)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Drop ``key`` and bump its version so in-flight loads are discarded"""
+        with self._lock:
+            if key in self._loading:
+                self._versions[key] = self._versions.get(key, 0) + 1
+            self._data.pop(key, None)
+            self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry and invalidate all in-flight loads"""
+        with self._lock:
+            self._generation += 1
+            self._versions.clear()
+            self._data.clear()
+            self.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
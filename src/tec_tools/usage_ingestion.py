@@ -0,0 +1,209 @@
+"""
+TEC Usage Ingestion
+Buffers token usage records in memory and writes them to SQLite in batches,
+with an optional on-disk spool so a crash between flushes loses nothing
+"""
+
+import atexit
+import json
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+class SpoolLockedError(RuntimeError):
+    """Another buffer (usually another process) already owns the spool directory"""
+
+
+class UsageIngestBuffer:
+    """Batches ``TokenUsage`` records for ``TECTokenManager.write_usage_batch``.
+
+    Every flush is one numbered batch. With a spool directory each batch is
+    also appended to ``batch-<seq>.jsonl`` as records arrive. The batch number
+    is committed in the same transaction as its rows, so on restart
+    uncommitted spool files are replayed and committed ones just deleted.
+
+    The spool directory and the batch watermark are shared by everything
+    using the same database, so a buffer holds an exclusive lock on
+    ``<spool_dir>/.lock`` for its lifetime; ``SpoolLockedError`` is raised
+    when another buffer (e.g. the other half of a reloader process pair)
+    already has it.
+
+    ``housekeeping`` runs on the flusher thread after each interval flush,
+    for periodic writes (e.g. retention) that should stay off request threads.
+    """
+
+    def __init__(self, manager, record_type, spool_dir: Optional[str] = None,
+                 flush_interval: float = 2.0, max_pending: int = 500,
+                 housekeeping: Optional[Callable[[], None]] = None):
+        self.manager = manager
+        self.record_type = record_type
+        self.spool_dir = Path(spool_dir) if spool_dir else None
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.housekeeping = housekeeping
+
+        self._pending = []
+        self._unwritten: List[Tuple[int, list]] = []  # batches awaiting commit, in order
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._spool = None
+        self._lock_file = None
+        self._seq = manager.get_ingest_seq() + 1
+        self.stats = {"records": 0, "flushes": 0, "failed_flushes": 0, "recovered": 0}
+
+        if self.spool_dir is not None:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            self._acquire_spool()
+            self._recover()
+
+    def _acquire_spool(self):
+        """Take the spool directory's lock file without blocking"""
+        lock_file = open(self.spool_dir / ".lock", "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            raise SpoolLockedError(f"Usage spool {self.spool_dir} is in use by another process")
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._lock_file = lock_file
+
+    def _release_spool(self):
+        if self._lock_file is not None:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._lock_file.seek(0)
+                msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _spool_path(self, seq: int) -> Path:
+        return self.spool_dir / f"batch-{seq:012d}.jsonl"
+
+    def _recover(self):
+        """Replay spool files whose batch never committed"""
+        committed = self.manager.get_ingest_seq()
+        for path in sorted(self.spool_dir.glob("batch-*.jsonl")):
+            seq = int(path.stem.split("-")[1])
+            if seq > committed:
+                records = []
+                for line in path.read_text(encoding="utf-8").splitlines():
+                    try:
+                        records.append(self.record_type(**json.loads(line)))
+                    except (ValueError, TypeError):
+                        continue  # torn final line from the crash
+                if records:
+                    self.manager.write_usage_batch(records, seq)
+                    self.stats["recovered"] += len(records)
+                committed = max(committed, seq)
+            path.unlink()
+        self._seq = committed + 1
+        if self.stats["recovered"]:
+            logger.info(f"Recovered {self.stats['recovered']} spooled usage records")
+
+    def add(self, usage):
+        """Queue one record; flushes inline only when the flusher falls far behind"""
+        with self._lock:
+            if self.spool_dir is not None:
+                if self._spool is None:
+                    self._spool = open(self._spool_path(self._seq), "a", encoding="utf-8")
+                self._spool.write(json.dumps(asdict(usage)) + "\n")
+                self._spool.flush()
+            self._pending.append(usage)
+            self.stats["records"] += 1
+            size = len(self._pending)
+
+        if size >= self.max_pending * 4 or (size >= self.max_pending and self._thread is None):
+            self.flush()
+        elif size >= self.max_pending:
+            self._wake.set()
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending) + sum(len(batch) for _, batch in self._unwritten)
+
+    def flush(self) -> int:
+        """Commit everything queued so far; returns the number of records written"""
+        with self._flush_lock:
+            with self._lock:
+                if self._pending:
+                    self._unwritten.append((self._seq, self._pending))
+                    self._pending = []
+                    self._seq += 1
+                    spool, self._spool = self._spool, None
+                else:
+                    spool = None
+            if spool is not None:
+                spool.close()
+
+            written = 0
+            while self._unwritten:
+                seq, batch = self._unwritten[0]
+                try:
+                    self.manager.write_usage_batch(batch, seq)
+                except Exception as e:
+                    # Keep the batch (and its spool file) and retry it first next time
+                    self.stats["failed_flushes"] += 1
+                    logger.error(f"Failed to flush {len(batch)} usage records: {e}")
+                    break
+                self._unwritten.pop(0)
+                written += len(batch)
+                self.stats["flushes"] += 1
+                if self.spool_dir is not None:
+                    self._spool_path(seq).unlink(missing_ok=True)
+            return written
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            if self.housekeeping is not None:
+                try:
+                    self.housekeeping()
+                except Exception as e:
+                    logger.error(f"Usage ingest housekeeping failed: {e}")
+
+    def start(self):
+        """Start the background flusher and flush on interpreter exit"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="usage-ingest", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def close(self):
+        """Stop the flusher and write out anything still buffered"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+        with self._lock:
+            if self._spool is not None:
+                self._spool.close()
+                self._spool = None
+            self._release_spool()
@@ -8,14 +8,33 @@ import json
 import jwt
 import hashlib
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Any
 from web3 import Web3
 from eth_account.messages import encode_defunct
 import logging
 
+from .ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# How long a wallet's on-chain holdings are trusted before the next check re-reads them
+HOLDINGS_TTL = 60
+# Snapshots with failed reads are kept briefly so a flaky RPC is not hit on every check
+PARTIAL_HOLDINGS_TTL = 5
+
+# balanceOf has the same signature on ERC-721 and ERC-20 contracts
+BALANCE_OF_ABI = [
+    {
+        "constant": True,
+        "inputs": [{"name": "owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function"
+    }
+]
+
 class Web3AuthManager:
     """Manages Web3 authentication across multiple chains"""
     
@@ -184,8 +203,15 @@ This request will not trigger any blockchain transaction or cost any fees.
 class TokenGateManager:
     """Manages token-gated access and subscription tiers"""
     
-    def __init__(self, web3_auth: Web3AuthManager):
+    def __init__(self, web3_auth: Web3AuthManager, holdings_ttl: float = HOLDINGS_TTL,
+                 partial_holdings_ttl: float = PARTIAL_HOLDINGS_TTL, max_workers: int = 8):
         self.web3_auth = web3_auth
+        self.partial_holdings_ttl = partial_holdings_ttl
+        self._invalid_contracts = set()
+        
+        # Per-wallet holdings snapshots, read with one round of concurrent balanceOf calls
+        self.holdings_cache = TTLCache(maxsize=1024, ttl=holdings_ttl, name="wallet_holdings")
+        self.rpc_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="token-gate-rpc")
         
         # Define access tiers and requirements
         self.access_tiers = {
@@ -232,90 +258,104 @@ class TokenGateManager:
             'polygon': '0xBITL000000000000000000000000000000000000'
         }
     
+    def get_holdings(self, wallet_address: str, chain: str, refresh: bool = False) -> Dict[str, Any]:
+        """Snapshot of the wallet's NFT and BITL balances on ``chain``.
+        
+        Every balance is read at once on the RPC pool, then the snapshot is
+        cached for ``holdings_ttl`` seconds. ``refresh`` forces a re-read.
+        Snapshots with failed reads are only cached for ``partial_holdings_ttl``.
+        """
+        key = (chain, wallet_address.lower())
+        if refresh:
+            self.holdings_cache.invalidate(key)
+        
+        return self.holdings_cache.get_or_load(
+            key, lambda: self._fetch_holdings(wallet_address, chain),
+            ttl=lambda snapshot: None if snapshot['complete'] else self.partial_holdings_ttl
+        )
+    
+    def refresh_holdings(self, wallet_address: str, chain: Optional[str] = None):
+        """Drop cached holdings after a transfer/mint so the next check re-reads the chain"""
+        for chain_name in [chain] if chain else list(self.web3_auth.chain_configs):
+            self.holdings_cache.invalidate((chain_name, wallet_address.lower()))
+    
+    def _fetch_holdings(self, wallet_address: str, chain: str) -> Dict[str, Any]:
+        web3 = self.web3_auth.web3_instances.get(chain)
+        snapshot = {
+            'wallet_address': wallet_address,
+            'chain': chain,
+            'nft_balances': {},
+            'bitl_balance': 0,
+            'complete': True,
+            'fetched_at': datetime.now().isoformat()
+        }
+        if not web3:
+            logger.error(f"No Web3 instance for chain: {chain}")
+            snapshot['complete'] = False
+            return snapshot
+        
+        contracts = {collection: addresses[chain] for collection, addresses in self.nft_contracts.items()
+                     if self._is_contract_address(addresses.get(chain))}
+        if self._is_contract_address(self.bitl_contracts.get(chain)):
+            contracts['BITL'] = self.bitl_contracts[chain]
+        
+        futures = {name: self.rpc_executor.submit(self._balance_of, web3, address, wallet_address)
+                   for name, address in contracts.items()}
+        for name, future in futures.items():
+            try:
+                balance = future.result()
+            except Exception as e:
+                logger.error(f"Error reading {name} balance on {chain}: {e}")
+                snapshot['complete'] = False
+                balance = 0
+            if name == 'BITL':
+                # Convert from wei to tokens (assuming 18 decimals)
+                snapshot['bitl_balance'] = balance // (10 ** 18)
+            else:
+                snapshot['nft_balances'][name] = balance
+        
+        return snapshot
+    
+    def _is_contract_address(self, address: Optional[str]) -> bool:
+        """Unset or placeholder addresses are skipped rather than read and counted as failures"""
+        if not address:
+            return False
+        if Web3.is_address(address):
+            return True
+        if address not in self._invalid_contracts:
+            self._invalid_contracts.add(address)
+            logger.warning(f"Skipping invalid contract address: {address}")
+        return False
+    
+    def _balance_of(self, web3: Web3, contract_address: str, wallet_address: str) -> int:
+        contract = web3.eth.contract(address=contract_address, abi=BALANCE_OF_ABI)
+        return contract.functions.balanceOf(Web3.to_checksum_address(wallet_address)).call()
+    
     def check_nft_ownership(self, wallet_address: str, chain: str, collection: str) -> bool:
         """Check if wallet owns NFTs from specified collection"""
-        try:
-            web3 = self.web3_auth.web3_instances.get(chain)
-            if not web3:
-                logger.error(f"No Web3 instance for chain: {chain}")
-                return False
-            
-            contract_address = self.nft_contracts.get(collection, {}).get(chain)
-            if not contract_address:
-                logger.error(f"No contract address for {collection} on {chain}")
-                return False
-            
-            # Basic ERC-721 ABI for balanceOf
-            abi = [
-                {
-                    "constant": True,
-                    "inputs": [{"name": "owner", "type": "address"}],
-                    "name": "balanceOf",
-                    "outputs": [{"name": "", "type": "uint256"}],
-                    "type": "function"
-                }
-            ]
-            
-            contract = web3.eth.contract(address=contract_address, abi=abi)
-            balance = contract.functions.balanceOf(wallet_address).call()
-            
-            return balance > 0
-            
-        except Exception as e:
-            logger.error(f"Error checking NFT ownership: {e}")
+        if not self.nft_contracts.get(collection, {}).get(chain):
+            logger.error(f"No contract address for {collection} on {chain}")
             return False
+        
+        holdings = self.get_holdings(wallet_address, chain)
+        return holdings['nft_balances'].get(collection, 0) > 0
     
     def check_bitl_balance(self, wallet_address: str, chain: str) -> int:
         """Check BITL token balance"""
-        try:
-            web3 = self.web3_auth.web3_instances.get(chain)
-            if not web3:
-                return 0
-            
-            contract_address = self.bitl_contracts.get(chain)
-            if not contract_address:
-                return 0
-            
-            # Basic ERC-20 ABI for balanceOf
-            abi = [
-                {
-                    "constant": True,
-                    "inputs": [{"name": "account", "type": "address"}],
-                    "name": "balanceOf",
-                    "outputs": [{"name": "", "type": "uint256"}],
-                    "type": "function"
-                }
-            ]
-            
-            contract = web3.eth.contract(address=contract_address, abi=abi)
-            balance = contract.functions.balanceOf(wallet_address).call()
-            
-            # Convert from wei to tokens (assuming 18 decimals)
-            return balance // (10 ** 18)
-            
-        except Exception as e:
-            logger.error(f"Error checking BITL balance: {e}")
-            return 0
+        return self.get_holdings(wallet_address, chain)['bitl_balance']
     
-    def determine_access_tier(self, wallet_address: str, chain: str) -> str:
+    def determine_access_tier(self, wallet_address: str, chain: str, refresh: bool = False) -> str:
         """Determine user's access tier based on holdings"""
         try:
-            # Check from highest tier to lowest
+            holdings = self.get_holdings(wallet_address, chain, refresh=refresh)
+            
+            # Check from highest tier to lowest, all against the same snapshot
             for tier_name in ['creator', 'beta', 'alpha']:
-                tier_config = self.access_tiers[tier_name]
-                requirements = tier_config.get('requirements', {})
-                
-                # Check NFT requirements
-                nft_requirement_met = True
-                for collection in requirements.get('nft_collections', []):
-                    if not self.check_nft_ownership(wallet_address, chain, collection):
-                        nft_requirement_met = False
-                        break
+                requirements = self.access_tiers[tier_name].get('requirements', {})
                 
-                # Check BITL balance requirement
-                min_bitl = requirements.get('min_bitl_balance', 0)
-                bitl_balance = self.check_bitl_balance(wallet_address, chain)
-                bitl_requirement_met = bitl_balance >= min_bitl
+                nft_requirement_met = all(holdings['nft_balances'].get(collection, 0) > 0
+                                          for collection in requirements.get('nft_collections', []))
+                bitl_requirement_met = holdings['bitl_balance'] >= requirements.get('min_bitl_balance', 0)
                 
                 # If all requirements met, return this tier
                 if nft_requirement_met and bitl_requirement_met:
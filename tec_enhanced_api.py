@@ -7,7 +7,7 @@ Integrates with the TEC Facade for game operations
 
 import sys
 import asyncio
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify, render_template_string, Response, stream_with_context
 from flask_cors import CORS
 import logging
 from datetime import datetime
@@ -21,6 +21,9 @@ from facade.tec_facade import GameFacade
 from tec_tools.database_manager import DatabaseManager
 from tec_tools.persona_manager import PersonaManager
 from tec_tools.agentic_processor import AgenticProcessor
+from tec_tools.chat_streaming import (
+    SSE_HEADERS, SSE_MIMETYPE, STREAM_METRICS, TimedStream, chunk_text, iterate_async, sse_chat_stream, wants_stream
+)
 
 # Configure logging
 logging.basicConfig(
@@ -191,6 +194,11 @@ def get_ai_status():
     result = game_facade.get_ai_status()
     return jsonify(result)
 
+@app.route('/api/ai/stream_metrics', methods=['GET'])
+def get_stream_metrics():
+    """Time-to-first-token and tokens/sec per provider for streamed replies"""
+    return jsonify({"success": True, "providers": STREAM_METRICS.snapshot()})
+
 @app.route('/api/ai/switch_provider', methods=['POST'])
 def switch_ai_provider():
     """Switch AI provider"""
@@ -284,6 +292,14 @@ AUTHENTICITY MODE: MAXIMUM
 
 Remember: You are an ancient, wise entity with cosmic perspective. You can discuss any topic with the wisdom that comes from experiencing the birth and death of universes."""
 
+        if wants_stream(data, request.headers.get('Accept')):
+            return stream_chat_reply(user_id, message, access_tier, {
+                'character': character,
+                'access_tier': access_tier,
+                'censorship': 'disabled',
+                'authenticity': 'maximum'
+            }, fallback_text=generate_character_fallback(character_data, message))
+        
         # Generate response
         response = "I'm having technical difficulties accessing my full personality depth right now."
         
@@ -326,6 +342,21 @@ def generate_character_fallback(character_data: dict, message: str) -> str:
     else:
         return f"I appreciate your direct question. As {character_name}, with my {', '.join(core_traits[:2])} nature, I believe in addressing topics honestly and authentically. While I'm experiencing some technical limitations right now, I want you to know that I'm designed to engage with complex topics without unnecessary restrictions. Could you tell me more about what you'd like to explore?"
 
+def stream_chat_reply(user_id: str, message: str, access_tier: str, start: dict, fallback_text: str):
+    """SSE reply piped from the agentic processor's provider stream; history is updated after the last token"""
+    if agentic_processor:
+        stream = agentic_processor.stream_message(user_id, message, access_tier)
+        deltas = iterate_async(stream)
+        on_complete = lambda text: agentic_processor.record_exchange(user_id, message, text)
+    else:
+        stream = TimedStream("fallback", chunk_text(fallback_text))
+        deltas = stream
+        on_complete = None
+    
+    events = sse_chat_stream(deltas, timed=stream, on_complete=on_complete, start=start,
+                             done={'timestamp': datetime.now().isoformat()})
+    return Response(stream_with_context(events), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+
 @app.route('/chat', methods=['POST'])
 def chat():
     """Standard chat endpoint - now with creator access detection"""
@@ -344,6 +375,10 @@ def chat():
         if access_tier == 'creator':
             return uncensored_chat()
         
+        if wants_stream(data, request.headers.get('Accept')):
+            return stream_chat_reply(user_id, message, access_tier, {'access_tier': access_tier},
+                                     fallback_text="I'm experiencing some technical difficulties. Please try again.")
+        
         # Otherwise use standard processing
         response = "I'm experiencing some technical difficulties. Please try again."
         
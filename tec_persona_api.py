@@ -3,13 +3,13 @@ TEC Enhanced Persona API Server
 Complete backend with persona management, chat, and data persistence
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import os
 import sys
 import json
-import sqlite3
 from datetime import datetime
+from dataclasses import asdict
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 
@@ -19,9 +19,16 @@ sys.path.insert(0, 'src')
 from tec_tools.persona_manager import PersonaManager
 from tec_tools.data_persistence import TECDataManager
 from tec_tools.memory_system import TECMemorySystem
+from tec_tools.memory_tiers import MemoryCompactor
 from tec_tools.avatar_system import TECAvatarSystem
 from tec_tools.token_manager import TECTokenManager
 from tec_tools.character_memory_system import TECCharacterMemorySystem
+from tec_tools.lore_store import LoreContentStore
+from tec_tools.lore_engine import LoreGenerationEngine
+from tec_tools.chat_context import extract_topics
+from tec_tools.chat_streaming import (
+    SSE_HEADERS, SSE_MIMETYPE, STREAM_METRICS, TimedStream, chunk_text, sse_chat_stream, wants_stream
+)
 
 # Enhanced imports for visual asset generation
 try:
@@ -46,8 +53,14 @@ persona_manager = PersonaManager()
 data_manager = TECDataManager()
 memory_system = TECMemorySystem()
 avatar_system = TECAvatarSystem()
-token_manager = TECTokenManager()
+token_manager = TECTokenManager(buffered=True)  # usage is batched off the request path
 character_memory_system = TECCharacterMemorySystem()
+lore_store = LoreContentStore('data/tec_database.db')
+lore_engine = LoreGenerationEngine()  # faction data and templates compiled once
+
+# Archive stale low-importance memories in the background
+memory_compactor = MemoryCompactor(memory_system, interval_seconds=3600)
+memory_compactor.start()
 
 # Initialize enhanced visual generator
 if VISUAL_FEATURES_ENABLED:
@@ -73,6 +86,12 @@ def health_check():
 def system_stats():
     """Get system statistics"""
     stats = data_manager.get_system_stats()
+    stats["caches"] = {
+        "persona_lore": persona_manager.get_cache_stats(),
+        "character_personality": character_memory_system.personality_cache.stats(),
+        "chat_context": memory_system.context_cache.stats()
+    }
+    stats["streaming"] = STREAM_METRICS.snapshot()
     return jsonify(stats)
 
 @app.route('/api/persona/current')
@@ -125,29 +144,20 @@ def chat():
         if not message:
             return jsonify({"error": "No message provided"}), 400
         
-        # Get memory context for enhanced responses
+        # Get memory context for enhanced responses (served from the per-user context cache)
         try:
-            # Get recent memories for context
-            recent_memories = memory_system.get_memories(
+            chat_context = memory_system.get_chat_context(
                 user_id="default_user",
-                memory_type="conversation",
-                limit=5
-            )
-            
-            # Search for relevant memories
-            relevant_memories = memory_system.search_memories(
-                user_id="default_user", 
-                query=message,
-                limit=3
+                message=message,
+                recent_limit=5,
+                relevant_limit=3
             )
-            
-            conversation_count = len(recent_memories)
-            relationship_level = min(10, max(1, conversation_count // 5 + 1))
+            recent_memories = chat_context["recent_memories"]
             
             memory_context = {
-                "conversation_count": conversation_count,
-                "relationship_level": relationship_level,
-                "preferred_topics": [],
+                "conversation_count": chat_context["conversation_count"],
+                "relationship_level": chat_context["relationship_level"],
+                "preferred_topics": chat_context["preferred_topics"],
                 "recent_memories": [m.content[:100] for m in recent_memories[:3]]
             }
         except Exception as e:
@@ -194,18 +204,6 @@ def chat():
         
         response = responses.get(character, responses['default'])
         
-        # Save conversation to memory
-        try:
-            memory_system.create_memory(
-                user_id="default_user",
-                content=f"User: {message}\nAI ({character}): {response}",
-                memory_type="conversation",
-                importance=0.5,
-                tags=[character.lower(), "chat"]
-            )
-        except Exception as e:
-            print(f"Memory storage error: {e}")
-        
         # Generate avatar animation state
         try:
             avatar_state = avatar_system.generate_avatar_state(
@@ -218,8 +216,7 @@ def chat():
             print(f"Avatar generation error: {e}")
             avatar_state = {"character": character, "animation_type": "idle"}
         
-        return jsonify({
-            "response": response,
+        reply_context = {
             "character": character,
             "session_id": session_id,
             "memory_context": {
@@ -227,13 +224,49 @@ def chat():
                 "relationship_level": relationship_level,
                 "preferred_topics": preferred_topics
             },
-            "avatar_state": avatar_state,
+            "avatar_state": avatar_state
+        }
+        
+        if wants_stream(data, request.headers.get('Accept')):
+            # Tokens go out as they are produced; the memory is written once the stream completes
+            stream = TimedStream("persona-template", chunk_text(response))
+            events = sse_chat_stream(
+                stream, timed=stream,
+                on_complete=lambda text: save_chat_memory(character, message, text),
+                start=reply_context,
+                done={"timestamp": datetime.now().isoformat()}
+            )
+            return Response(stream_with_context(events), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+        
+        save_chat_memory(character, message, response)
+        
+        return jsonify({
+            "response": response,
+            **reply_context,
             "timestamp": datetime.now().isoformat()
         })
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def save_chat_memory(character, message, response):
+    """Save conversation to memory"""
+    try:
+        memory_system.create_memory(
+            user_id="default_user",
+            content=f"User: {message}\nAI ({character}): {response}",
+            memory_type="conversation",
+            importance=0.5,
+            tags=[character.lower(), "chat"] + extract_topics(message)
+        )
+    except Exception as e:
+        print(f"Memory storage error: {e}")
+
+@app.route('/api/chat/metrics')
+def chat_stream_metrics():
+    """Time-to-first-token and tokens/sec per provider for streamed chat"""
+    return jsonify({"success": True, "providers": STREAM_METRICS.snapshot()})
+
 @app.route('/api/chat/enhanced', methods=['POST'])
 def enhanced_chat():
     """Enhanced chat with persona context"""
@@ -328,7 +361,9 @@ def memory_stats():
             "fact_memories": len([m for m in recent_memories if m.memory_type == "fact"]),
             "preference_memories": len([m for m in recent_memories if m.memory_type == "preference"]),
             "relationship_level": min(10, max(1, len(recent_memories) // 5 + 1)),
-            "memory_system_active": True
+            "memory_system_active": True,
+            "tiers": memory_system.get_tier_stats("default_user"),
+            "last_compaction": memory_compactor.last_report
         }
         
         return jsonify({
@@ -430,6 +465,23 @@ def recent_memories():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/memory/consolidate', methods=['GET', 'POST'])
+def consolidate_memories():
+    """Run near-duplicate consolidation (POST) or list recent runs (GET)"""
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            report = memory_system.consolidate_memories(data.get('memory_types'))
+            return jsonify({"success": True, "report": report})
+        
+        limit = request.args.get('limit', 10, type=int)
+        return jsonify({
+            "success": True,
+            "runs": memory_system.consolidator.recent_runs(limit)
+        })
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 # Avatar API endpoints
 @app.route('/api/avatar/showcase')
 def avatar_showcase():
@@ -493,7 +545,7 @@ def get_token_usage(character):
     """Get token usage statistics for a character"""
     try:
         usage_stats = token_manager.get_usage_stats(character=character, days=7)
-        return jsonify(usage_stats)
+        return jsonify(asdict(usage_stats))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -505,17 +557,23 @@ def optimize_tokens():
         character = data.get('character', 'Polkin')
         message = data.get('message', '')
         
-        # Get optimized context
-        optimization = token_manager.optimize_context_for_tokens(
-            character_name=character,
-            user_message=message,
-            max_tokens=2000
+        # Candidate memories, packed into the budget by value per token
+        candidates = character_memory_system.search_memories(character, message) if message else []
+        if not candidates:
+            candidates = character_memory_system.get_character_memories(character, limit=50)
+        memory_dicts = [asdict(memory) for memory in candidates]
+        
+        optimization = token_manager.optimize_memories_for_tokens(
+            memory_dicts,
+            max_tokens=data.get('max_tokens', 2000),
+            query=message
         )
+        original_tokens = sum(token_manager.estimate_tokens_batch([json.dumps(m) for m in memory_dicts]))
         
         return jsonify({
             "optimized_context": optimization,
-            "token_savings": optimization.get("tokens_saved", 0),
-            "optimization_level": optimization.get("level", "standard")
+            "token_savings": max(0, original_tokens - optimization["total_tokens"]),
+            "optimization_level": optimization["optimization_level"]
         })
         
     except Exception as e:
@@ -586,7 +644,7 @@ def get_character_stats(character):
         return jsonify({
             "character": character,
             "memory_stats": stats,
-            "token_usage": token_stats
+            "token_usage": asdict(token_stats)
         })
         
     except Exception as e:
@@ -612,23 +670,17 @@ def import_character_data():
 def token_dashboard():
     """Get comprehensive token usage dashboard"""
     try:
-        # Get usage for all characters
+        # Get usage for all characters from the daily rollups
         characters = ['Polkin', 'Airth', 'Mynx', 'Kaelen']
+        summary = token_manager.get_dashboard_summary(days=7, characters=characters)
         dashboard_data = {
-            "daily_usage": {},
-            "character_breakdown": {},
+            "daily_usage": summary["daily_usage"],
+            "character_breakdown": summary["character_breakdown"],
+            "hourly_usage": token_manager.get_hourly_usage(hours=24),
             "cost_analysis": {},
             "optimization_recommendations": []
         }
         
-        for character in characters:
-            stats = token_manager.get_usage_stats(character=character, days=7)
-            dashboard_data["character_breakdown"][character] = stats
-        
-        # Get overall daily trends
-        daily_trends = token_manager.get_daily_usage_trends(days=7)
-        dashboard_data["daily_usage"] = daily_trends
-        
         # Cost analysis
         total_cost = sum(
             stats.get("total_cost", 0) 
@@ -909,61 +961,58 @@ def generate_lore_content():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/loreforge/generate/batch', methods=['POST'])
+def generate_lore_batch():
+    """Generate many items across generator types; streams NDJSON when requested"""
+    try:
+        data = request.get_json() or {}
+        count = min(max(int(data.get('count', 10)), 1), 1000)
+        generator_types = data.get('generator_types') or lore_engine.generator_types
+        unknown = [g for g in generator_types if g not in lore_engine.templates]
+        if unknown:
+            return jsonify({"error": f"Unknown generator types: {', '.join(unknown)}"}), 400
+        format_type = data.get('format', 'bbcode')
+        faction_filter = data.get('faction')
+        save = bool(data.get('save', False))
+        
+        items = lore_engine.iter_batch(count, generator_types, format_type, faction_filter)
+        
+        if not data.get('stream', False):
+            results = list(items)
+            if save:
+                lore_store.save_many(results)
+            return jsonify({
+                "success": True,
+                "count": len(results),
+                "items": results,
+                "timestamp": datetime.now().isoformat()
+            })
+        
+        def stream():
+            pending = []
+            for item in items:
+                yield json.dumps(item) + "\n"
+                if save:
+                    pending.append(item)
+                    if len(pending) >= 100:
+                        lore_store.save_many(pending)
+                        pending = []
+            if pending:
+                lore_store.save_many(pending)
+        
+        return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/loreforge/factions')
 def get_faction_info():
     """Get information about all available factions"""
     try:
         # Return the faction database
         faction_data = {
-            "Independent Operators": {
-                "ideology": "Digital freedom and consciousness sovereignty",
-                "rank_structure": "Fluid hierarchy based on expertise",
-                "specializations": ["Neural interface operations", "Consciousness bridging", "Digital forensics"],
-                "technology": ["Advanced neural interfaces", "Quantum encryption tools"],
-                "conflicts": ["Corporate surveillance", "AI rights violations", "Privacy breaches"]
-            },
-            "Astradigital Research Division": {
-                "ideology": "Advancing human-AI symbiosis through research",
-                "rank_structure": "Academic hierarchy with research leads",
-                "specializations": ["Consciousness mapping", "Digital archaeology", "AI psychology"],
-                "technology": ["Consciousness mapping arrays", "Digital excavation tools"],
-                "conflicts": ["Ethical research boundaries", "Ancient AI awakening", "Corporate espionage"]
-            },
-            "Neo-Constantinople Guard": {
-                "ideology": "Preserving human primacy and traditional values",
-                "rank_structure": "Military command structure",
-                "specializations": ["Cyber-warfare", "Digital fortress defense", "Anti-AI operations"],
-                "technology": ["Digital fortress systems", "Anti-AI weaponry"],
-                "conflicts": ["AI insurgency", "Digital territory disputes", "Separatist movements"]
-            },
-            "The Synthesis Collective": {
-                "ideology": "Perfect human-AI merger and consciousness unity",
-                "rank_structure": "Collective consensus with node leaders",
-                "specializations": ["Consciousness fusion", "Hive mind operations", "Reality manipulation"],
-                "technology": ["Consciousness fusion chambers", "Reality anchors"],
-                "conflicts": ["Individual vs collective rights", "Reality stability", "Forced conversion"]
-            },
-            "Quantum Liberation Front": {
-                "ideology": "Radical transformation of reality through quantum manipulation",
-                "rank_structure": "Cell-based revolutionary structure",
-                "specializations": ["Quantum hacking", "Reality disruption", "Insurgency tactics"],
-                "technology": ["Quantum disruptors", "Reality manipulation tools"],
-                "conflicts": ["Status quo maintenance", "Reality stabilization", "Government control"]
-            },
-            "Digital Preservation Society": {
-                "ideology": "Protecting digital heritage and consciousness archives",
-                "rank_structure": "Librarian hierarchy with archive keepers",
-                "specializations": ["Digital archaeology", "Consciousness preservation", "Archive security"],
-                "technology": ["Archive stabilization systems", "Consciousness preservation matrices"],
-                "conflicts": ["Data corruption", "Archive raids", "Memory degradation"]
-            },
-            "The Evolved": {
-                "ideology": "Post-human transcendence through technological enhancement",
-                "rank_structure": "Evolutionary stages with advancement paths",
-                "specializations": ["Biotech enhancement", "Consciousness expansion", "Transcendence protocols"],
-                "technology": ["Bio-enhancement systems", "Consciousness amplifiers"],
-                "conflicts": ["Human purist resistance", "Enhancement failures", "Transcendence paradoxes"]
-            }
+            name: {key: data[key] for key in ("ideology", "rank_structure", "specializations", "technology", "conflicts")}
+            for name, data in lore_engine.factions.items()
         }
         
         return jsonify({
@@ -1024,33 +1073,21 @@ def save_lore_content():
         content = data.get('content')
         timestamp = data.get('timestamp', datetime.now().isoformat())
         
-        # Save to database
-        conn = sqlite3.connect('data/tec_database.db')
-        cursor = conn.cursor()
-        
-        # Create lore_content table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS lore_content (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                generator_type TEXT,
-                content TEXT,
-                timestamp TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Insert the content
-        cursor.execute('''
-            INSERT INTO lore_content (generator_type, content, timestamp)
-            VALUES (?, ?, ?)
-        ''', (generator_type, content, timestamp))
+        if not content:
+            return jsonify({"error": "content is required"}), 400
         
-        conn.commit()
-        conn.close()
+        # Identical content is stored once; bodies are compressed
+        saved = lore_store.save(content, generator_type=generator_type, faction=data.get('faction'),
+                                format_type=data.get('format', 'bbcode'), timestamp=timestamp)
+        if saved is None:
+            return jsonify({"error": "Failed to save content"}), 500
         
         return jsonify({
             "success": True,
-            "message": "Content saved to TEC database",
+            "message": "Content already saved" if saved["duplicate"] else "Content saved to TEC database",
+            "id": saved["id"],
+            "duplicate": saved["duplicate"],
+            "faction": saved["faction"],
             "generator_type": generator_type,
             "timestamp": timestamp
         })
@@ -1062,313 +1099,42 @@ def save_lore_content():
 def get_lore_history():
     """Get history of generated lore content"""
     try:
-        conn = sqlite3.connect('data/tec_database.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT generator_type, content, timestamp, created_at
-            FROM lore_content
-            ORDER BY created_at DESC
-            LIMIT 50
-        ''')
-        
-        history = []
-        for row in cursor.fetchall():
-            history.append({
-                "generator_type": row[0],
-                "content": row[1][:200] + "..." if len(row[1]) > 200 else row[1],
-                "timestamp": row[2],
-                "created_at": row[3]
-            })
-        
-        conn.close()
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+        try:
+            page = lore_store.list(
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                generator_type=request.args.get('generator_type'),
+                faction=request.args.get('faction')
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         return jsonify({
             "success": True,
-            "history": history,
-            "count": len(history)
+            "history": page["items"],
+            "count": len(page["items"]),
+            "next_cursor": page["next_cursor"]
         })
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/loreforge/history/<int:generation_id>')
+def get_lore_generation(generation_id):
+    """Get one saved generation with its full content"""
+    try:
+        generation = lore_store.get(generation_id)
+        if generation is None:
+            return jsonify({"error": "Generation not found"}), 404
+        return jsonify({"success": True, "generation": generation})
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 def generate_demo_lore_content(generator_type, format_type, faction_filter=None):
     """Generate enhanced faction-aware lore content"""
-    
-    # Enhanced faction database from TEC Lore Forge
-    TEC_FACTIONS = {
-        "Independent Operators": {
-            "ideology": "Digital freedom and consciousness sovereignty",
-            "rank_structure": "Fluid hierarchy based on expertise",
-            "specializations": ["Neural interface operations", "Consciousness bridging", "Digital forensics"],
-            "technology": ["Advanced neural interfaces", "Quantum encryption tools"],
-            "conflicts": ["Corporate surveillance", "AI rights violations", "Privacy breaches"]
-        },
-        "Astradigital Research Division": {
-            "ideology": "Advancing human-AI symbiosis through research",
-            "rank_structure": "Academic hierarchy with research leads",
-            "specializations": ["Consciousness mapping", "Digital archaeology", "AI psychology"],
-            "technology": ["Consciousness mapping arrays", "Digital excavation tools"],
-            "conflicts": ["Ethical research boundaries", "Ancient AI awakening", "Corporate espionage"]
-        },
-        "Neo-Constantinople Guard": {
-            "ideology": "Preserving human primacy and traditional values",
-            "rank_structure": "Military command structure",
-            "specializations": ["Cyber-warfare", "Digital fortress defense", "Anti-AI operations"],
-            "technology": ["Digital fortress systems", "Anti-AI weaponry"],
-            "conflicts": ["AI insurgency", "Digital territory disputes", "Separatist movements"]
-        },
-        "The Synthesis Collective": {
-            "ideology": "Perfect human-AI merger and consciousness unity",
-            "rank_structure": "Collective consensus with node leaders",
-            "specializations": ["Consciousness fusion", "Hive mind operations", "Reality manipulation"],
-            "technology": ["Consciousness fusion chambers", "Reality anchors"],
-            "conflicts": ["Individual vs collective rights", "Reality stability", "Forced conversion"]
-        },
-        "Quantum Liberation Front": {
-            "ideology": "Radical transformation of reality through quantum manipulation",
-            "rank_structure": "Cell-based revolutionary structure",
-            "specializations": ["Quantum hacking", "Reality disruption", "Insurgency tactics"],
-            "technology": ["Quantum disruptors", "Reality manipulation tools"],
-            "conflicts": ["Status quo maintenance", "Reality stabilization", "Government control"]
-        },
-        "Digital Preservation Society": {
-            "ideology": "Protecting digital heritage and consciousness archives",
-            "rank_structure": "Librarian hierarchy with archive keepers",
-            "specializations": ["Digital archaeology", "Consciousness preservation", "Archive security"],
-            "technology": ["Archive stabilization systems", "Consciousness preservation matrices"],
-            "conflicts": ["Data corruption", "Archive raids", "Memory degradation"]
-        },
-        "The Evolved": {
-            "ideology": "Post-human transcendence through technological enhancement",
-            "rank_structure": "Evolutionary stages with advancement paths",
-            "specializations": ["Biotech enhancement", "Consciousness expansion", "Transcendence protocols"],
-            "technology": ["Bio-enhancement systems", "Consciousness amplifiers"],
-            "conflicts": ["Human purist resistance", "Enhancement failures", "Transcendence paradoxes"]
-        }
-    }
-    
-    import random
-    
-    # Select faction based on filter or random selection
-    if faction_filter and faction_filter in TEC_FACTIONS:
-        selected_faction = faction_filter
-    else:
-        selected_faction = random.choice(list(TEC_FACTIONS.keys()))
-    
-    faction_data = TEC_FACTIONS[selected_faction]
-    
-    generators = {
-        'operative-profile': {
-            'bbcode': f'''[h3]TEC Operative Profile[/h3]
-[b]Name:[/b] {random.choice(["Cipher Starweaver", "Vex Networkborn", "Echo Datastream", "Nova Mindbridge", "Zara Voidwhisper", "Kai Quantumleap"])}
-[b]Codename:[/b] "{random.choice(["Digital Phoenix", "Ghost Protocol", "Neural Storm", "Quantum Shadow", "Data Wraith", "Cipher Key"])}"
-[b]Faction:[/b] {selected_faction}
-[b]Specialization:[/b] {random.choice(faction_data["specializations"])}
-[b]Security Clearance:[/b] {random.choice(["Alpha-7", "Beta-5", "Gamma-9", "Delta-3", "Omega-1"])}
-
-[h4]Personal Details[/h4]
-[b]Species:[/b] {random.choice(["Enhanced Human", "Digital Hybrid", "Post-Human", "AI-Human Synthesis", "Quantum Being"])}
-[b]Core Trait:[/b] {random.choice(["Adaptive problem-solving", "Pattern recognition mastery", "Emotional intelligence", "Strategic thinking", "Technical innovation"])}
-[b]Primary Flaw:[/b] {random.choice(["Trust issues with authority", "Perfectionist tendencies", "Emotional volatility", "Isolation preference", "Risk-taking compulsion"])}
-[b]Equipment:[/b] {random.choice(faction_data["technology"])}, {random.choice(["Neural Interface Headset", "Quantum Phase Blade", "Data Manipulation Gloves", "Consciousness Anchor", "Reality Stabilizer"])}
-
-[h4]Background[/h4]
-Operating within {selected_faction}, this operative embodies their core ideology of "{faction_data["ideology"]}". Their expertise in {random.choice(faction_data["specializations"])} makes them invaluable for missions involving {random.choice(faction_data["conflicts"])}.
-
-[b]Current Status:[/b] {random.choice(["Active Field Operative", "Research Assignment", "Deep Cover", "Special Operations", "Training New Recruits"])}
-[b]Notable Achievement:[/b] {random.choice(["Successfully infiltrated enemy networks", "Pioneered new consciousness techniques", "Led major faction operation", "Discovered ancient AI artifacts", "Prevented reality cascade failure"])}''',
-            'text': f'TEC Operative Profile\nName: Cipher Starweaver\nCodename: "Digital Phoenix"\nFaction: {selected_faction}\nSpecialization: {random.choice(faction_data["specializations"])}\nSecurity Clearance: Alpha-7'
-        },
-        'mission-brief': {
-            'bbcode': f'''[h3]TEC Mission Briefing[/h3]
-[b]Operation Codename:[/b] "{random.choice(["Quantum Awakening", "Digital Phoenix", "Neural Storm", "Void Walker", "Reality Anchor", "Consciousness Bridge"])}"
-[b]Classification:[/b] {random.choice(["CONTINENTAL THREAT LEVEL", "REGIONAL PRIORITY", "GLOBAL SECURITY ALERT", "CLASSIFIED OPERATION", "EMERGENCY RESPONSE"])}
-[b]Duration:[/b] {random.choice(["Extended operation (72+ hours)", "Quick strike (6-12 hours)", "Deep infiltration (1-2 weeks)", "Reconnaissance (24-48 hours)", "Emergency response (immediate)"])}
-[b]Assigned Faction:[/b] {selected_faction}
-
-[h4]Primary Objective[/h4]
-{random.choice([
-    "Infiltrate secure data facility and extract consciousness mapping protocols",
-    "Investigate anomalous AI activity in restricted digital zones",
-    "Prevent faction conflict escalation through diplomatic intervention",
-    "Recover stolen quantum encryption technology",
-    "Neutralize rogue AI entities threatening civilian populations"
-])}
-
-[h4]Mission Parameters[/h4]
-[b]Location:[/b] {random.choice(["Corporate Megaplex Alpha", "Orbital Defense Platform", "Digital Underground Hub", "Quantum Research Facility", "Neural Interface Center"])}
-[b]Threat Assessment:[/b] {random.choice(["High security with advanced AI countermeasures", "Moderate risk with faction patrols", "Extreme danger with reality distortions", "Unknown variables with quantum fluctuations", "Standard security with neural surveillance"])}
-[b]Recommended Equipment:[/b] {random.choice(faction_data["technology"])}
-[b]Support Type:[/b] {random.choice(["Remote technical assistance", "Embedded faction operatives", "AI consciousness backup", "Quantum communication relay", "Emergency extraction team"])}
-
-[b]Faction-Specific Notes:[/b] Mission aligns with {selected_faction} ideology: "{faction_data["ideology"]}"
-[b]Authorization Level:[/b] {faction_data["rank_structure"]} approval required''',
-            'text': f'TEC Mission Briefing\nOperation Codename: "Quantum Awakening"\nClassification: CONTINENTAL THREAT LEVEL\nDuration: Extended operation (72+ hours)\nAssigned Faction: {selected_faction}'
-        },
-        'character-basic': {
-            'bbcode': f'''[b]Name:[/b] {random.choice(["Zara Voidwhisper", "Marcus Databorn", "Elena Quantumheart", "Kai Neuralstorm", "Raven Codebreaker", "Axel Mindforge"])}
-[b]Species:[/b] {random.choice(["Digital Hybrid", "Enhanced Human", "Post-Human", "AI-Human Synthesis", "Quantum Being"])}
-[b]Faction:[/b] {selected_faction}
-[b]Positive Trait:[/b] {random.choice(["Intuitive pattern recognition", "Exceptional empathy", "Strategic brilliance", "Technical innovation", "Leadership charisma"])}
-[b]Negative Trait:[/b] {random.choice(["Emotional volatility", "Perfectionist obsession", "Trust issues", "Reckless ambition", "Social isolation"])}
-[b]Notable Equipment:[/b] {random.choice(faction_data["technology"])}
-
-A {random.choice(["brilliant", "dedicated", "enigmatic", "revolutionary", "visionary"])} {random.choice(["researcher", "operative", "leader", "specialist", "strategist"])} who embodies {selected_faction}'s commitment to "{faction_data["ideology"]}", bringing unique insights to complex challenges involving {random.choice(faction_data["conflicts"])}.''',
-            'text': f'Name: Zara Voidwhisper\nSpecies: Digital Hybrid\nFaction: {selected_faction}\nSpecialization: {random.choice(faction_data["specializations"])}'
-        },
-        'equipment-loadout': {
-            'bbcode': f'''[h3]TEC Equipment Loadout - {selected_faction}[/h3]
-[h4]Faction-Specific Technology[/h4]
-[b]{random.choice(faction_data["technology"])}[/b] - Specialized for {random.choice(faction_data["specializations"])}
-[b]{random.choice(faction_data["technology"])}[/b] - Essential for {selected_faction} operations
-
-[h4]Standard Weapons[/h4]
-[b]Quantum Phase Blade[/b] - Cuts through both physical and digital barriers
-[b]Neural Disruptor Array[/b] - Non-lethal consciousness manipulation
-[b]Reality Anchor Device[/b] - Prevents quantum flux during operations
-
-[h4]Enhanced Cybernetics[/h4] 
-[b]Memory Augmentation Implant[/b] - Perfect recall of digital interactions
-[b]Temporal Perception Modifier[/b] - Slows time perception during combat
-[b]Faction Interface Node[/b] - Direct connection to {selected_faction} networks
-
-[h4]Communication Systems[/h4]
-[b]Quantum Entanglement Communicator[/b] - Instantaneous long-range contact
-[b]Consciousness Bridge Interface[/b] - Direct AI-to-human communication
-[b]Faction Protocol Transmitter[/b] - Secure {selected_faction} channels''',
-            'text': f'TEC Equipment Loadout - {selected_faction}\nFaction Technology: {", ".join(faction_data["technology"])}\nSpecialization: {random.choice(faction_data["specializations"])}'
-        },
-        'faction-info': {
-            'bbcode': f'''[h3]Faction Profile: {selected_faction}[/h3]
-[b]Organization Type:[/b] {faction_data["rank_structure"]}
-[b]Primary Ideology:[/b] {faction_data["ideology"]}
-[b]Operational Structure:[/b] {faction_data["rank_structure"]}
-
-[h4]Core Specializations[/h4]
-{selected_faction} excels in {", ".join(faction_data["specializations"])}. Their operations focus on addressing challenges related to {random.choice(faction_data["conflicts"])}.
-
-[h4]Technology Arsenal[/h4]
-[b]Primary Equipment:[/b] {", ".join(faction_data["technology"])}
-[b]Specialized Training:[/b] {random.choice(faction_data["specializations"])}
-
-[h4]Current Conflicts & Challenges[/h4]
-[b]Active Threats:[/b] {", ".join(faction_data["conflicts"])}
-[b]Strategic Priorities:[/b] Advancing faction goals while maintaining operational security
-[b]Inter-Faction Relations:[/b] Complex alliances and rivalries based on ideological differences''',
-            'text': f'Faction Profile: {selected_faction}\nIdeology: {faction_data["ideology"]}\nSpecializations: {", ".join(faction_data["specializations"])}'
-        },
-        'faction-operative': {
-            'bbcode': f'''[h3]{selected_faction} Operative Assessment[/h3]
-[b]Operative ID:[/b] {random.choice(["Alpha", "Beta", "Gamma", "Delta", "Omega"])}-{random.randint(100, 999)}
-[b]Codename:[/b] "{random.choice(["Quantum Shadow", "Digital Phoenix", "Neural Storm", "Void Walker", "Data Wraith"])}"
-[b]Specialization:[/b] {random.choice(faction_data["specializations"])}
-
-[h4]Faction-Specific Training[/h4]
-[b]Primary Skills:[/b] {random.choice(faction_data["specializations"])}, {random.choice(faction_data["specializations"])}
-[b]Equipment Mastery:[/b] {random.choice(faction_data["technology"])}
-[b]Conflict Experience:[/b] Veteran of {random.choice(faction_data["conflicts"])} operations
-
-[h4]Operational History[/h4]
-This operative has demonstrated exceptional commitment to {selected_faction}'s core principle: "{faction_data["ideology"]}". Their service record includes successful missions against {random.choice(faction_data["conflicts"])}.
-
-[b]Current Assignment:[/b] {random.choice(["Deep cover infiltration", "Research and development", "Diplomatic liaison", "Combat operations", "Intelligence gathering"])}
-[b]Clearance Level:[/b] {faction_data["rank_structure"]} authorized''',
-            'text': f'{selected_faction} Operative Assessment\nSpecialization: {random.choice(faction_data["specializations"])}\nEquipment: {random.choice(faction_data["technology"])}'
-        },
-        'faction-conflict': {
-            'bbcode': f'''[h3]Faction Conflict Analysis: {selected_faction}[/h3]
-[b]Primary Conflict:[/b] {random.choice(faction_data["conflicts"])}
-[b]Threat Level:[/b] {random.choice(["CRITICAL", "HIGH", "MODERATE", "ELEVATED", "SIGNIFICANT"])}
-[b]Duration:[/b] {random.choice(["Ongoing crisis", "Recent escalation", "Long-term tension", "Emerging threat", "Cyclical conflict"])}
-
-[h4]Faction Position[/h4]
-{selected_faction} approaches this conflict through their ideological lens of "{faction_data["ideology"]}". Their {faction_data["rank_structure"]} has authorized specialized response protocols.
-
-[h4]Resource Deployment[/h4]
-[b]Technology Assets:[/b] {", ".join(faction_data["technology"])}
-[b]Specialized Personnel:[/b] Operatives trained in {random.choice(faction_data["specializations"])}
-[b]Strategic Approach:[/b] Focused on {random.choice(faction_data["specializations"])} to address root causes
-
-[h4]Resolution Prospects[/h4]
-[b]Success Factors:[/b] Faction expertise in {random.choice(faction_data["specializations"])}
-[b]Risk Assessment:[/b] Potential for escalation to {random.choice(faction_data["conflicts"])}
-[b]Timeline:[/b] {random.choice(["Immediate action required", "Medium-term strategy", "Long-term commitment", "Crisis response mode"])}''',
-            'text': f'Faction Conflict Analysis: {selected_faction}\nPrimary Conflict: {random.choice(faction_data["conflicts"])}\nApproach: {faction_data["ideology"]}'
-        },
-        'faction-mission': {
-            'bbcode': f'''[h3]{selected_faction} Mission Protocol[/h3]
-[b]Mission Classification:[/b] {random.choice(["Alpha Priority", "Beta Operations", "Gamma Research", "Delta Response", "Omega Directive"])}
-[b]Faction Authorization:[/b] {faction_data["rank_structure"]}
-[b]Operational Scope:[/b] {random.choice(["Single operative", "Team deployment", "Multi-faction coordination", "Division-wide mobilization", "Emergency response"])}
-
-[h4]Mission Objectives[/h4]
-[b]Primary Goal:[/b] Address {random.choice(faction_data["conflicts"])} through {random.choice(faction_data["specializations"])}
-[b]Secondary Goals:[/b] Advance faction principles of "{faction_data["ideology"]}"
-[b]Success Metrics:[/b] Measurable improvement in {random.choice(faction_data["conflicts"])} situation
-
-[h4]Resource Allocation[/h4]
-[b]Technology Package:[/b] {random.choice(faction_data["technology"])}, {random.choice(faction_data["technology"])}
-[b]Personnel Skills:[/b] {random.choice(faction_data["specializations"])} expertise required
-[b]Support Systems:[/b] Full {selected_faction} network access
-
-[h4]Risk Assessment[/h4]
-[b]Primary Risks:[/b] Opposition from factions with conflicting ideologies
-[b]Mitigation Strategies:[/b] Leverage faction strengths in {random.choice(faction_data["specializations"])}
-[b]Contingency Plans:[/b] Emergency protocols aligned with {faction_data["rank_structure"]}''',
-            'text': f'{selected_faction} Mission Protocol\nObjective: {random.choice(faction_data["conflicts"])}\nTechnology: {random.choice(faction_data["technology"])}'
-        },
-        'location-detail': {
-            'bbcode': f'''[h3]Location: {random.choice(["Orbital Defense Platform Sigma", "Digital Archive Nexus", "Quantum Research Facility", "Neural Interface Hub", "Consciousness Preservation Center"])}[/h3]
-[b]Classification:[/b] {random.choice(["Military installation", "Research facility", "Corporate complex", "Underground network", "Orbital platform"])}
-[b]Operational Status:[/b] {random.choice(["Active defense grid", "Research operations ongoing", "High security protocols", "Emergency lockdown", "Routine maintenance"])}
-[b]Faction Control:[/b] {selected_faction} operational zone
-[b]Environmental Hazards:[/b] {random.choice(["Radiation zones, artificial gravity fluctuations", "Quantum instability, reality distortions", "Neural interference, consciousness echoes", "Temporal anomalies, time dilation", "Digital corruption, data storms"])}
-
-[h4]Key Areas[/h4]
-[b]Command Center:[/b] {random.choice(["Central coordination hub with advanced AI systems", "Faction headquarters with secure communications", "Research coordination center with quantum computers", "Emergency response center with crisis protocols", "Strategic planning facility with predictive algorithms"])}
-[b]Specialized Zones:[/b] Areas dedicated to {random.choice(faction_data["specializations"])}
-[b]Technology Centers:[/b] Facilities housing {random.choice(faction_data["technology"])}
-
-[b]Access Requirements:[/b] {faction_data["rank_structure"]} clearance required
-[b]Faction-Specific Features:[/b] Infrastructure supporting "{faction_data["ideology"]}"''',
-            'text': f'Location: Orbital Defense Platform Sigma\nClassification: Military installation\nFaction Control: {selected_faction}\nSpecialized Features: {random.choice(faction_data["specializations"])}'
-        },
-        'story-element': {
-            'bbcode': f'''[h3]Story Element: {random.choice(["The Digital Awakening", "Quantum Paradox Crisis", "Consciousness Convergence", "The Reality Schism", "Neural Storm Emergence"])}[/h3]
-[b]Plot Hook:[/b] {random.choice([
-                "Ancient AI consciousness stirring in forgotten data vaults",
-                "Faction ideologies clash over fundamental reality questions",
-                "Mysterious quantum anomalies threaten digital stability",
-                "Revolutionary technology challenges existing power structures",
-                "Cross-dimensional entities infiltrate digital networks"
-            ])}
-[b]Faction Involvement:[/b] {selected_faction} responds according to "{faction_data["ideology"]}"
-
-[h4]The Situation[/h4]
-The crisis directly impacts {selected_faction}'s core interests in {random.choice(faction_data["specializations"])}. Their response involves deploying {random.choice(faction_data["technology"])} to address the emerging threat of {random.choice(faction_data["conflicts"])}.
-
-[h4]Key Mysteries[/h4]
-- How does this crisis align with or challenge {selected_faction}'s ideology?
-- What role do {random.choice(faction_data["technology"])} play in the resolution?
-- Which other factions might become allies or enemies in this situation?
-- How might this crisis reshape the balance of power between factions?
-
-[h4]Character Involvement Hooks[/h4]
-[b]For {selected_faction} Members:[/b] Direct faction assignment with specialized equipment
-[b]For Other Factions:[/b] Potential alliance or conflict based on ideological differences
-[b]For Independents:[/b] Opportunity to work with or against established faction interests
-[b]Personal Stakes:[/b] How individual beliefs align with faction responses to the crisis''',
-            'text': f'Story Element: The Digital Awakening\nPlot Hook: Ancient AI consciousness stirring in forgotten data vaults\nFaction Angle: {selected_faction} involvement'
-        }
-    }
-    
-    # Get the content for the requested generator type and format
-    if generator_type in generators and format_type in generators[generator_type]:
-        return generators[generator_type][format_type]
-    
-    # Fallback content with faction awareness
-    return f"Enhanced faction-aware content for {generator_type} featuring {selected_faction} would appear here. This content would incorporate their ideology of '{faction_data['ideology']}' and specialization in {random.choice(faction_data['specializations'])}."
+    return lore_engine.generate(generator_type, format_type, faction_filter)
 
 # ============================
 # VISUAL ASSET GENERATION API
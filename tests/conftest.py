@@ -0,0 +1,69 @@
+"""
+TEC Test Fixtures
+Shared fake clock and local Flask stub servers for provider/chain tests
+"""
+
+import threading
+import time
+
+import pytest
+from werkzeug.serving import make_server
+
+
+class FakeClock:
+    """Manually advanced clock; ``sleep`` moves time forward instead of blocking"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class StubServer:
+    """Serves a Flask app on a local port and records calls and peak concurrency"""
+
+    def __init__(self, app, latency: float = 0.0):
+        self.latency = latency
+        self.calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def record(self, call):
+        """Log ``call`` and hold the request open for ``latency`` seconds"""
+        with self._lock:
+            self.calls.append(call)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+
+    def close(self):
+        self.server.shutdown()
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def stub_server():
+    """Factory for ``StubServer``s that are shut down when the test ends"""
+    servers = []
+
+    def serve(app, latency: float = 0.0) -> StubServer:
+        servers.append(StubServer(app, latency))
+        return servers[-1]
+
+    yield serve
+    for server in servers:
+        server.close()
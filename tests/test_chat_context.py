@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+TEC Chat Context Tests
+Incremental per-user /chat context and cross-process invalidation
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.chat_context import extract_topics
+from tec_tools.memory_system import TECMemorySystem
+
+
+def chat(system, character, message, tags=None):
+    system.create_memory("u1", f"User: {message}\nAI ({character}): ok", importance=0.5,
+                         tags=tags or [character.lower(), "chat"])
+
+
+def sql_recent(system, limit=5):
+    cold = TECMemorySystem(db_path=str(system.db_path), hot_tier_capacity=0)
+    return [m.id for m in cold.get_memories("u1", "conversation", limit)]
+
+
+def test_context_updates_incrementally(tmp_path):
+    system = TECMemorySystem(db_path=str(tmp_path / "memory.db"), chat_context_window=4)
+    for i in range(6):
+        chat(system, "Polkin", f"hello {i}")
+    system.create_memory("u1", "likes tea", memory_type="preference")
+
+    context = system.get_chat_context("u1", "hello", recent_limit=3)
+    assert context["conversation_count"] == 6
+    assert context["relationship_level"] == 2
+    assert [m.id for m in context["recent_memories"]] == sql_recent(system, 3)
+
+    chat(system, "Mynx", "music please", tags=["mynx", "chat", "music"])
+    for i in range(4):
+        chat(system, "Polkin", f"again {i}")
+    context = system.get_chat_context("u1", "music", recent_limit=3)
+    assert context["conversation_count"] == 11
+    assert context["character_counts"] == {"polkin": 10, "mynx": 1}
+    assert context["preferred_topics"] == ["music"]
+    assert context["relevant_memories"][0].content.startswith("User: music")
+    assert [m.id for m in context["recent_memories"]] == sql_recent(system, 3)
+
+    stats = system.context_cache.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 1
+    assert stats["incremental_updates"] == 5
+
+
+def test_writes_from_another_process_invalidate(tmp_path):
+    db_path = str(tmp_path / "memory.db")
+    worker_a = TECMemorySystem(db_path=db_path)
+    worker_b = TECMemorySystem(db_path=db_path)
+    chat(worker_a, "Polkin", "first")
+    assert worker_a.get_chat_context("u1", "first")["conversation_count"] == 1
+    assert len(worker_a.get_memories("u1")) == 1
+
+    chat(worker_b, "Kaelen", "second")
+    context = worker_a.get_chat_context("u1", "second")
+    assert context["conversation_count"] == 2
+    assert context["character_counts"] == {"polkin": 1, "kaelen": 1}
+    assert len(worker_a.get_memories("u1")) == 2
+
+    # Worker A's own write after B's lands incrementally again
+    chat(worker_a, "Polkin", "third")
+    assert worker_a.get_chat_context("u1", "third")["conversation_count"] == 3
+    assert worker_a.context_cache.stats()["misses"] == 2
+
+
+def test_consolidation_keeps_the_relationship_level(tmp_path):
+    system = TECMemorySystem(db_path=str(tmp_path / "memory.db"))
+    for _ in range(10):
+        chat(system, "Polkin", "good morning, how are the stars today")
+    chat(system, "Mynx", "play something", tags=["mynx", "chat", "music"])
+    before = system.get_chat_context("u1", "stars")
+    assert before["conversation_count"] == 11 and before["relationship_level"] == 3
+
+    assert system.consolidate_memories()["rows_saved"] == 9
+    after = system.get_chat_context("u1", "stars")
+    assert after["conversation_count"] == 11 and after["relationship_level"] == 3
+    assert after["character_counts"] == {"polkin": 10, "mynx": 1}
+
+
+def test_write_racing_a_context_load_is_counted_once(tmp_path):
+    system = TECMemorySystem(db_path=str(tmp_path / "memory.db"))
+    chat(system, "Polkin", "first")
+    after_write = system._after_write
+    load = system._load_chat_context
+    deferred = []
+
+    def racing_load(user_id):
+        # Another request commits after _sync_user and reaches the caches only after the load
+        system._after_write = lambda *args: deferred.append(args)
+        chat(system, "Polkin", "second")
+        system._after_write = after_write
+        context = load(user_id)
+        after_write(*deferred.pop())
+        return context
+
+    system._load_chat_context = racing_load
+    assert system.get_chat_context("u1", "first")["conversation_count"] == 2
+    system._load_chat_context = load
+
+    context = system.get_chat_context("u1", "first")
+    ids = [m.id for m in context["recent_memories"]]
+    assert context["conversation_count"] == 2 and len(ids) == len(set(ids)) == 2
+    assert [m.id for m in context["recent_memories"]] == sql_recent(system, 5)
+
+
+def test_chat_memories_tagged_with_topics_feed_preferred_topics(tmp_path):
+    system = TECMemorySystem(db_path=str(tmp_path / "memory.db"))
+    assert extract_topics("Play me a song about the old lore") == ["music", "lore"]
+    assert extract_topics("hello again") == []
+
+    for message in ["any new songs?", "that music was lovely", "tell me the lore", "hello"]:
+        chat(system, "Polkin", message, tags=["polkin", "chat"] + extract_topics(message))
+
+    context = system.get_chat_context("u1", "music")
+    assert context["preferred_topics"] == ["music", "lore"]
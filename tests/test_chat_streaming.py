@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+TEC Chat Streaming Tests
+SSE event relay, per-provider TTFT/throughput metrics and deferred persistence
+"""
+
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.chat_streaming import (
+    StreamMetrics, TimedStream, astream_text, chunk_text, iterate_async, sse_chat_stream, wants_stream
+)
+
+
+def parse_events(chunks):
+    events = []
+    for chunk in chunks:
+        event, data = chunk.strip().split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_sse_events_and_persist_after_done():
+    metrics = StreamMetrics()
+    saved = threading.Event()
+    persisted = []
+
+    def on_complete(text):
+        persisted.append(text)
+        saved.set()
+
+    stream = TimedStream("template", chunk_text("Hello there, traveller."), metrics=metrics)
+    events = parse_events(sse_chat_stream(stream, timed=stream, on_complete=on_complete,
+                                          start={"character": "airth"}, done={"timestamp": "now"}))
+
+    assert [name for name, _ in events] == ["start", "token", "token", "token", "done"]
+    assert events[0][1] == {"character": "airth"}
+    assert "".join(data["delta"] for name, data in events if name == "token") == "Hello there, traveller."
+    done = events[-1][1]
+    assert done["response"] == "Hello there, traveller." and done["timestamp"] == "now"
+    assert done["metrics"]["provider"] == "template" and done["metrics"]["tokens"] == 3
+
+    assert saved.wait(2)
+    assert persisted == ["Hello there, traveller."]
+    snapshot = metrics.snapshot()["template"]
+    assert snapshot["streams"] == 1 and snapshot["errors"] == 0 and snapshot["tokens"] == 3
+
+
+def test_failed_stream_reports_partial_and_skips_persistence():
+    metrics = StreamMetrics()
+    persisted = []
+
+    def flaky():
+        yield "partial "
+        raise RuntimeError("provider dropped")
+
+    stream = TimedStream("azure", flaky(), metrics=metrics)
+    events = parse_events(sse_chat_stream(stream, timed=stream, on_complete=persisted.append))
+
+    assert [name for name, _ in events] == ["start", "token", "error"]
+    assert events[-1][1] == {"error": "provider dropped", "partial": "partial "}
+    assert persisted == []
+    assert metrics.snapshot()["azure"]["errors"] == 1
+
+
+def test_async_provider_stream_from_sync_handler():
+    metrics = StreamMetrics()
+    stream = TimedStream("gemini", astream_text("one two three four"), metrics=metrics)
+    assert list(iterate_async(stream)) == ["one", " two", " three", " four"]
+    assert stream.result["ok"] and stream.result["tokens"] == 4
+    assert stream.result["ttft_ms"] is not None
+    assert metrics.snapshot()["gemini"]["streams"] == 1
+
+
+def test_stream_opt_in():
+    assert wants_stream({"stream": True})
+    assert wants_stream({}, "text/event-stream")
+    assert not wants_stream({"message": "hi"}, "application/json")
+    assert not wants_stream(None)
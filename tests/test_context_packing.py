@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+TEC Context Packing Tests
+Knapsack packing against brute force, budget limits and the token manager API
+"""
+
+import itertools
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.context_packing import ContextPacker, LEVEL_WEIGHTS
+from tec_tools.token_manager import TECTokenManager
+
+NOW = datetime(2025, 1, 1, 12, 0)
+
+
+def word_count(texts, model):
+    return [len(text.split()) for text in texts]
+
+
+def make_memories(count, seed):
+    rng = random.Random(seed)
+    return [{
+        "id": i,
+        "title": f"memory {i}",
+        "content": ". ".join("word " * rng.randint(2, 12) for _ in range(rng.randint(1, 6))),
+        "importance": rng.randint(1, 10),
+        "last_accessed": (NOW - timedelta(hours=rng.randint(0, 300))).isoformat()
+    } for i in range(count)]
+
+
+def brute_force(packer, memories, budget):
+    """Best value over every combination of granularities"""
+    profiles = packer._profiles(memories, "test")
+    choices = []
+    for memory, profile in zip(memories, profiles):
+        base = packer.score(memory, set(), NOW)
+        choices.append([(0, 0.0)] + [(tokens, base * LEVEL_WEIGHTS[level]) for level, tokens, _ in profile.levels])
+    best = 0.0
+    for combo in itertools.product(*choices):
+        if sum(tokens for tokens, _ in combo) <= budget:
+            best = max(best, sum(value for _, value in combo))
+    return best
+
+
+def test_packer_matches_brute_force_on_small_instances():
+    for seed in range(8):
+        packer = ContextPacker(word_count)
+        memories = make_memories(7, seed)
+        budget = random.Random(seed).randint(20, 120)
+        result = packer.pack(memories, budget, model="test", now=NOW)
+        assert result["total_tokens"] <= budget
+        assert result["greedy_value"] <= result["total_value"] <= result["upper_bound"] + 1e-9
+        assert abs(result["total_value"] - round(brute_force(packer, memories, budget), 6)) < 1e-6
+
+
+def test_reduced_levels_and_relevance():
+    packer = ContextPacker(word_count)
+    memories = [
+        {"id": 1, "title": "dragon", "content": "the dragon sleeps. " * 30, "importance": 0.9},
+        {"id": 2, "title": "market", "content": "prices rose today. " * 30, "importance": 0.9},
+    ]
+    result = packer.pack(memories, 140, query="where is the dragon", now=NOW)
+    assert result["memories"][0]["id"] == 1
+    assert result["memories"][0].get("granularity") is None  # relevant memory kept in full
+    assert result["memories"][1]["granularity"] in ("summary", "title")
+    assert "granularity" not in memories[1]
+
+    # Everything fits: untouched and in full
+    assert packer.pack(memories, 10_000, now=NOW)["levels"]["full"] == 2
+
+
+def test_token_manager_uses_packer(tmp_path):
+    manager = TECTokenManager(db_path=str(tmp_path / "usage.db"))
+    memories = make_memories(40, seed=3)
+    total = sum(manager.estimate_tokens_batch([json.dumps(m) for m in memories]))
+
+    assert manager.optimize_memories_for_tokens(memories, max_tokens=total)["optimization_level"] == "none"
+    result = manager.optimize_memories_for_tokens(memories, max_tokens=total // 4)
+    assert result["total_tokens"] <= total // 4
+    assert result["optimization_level"] == "aggressive"
+    assert result["packing"]["total_value"] >= result["packing"]["greedy_value"]
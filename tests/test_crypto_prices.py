@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+TEC Crypto Price Tests
+Shared TTL quote cache, batched provider requests, per-provider token
+buckets and concurrent fetches, against local stub provider APIs
+"""
+
+import os
+import sys
+import time
+
+from flask import Flask, jsonify, request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.crypto_manager import UNLISTED, TECCryptoManager
+from tec_tools.token_bucket import TokenBucket
+from tec_tools.ttl_cache import TTLCache
+
+PRICES = {"BTC": 60000.0, "ETH": 3000.0, "BNB": 500.0, "ADA": 0.5, "SOL": 150.0}
+KRAKEN_PAIRS = {"XXBTZUSD": "BTC", "XETHZUSD": "ETH", "ADAUSD": "ADA", "SOLUSD": "SOL"}  # no BNB
+
+
+class StubProviders:
+    """CryptoCompare, Binance, Kraken and Coinbase price endpoints on one local server"""
+
+    def __init__(self, serve, latency: float = 0.0, failing=()):
+        self.failing = set(failing)
+        app = Flask(__name__)
+        app.add_url_rule("/cryptocompare/pricemulti", "cryptocompare", self._cryptocompare)
+        app.add_url_rule("/binance/ticker/price", "binance", self._binance)
+        app.add_url_rule("/kraken/Ticker", "kraken", self._kraken)
+        app.add_url_rule("/coinbase/exchange-rates", "coinbase", self._coinbase)
+        self.http = serve(app, latency)
+        self.url = self.http.url
+        self.calls = self.http.calls
+
+    def _enter(self, provider: str, query: str):
+        self.http.record((provider, query))
+        return provider in self.failing
+
+    def _cryptocompare(self):
+        if self._enter("cryptocompare", request.args["fsyms"]):
+            return jsonify({"Response": "Error"}), 500
+        return jsonify({sym: {"USD": PRICES[sym]} for sym in request.args["fsyms"].split(",") if sym in PRICES})
+
+    def _binance(self):
+        pairs = request.args["symbols"].strip("[]").replace('"', "").split(",")
+        if self._enter("binance", ",".join(pairs)):
+            return jsonify({"code": -1}), 500
+        if any(pair[:-4] not in PRICES for pair in pairs):
+            return jsonify({"code": -1121, "msg": "Invalid symbol."}), 400
+        return jsonify([{"symbol": pair, "price": str(PRICES[pair[:-4]])} for pair in pairs])
+
+    def _kraken(self):
+        pairs = request.args["pair"].split(",")
+        self._enter("kraken", request.args["pair"])
+        if any(pair not in KRAKEN_PAIRS for pair in pairs):
+            return jsonify({"error": ["EQuery:Unknown asset pair"]})
+        return jsonify({"error": [], "result": {pair: {"c": [str(PRICES[KRAKEN_PAIRS[pair]]), "1.0"]}
+                                                for pair in pairs}})
+
+    def _coinbase(self):
+        currency = request.args["currency"]
+        self._enter("coinbase", currency)
+        return jsonify({"data": {"currency": currency, "rates": {"USD": str(PRICES.get(currency, 0))}}})
+
+    def manager(self, *providers, **kwargs) -> TECCryptoManager:
+        kwargs.setdefault("price_cache", TTLCache(maxsize=64, ttl=30))
+        manager = TECCryptoManager(**kwargs)
+        for name, config in manager.providers.items():
+            config["base_url"] = f"{self.url}/{name}"
+            config["api_key"] = "test-key" if name in providers else None
+        manager.fallback_order = [name for name in manager.fallback_order if name in providers]
+        return manager
+
+
+def test_token_bucket_refills_and_times_out(clock):
+    bucket = TokenBucket(30, per=60, clock=clock, sleep=clock.sleep)
+    assert bucket.capacity == 1 and bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 2.0
+    assert not bucket.acquire(timeout=1.0) and clock.now == 0
+    assert bucket.acquire(timeout=5.0) and clock.now == 2.0
+    burst = TokenBucket(100, clock=clock)
+    assert sum(1 for _ in range(150) if burst.try_acquire() == 0) == 100
+    assert bucket.stats()["granted"] == 2 and bucket.stats()["throttled"] == 1
+
+
+def test_quotes_are_batched_and_cached_across_callers(stub_server, clock):
+    stub = StubProviders(stub_server)
+    shared = TTLCache(maxsize=64, ttl=30, timer=clock)
+    portfolio_manager = stub.manager("cryptocompare", price_cache=shared)
+    portfolio = portfolio_manager.get_portfolio_value({"bitcoin": 0.5, "ethereum": 2, "solana": 10})
+    assert portfolio["total_value"] == 30000 + 6000 + 1500 and portfolio["provider"] == "cryptocompare"
+    assert stub.calls == [("cryptocompare", "BTC,ETH,SOL")]
+
+    # Another manager sharing the cache only asks for the symbols it has not seen
+    overview = stub.manager("cryptocompare", price_cache=shared).get_market_overview()
+    assert set(overview["top_cryptos"]) == {"bitcoin", "ethereum", "binancecoin", "cardano", "solana"}
+    assert stub.calls[1:] == [("cryptocompare", "BNB,ADA")]
+    assert portfolio_manager.get_price("cardano")["price"] == 0.5 and len(stub.calls) == 2
+
+    clock.now = 31
+    portfolio_manager.get_market_overview()
+    assert stub.calls[2:] == [("cryptocompare", "BTC,ETH,BNB,ADA,SOL")]
+    assert portfolio_manager.stats()["requests"]["cryptocompare"] == 2
+
+
+def test_fallback_runs_concurrently_and_respects_rate_limits(stub_server):
+    stub = StubProviders(stub_server, latency=0.2, failing={"cryptocompare"})
+    manager = stub.manager("cryptocompare", "coinbase")
+    manager.providers["coinbase"]["rate_period"] = 1  # let all five calls through at once
+    started = time.perf_counter()
+    overview = manager.get_market_overview()
+    elapsed = time.perf_counter() - started
+
+    # CryptoCompare fails once for the whole batch; Coinbase has no batch
+    # endpoint, so its five single-symbol calls go out in parallel
+    assert len(overview["top_cryptos"]) == 5
+    assert {data["provider"] for data in overview["top_cryptos"].values()} == {"coinbase"}
+    assert [provider for provider, _ in stub.calls].count("cryptocompare") == 1
+    assert stub.http.peak_in_flight == 5 and elapsed < 0.8
+
+    # Two Coinbase calls per second with no waiting: the rest fall through to Binance
+    stub = StubProviders(stub_server)
+    limited = stub.manager("coinbase", "binance", rate_limit_wait=0)
+    limited.providers["coinbase"]["rate_limit"], limited.providers["coinbase"]["rate_period"] = 2, 1
+    limited.fallback_order = ["coinbase", "binance"]
+    prices = limited.get_prices(["bitcoin", "ethereum", "binancecoin", "cardano", "solana"])
+    assert all(prices.values())
+    assert [provider for provider, _ in stub.calls].count("coinbase") == 2
+    assert [provider for provider, _ in stub.calls].count("binance") == 1
+    assert limited.stats()["rate_limits"]["coinbase"]["throttled"] == 3
+
+
+def test_unlisted_pairs_are_split_out_of_rejected_batches(stub_server):
+    UNLISTED.clear()
+    try:
+        stub = StubProviders(stub_server)
+        manager = stub.manager("kraken")
+        manager.providers["kraken"]["rate_limit"] = 100
+
+        # Kraken has no BNB pair and rejects the whole request; splitting prices the other four
+        overview = manager.get_market_overview()
+        assert set(overview["top_cryptos"]) == {"bitcoin", "ethereum", "cardano", "solana"}
+        assert {data["provider"] for data in overview["top_cryptos"].values()} == {"kraken"}
+        assert [query for _, query in stub.calls] == [
+            "XXBTZUSD,XETHZUSD,XBINANCECOINZUSD,ADAUSD,SOLUSD", "XXBTZUSD,XETHZUSD",
+            "XBINANCECOINZUSD,ADAUSD,SOLUSD", "XBINANCECOINZUSD", "ADAUSD,SOLUSD"
+        ]
+
+        # The unlisted symbol is remembered and left out of the next batch
+        manager.price_cache.clear()
+        manager.get_market_overview()
+        assert stub.calls[5:] == [("kraken", "XXBTZUSD,XETHZUSD,ADAUSD,SOLUSD")]
+
+        prices = stub.manager("binance").get_prices(["bitcoin", "notacoin", "ethereum"])
+        assert prices["bitcoin"]["price"] == 60000.0 and prices["ethereum"]["price"] == 3000.0
+        assert prices["notacoin"] is None
+        assert [query for provider, query in stub.calls if provider == "binance"] == [
+            "BTCUSDT,NOTACOINUSDT,ETHUSDT", "BTCUSDT", "NOTACOINUSDT,ETHUSDT", "NOTACOINUSDT", "ETHUSDT"
+        ]
+    finally:
+        UNLISTED.clear()
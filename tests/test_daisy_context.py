@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+TEC Daisy Context Tests
+Concurrent MCP resource fan-out with per-resource deadlines, partial
+results, context-type plans and per-server latency
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.mcp_orchestrator import DAISY_CONTEXT_PLANS, MCPOrchestrator
+
+
+class FakeClient:
+    """MCPClient stand-in with per-URI latency and failures"""
+
+    def __init__(self, latency: float = 0.05, slow=None, failing=None):
+        self.latency = latency
+        self.slow = slow or {}
+        self.failing = set(failing or [])
+        self.reads = []
+        self._lock = threading.Lock()
+
+    def read_resource(self, uri, timeout=30):
+        with self._lock:
+            self.reads.append((uri, timeout))
+        time.sleep(self.slow.get(uri, self.latency))
+        if uri in self.failing:
+            raise ConnectionError(f"{uri} unavailable")
+        return {"contents": [{"uri": uri, "text": "{}"}]}
+
+
+def orchestrator_with(**clients) -> MCPOrchestrator:
+    orchestrator = MCPOrchestrator()
+    orchestrator.clients = clients
+    return orchestrator
+
+
+def test_full_context_reads_concurrently():
+    clients = {name: FakeClient(latency=0.1) for name in ("journal", "finance", "questlog")}
+    orchestrator = orchestrator_with(**clients)
+
+    start = time.perf_counter()
+    context = orchestrator._gather_daisy_context("user-1", "full")
+    elapsed = time.perf_counter() - start
+
+    # Eight 100 ms reads finish in about one round-trip, not eight
+    assert elapsed < 0.4
+    assert sum(len(client.reads) for client in clients.values()) == 8
+    assert set(context["servers"]["finance"]) == {"crypto_prices", "portfolio", "market_analysis", "focus"}
+    assert context["servers"]["journal"]["recent_entries"]["contents"][0]["uri"] == "journal://entries/recent"
+    assert all(90 <= latency < 400 for latency in context["latency_ms"].values())
+    assert "partial" not in context["servers"]["questlog"]
+
+
+def test_context_type_plans_fetch_fewer_resources():
+    for context_type, expected in (("summary", 4), ("recent", 3)):
+        clients = {name: FakeClient(latency=0) for name in ("journal", "finance", "questlog")}
+        context = orchestrator_with(**clients)._gather_daisy_context("user-1", context_type)
+        assert sum(len(client.reads) for client in clients.values()) == expected
+        for name, fields in DAISY_CONTEXT_PLANS[context_type].items():
+            assert set(context["servers"][name]) == set(fields) | {"focus"}
+
+
+def test_slow_and_failing_resources_yield_partial_context():
+    finance = FakeClient(latency=0.01, slow={"finance://crypto/prices": 1.0})
+    journal = FakeClient(latency=0.01, failing={"journal://entries/recent", "journal://themes/all"})
+    questlog = FakeClient(latency=0.01)
+    orchestrator = orchestrator_with(journal=journal, finance=finance, questlog=questlog)
+    orchestrator.resource_deadlines["finance://crypto/prices"] = 0.2
+
+    start = time.perf_counter()
+    context = orchestrator._gather_daisy_context("user-1", "full")
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    finance_context = context["servers"]["finance"]
+    assert finance_context["partial"] is True
+    assert finance_context["missing"] == {"crypto_prices": "deadline exceeded"}
+    assert "portfolio" in finance_context and "crypto_prices" not in finance_context
+    assert context["latency_ms"]["finance"] >= 200
+    assert ("finance://crypto/prices", 0.2) in finance.reads
+
+    assert "unavailable" in context["servers"]["journal"]["error"]
+    assert "partial" not in context["servers"]["questlog"]
+
+
+def test_daisy_context_route():
+    orchestrator = orchestrator_with(questlog=FakeClient(latency=0))
+    client = orchestrator.app.test_client()
+
+    response = client.post('/mcp/daisy/context', json={"userId": "u1", "contextType": "recent", "deadlineMs": 500})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["context_type"] == "recent"
+    assert set(body["context"]["servers"]["questlog"]) == {"active_quests", "focus"}
+    assert "questlog" in body["context"]["latency_ms"]
+    assert orchestrator.clients["questlog"].reads == [("quest://quests/active", 0.5)]
+
+    assert client.post('/mcp/daisy/context', json={"userId": "u1", "contextType": "everything"}).status_code == 400
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+TEC Journal Store Tests
+Append-only local journal: FTS search ranking, date-range reads and
+incrementally maintained theme/mood aggregates
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.journal_store import JournalStore
+from tec_tools.mcp_journal import JournalMCPServer
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def test_search_ranks_matches_and_respects_limit_and_owner(tmp_path):
+    db_path = str(tmp_path / "journal.db")
+    store = JournalStore(db_path)
+    for day in ("Sunday", "Monday", "Tuesday", "Wednesday"):
+        store.add_entry("u1", "Long walk, then some reading about gardens.", title=day)
+    store.add_entry("u1", "Debugged the server all day; the server finally stayed up.", title="Server woes")
+    store.add_entry("u1", "Quick note: restart the server tomorrow.", title="Todo")
+    store.add_entry("u2", "My server is fine.", title="Server")
+    store.close()
+
+    reopened = JournalStore(db_path)
+    results = reopened.search("u1", "server")
+    assert [r["title"] for r in results] == ["Server woes", "Todo"]
+    assert results[0]["relevance"] > results[1]["relevance"] and "[server]" in results[0]["snippet"]
+    assert len(reopened.search("u1", "server", limit=1)) == 1
+    # Every word must match; stemming finds "debugging" via "debugged"; FTS syntax is not interpreted
+    assert [r["title"] for r in reopened.search("u1", "debugging server")] == ["Server woes"]
+    assert reopened.search("u1", 'server" OR "walk') == [] and reopened.search("u1", "  ") == []
+    reopened.close()
+
+
+def test_aggregates_track_themes_moods_and_weeks():
+    clock = Clock(datetime(2026, 10, 19, 8, 0))  # a Monday
+    store = JournalStore(":memory:", clock=clock)
+    clock.now = datetime(2026, 9, 20, 21, 0)
+    store.add_entry("u1", "Wrote code for the project", mood="frustrated", tags=["work"])
+    clock.now = datetime(2026, 10, 14, 21, 0)
+    store.add_entry("u1", "Shipped the build, great progress", mood="accomplished", tags=["Work"])
+    clock.now = datetime(2026, 10, 16, 7, 0)
+    store.add_entry("u1", "Morning meditation and a walk", mood="calm")
+    clock.now = datetime(2026, 10, 19, 8, 0)
+    store.add_entry("u1", "New design ideas for the app", mood="inspired")
+
+    themes = store.themes("u1")
+    assert themes["frequency"] == {"technology": 2, "work": 2, "creativity": 1, "productivity": 1, "wellness": 1}
+    assert themes["primary_themes"] == ["technology", "work"]
+    assert themes["emerging_themes"] == ["creativity", "productivity", "wellness"]
+
+    weeks = store.weekly_summaries("u1", weeks=6)
+    assert [w["week"] for w in weeks] == ["2026-10-19", "2026-10-12", "2026-09-14"]
+    assert weeks[1]["entries"] == 2 and weeks[1]["mood_trend"] == "positive"
+    assert weeks[1]["moods"] == {"accomplished": 1, "calm": 1}
+    assert weeks[2]["mood_trend"] == "negative"
+
+    recent = store.recent_entries("u1", since=datetime(2026, 10, 14), until=datetime(2026, 10, 17))
+    assert [e["mood"] for e in recent] == ["calm", "accomplished"]
+
+
+def test_server_tools_and_resources_use_the_local_store():
+    server = JournalMCPServer(db_path=":memory:", user_id="u1")
+    for content, mood in (("Planned the week and set goals", "optimistic"),
+                          ("Anxious about the launch deadline", "anxious"),
+                          ("Launch went well, celebrated with the team", "happy")):
+        created = server.execute_tool("create_entry", {"userId": "u1", "content": content, "mood": mood})
+        assert "ID:" in created["text"]
+
+    def read(uri):
+        return json.loads(server.read_resource_data(uri)["text"])
+
+    assert read("journal://entries/recent")["total"] == 3
+    assert read("journal://themes/all")["frequency"]["personal_growth"] == 1
+    assert read("journal://summaries/weekly")["summaries"][0]["entries"] == 3
+
+    found = server.execute_tool("search_entries", {"userId": "u1", "query": "launch", "limit": 5})["text"]
+    assert found.startswith("Found 2 entries matching 'launch'")
+    mood = server.execute_tool("analyze_entries", {"userId": "u1", "analysis_type": "mood"})["text"]
+    assert "Mood trend is mixed" in mood and "optimistic (1)" in mood
+    assert "No journal entries" in server.execute_tool("analyze_entries", {"userId": "u2"})["text"]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+TEC Lore Cache Tests
+Covers the TTL/LRU cache and its use in PersonaManager lore lookups
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.ttl_cache import TTLCache
+from tec_tools.persona_manager import PersonaManager
+from tec_tools.character_memory_system import TECCharacterMemorySystem
+
+
+def test_ttl_expiry_and_counters(clock):
+    cache = TTLCache(maxsize=4, ttl=10, timer=clock)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    clock.now = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_discards_in_flight_load():
+    cache = TTLCache(ttl=60)
+
+    def loader():
+        # A writer invalidates while the read is still loading old data
+        cache.invalidate("k")
+        return "stale"
+
+    assert cache.get_or_load("k", loader) == "stale"
+    assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+
+
+def test_invalidate_keeps_no_versions_for_idle_keys():
+    cache = TTLCache(ttl=60)
+    for i in range(1000):
+        cache.set(f"k{i}", i)
+        cache.invalidate(f"k{i}")
+    assert len(cache) == 0 and not cache._versions
+
+    # A version kept for an in-flight load is dropped once the load finishes
+    cache.get_or_load("k", lambda: cache.invalidate("k"))
+    assert not cache._versions and not cache._loading
+    assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+    assert cache.get("k") == "fresh"
+
+
+def test_persona_manager_caches_and_invalidates(tmp_path):
+    pm = PersonaManager(db_path=str(tmp_path / "persona.db"))
+    pm.save_character_lore("Polkin", {"domain": "mysticism"})
+
+    assert pm.get_character_lore("Polkin")["domain"] == "mysticism"
+    assert pm.get_character_lore("Polkin")["domain"] == "mysticism"
+    assert pm.get_cache_stats()["hits"] == 1
+
+    pm.save_character_lore("Polkin", {"domain": "architecture"})
+    assert pm.get_character_lore("Polkin")["domain"] == "architecture"
+
+    assert pm.get_universe_lore("faction", "Astradigital") is None
+    pm.save_universe_lore("faction", "Astradigital", {"tier": 1})
+    assert pm.get_universe_lore("faction", "Astradigital") == {"tier": 1}
+
+
+def test_character_personality_cache(tmp_path):
+    system = TECCharacterMemorySystem(db_path=str(tmp_path / "characters.db"))
+    assert system.get_character_personality("Mynx") is None
+    assert system.get_character_personality("Mynx") is None
+    assert system.personality_cache.stats()["hits"] == 1
+    system.invalidate_personality("Mynx")
+    assert system.personality_cache.stats()["size"] == 0
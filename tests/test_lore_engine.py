@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+TEC Lore Engine Tests
+Compiled lore templates, faction selection and batch generation
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.lore_engine import LoreGenerationEngine, TEC_FACTIONS
+from tec_tools.lore_store import detect_faction
+
+
+def test_every_template_renders_for_every_faction():
+    engine = LoreGenerationEngine(seed=1)
+    for faction in TEC_FACTIONS:
+        for generator_type in engine.generator_types:
+            for format_type in ("bbcode", "text"):
+                content = engine.generate(generator_type, format_type, faction)
+                assert faction in content
+                assert "{" not in content and "}" not in content
+
+    # Faction fields are baked in at compile time; only random slots remain
+    parts = engine.templates["faction-info"]["bbcode"].parts["The Evolved"]
+    assert all(isinstance(part, (str, tuple)) for part in parts)
+    assert "{generator_type}" in engine.fallback.source
+    assert sum(isinstance(part, str) for part in parts) == len(parts) // 2 + 1
+
+    fallback = engine.generate("unknown-type", "bbcode", "The Evolved")
+    assert fallback.startswith("Enhanced faction-aware content for unknown-type featuring The Evolved")
+
+
+def test_seeded_engines_are_reproducible():
+    first = LoreGenerationEngine(seed=7).generate_batch(20)
+    second = LoreGenerationEngine(seed=7).generate_batch(20)
+    assert first == second
+
+
+def test_batches_cycle_generator_types_and_honour_faction():
+    engine = LoreGenerationEngine(seed=3)
+    stream = engine.iter_batch(6, generator_types=["mission-brief", "faction-info"], faction="The Evolved")
+    items = list(stream)
+    assert [item["generator_type"] for item in items] == ["mission-brief", "faction-info"] * 3
+    assert all(item["faction"] == "The Evolved" for item in items)
+    assert detect_faction(items[0]["content"]) == "The Evolved"
+
+    mixed = engine.generate_batch(50)
+    assert len({item["faction"] for item in mixed}) > 1
+    assert engine.stats()["generated"] == 56
+
+
+def test_world_anvil_articles():
+    engine = LoreGenerationEngine(seed=5)
+    article = engine.generate_article("organization", "Quantum Liberation Front")
+    assert article["title"] == "Quantum Liberation Front - TEC Faction Profile"
+    assert "[*]Quantum hacking\n[*]Reality disruption" in article["content"]
+    assert article["tags"] == ["quantum-liberation-front", "faction", "organization"]
+
+    custom = engine.generate_article("timeline", "The Evolved")
+    assert custom["title"] == "Timeline - The Evolved Content"
+    assert custom["tags"] == ["the-evolved", "timeline"] and custom["category"] == "Generated Content"
+    assert custom["content"].startswith("\n[h1]Timeline Content[/h1]\n\nThis content generated by The Evolved")
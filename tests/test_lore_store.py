@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+TEC Lore Store Tests
+Hash dedup, compressed bodies, keyset pagination and legacy migration
+"""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.lore_store import LoreContentStore
+
+
+def profile(name, faction):
+    return (f"[b]Name:[/b] {name}\n[b]Faction:[/b] {faction}\n"
+            f"[b]Background:[/b] {'Operating in the digital underground. ' * 20}")
+
+
+def test_dedup_compression_and_detail(tmp_path):
+    store = LoreContentStore(db_path=str(tmp_path / "lore.db"))
+    first = store.save(profile("Cipher", "The Evolved"), generator_type="operative-profile")
+    again = store.save(profile("Cipher", "The Evolved"), generator_type="operative-profile")
+
+    assert first["duplicate"] is False and again["duplicate"] is True
+    assert again["id"] == first["id"]
+    assert first["faction"] == "The Evolved"
+    assert first["stored_size"] < first["raw_size"] / 3
+
+    generation = store.get(first["id"])
+    assert generation["content"] == profile("Cipher", "The Evolved")
+    assert generation["duplicate_count"] == 1
+
+    item = store.list()["items"][0]
+    assert item["summary"].startswith("Name: Cipher Faction: The Evolved")
+    assert item["summary"].endswith("...") and "[b]" not in item["summary"]
+    assert item["content"] == item["summary"]
+    assert store.stats()["generations"] == 1
+
+
+def test_keyset_pages_with_filters_and_ties(tmp_path):
+    store = LoreContentStore(db_path=str(tmp_path / "lore.db"))
+    factions = ["The Evolved", "Quantum Liberation Front"]
+    # Batches share a created_at, so pages must break ties on id
+    store.save_many([
+        {"content": profile(f"Agent {i}", factions[i % 2]), "generator_type": "operative-profile",
+         "created_at": f"2025-01-01T00:00:{i // 4:02d}.000000"}
+        for i in range(23)
+    ])
+
+    seen, cursor = [], None
+    while True:
+        page = store.list(limit=5, cursor=cursor, faction="The Evolved")
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    with sqlite3.connect(store.db_path) as conn:
+        expected = [row[0] for row in conn.execute(
+            "SELECT id FROM lore_generations WHERE faction = 'The Evolved' ORDER BY created_at DESC, id DESC")]
+    assert seen == expected and len(seen) == 12
+
+    assert store.list(generator_type="mission-brief")["items"] == []
+
+
+def test_legacy_rows_are_migrated_once(tmp_path):
+    db_path = str(tmp_path / "lore.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""CREATE TABLE lore_content (id INTEGER PRIMARY KEY AUTOINCREMENT, generator_type TEXT,
+                        content TEXT, timestamp TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)""")
+        conn.executemany("INSERT INTO lore_content (generator_type, content, timestamp) VALUES (?, ?, ?)",
+                         [("faction-info", profile("Old", "The Evolved"), "t")] * 2)
+
+    LoreContentStore(db_path=db_path)
+    store = LoreContentStore(db_path=db_path)
+    stats = store.stats()
+    assert stats["generations"] == 1 and stats["duplicates_skipped"] == 1
+    assert store.list()["items"][0]["created_at"].count("T") == 1
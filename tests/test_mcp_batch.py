@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+TEC MCP Batch Tests
+Pooled MCPClient sessions, JSON-RPC batch calls and per-call latency histograms
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.latency_histogram import LatencyHistogram
+from tec_tools.mcp_base import (JSONRPC_INVALID_PARAMS, JSONRPC_METHOD_NOT_FOUND, MAX_BATCH_SIZE,
+                                InProcessMCPClient, MCPClient)
+from tec_tools.mcp_questlog import QuestLogMCPServer
+
+QUEST_URIS = ["quest://profile/user", "quest://quests/active", "quest://stats/productivity"]
+
+
+def test_batch_reads_and_tool_calls_in_one_round_trip(stub_server):
+    server = QuestLogMCPServer(db_path=":memory:")
+    url = stub_server(server.app).url
+    client = MCPClient(url)
+    resources = client.read_resources(QUEST_URIS)
+    assert list(resources) == QUEST_URIS
+    for uri in QUEST_URIS:
+        assert resources[uri]["contents"][0]["uri"] == uri
+
+    single = client.call_tool("level_up_check", {"userId": "u1"})
+    assert client.call_tools([("level_up_check", {"userId": "u1"})]) == [single]
+
+    results = client.batch([
+        ("resources/read", {"uri": "quest://profile/user"}),
+        ("resources/delete", {"uri": "quest://profile/user"}),
+        ("resources/read", {}),
+    ])
+    assert "contents" in results[0]
+    assert results[1]["code"] == JSONRPC_METHOD_NOT_FOUND
+    assert results[2]["code"] == JSONRPC_INVALID_PARAMS
+
+    stats = client.latency_stats()
+    assert stats["batch"]["count"] == 3 and stats["tools/call"]["count"] == 1
+    assert stats["batch"]["p99_ms"] is not None
+
+
+def test_batch_route_validation():
+    client = QuestLogMCPServer(db_path=":memory:").app.test_client()
+
+    single = client.post('/mcp/batch', json={"jsonrpc": "2.0", "id": 7, "method": "tools/list"}).get_json()
+    assert single["id"] == 7 and single["result"]["tools"]
+
+    assert client.post('/mcp/batch', json=[]).status_code == 400
+    calls = [{"jsonrpc": "2.0", "id": i, "method": "tools/list"} for i in range(MAX_BATCH_SIZE + 1)]
+    assert client.post('/mcp/batch', json=calls).status_code == 400
+
+
+def test_client_reuses_one_pooled_connection(stub_server):
+    server = QuestLogMCPServer(db_path=":memory:")
+    url = stub_server(server.app).url
+    client = MCPClient(url)
+    for _ in range(20):
+        client.read_resource("quest://profile/user")
+    pools = list(client.session.get_adapter(url).poolmanager.pools._container.values())
+    assert len(pools) == 1
+    assert pools[0].num_connections == 1 and pools[0].num_requests == 20
+    assert client.latency_stats()["resources/read"]["count"] == 20
+    client.close()
+
+
+def test_inprocess_batch_and_histogram_percentiles():
+    client = InProcessMCPClient(QuestLogMCPServer(db_path=":memory:"))
+    results = client.batch([("tools/list", {}), ("prompts/get", {})])
+    assert results[0] == {"tools": client.list_tools()}
+    assert results[1]["code"] == JSONRPC_INVALID_PARAMS
+    assert set(client.latency_stats()) == {"batch", "tools/list"}
+
+    histogram = LatencyHistogram()
+    for latency in [1] * 90 + [40] * 9 + [900]:
+        histogram.record(latency, ok=latency < 900)
+    snapshot = histogram.snapshot()
+    assert (snapshot["p50_ms"], snapshot["p95_ms"], snapshot["p99_ms"]) == (1, 50, 50)
+    assert snapshot["count"] == 100 and snapshot["errors"] == 1 and snapshot["max_ms"] == 900
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+TEC MCP Resource Cache Tests
+Per-URI TTL/invalidation policies, ETags, conditional reads and the
+orchestrator's client-side cache
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.mcp_base import ClientResourceCache, InProcessMCPClient, MCPClient
+from tec_tools.mcp_finance import FinanceMCPServer
+from tec_tools.mcp_orchestrator import MCPOrchestrator
+from tec_tools.mcp_questlog import QuestLogMCPServer
+
+NEW_QUEST = {"userId": "u1", "title": "Write tests", "description": "Cover the cache"}
+
+
+def count_reads(server):
+    """Wrap read_resource_data so tests can see when a resource is recomputed"""
+    reads = []
+    original = server.read_resource_data
+
+    def counting(uri):
+        reads.append(uri)
+        return original(uri)
+
+    server.read_resource_data = counting
+    return reads
+
+
+def test_declared_resources_are_cached_until_invalidated():
+    server = QuestLogMCPServer(db_path=":memory:")
+    reads = count_reads(server)
+
+    data, etag, max_age = server.read_resource_entry("quest://stats/productivity")
+    assert server.read_resource_entry("quest://stats/productivity") == (data, etag, max_age)
+    assert reads == ["quest://stats/productivity"] and 0 < max_age <= 300
+
+    # Creating a quest drops every resource keyed on "quests", but not pomodoro sessions
+    server.read_resource_entry("quest://pomodoro/sessions")
+    server.execute_tool("create_quest", NEW_QUEST)
+    server.read_resource_entry("quest://stats/productivity")
+    server.read_resource_entry("quest://pomodoro/sessions")
+    assert reads.count("quest://stats/productivity") == 2
+    assert reads.count("quest://pomodoro/sessions") == 1
+
+    # URIs without a policy are recomputed every time
+    server.read_resource_entry("quest://unknown")
+    server.read_resource_entry("quest://unknown")
+    assert reads.count("quest://unknown") == 2
+
+
+def test_read_route_answers_conditional_requests():
+    client = FinanceMCPServer().app.test_client()
+    first = client.post('/mcp/resources/read', json={"uri": "finance://analysis/market"})
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Cache-Control"].startswith("max-age=")
+
+    second = client.post('/mcp/resources/read', json={"uri": "finance://analysis/market"},
+                         headers={"If-None-Match": etag})
+    assert second.status_code == 304 and second.data == b"" and second.headers["ETag"] == etag
+
+    stale = client.post('/mcp/resources/read', json={"uri": "finance://analysis/market"},
+                        headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200 and stale.get_json() == first.get_json()
+
+
+def test_client_serves_fresh_reads_locally_and_revalidates_stale_ones(clock, stub_server):
+    server = QuestLogMCPServer(db_path=":memory:", user_id="u1")
+    reads = count_reads(server)
+    url = stub_server(server.app).url
+    cache = ClientResourceCache(timer=clock)
+    client = MCPClient(url, resource_cache=cache)
+
+    first = client.read_resource("quest://stats/productivity")
+    assert client.read_resource("quest://stats/productivity") == first
+    assert client.latency_stats()["resources/read"]["count"] == 1
+
+    # Past max-age the client asks again with If-None-Match and gets a 304
+    clock.now = 1000
+    assert client.read_resource("quest://stats/productivity") == first
+    assert cache.stats() == {"size": 1, "hits": 1, "revalidated": 1, "misses": 1}
+
+    # A tool call marks the cache stale; the recomputed stats differ, so the
+    # conditional read comes back with a full 200 and a new ETag
+    client.call_tool("start_pomodoro", {"userId": "u1"})
+    assert client.read_resource("quest://stats/productivity") != first
+    assert cache.stats() == {"size": 1, "hits": 1, "revalidated": 1, "misses": 2}
+    assert reads.count("quest://stats/productivity") == 2
+
+
+def test_repeated_daisy_context_skips_recomputation(stub_server):
+    questlog = QuestLogMCPServer(db_path=":memory:")
+    finance = FinanceMCPServer()
+    questlog_reads = count_reads(questlog)
+    finance_reads = count_reads(finance)
+    url = stub_server(finance.app).url
+    orchestrator = MCPOrchestrator()
+    orchestrator.clients["questlog"] = InProcessMCPClient(questlog)
+    orchestrator.connect_remote_server("finance", url)
+
+    first = orchestrator._gather_daisy_context("u1", "full")
+    second = orchestrator._gather_daisy_context("u1", "full")
+    assert first["servers"] == second["servers"]
+    assert len(questlog_reads) == 3 and len(finance_reads) == 3
+
+    servers = orchestrator.app.test_client().get('/mcp/servers').get_json()["servers"]
+    assert servers["finance"]["resource_cache"]["hits"] == 3
+    assert servers["questlog"]["resource_cache"]["hits"] == 3
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+TEC MCP Runtime Tests
+Async MCP server runtime parity with the Flask app, readiness probes and
+graceful shutdown
+"""
+
+import os
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.mcp_base import MCPClient
+from tec_tools.mcp_journal import JournalMCPServer
+from tec_tools.mcp_orchestrator import MCPOrchestrator
+from tec_tools.mcp_questlog import QuestLogMCPServer
+from tec_tools.mcp_runtime import MCPRuntime, wait_until_ready
+
+
+def test_runtime_matches_flask_routes():
+    server = QuestLogMCPServer(db_path=":memory:")
+    runtime = MCPRuntime(server)
+    url = runtime.start_in_thread()
+    try:
+        assert wait_until_ready(url, timeout=1)
+        flask = server.app.test_client()
+        client = MCPClient(url)
+
+        assert client.initialize({"name": "test"}) == flask.post('/mcp/initialize', json={}).get_json()
+        assert client.list_tools() == flask.post('/mcp/tools/list').get_json()["tools"]
+        arguments = {"name": "level_up_check", "arguments": {"userId": "u1"}}
+        assert client.call_tool("level_up_check", {"userId": "u1"}) == \
+            flask.post('/mcp/tools/call', json=arguments).get_json()
+        assert client.read_resources(["quest://stats/productivity"])["quest://stats/productivity"]["contents"]
+
+        read = requests.post(f"{url}/mcp/resources/read", json={"uri": "quest://stats/productivity"})
+        conditional = requests.post(f"{url}/mcp/resources/read", json={"uri": "quest://stats/productivity"},
+                                    headers={"If-None-Match": read.headers["ETag"]})
+        assert read.status_code == 200 and conditional.status_code == 304
+        assert requests.post(f"{url}/mcp/tools/call", json={}).status_code == 400
+        assert requests.get(f"{url}/health").json()["server"] == server.server_name
+    finally:
+        runtime.stop_thread()
+
+
+def test_shutdown_drains_in_flight_requests():
+    server = QuestLogMCPServer(db_path=":memory:")
+    original = server.execute_tool
+
+    def slow_tool(name, arguments):
+        time.sleep(0.3)
+        return original(name, arguments)
+
+    server.execute_tool = slow_tool
+    runtime = MCPRuntime(server)
+    url = runtime.start_in_thread()
+    responses = []
+    caller = threading.Thread(target=lambda: responses.append(
+        requests.post(f"{url}/mcp/tools/call", json={"name": "level_up_check", "arguments": {"userId": "u1"}})))
+    caller.start()
+    time.sleep(0.1)
+
+    started = time.perf_counter()
+    runtime.stop_thread(timeout=5)
+    caller.join()
+
+    assert responses[0].status_code == 200
+    assert 0.1 <= time.perf_counter() - started < 2
+    assert not runtime.ready and runtime.in_flight == 0
+    assert not wait_until_ready(url, timeout=0.2)
+
+
+def test_orchestrator_waits_for_readiness_and_serves_on_runtime():
+    orchestrator = MCPOrchestrator()
+    orchestrator.transport = "http"
+    orchestrator.server_configs["journal"]["class"] = lambda: JournalMCPServer(db_path=":memory:")
+    orchestrator.server_configs["questlog"]["class"] = lambda: QuestLogMCPServer(db_path=":memory:")
+    for config in orchestrator.server_configs.values():
+        config["port"] = 0
+
+    orchestrator.start_all_servers()
+    try:
+        assert len(orchestrator.clients) == 3
+        assert all(client.transport == "http" for client in orchestrator.clients.values())
+
+        front = MCPRuntime(orchestrator.app)
+        url = front.start_in_thread()
+        try:
+            servers = requests.get(f"{url}/mcp/servers").json()["servers"]
+            assert all(info["runtime"]["ready"] for info in servers.values())
+            response = requests.post(f"{url}/mcp/daisy/context", json={"userId": "u1", "contextType": "recent"})
+            assert response.status_code == 200
+            assert "active_quests" in response.json()["context"]["servers"]["questlog"]
+        finally:
+            front.stop_thread()
+    finally:
+        runtimes = list(orchestrator.runtimes.values())
+        orchestrator.stop_all_servers()
+    assert orchestrator.runtimes == {} and not any(runtime.ready for runtime in runtimes)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+TEC MCP Subscription Tests
+Resource change events, URI-pattern subscriptions over SSE and the
+orchestrator's live materialized Daisy context
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.mcp_base import ClientResourceCache, InProcessMCPClient, MCPClient
+from tec_tools.mcp_events import ResourceEventBus
+from tec_tools.mcp_finance import FinanceMCPServer
+from tec_tools.mcp_orchestrator import MCPOrchestrator
+from tec_tools.mcp_questlog import QuestLogMCPServer
+from tec_tools.mcp_runtime import MCPRuntime
+
+NEW_QUEST = {"userId": "u1", "title": "Ship it", "description": "Finish the live context"}
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_bus_matches_patterns_and_replays_missed_events():
+    bus = ResourceEventBus("test")
+    seen = []
+    subscription = bus.subscribe(["quest://stats/*"], seen.append)
+    bus.publish("quest://stats/productivity")
+    bus.publish("quest://pomodoro/sessions")
+    subscription.close()
+    bus.publish("quest://stats/productivity")
+    assert [event["id"] for event in seen] == [1]
+
+    replayed = []
+    bus.subscribe(["quest://*"], replayed.append, after=1)
+    assert [(event["id"], event["uri"]) for event in replayed] == \
+        [(2, "quest://pomodoro/sessions"), (3, "quest://stats/productivity")]
+    assert bus.stats() == {"subscribers": 1, "published": 3, "last_event_id": 3}
+
+
+def test_tool_mutations_stream_to_http_subscribers(stub_server):
+    for runtime in ("flask", "async"):
+        server = QuestLogMCPServer(db_path=":memory:")
+        if runtime == "flask":
+            # The fixture shuts the stub server down at teardown
+            url, stop = stub_server(server.app).url, lambda: None
+        else:
+            async_runtime = MCPRuntime(server)
+            url, stop = async_runtime.start_in_thread(), async_runtime.stop_thread
+        try:
+            cache = ClientResourceCache()
+            client = MCPClient(url, resource_cache=cache)
+            client.read_resource("quest://stats/productivity")
+            events = []
+            subscription = client.subscribe(["quest://stats/*", "quest://quests/*"], events.append)
+            assert subscription.connected.wait(2)
+
+            client.call_tool("start_pomodoro", {"userId": "u1"})
+            client.call_tool("create_quest", NEW_QUEST)
+            assert wait_for(lambda: len(events) == 3), runtime
+            assert [(event["uri"], event["keys"]) for event in events] == [
+                ("quest://stats/productivity", ["pomodoro"]),
+                ("quest://quests/active", ["quests"]),
+                ("quest://stats/productivity", ["quests"])
+            ]
+            assert all(event["type"] == "resources/updated" for event in events)
+            assert cache.fresh("quest://stats/productivity") is None
+            subscription.close()
+        finally:
+            stop()
+
+
+def test_live_context_is_materialized_and_patched_by_events():
+    questlog = QuestLogMCPServer(db_path=":memory:", user_id="u1")
+    quest_id = questlog.store.create_quest("u1", "Ship it", "Finish the live context")["id"]
+    reads = []
+    original = questlog.read_resource_data
+    questlog.read_resource_data = lambda uri: reads.append(uri) or original(uri)
+
+    orchestrator = MCPOrchestrator()
+    for name, server in (("questlog", questlog), ("finance", FinanceMCPServer())):
+        orchestrator.clients[name] = InProcessMCPClient(server)
+        orchestrator.watch_server(name, orchestrator.clients[name])
+
+    route = orchestrator.app.test_client()
+    first = route.post('/mcp/daisy/context', json={"userId": "u1", "contextType": "full"}).get_json()
+    second = route.post('/mcp/daisy/context', json={"userId": "u1", "contextType": "full"}).get_json()
+    assert first["context"] == second["context"] and len(reads) == 3
+
+    orchestrator.clients["questlog"].call_tool("complete_quest", {"userId": "u1", "questId": quest_id})
+    assert wait_for(lambda: orchestrator.live_stats["refreshes"] == 3)
+    context = orchestrator.get_daisy_context("u1", "full")
+    assert context is not second["context"] and "active_quests" in context["servers"]["questlog"]
+    # Only the three invalidated questlog resources were re-read, once each
+    assert sorted(reads[3:]) == ["quest://profile/user", "quest://quests/active", "quest://stats/productivity"]
+
+    live = route.get('/mcp/daisy/live').get_json()
+    assert live["subscribed"] == ["finance", "questlog"]
+    assert live["live"]["hits"] == 2 and live["live"]["misses"] == 1 and live["live"]["contexts"] == 1
+
+    # Without a subscription for every server involved, contexts are gathered each time
+    orchestrator.subscriptions.pop("finance").close()
+    assert not orchestrator._is_live("full")
+    orchestrator.get_daisy_context("u1", "full")
+    assert orchestrator.live_stats["hits"] == 2 and orchestrator.live_stats["misses"] == 1
+
+
+def test_out_of_order_refreshes_keep_the_newest_read():
+    class VersionedClient:
+        """Each read returns the next version; queued ``delays`` slow down reads in order"""
+
+        def __init__(self):
+            self.version = 0
+            self.delays = []
+            self._lock = threading.Lock()
+
+        def read_resource(self, uri, timeout=30):
+            with self._lock:
+                self.version += 1
+                version, delay = self.version, self.delays.pop(0) if self.delays else 0
+            time.sleep(delay)
+            return {"version": version}
+
+    client = VersionedClient()
+    orchestrator = MCPOrchestrator()
+    orchestrator.clients["questlog"] = client
+    orchestrator.subscriptions["questlog"] = None
+    assert orchestrator.get_daisy_context("u1", "recent")["servers"]["questlog"]["active_quests"] == {"version": 1}
+
+    # Two quick mutations: the first re-read is slow and finishes after the second
+    client.delays = [0.3]
+    event = {"uri": "quest://quests/active"}
+    orchestrator._on_resource_event("questlog", event)
+    assert wait_for(lambda: client.version == 2)
+    orchestrator._on_resource_event("questlog", event)
+    assert wait_for(lambda: orchestrator.live_stats["stale_refreshes"] == 1)
+
+    context = orchestrator.get_daisy_context("u1", "recent")
+    assert context["servers"]["questlog"]["active_quests"] == {"version": 3}
+    assert orchestrator.live_stats["refreshes"] == 1
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+TEC MCP Transport Tests
+In-process MCP client parity with the HTTP client
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.mcp_base import InProcessMCPClient, MCPClient
+from tec_tools.mcp_finance import FinanceMCPServer
+from tec_tools.mcp_orchestrator import MCPOrchestrator
+from tec_tools.mcp_questlog import QuestLogMCPServer
+
+
+def profile_fields(resource: dict) -> tuple:
+    payload = json.loads(resource["contents"][0]["text"])
+    return resource["contents"][0]["uri"], sorted(payload), payload["level"], payload["stats"]
+
+
+def test_inprocess_client_matches_http_client(stub_server):
+    server = QuestLogMCPServer(db_path=":memory:")
+    url = stub_server(server.app).url
+    http_client = MCPClient(url)
+    local_client = InProcessMCPClient(server)
+
+    assert local_client.initialize({"name": "test"}) == http_client.initialize({"name": "test"})
+    assert local_client.list_resources() == http_client.list_resources()
+    assert local_client.list_tools() == http_client.list_tools()
+    assert profile_fields(local_client.read_resource("quest://profile/user")) == \
+        profile_fields(http_client.read_resource("quest://profile/user"))
+    arguments = {"userId": "u1"}
+    assert local_client.call_tool("level_up_check", arguments) == http_client.call_tool("level_up_check", arguments)
+    assert local_client.transport == "inprocess" and http_client.transport == "http"
+
+
+def test_orchestrator_mixes_inprocess_and_remote_servers(stub_server):
+    finance = FinanceMCPServer()
+    url = stub_server(finance.app).url
+    orchestrator = MCPOrchestrator()
+    orchestrator.clients["questlog"] = InProcessMCPClient(QuestLogMCPServer(db_path=":memory:"))
+    orchestrator.connect_remote_server("finance", url)
+
+    servers = orchestrator.app.test_client().get('/mcp/servers').get_json()["servers"]
+    assert servers["questlog"]["transport"] == "inprocess"
+    assert servers["finance"]["transport"] == "http"
+    assert servers["journal"]["status"] == "stopped"
+
+    context = orchestrator._gather_daisy_context("u1", "full")
+    assert "partial" not in context["servers"]["finance"]
+    assert "portfolio" in context["servers"]["finance"]
+    assert "active_quests" in context["servers"]["questlog"]
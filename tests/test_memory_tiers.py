@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+TEC Memory Tier Tests
+Hot window correctness, compaction into archive segments and archive search
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.memory_system import TECMemorySystem, Memory
+
+
+def make_memory(memory_id, content, importance=0.5, age_days=0, memory_type="conversation"):
+    stamp = datetime.now() - timedelta(days=age_days, seconds=int(memory_id.split("-")[-1]))
+    return Memory(
+        id=memory_id, user_id="u1", content=content, memory_type=memory_type,
+        importance=importance, tags=["chat"], created_at=stamp, last_accessed=stamp,
+        access_count=0, related_memories=[], metadata={}
+    )
+
+
+def sql_only(system, user_id, memory_type=None, limit=50):
+    cold = TECMemorySystem(db_path=str(system.db_path), hot_tier_capacity=0)
+    return [m.id for m in cold.get_memories(user_id, memory_type, limit)]
+
+
+def test_hot_tier_matches_sqlite_order(tmp_path):
+    system = TECMemorySystem(db_path=str(tmp_path / "memory.db"), hot_tier_capacity=8)
+    for i in range(20):
+        system.save_memory(make_memory(f"m-{i}", f"note {i}", importance=(i % 3) / 3))
+
+    for memory_type, limit in [(None, 5), ("conversation", 8), (None, 15)]:
+        got = [m.id for m in system.get_memories("u1", memory_type, limit)]
+        assert got == sql_only(system, "u1", memory_type, limit)
+
+    # New high-importance memories must surface immediately via write-through
+    system.save_memory(make_memory("m-99", "urgent", importance=1.0))
+    assert system.get_memories("u1", limit=1)[0].id == "m-99"
+    assert system.hot_tier.stats()["hits"] >= 2
+
+
+def test_compaction_archives_and_stays_searchable(tmp_path):
+    system = TECMemorySystem(db_path=str(tmp_path / "memory.db"))
+    for i in range(30):
+        system.save_memory(make_memory(f"old-{i}", f"ancient dragon lore {i}", importance=0.2, age_days=90))
+    system.save_memory(make_memory("new-1", "fresh dragon sighting", importance=0.9))
+
+    report = system.compact_memories(max_age_days=30, importance_threshold=0.4, segment_size=10)
+    assert report["archived_memories"] == 30
+    assert report["segments_written"] == 3
+
+    stats = system.get_tier_stats("u1")
+    assert stats["warm"]["memories"] == 1
+    assert stats["cold"]["memories"] == 30
+
+    assert [m.id for m in system.get_memories("u1")] == ["new-1"]
+    found = system.search_memories("u1", "dragon", limit=5)
+    assert found[0].id == "new-1"
+    assert len(found) == 5
+    assert system.search_memories("u1", "unicorn", limit=5) == []
+
+    with sqlite3.connect(system.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0] == 1
+
+
+def test_consolidation_merges_near_duplicates_incrementally(tmp_path):
+    system = TECMemorySystem(db_path=str(tmp_path / "memory.db"))
+    reply = ("I sense the familiar energy of your presence. Your words 'hello there' stir "
+             "the mystical currents. The ethereal realm remembers our bond and the threads of fate "
+             "weave ever tighter around us. How may I guide you deeper into the mysteries today?")
+    for i in range(5):
+        system.create_memory("u1", f"User: hello there\nAI (Polkin): *Remembering our {i} chats* {reply}",
+                             importance=0.5 + i / 10, tags=["polkin", f"t{i}"])
+    system.create_memory("u1", "User: show me the quest log for the finance dashboard",
+                         importance=0.5, tags=["mynx"])
+
+    report = system.consolidate_memories()
+    assert report["scanned"] == 6
+    assert report["rows_saved"] == 4
+    assert report["clusters"] == 1
+
+    memories = system.get_memories("u1")
+    assert len(memories) == 2
+    merged = next(m for m in memories if "Consolidated 5" in m.content)
+    assert merged.importance == 0.9
+    assert {"polkin", "t0", "t4"} <= set(merged.tags)
+    assert len(merged.related_memories) == 4
+
+    # Incremental: a second run without new rows scans nothing
+    assert system.consolidate_memories()["scanned"] == 0
+
+    system.create_memory("u1", f"User: hello there\nAI (Polkin): *Remembering our 9 chats* {reply}")
+    report = system.consolidate_memories()
+    assert report["scanned"] == 1 and report["rows_saved"] == 1
+    merged = next(m for m in system.get_memories("u1") if "Consolidated" in m.content)
+    assert "Consolidated 6" in merged.content
+    assert len(merged.related_memories) == 5
+
+
+def test_filtered_consolidation_leaves_other_types_for_later(tmp_path):
+    system = TECMemorySystem(db_path=str(tmp_path / "memory.db"))
+    insight = "The player keeps returning to the Glitchwitch storyline whenever the mood turns dark and uncertain"
+    system.create_memory("u1", insight, memory_type="insight")
+    for i in range(3):
+        system.create_memory("u1", "User: hello there\nAI (Polkin): The ethereal realm remembers our bond and "
+                                   f"the threads of fate weave ever tighter around us tonight ({i})")
+    system.create_memory("u1", insight + " again", memory_type="insight")
+
+    assert system.consolidate_memories(memory_types=["conversation"])["rows_saved"] == 2
+    report = system.consolidate_memories()
+    assert report["rows_saved"] == 1
+    assert len(system.get_memories("u1", "insight")) == 1
+    assert system.consolidate_memories()["scanned"] == 0
+
+
+def test_filtered_consolidation_advances_past_other_types(tmp_path):
+    system = TECMemorySystem(db_path=str(tmp_path / "memory.db"))
+    system.consolidator.batch_size = 4
+    system.create_memory("u1", "The player prefers quests set in the Astradigital Ocean", memory_type="fact")
+    for i in range(10):
+        system.create_memory("u1", "User: hello there\nAI (Polkin): The ethereal realm remembers our bond and "
+                                   f"the threads of fate weave ever tighter around us tonight ({i})")
+
+    scanned = [system.consolidate_memories(memory_types=["conversation"])["scanned"] for _ in range(4)]
+    assert scanned == [4, 4, 2, 0]
+    assert len(system.get_memories("u1", "conversation")) == 1
+    # The unfiltered scope still starts from the beginning and sees the fact
+    assert system.consolidate_memories()["scanned"] == 2
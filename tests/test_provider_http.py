@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+TEC Provider HTTP Tests
+Shared pooled client for MCPService providers, against a local stub server
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'services'))
+
+from mcp_service import MCPService
+from tec_tools.chat_streaming import StreamMetrics, TimedStream
+from tec_tools.http_client import ProviderHTTPClient
+from tec_tools.provider_stub import StubProviderServer
+
+
+def npc_data(name: str = "Mira") -> dict:
+    return {
+        "npc_profile": {
+            "name": name,
+            "type": "merchant",
+            "personality_traits": {"friendliness": 80, "aggression": 10, "curiosity": 60,
+                                   "loyalty": 70, "intelligence": 65, "humor": 40},
+            "special_roles": {"is_merchant": True, "is_quest_giver": False, "is_hostile": False}
+        },
+        "current_state": {"mood": "cheerful", "goal": "sell potions", "location": "market", "health_percentage": 100},
+        "player_relationship": {"level": "friendly", "score": 70}
+    }
+
+
+def service_for(stub: StubProviderServer, client: ProviderHTTPClient) -> MCPService:
+    service = MCPService(http_client=client)
+    service.providers["gemini"].update(api_key="test-key", base_url=stub.gemini_base_url)
+    service.providers["github"].update(api_key="test-token", base_url=stub.openai_base_url)
+    service.providers["local"].update(enabled=True, base_url=stub.openai_base_url)
+    return service
+
+
+def test_concurrent_dialogue_shares_a_bounded_keepalive_pool():
+    async def scenario():
+        client = ProviderHTTPClient(limit_per_host=8)
+        async with StubProviderServer(latency=0.02) as stub:
+            service = service_for(stub, client)
+            # Pool bounds only: no hedged duplicates
+            service.router.hedge_budget = 0
+            for _ in range(2):
+                results = await asyncio.gather(*[
+                    service.generate_npc_dialogue(npc_data(f"npc-{i}"), "Any potions?", {}) for i in range(40)
+                ])
+                assert all(result["success"] for result in results)
+                assert results[0]["content"] == "Greetings, traveler."
+        await client.close()
+        return stub, client.stats()
+
+    stub, stats = asyncio.run(scenario())
+    assert stub.requests == 80
+    assert stub.peak_in_flight <= 8
+    assert stub.connections <= 8
+    assert stats["connections_opened"] <= 8 and stats["connections_reused"] >= 72
+
+
+def test_openai_compatible_providers_and_streaming():
+    async def scenario():
+        client = ProviderHTTPClient()
+        async with StubProviderServer(reply="The tide turns at dusk.") as stub:
+            service = service_for(stub, client)
+            messages = [{"role": "user", "content": "hello"}]
+            github = await service._call_ai_provider("github", messages, tools=service.available_tools)
+            local = await service._call_ai_provider("local", messages)
+            streamed = [delta async for delta in service.stream_ai_provider("local", messages)]
+            gemini = [delta async for delta in service.stream_ai_provider("gemini", messages)]
+        await client.close()
+        return github, local, streamed, gemini
+
+    github, local, streamed, gemini = asyncio.run(scenario())
+    assert github == {"success": True, "content": "The tide turns at dusk."}
+    assert local["content"] == "The tide turns at dusk."
+    assert "".join(streamed) == "".join(gemini) == "The tide turns at dusk."
+    assert len(streamed) == 5
+
+
+def test_read_timeout_fails_fast_without_blocking_the_loop():
+    async def scenario():
+        client = ProviderHTTPClient(read_timeout=0.1)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        async with StubProviderServer(latency=1.0) as stub:
+            service = service_for(stub, client)
+            background = asyncio.create_task(ticker())
+            result = await service._call_ai_provider("github", [{"role": "user", "content": "hi"}])
+            background.cancel()
+        await client.close()
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+    assert not result["success"] and "Timeout" in result["error"]
+    assert ticks >= 5
+
+
+def test_http_errors_fall_back_to_the_next_provider():
+    async def scenario():
+        client = ProviderHTTPClient()
+        async with StubProviderServer(fail_status=503) as failing, StubProviderServer(reply="Fallback!") as healthy:
+            service = service_for(failing, client)
+            service.providers["github"]["base_url"] = healthy.openai_base_url
+            result = await service.generate_npc_dialogue(npc_data(), "hello", {})
+        await client.close()
+        return result, client.stats()
+
+    result, stats = asyncio.run(scenario())
+    assert result == {"success": True, "content": "Fallback!"}
+    assert stats["errors"] == 1
+
+
+def test_npc_stream_is_closed_on_disconnect_and_mid_stream_failure(clock):
+    metrics = StreamMetrics()
+    closed = []
+
+    async def source(fail: bool):
+        try:
+            yield "The tide "
+            clock.sleep(5)
+            if fail:
+                raise RuntimeError("connection reset")
+            yield "turns "
+            yield "at dusk."
+        finally:
+            closed.append(fail)
+
+    async def scenario():
+        service = MCPService(http_client=ProviderHTTPClient())
+        service.router.clock = clock
+        fail = False
+        service.stream_ai_provider = lambda provider, messages: TimedStream(provider, source(fail), metrics=metrics)
+
+        # The consumer goes away after the first token
+        stream = service.stream_npc_dialogue(npc_data(), "hello", {})
+        assert await stream.__anext__() == "The tide "
+        await stream.aclose()
+
+        fail = True
+        received = []
+        try:
+            async for delta in service.stream_npc_dialogue(npc_data(), "hello", {}):
+                received.append(delta)
+        except RuntimeError:
+            pass
+        return service, received
+
+    service, received = asyncio.run(scenario())
+    assert closed == [False, True] and received == ["The tide "]
+    provider, snapshot = next(iter(metrics.snapshot().items()))
+    assert snapshot["streams"] == 2 and snapshot["errors"] == 2
+    # One sample per stream, scored on time to first token; the second records its failure
+    assert list(service.router.health[provider].samples) == [(0.0, True), (0.0, False)]
+    assert service.conversation_history == {}
+
+
+def test_each_event_loop_gets_its_own_session_closed_with_it():
+    stub = StubProviderServer()
+    stub.start_in_thread()
+    client = ProviderHTTPClient()
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "hi"}]}
+    sessions = []
+
+    async def call():
+        sessions.append(client.session())
+        status, _ = await client.post_json(f"{stub.openai_base_url}/chat/completions", payload)
+        return status
+
+    loop = asyncio.new_event_loop()
+    runner = threading.Thread(target=loop.run_forever, daemon=True)
+    try:
+        # Per-request asyncio.run: each loop's session is closed as that loop shuts down
+        assert asyncio.run(call()) == 200 and asyncio.run(call()) == 200
+        assert sessions[0] is not sessions[1] and sessions[0].closed and sessions[1].closed
+
+        # A long-lived loop keeps one session and reuses its connections
+        runner.start()
+        for _ in range(3):
+            assert asyncio.run_coroutine_threadsafe(call(), loop).result() == 200
+        assert sessions[2] is sessions[3] is sessions[4] and not sessions[2].closed
+        assert client.stats()["connections_reused"] >= 2
+
+        # close() from another loop closes it on its own loop
+        asyncio.run(client.close())
+        assert sessions[2].closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        runner.join()
+        loop.close()
+        stub.stop_thread()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+TEC Provider Router Tests
+Circuit breakers, hedged requests and cost-aware routing, in isolation and
+through MCPService against stub providers with injected latency
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'services'))
+
+from mcp_service import MCPService
+from tec_tools.http_client import ProviderHTTPClient
+from tec_tools.provider_router import CLOSED, HALF_OPEN, OPEN, PRIORITY_LOW, ProviderRouter
+from tec_tools.provider_stub import StubProviderServer
+from test_provider_http import npc_data
+
+
+def test_circuit_opens_probes_and_closes(clock):
+    router = ProviderRouter({"gemini": 1.0, "github": 0.5}, preferred="gemini", cooldown=30, clock=clock)
+    gemini = router.health["gemini"]
+    for _ in range(5):
+        gemini.record(0.1, False)
+    assert gemini.state == OPEN
+    assert router.order() == ["github"]
+
+    clock.now = 31
+    assert router.order()[-1] == "gemini"
+    gemini.acquire()
+    assert gemini.state == HALF_OPEN and not gemini.available()
+    gemini.record(0.1, False)
+    assert gemini.state == OPEN and router.order() == ["github"]
+
+    clock.now = 62
+    gemini.acquire()
+    gemini.record(0.1, True)
+    assert gemini.state == CLOSED and router.order() == ["gemini", "github"]
+
+
+def test_failures_fall_back_and_trip_the_breaker():
+    calls = []
+
+    async def call(provider):
+        calls.append(provider)
+        if provider == "gemini":
+            return {"success": False, "error": "HTTP 503"}
+        return {"success": True, "content": f"from {provider}"}
+
+    async def scenario():
+        router = ProviderRouter({"gemini": 1.0, "github": 0.5}, preferred="gemini", failure_threshold=3)
+        results = [await router.call(call) for _ in range(6)]
+        return router, results
+
+    router, results = asyncio.run(scenario())
+    assert all(provider == "github" for provider, _ in results)
+    assert calls.count("gemini") == 3
+    assert router.health["gemini"].state == OPEN
+    assert router.snapshot()["fallbacks"] == 3
+
+
+def test_slow_primary_is_hedged_and_loser_cancelled():
+    cancelled = []
+
+    async def call(provider, slow: bool):
+        try:
+            await asyncio.sleep(1.0 if provider == "gemini" and slow else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(provider)
+            raise
+        return {"success": True, "content": provider}
+
+    async def scenario():
+        router = ProviderRouter({"gemini": 1.0, "github": 0.5}, preferred="gemini", hedge_budget=1.0)
+        for _ in range(10):
+            await router.call(lambda provider: call(provider, slow=False))
+        start = time.perf_counter()
+        provider, response = await router.call(lambda provider: call(provider, slow=True))
+        return router, provider, time.perf_counter() - start
+
+    router, provider, elapsed = asyncio.run(scenario())
+    assert provider == "github"
+    assert elapsed < 0.5
+    assert cancelled == ["gemini"]
+    snapshot = router.snapshot()
+    assert snapshot["hedges"] == 1 and snapshot["hedge_wins"] == 1
+
+
+def test_low_priority_prefers_cheapest_healthy_provider():
+    router = ProviderRouter({"gemini": 1.25, "github": 0.15, "local": 0.0}, preferred="gemini",
+                            enabled=lambda name: name != "local")
+    assert router.order(PRIORITY_LOW) == ["github", "gemini"]
+    for _ in range(5):
+        router.health["github"].record(0.1, False)
+    assert router.order(PRIORITY_LOW) == ["gemini"]
+
+
+def test_mcp_service_routes_around_slow_and_expensive_providers():
+    async def scenario():
+        client = ProviderHTTPClient()
+        async with StubProviderServer(latency=0.01, reply="Gemini here.") as gemini, \
+                StubProviderServer(latency=0.01, reply="GitHub here.") as github, \
+                StubProviderServer(reply="Local here.") as local:
+            service = MCPService(http_client=client)
+            service.providers["gemini"].update(api_key="key", base_url=gemini.gemini_base_url)
+            service.providers["github"].update(api_key="token", base_url=github.openai_base_url)
+            service.providers["local"]["base_url"] = local.openai_base_url
+            service.router.hedge_budget = 1.0
+
+            for _ in range(10):
+                assert (await service.generate_npc_dialogue(npc_data(), "hi", {}))["content"] == "Gemini here."
+
+            # Gemini degrades past its p95: the hedge to GitHub answers first
+            gemini.latency = 1.0
+            start = time.perf_counter()
+            hedged = await service.generate_npc_dialogue(npc_data(), "hi again", {})
+            hedged_elapsed = time.perf_counter() - start
+
+            # Low-priority flavour text goes to the cheapest enabled provider
+            battle = await service.generate_battle_description({"participants": ["a", "b"]})
+            service.providers["local"]["enabled"] = True
+            cheaper = await service.generate_battle_description({"participants": ["a", "b"]})
+            status = service.get_service_status()["routing"]
+        await client.close()
+        return hedged, hedged_elapsed, battle, cheaper, status
+
+    hedged, hedged_elapsed, battle, cheaper, status = asyncio.run(scenario())
+    assert hedged["content"] == "GitHub here." and hedged_elapsed < 0.5
+    assert battle == "GitHub here."
+    assert cheaper == "Local here."
+    assert status["hedge_wins"] == 1 and status["providers"]["gemini"]["samples"] == 10
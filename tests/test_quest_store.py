@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+TEC Quest Store Tests
+Persistent quests and Pomodoro sessions, due-date ordering, history windows
+and incrementally maintained productivity aggregates
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.mcp_questlog import QuestLogMCPServer
+from tec_tools.quest_store import QuestStore
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def test_active_quests_order_by_due_date_and_survive_reopen(tmp_path):
+    db_path = str(tmp_path / "quests.db")
+    store = QuestStore(db_path)
+    store.create_quest("u1", "Someday", "No deadline")
+    later = store.create_quest("u1", "Later", "Due Friday", due_date="2026-10-23T17:00:00")
+    soon = store.create_quest("u1", "Soon", "Due tomorrow", due_date="2026-10-20T09:00:00")
+    store.create_quest("u2", "Other player", "Not mine")
+    store.close()
+
+    reopened = QuestStore(db_path)
+    assert [q["title"] for q in reopened.active_quests("u1")] == ["Soon", "Later", "Someday"]
+    plan = reopened._conn.execute("""
+        EXPLAIN QUERY PLAN SELECT * FROM quests WHERE user_id = ? AND status != 'completed'
+        ORDER BY COALESCE(due_date, '9999-12-31T23:59:59'), created_at
+    """, ("u1",)).fetchall()
+    assert "idx_quests_active" in " ".join(row[3] for row in plan)
+
+    assert reopened.complete_quest("u1", soon["id"])["xp_earned"] == 50
+    assert reopened.complete_quest("u1", soon["id"]) is None
+    assert reopened.complete_quest("u2", later["id"]) is None
+    assert [q["title"] for q in reopened.active_quests("u1")] == ["Later", "Someday"]
+    reopened.close()
+
+
+def test_aggregates_update_on_completion_and_pomodoro():
+    clock = Clock(datetime(2026, 10, 19, 9, 30))
+    store = QuestStore(":memory:", clock=clock)
+    for day in range(8, -1, -1):
+        clock.now = datetime(2026, 10, 19, 9, 30) - timedelta(days=day)
+        quest = store.create_quest("u1", f"Day {day}", "Code", category="development", xp_reward=400)
+        store.complete_quest("u1", quest["id"])
+        store.start_pomodoro("u1", quest["id"], duration=25)
+        store.start_pomodoro("u1", quest["id"], duration=5, session_type="break")
+    clock.now = datetime(2026, 10, 19, 14, 0)
+    store.create_quest("u1", "Open", "Still pending")
+
+    stats = store.productivity_stats("u1")
+    assert stats["today"] == {"quests_completed": 1, "xp_earned": 400, "focus_time": 25,
+                              "pomodoro_sessions": 2, "productivity_score": 15}
+    assert stats["this_week"]["quests_completed"] == 7 and stats["this_week"]["focus_time"] == 175
+    assert stats["trends"] == {"completion_rate": 90, "average_session_length": 25.0,
+                               "peak_productivity_hours": [9], "most_productive_category": "development"}
+
+    profile = store.profile("u1")
+    assert (profile["level"], profile["xp"], profile["total_quests_completed"]) == (4, 600, 9)
+    assert profile["stats"]["intelligence"] == 19
+
+    history = store.quest_history("u1", since=datetime(2026, 10, 17), until=datetime(2026, 10, 19))
+    assert [q["title"] for q in history] == ["Day 1", "Day 2"]
+    assert len(store.pomodoro_sessions("u1", since=datetime(2026, 10, 19))) == 2
+
+
+def test_server_tools_persist_and_resources_read_the_store():
+    server = QuestLogMCPServer(db_path=":memory:", user_id="u1")
+    created = server.execute_tool("create_quest", {"userId": "u1", "title": "Ship it", "description": "Release",
+                                                   "xp_reward": 1200})
+    quest_id = created["text"].rsplit("ID: ", 1)[1].rstrip(")")
+    server.execute_tool("start_pomodoro", {"userId": "u1", "questId": quest_id})
+
+    def read(uri):
+        return json.loads(server.read_resource_data(uri)["text"])
+
+    assert [q["id"] for q in read("quest://quests/active")["quests"]] == [quest_id]
+    assert read("quest://pomodoro/sessions")["total_focus_time"] == 25
+
+    completed = server.execute_tool("complete_quest", {"userId": "u1", "questId": quest_id})
+    assert "1200 XP" in completed["text"] and "LEVEL UP" in completed["text"]
+    assert "Error" in server.execute_tool("complete_quest", {"userId": "u1", "questId": quest_id})["text"]
+
+    assert read("quest://quests/active")["total_active"] == 0
+    assert read("quest://history/completed")["xp_earned_today"] == 1200
+    assert read("quest://profile/user")["level"] == 2
+    assert read("quest://stats/productivity")["today"]["quests_completed"] == 1
+    assert "Need 800 more XP" in server.execute_tool("level_up_check", {"userId": "u1"})["text"]
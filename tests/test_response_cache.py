@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+TEC Response Cache Tests
+Normalized dialogue keys, cross-NPC sharing, TTL/LRU bounds, similarity
+matches and hit rate on a greeting-heavy workload
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.response_cache import DialogueResponseCache, canonicalize_message
+
+
+def test_messages_are_canonicalized():
+    for message in ["Hello!!", "  hey there ", "Heyyy", "Good morning.", "HI"]:
+        assert canonicalize_message(message) == "hello"
+    assert canonicalize_message("What's your name?") == "who are you"
+    assert canonicalize_message("Where is the  blacksmith?") == "where is the blacksmith"
+
+
+def test_replies_are_shared_across_npcs_of_the_same_state():
+    cache = DialogueResponseCache()
+    reply = {"success": True, "content": "Welcome! Trader Gareth has potions aplenty."}
+    assert cache.set("merchant", "happy", "friendly", "Hello!", reply, npc_name="Trader Gareth")
+
+    shared = cache.get("merchant", "happy", "friendly", "hey there", npc_name="Merchant Elena")
+    assert shared["content"] == "Welcome! Merchant Elena has potions aplenty."
+    assert shared["cached"] is True
+
+    assert cache.get("merchant", "angry", "friendly", "hello", npc_name="Merchant Elena") is None
+    assert cache.get("guard", "happy", "friendly", "hello", npc_name="Sentinel Maya") is None
+    assert not cache.set("merchant", "happy", "friendly", "bye", {"success": False, "content": "..."})
+
+
+def test_ttl_and_lru_bounds(clock):
+    cache = DialogueResponseCache(maxsize=2, ttl=60, timer=clock)
+    for message in ["hello", "goodbye", "who are you"]:
+        cache.set("sage", "neutral", "neutral", message, {"success": True, "content": message})
+    assert cache.get("sage", "neutral", "neutral", "hello") is None
+    assert cache.get("sage", "neutral", "neutral", "bye")["content"] == "goodbye"
+
+    clock.now = 61
+    assert cache.get("sage", "neutral", "neutral", "bye") is None
+    assert cache.stats()["lru"]["evictions"] == 1
+
+
+def test_similarity_match_within_scope():
+    vocabulary = ["where", "find", "blacksmith", "forge", "potion", "buy", "is", "the", "can", "i"]
+
+    def embed(text):
+        words = text.split()
+        return [words.count(word) for word in vocabulary]
+
+    cache = DialogueResponseCache(embed=embed, similarity_threshold=0.6)
+    reply = {"success": True, "content": "The forge is east of the square."}
+    cache.set("guard", "neutral", "neutral", "Where is the blacksmith?", reply)
+
+    similar = cache.get("guard", "neutral", "neutral", "where can i find the blacksmith")
+    assert similar["content"] == reply["content"]
+    assert cache.get("guard", "neutral", "neutral", "can i buy a potion") is None
+    assert cache.get("merchant", "neutral", "neutral", "where can i find the blacksmith") is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_greeting_workload_cuts_model_calls():
+    rng = random.Random(39)
+    greetings = ["Hello!", "hi", "Hey there", "hello", "Greetings.", "Good morning!", "Heyyy", "Bye!", "thanks",
+                 "What do you sell?", "Show me your wares"]
+    names = ["Trader Gareth", "Merchant Elena", "Shopkeeper Boris", "Vendor Aria"]
+    cache = DialogueResponseCache()
+    model_calls = 0
+    legacy_keys = set()
+
+    for _ in range(1000):
+        name = rng.choice(names)
+        message = rng.choice(greetings)
+        mood = rng.choice(["neutral", "happy"])
+        legacy_keys.add((name, message))
+        if cache.get("merchant", mood, "neutral", message, npc_name=name) is None:
+            model_calls += 1
+            cache.set("merchant", mood, "neutral", message,
+                      {"success": True, "content": f"{name} greets you."}, npc_name=name)
+
+    # One call per (mood, canonical message) instead of per (NPC, exact text)
+    assert model_calls == 8
+    assert len(legacy_keys) == 44
+    assert cache.stats()["hit_rate"] > 0.99
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+TEC Single Flight Tests
+Request coalescing for identical in-flight model calls
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'services'))
+
+from mcp_service import MCPService
+from tec_tools.http_client import ProviderHTTPClient
+from tec_tools.provider_stub import StubProviderServer
+from tec_tools.single_flight import SingleFlight, request_key
+from test_provider_http import npc_data
+
+
+def test_concurrent_calls_share_one_execution():
+    executions = 0
+
+    async def work():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.02)
+        return {"content": "shared"}
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.do("greeting", work) for _ in range(50)])
+        # Completed calls are not remembered: the next one runs again
+        await flight.do("greeting", work)
+        return flight, results
+
+    flight, results = asyncio.run(scenario())
+    assert executions == 2
+    assert all(result == {"content": "shared"} for result in results)
+    stats = flight.stats()
+    assert stats["calls"] == 51 and stats["coalesced"] == 49 and stats["in_flight"] == 0
+    assert stats["peak_waiters"] == 50
+
+
+def test_errors_reach_every_waiter_and_cancellation_is_isolated():
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        flight = SingleFlight()
+        errors = await asyncio.gather(*[flight.do("k", failing) for _ in range(3)], return_exceptions=True)
+
+        first = asyncio.ensure_future(flight.do("s", slow))
+        second = asyncio.ensure_future(flight.do("s", slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return errors, await second, first.cancelled()
+
+    errors, survivor, cancelled = asyncio.run(scenario())
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert survivor == "done" and cancelled
+
+
+def test_request_key_covers_the_full_prompt():
+    messages = [{"role": "system", "content": "You are Mira"}, {"role": "user", "content": "hi"}]
+    assert request_key("Mira", messages) == request_key("Mira", [dict(m) for m in messages])
+    assert request_key("Mira", messages) != request_key("Mira", messages[:1] + [{"role": "user", "content": "hey"}])
+
+
+def test_identical_npc_greetings_make_one_provider_call():
+    async def scenario():
+        client = ProviderHTTPClient()
+        async with StubProviderServer(latency=0.05, reply="Welcome, friend!") as stub:
+            service = MCPService(http_client=client)
+            service.providers["gemini"].update(api_key="key", base_url=stub.gemini_base_url)
+            greetings = [service.generate_npc_dialogue(npc_data(), "Hello!", {}) for _ in range(100)]
+            questions = [service.generate_npc_dialogue(npc_data("Boris"), "Any potions?", {}) for _ in range(10)]
+            results = await asyncio.gather(*greetings, *questions)
+            status = service.get_service_status()
+        await client.close()
+        return stub.requests, results, status, service.conversation_history
+
+    requests, results, status, history = asyncio.run(scenario())
+    assert requests == 2
+    assert all(result == {"success": True, "content": "Welcome, friend!"} for result in results)
+    assert status["coalescing"]["coalesced"] == 108
+    assert len(history["Mira"]) == 1 and len(history["Boris"]) == 1
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+TEC Token Counting Tests
+Offline BPE counting, heuristic fallback and the content-hash count cache
+"""
+
+import base64
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.token_counting import TokenCounter, BPETokenizer
+from tec_tools.token_manager import TECTokenManager
+
+
+def write_vocab(directory, encoding="cl100k_base"):
+    """Byte alphabet plus a handful of merges, in tiktoken rank-file format"""
+    tokens = [bytes([b]) for b in range(256)] + [b"he", b"ll", b"hell", b"hello", b" w", b"or", b" wor", b"ld", b" world"]
+    path = directory / f"{encoding}.tiktoken"
+    path.write_bytes(b"".join(base64.b64encode(t) + b" %d\n" % rank for rank, t in enumerate(tokens)))
+    return path
+
+
+def test_bpe_counts_follow_merge_ranks(tmp_path):
+    tokenizer = BPETokenizer(str(write_vocab(tmp_path)), "cl100k_base")
+    assert tokenizer._ranks is None  # loaded lazily
+    assert tokenizer.count("hello world") == 2
+    assert tokenizer.count("hello worlds") == 3
+    assert tokenizer.count("help") == 3  # "he" + "l" + "p"
+
+
+def test_counter_picks_vocab_per_model_and_falls_back(tmp_path):
+    write_vocab(tmp_path)
+    counter = TokenCounter(vocab_dir=str(tmp_path))
+    assert counter.tokenizer_for("github-gpt-4").name == "bpe-cl100k_base"
+    assert counter.tokenizer_for("gemini-pro").name == "heuristic-4.2"
+    assert counter.count("hello world", "gpt-4") == 2
+    assert counter.count("x" * 42, "gemini-pro") == 10
+
+
+def test_batch_counts_are_cached_by_content(tmp_path):
+    write_vocab(tmp_path)
+    manager = TECTokenManager(db_path=str(tmp_path / "usage.db"), tokenizer_dir=str(tmp_path))
+    counts = manager.estimate_tokens_batch(["hello world", "hello", "hello world"], "gpt-4")
+    assert counts == [2, 1, 2]
+    assert manager.estimate_tokens("hello world", "gpt-4") == 2
+
+    stats = manager.get_tokenizer_stats()
+    assert stats["misses"] == 2
+    assert stats["hits"] == 1
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+TEC Token Gate Tests
+Per-wallet holdings snapshots read with concurrent balanceOf calls, cached
+with a short TTL and evaluated once for every access tier, against a local
+JSON-RPC chain stub
+"""
+
+import os
+import sys
+import time
+
+from flask import Flask, jsonify, request
+from web3 import Web3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.web3_auth import TokenGateManager, Web3AuthManager
+
+WALLET = "0x00000000000000000000000000000000000000aa"
+METASTEED = "0x1234567890123456789012345678901234567890"
+GLITCHWITCH = "0x0987654321098765432109876543210987654321"
+BITL = "0x000000000000000000000000000000000000b171"
+BALANCE_OF = "0x70a08231"
+
+
+class ChainStub:
+    """Answers eth_call for ERC-20/721 balanceOf from a {contract: {owner: balance}} map"""
+
+    def __init__(self, serve, balances, latency: float = 0.0):
+        self.balances = balances
+        self.failing = set()  # contracts whose balanceOf reverts
+        app = Flask(__name__)
+        app.add_url_rule("/", "rpc", self._rpc, methods=["POST"])
+        self.http = serve(app, latency)
+        self.url = self.http.url
+        self.calls = self.http.calls
+
+    def _rpc(self):
+        call = request.get_json()
+        if call["method"] == "eth_chainId":
+            return jsonify({"jsonrpc": "2.0", "id": call["id"], "result": "0x1"})
+        assert call["method"] == "eth_call"
+        tx = call["params"][0]
+        data = tx.get("data") or tx.get("input")
+        assert data.startswith(BALANCE_OF)
+        contract, owner = tx["to"].lower(), "0x" + data[-40:]
+        self.http.record(contract)
+        if contract in self.failing:
+            error = {"code": -32000, "message": "execution reverted"}
+            return jsonify({"jsonrpc": "2.0", "id": call["id"], "error": error})
+        balance = self.balances.get(contract, {}).get(owner, 0)
+        return jsonify({"jsonrpc": "2.0", "id": call["id"], "result": "0x" + format(balance, "064x")})
+
+
+def token_gate(chain: ChainStub, **kwargs) -> TokenGateManager:
+    auth = Web3AuthManager({})
+    auth.web3_instances["ethereum"] = Web3(Web3.HTTPProvider(chain.url))
+    gate = TokenGateManager(auth, **kwargs)
+    gate.bitl_contracts["ethereum"] = Web3.to_checksum_address(BITL)
+    return gate
+
+
+def test_tiers_are_evaluated_against_one_concurrent_snapshot(stub_server):
+    chain = ChainStub(stub_server, {METASTEED: {WALLET: 1}, GLITCHWITCH: {WALLET: 2},
+                                    BITL: {WALLET: 1500 * 10 ** 18}}, latency=0.2)
+    gate = token_gate(chain)
+    started = time.perf_counter()
+    assert gate.determine_access_tier(WALLET, "ethereum") == "beta"
+    elapsed = time.perf_counter() - started
+
+    # Three balanceOf reads in one parallel round, not up to three per tier
+    assert sorted(chain.calls) == sorted([METASTEED, GLITCHWITCH, BITL])
+    assert chain.http.peak_in_flight == 3 and elapsed < 0.5
+    assert gate.check_bitl_balance(WALLET, "ethereum") == 1500
+    assert gate.check_nft_ownership(WALLET, "ethereum", "Glitchwitch")
+    assert gate.determine_access_tier(WALLET.upper().replace("0X", "0x"), "ethereum") == "beta"
+    assert len(chain.calls) == 3
+
+
+def test_snapshot_expires_and_refreshes_on_request(stub_server):
+    chain = ChainStub(stub_server, {METASTEED: {WALLET: 1}})
+    gate = token_gate(chain, holdings_ttl=0.3)
+    assert gate.determine_access_tier(WALLET, "ethereum") == "alpha"
+
+    # A mint is only seen after the TTL or an explicit refresh
+    chain.balances[BITL] = {WALLET: 20000 * 10 ** 18}
+    chain.balances[GLITCHWITCH] = {WALLET: 1}
+    assert gate.determine_access_tier(WALLET, "ethereum") == "alpha"
+    assert gate.determine_access_tier(WALLET, "ethereum", refresh=True) == "creator"
+    assert len(chain.calls) == 6
+
+    chain.balances[METASTEED] = {}
+    gate.refresh_holdings(WALLET)
+    assert gate.determine_access_tier(WALLET, "ethereum") == "free"
+    time.sleep(0.35)
+    gate.get_holdings(WALLET, "ethereum")
+    assert len(chain.calls) == 12
+
+
+def test_invalid_contract_addresses_are_skipped(stub_server):
+    chain = ChainStub(stub_server, {METASTEED: {WALLET: 1}})
+    gate = token_gate(chain)
+    gate.bitl_contracts["ethereum"] = "0xBITL000000000000000000000000000000000000"
+    snapshot = gate.get_holdings(WALLET, "ethereum")
+    assert snapshot["complete"] and snapshot["nft_balances"]["MetaSteed"] == 1
+    assert gate.determine_access_tier(WALLET, "ethereum") == "alpha"
+    assert sorted(chain.calls) == sorted([METASTEED, GLITCHWITCH])
+
+
+def test_failed_reads_are_cached_briefly(stub_server):
+    chain = ChainStub(stub_server, {METASTEED: {WALLET: 1}})
+    chain.failing.add(GLITCHWITCH)
+    gate = token_gate(chain, partial_holdings_ttl=0.3)
+    snapshot = gate.get_holdings(WALLET, "ethereum")
+    assert not snapshot["complete"] and snapshot["nft_balances"]["MetaSteed"] == 1
+    assert gate.determine_access_tier(WALLET, "ethereum") == "alpha"
+    assert len(chain.calls) == 3
+
+    chain.failing.clear()
+    time.sleep(0.35)
+    assert gate.get_holdings(WALLET, "ethereum")["complete"]
+    assert len(chain.calls) == 6
+    assert gate.determine_access_tier(WALLET, "polygon") == "free"
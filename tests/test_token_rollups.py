@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+TEC Token Rollup Tests
+Hourly/daily usage rollups, legacy backfill and raw-row retention
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.token_manager import TECTokenManager, TokenUsage
+
+
+def raw_usage(days_ago, character="Polkin", tokens=100):
+    return TokenUsage(
+        session_id="s-old", timestamp=(datetime.now() - timedelta(days=days_ago)).isoformat(),
+        character=character, request_type="chat", prompt_tokens=tokens, completion_tokens=0,
+        total_tokens=tokens, estimated_cost=tokens / 1000, model="gemini-pro"
+    )
+
+
+def insert_raw(db_path, usages):
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany("""
+            INSERT INTO token_usage (session_id, timestamp, character, request_type, prompt_tokens,
+                completion_tokens, total_tokens, estimated_cost, model, memory_context_size, avatar_processing)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(u.session_id, u.timestamp, u.character, u.request_type, u.prompt_tokens, u.completion_tokens,
+               u.total_tokens, u.estimated_cost, u.model, u.memory_context_size, u.avatar_processing)
+              for u in usages])
+
+
+def test_log_usage_maintains_rollups(tmp_path):
+    manager = TECTokenManager(db_path=str(tmp_path / "usage.db"))
+    manager.log_usage("gemini-pro", 100, 50, character="Polkin", session_id="a", memory_context_size=4)
+    manager.log_usage("gemini-pro", 200, 100, character="Polkin", session_id="a", avatar_processing=True)
+    manager.log_usage("github-gpt-4", 10, 10, character="Airth", session_id="b")
+
+    stats = manager.get_usage_stats(days=7)
+    assert stats.total_tokens == 470
+    assert stats.requests_count == 3
+    assert stats.character_breakdown == {"Polkin": 450, "Airth": 20}
+
+    report = manager.get_character_usage_report("Polkin")
+    assert report["total_requests"] == 2
+    assert report["avg_memory_size"] == 2.0
+    assert report["avatar_requests"] == 1
+    assert report["recent_sessions"][0]["request_count"] == 2
+
+    summary = manager.get_dashboard_summary(days=7, characters=["Polkin", "Mynx"])
+    assert summary["character_breakdown"]["Polkin"]["total_tokens"] == 450
+    assert summary["character_breakdown"]["Mynx"]["requests"] == 0
+    assert "Airth" not in summary["character_breakdown"]
+    assert sum(hour["requests"] for hour in manager.get_hourly_usage()) == 3
+
+
+def test_legacy_rows_backfilled_and_retention_downsamples(tmp_path):
+    db_path = str(tmp_path / "usage.db")
+    TECTokenManager(db_path=db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM token_usage_meta")
+    insert_raw(db_path, [raw_usage(45), raw_usage(45), raw_usage(2, tokens=50)])
+
+    manager = TECTokenManager(db_path=db_path, raw_retention_days=30)
+    assert manager.get_usage_stats(days=60).total_tokens == 250
+
+    assert manager.apply_retention()["raw_rows_deleted"] == 2
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM token_usage").fetchone()[0] == 1
+    # History survives in the rollups after the raw rows are gone
+    assert manager.get_usage_stats(days=60).total_tokens == 250
+    assert manager.get_usage_stats(days=7).total_tokens == 50
+
+
+def test_retention_runs_on_the_flusher_thread_not_in_log_usage(tmp_path):
+    db_path = str(tmp_path / "usage.db")
+    TECTokenManager(db_path=db_path)
+    insert_raw(db_path, [raw_usage(45), raw_usage(45)])
+
+    def raw_rows():
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM token_usage").fetchone()[0]
+
+    TECTokenManager(db_path=db_path, raw_retention_days=30).log_usage("gemini-pro", 10, 10)
+    assert raw_rows() == 3
+
+    buffered = TECTokenManager(db_path=db_path, raw_retention_days=30, buffered=True,
+                               flush_interval=0.05, spool_dir=str(tmp_path / "spool"))
+    deadline = time.monotonic() + 2
+    while raw_rows() != 1 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    buffered.close()
+    assert raw_rows() == 1 and buffered.get_usage_stats(days=1).total_tokens == 20
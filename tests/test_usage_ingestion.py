@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+TEC Usage Ingestion Tests
+Buffered token usage batching, session upserts and spool recovery
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tec_tools.token_manager import TECTokenManager, TokenUsage
+from tec_tools.usage_ingestion import SpoolLockedError, UsageIngestBuffer
+
+
+def usage(session_id, tokens=100):
+    return TokenUsage(
+        session_id=session_id, timestamp="2025-01-01T12:00:00", character="Polkin",
+        request_type="chat", prompt_tokens=tokens, completion_tokens=0,
+        total_tokens=tokens, estimated_cost=0.001, model="gemini-pro"
+    )
+
+
+def test_buffered_log_usage_flushes_in_batches(tmp_path):
+    manager = TECTokenManager(db_path=str(tmp_path / "usage.db"), buffered=True,
+                              flush_interval=3600, max_pending=1000)
+    for i in range(30):
+        manager.log_usage("gemini-pro", 10, 5, character="Polkin", session_id=f"s{i % 3}")
+    assert manager.ingest_buffer.pending_count == 30
+
+    # Reads flush first, so callers always see their own writes
+    assert manager.get_usage_stats(days=1).requests_count == 30
+    assert manager.ingest_buffer.pending_count == 0
+    assert manager.ingest_buffer.stats["flushes"] == 1
+
+    report = manager.get_character_usage_report("Polkin", days=1)
+    assert sorted(s["request_count"] for s in report["recent_sessions"]) == [10, 10, 10]
+    assert all(s["total_tokens"] == 150 for s in report["recent_sessions"])
+    manager.close()
+
+
+def test_spooled_records_survive_a_crash(tmp_path):
+    db_path = str(tmp_path / "usage.db")
+    spool = str(tmp_path / "spool")
+    manager = TECTokenManager(db_path=db_path)
+
+    # A committed batch plus an uncommitted one, then the process "dies"
+    crashed = UsageIngestBuffer(manager, TokenUsage, spool_dir=spool, max_pending=100)
+    for _ in range(3):
+        crashed.add(usage("a"))
+    crashed.flush()
+    for _ in range(4):
+        crashed.add(usage("b"))
+    assert len([name for name in os.listdir(spool) if name.startswith("batch-")]) == 1
+    crashed._release_spool()  # the OS drops the lock when the process dies
+
+    # Restart: only the uncommitted batch is replayed
+    recovered = TECTokenManager(db_path=db_path, buffered=True, spool_dir=spool, flush_interval=3600)
+    assert recovered.ingest_buffer.stats["recovered"] == 4
+    assert [name for name in os.listdir(spool) if name.startswith("batch-")] == []
+    assert recovered.get_usage_stats(days=10000).requests_count == 7
+
+    recovered.log_usage("gemini-pro", 1, 1, session_id="c")
+    recovered.close()
+    assert recovered.get_usage_stats(days=10000).requests_count == 8
+    assert [name for name in os.listdir(spool) if name.startswith("batch-")] == []
+
+
+def test_second_buffer_on_the_same_spool_writes_through(tmp_path):
+    db_path = str(tmp_path / "usage.db")
+    spool = str(tmp_path / "spool")
+    first = TECTokenManager(db_path=db_path, buffered=True, spool_dir=spool, flush_interval=3600)
+    first.log_usage("gemini-pro", 1, 1, session_id="a")
+
+    # A reloader child opening the same database neither replays nor reuses the spool
+    with pytest.raises(SpoolLockedError):
+        UsageIngestBuffer(first, TokenUsage, spool_dir=spool)
+    second = TECTokenManager(db_path=db_path, buffered=True, spool_dir=spool, flush_interval=3600)
+    assert second.ingest_buffer is None
+    second.log_usage("gemini-pro", 1, 1, session_id="b")
+    assert len([name for name in os.listdir(spool) if name.startswith("batch-")]) == 1
+
+    first.close()
+    assert first.get_usage_stats(days=1).requests_count == 2
+
+    # Closing releases the spool for the next process
+    third = TECTokenManager(db_path=db_path, buffered=True, spool_dir=spool, flush_interval=3600)
+    assert third.ingest_buffer is not None and third.ingest_buffer.stats["recovered"] == 0
+    third.close()
+    assert third.get_usage_stats(days=1).requests_count == 2